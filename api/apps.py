@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        """Register cached configs."""
+        from .config_registry import register_config
+        from .models import COMPANY_SETTINGS_CONFIG, CompanySettings
+
+        register_config(COMPANY_SETTINGS_CONFIG, CompanySettings, CompanySettings.load)
@@ -0,0 +1,203 @@
+"""
+Cache-aside helpers for the shared API cache.
+
+All keys are namespaced ("api:<namespace>:<parts>") on top of the cache's own
+KEY_PREFIX. Cached reads that depend on model data embed the current version
+of each model in their key; bumping a model's version (automatically on
+save/delete for registered models) makes every dependent entry unreachable
+without having to enumerate or delete keys.
+
+Usage:
+    register_cache_invalidation(Work, Recording)
+
+    class WorkViewSet(viewsets.ModelViewSet):
+        @cache_response(depends_on=[Work, Recording], vary_on_user=False)
+        def list(self, request, *args, **kwargs):
+            return super().list(request, *args, **kwargs)
+
+    rates = cache_get_or_set(make_key('fx', 'USD', 'EUR'), fetch_rate, timeout=3600)
+"""
+
+import functools
+import hashlib
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from rest_framework import status
+from rest_framework.response import Response
+
+
+KEY_NAMESPACE = 'api'
+VERSION_NAMESPACE = 'version'
+
+
+def api_cache_timeout():
+    """Return the default TTL (seconds) for cache-aside entries."""
+    return getattr(settings, 'API_CACHE_TIMEOUT', 60)
+
+
+def make_key(namespace, *parts):
+    """
+    Build a namespaced cache key.
+
+    Args:
+        namespace: Key family (e.g. 'fx', 'view', 'version')
+        *parts: Further key components, joined with ':'
+
+    Returns:
+        str: Cache key
+    """
+    return ':'.join([KEY_NAMESPACE, namespace, *(str(part) for part in parts)])
+
+
+def model_label(model):
+    """Return the lowercase 'app_label.model_name' label for a model class, instance or label."""
+    if isinstance(model, str):
+        model = apps.get_model(model)
+    return model._meta.label_lower
+
+
+# ==================== Versioned Invalidation ====================
+
+def get_model_versions(models):
+    """
+    Return the current cache version of each model, in one cache round trip.
+
+    Models without a stored version get one, so the first read after a cache
+    flush starts a fresh generation instead of reusing stale entries.
+
+    Args:
+        models: Iterable of model classes or 'app_label.Model' labels
+
+    Returns:
+        dict: {label: version}
+    """
+    labels = [model_label(model) for model in models]
+    keys = {make_key(VERSION_NAMESPACE, label): label for label in labels}
+    stored = cache.get_many(list(keys))
+
+    versions = {}
+    for key, label in keys.items():
+        version = stored.get(key)
+        if version is None:
+            version = time.time_ns()
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+        versions[label] = version
+    return versions
+
+
+def bump_model_version(*models):
+    """
+    Invalidate every cache entry depending on the given models.
+
+    Args:
+        *models: Model classes, instances or 'app_label.Model' labels
+    """
+    version = time.time_ns()
+    cache.set_many(
+        {make_key(VERSION_NAMESPACE, model_label(model)): version for model in models},
+        timeout=None,
+    )
+
+
+def _bump_on_change(sender, **kwargs):
+    bump_model_version(sender)
+
+
+def register_cache_invalidation(*models):
+    """
+    Bump a model's cache version whenever an instance is saved or deleted.
+
+    Bulk operations (update(), bulk_create(), bulk_update()) bypass signals;
+    code using them must call bump_model_version() itself.
+
+    Args:
+        *models: Model classes or 'app_label.Model' labels
+    """
+    for model in models:
+        if isinstance(model, str):
+            model = apps.get_model(model)
+        post_save.connect(_bump_on_change, sender=model, dispatch_uid=f'api_cache_save_{model_label(model)}')
+        post_delete.connect(_bump_on_change, sender=model, dispatch_uid=f'api_cache_delete_{model_label(model)}')
+
+
+# ==================== Cache-Aside ====================
+
+def cache_get_or_set(key, default_func, timeout=None):
+    """
+    Return a cached value, computing and storing it on a miss.
+
+    Args:
+        key: Cache key (see make_key)
+        default_func: Zero-argument callable producing the value
+        timeout: TTL in seconds (defaults to API_CACHE_TIMEOUT)
+
+    Returns:
+        The cached or freshly computed value
+    """
+    value = cache.get(key)
+    if value is None:
+        value = default_func()
+        if value is not None:
+            cache.set(key, value, timeout if timeout is not None else api_cache_timeout())
+    return value
+
+
+def view_cache_key(view, request, depends_on=(), vary_on_user=True):
+    """
+    Build the cache key for a viewset action response.
+
+    The key covers the view class, action, URL kwargs, query parameters, the
+    requesting user (when responses are user-scoped) and the current version
+    of every model the response depends on.
+    """
+    versions = get_model_versions(depends_on)
+    parts = [
+        f'{view.__class__.__module__}.{view.__class__.__name__}',
+        getattr(view, 'action', None) or request.method,
+        sorted((key, str(value)) for key, value in view.kwargs.items()),
+        sorted(request.query_params.lists()),
+        request.user.pk if vary_on_user else None,
+        sorted(versions.items()),
+    ]
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return make_key('view', view.__class__.__name__, digest)
+
+
+def cache_response(timeout=None, depends_on=(), vary_on_user=True):
+    """
+    Cache successful responses of a viewset list/retrieve action.
+
+    Only 200 responses to safe methods are cached, and only their data, so
+    renderers and content negotiation still run per request.
+
+    Args:
+        timeout: TTL in seconds (defaults to API_CACHE_TIMEOUT)
+        depends_on: Models whose changes invalidate the cached responses
+        vary_on_user: Key responses per user; disable only for data that is
+                      identical for every user allowed to see it
+
+    Returns:
+        callable: Decorator for viewset action methods
+    """
+    def decorator(action):
+        @functools.wraps(action)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return action(self, request, *args, **kwargs)
+
+            key = view_cache_key(self, request, depends_on, vary_on_user)
+            cached = cache.get(key)
+            if cached is not None:
+                return Response(cached)
+
+            response = action(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, timeout if timeout is not None else api_cache_timeout())
+            return response
+        return wrapper
+    return decorator
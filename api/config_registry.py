@@ -0,0 +1,117 @@
+"""
+Per-process registry of read-mostly configuration tables.
+
+Tables such as AlertConfiguration, NotificationPreferences and CompanySettings
+are read in hot loops but rarely written. Each registered config is loaded
+whole by its loader and kept in process memory. Saving or deleting a row of
+its model bumps the model's version in the shared cache (see api.cache) once
+the transaction commits and drops the local copy. Other processes compare
+their copy's version with the shared one at most every
+CONFIG_REGISTRY_CHECK_INTERVAL seconds, so a change reaches every worker
+within that interval without a query per read.
+
+Bulk operations (update(), bulk_create(), bulk_update()) bypass signals; code
+using them must call invalidate_config() itself. Values are shared between
+callers and must be treated as read-only. With the cache unreachable every
+version check misses and configs are reloaded on each check.
+
+Usage:
+    register_config('catalog.alert_configs', AlertConfiguration, load_alert_configs)
+
+    configs = get_config('catalog.alert_configs')
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .cache import bump_model_version, get_model_versions, model_label
+
+
+# name -> (model label, loader)
+CONFIG_LOADERS = {}
+
+# name -> (version, checked_at, value)
+_entries = {}
+_load_lock = threading.Lock()
+
+
+def config_registry_enabled():
+    """Return True if configs are cached in process memory."""
+    return getattr(settings, 'CONFIG_REGISTRY_ENABLED', True)
+
+
+def config_check_interval():
+    """Return how often (seconds) a cached config's version is checked."""
+    return getattr(settings, 'CONFIG_REGISTRY_CHECK_INTERVAL', 5)
+
+
+def _invalidate_on_change(sender, **kwargs):
+    transaction.on_commit(lambda: invalidate_config(sender))
+
+
+def register_config(name, model, loader):
+    """
+    Register a cached config loaded from a model's table.
+
+    Args:
+        name: Registry name (e.g. 'catalog.alert_configs')
+        model: Model class or 'app_label.Model' label whose changes invalidate it
+        loader: Zero-argument callable returning the config value
+    """
+    label = model_label(model)
+    CONFIG_LOADERS[name] = (label, loader)
+    post_save.connect(_invalidate_on_change, sender=model, dispatch_uid=f'config_registry_save_{label}')
+    post_delete.connect(_invalidate_on_change, sender=model, dispatch_uid=f'config_registry_delete_{label}')
+
+
+def invalidate_config(model):
+    """
+    Invalidate every config loaded from a model, in all processes.
+
+    Args:
+        model: Model class, instance or 'app_label.Model' label
+    """
+    label = model_label(model)
+    bump_model_version(label)
+    for name, (config_label, _loader) in CONFIG_LOADERS.items():
+        if config_label == label:
+            _entries.pop(name, None)
+
+
+def clear_configs():
+    """Drop every locally cached config (e.g. between tests)."""
+    _entries.clear()
+
+
+def get_config(name):
+    """
+    Return a registered config, loading it when missing or outdated.
+
+    Args:
+        name: Registry name
+
+    Returns:
+        The loader's value (shared; do not mutate)
+    """
+    label, loader = CONFIG_LOADERS[name]
+    if not config_registry_enabled():
+        return loader()
+
+    now = time.monotonic()
+    entry = _entries.get(name)
+    if entry is not None and now - entry[1] < config_check_interval():
+        return entry[2]
+
+    version = get_model_versions([label])[label]
+    if entry is not None and entry[0] == version:
+        _entries[name] = (version, now, entry[2])
+        return entry[2]
+
+    with _load_lock:
+        value = loader()
+        _entries[name] = (version, now, value)
+    return value
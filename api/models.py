@@ -312,6 +312,10 @@ def prevent_profile_deletion(sender, instance, **kwargs):
     )
 
 
+# Config registry entry holding the CompanySettings singleton
+COMPANY_SETTINGS_CONFIG = 'api.company_settings'
+
+
 class CompanySettings(models.Model):
     """
     Singleton model to store company settings.
@@ -384,6 +388,17 @@ class CompanySettings(models.Model):
         obj, created = cls.objects.get_or_create(pk=1)
         return obj
 
+    @classmethod
+    def cached(cls):
+        """
+        Return the singleton from the per-process config registry (see api.config_registry).
+
+        The instance is shared and must not be modified; use load() to edit settings.
+        """
+        from .config_registry import get_config
+
+        return get_config(COMPANY_SETTINGS_CONFIG)
+
     def get_placeholders(self):
         """
         Returns a dictionary of placeholders for contract generation.
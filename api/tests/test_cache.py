@@ -0,0 +1,130 @@
+"""
+Tests for the shared API cache layer.
+
+Tests api.cache and config.cache_backends:
+- Namespaced keys and per-model versioned invalidation
+- cache_response() on catalog list/retrieve actions
+- FailOpenRedisCache degrading to misses when Redis is unreachable
+"""
+
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.cache import (
+    bump_model_version, cache_get_or_set, get_model_versions, make_key,
+)
+from api.models import Role, UserProfile
+from catalog.models import Work, Recording
+from catalog.views import WorkViewSet
+from config.cache_backends import FailOpenRedisCache
+from identity.models import Identifier
+
+User = get_user_model()
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'api'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class VersionedInvalidationTestCase(TestCase):
+    """Test namespaced keys and model versions."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_make_key_is_namespaced(self):
+        self.assertEqual(make_key('exchange_rate', 'USD', 'EUR'), 'api:exchange_rate:USD:EUR')
+
+    def test_versions_are_stable_until_bumped(self):
+        first = get_model_versions([Work, Recording])
+        self.assertEqual(get_model_versions(['catalog.Work', 'catalog.Recording']), first)
+
+        bump_model_version(Work)
+        second = get_model_versions([Work, Recording])
+        self.assertNotEqual(second['catalog.work'], first['catalog.work'])
+        self.assertEqual(second['catalog.recording'], first['catalog.recording'])
+
+    def test_registered_models_bump_on_save_and_delete(self):
+        before = get_model_versions([Work])
+        work = Work.objects.create(title='Versioned')
+        after_save = get_model_versions([Work])
+        self.assertNotEqual(after_save, before)
+
+        work.delete()
+        self.assertNotEqual(get_model_versions([Work]), after_save)
+
+    def test_cache_get_or_set_computes_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return 42
+
+        key = make_key('test', 'answer')
+        self.assertEqual(cache_get_or_set(key, compute), 42)
+        self.assertEqual(cache_get_or_set(key, compute), 42)
+        self.assertEqual(len(calls), 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, API_CACHE_TIMEOUT=60)
+class CachedViewSetTestCase(TestCase):
+    """Test cache_response() on WorkViewSet."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username='cache_user', password='pass')
+        role, _ = Role.objects.get_or_create(
+            code='administrator', defaults={'name': 'Administrator', 'level': 1000},
+        )
+        UserProfile.objects.update_or_create(user=self.user, defaults={'role': role})
+        self.work = Work.objects.create(title='Cached Work')
+
+    def get(self, action, path='/api/works/', **kwargs):
+        request = self.factory.get(path)
+        force_authenticate(request, user=self.user)
+        return WorkViewSet.as_view({'get': action})(request, **kwargs)
+
+    def test_list_is_served_from_cache_until_data_changes(self):
+        first = self.get('list')
+        self.assertEqual(first.status_code, 200)
+
+        with CaptureQueriesContext(connection) as cached:
+            second = self.get('list')
+        self.assertEqual(second.data, first.data)
+        self.assertFalse(any('catalog_work' in query['sql'] for query in cached.captured_queries))
+
+        Work.objects.create(title='Another Work')
+        self.assertEqual(self.get('list').data['count'], first.data['count'] + 1)
+
+    def test_retrieve_is_invalidated_by_identifier_changes(self):
+        self.assertIsNone(self.get('retrieve', pk=self.work.pk).data['iswc'])
+
+        Identifier.objects.create(owner_type='work', owner_id=self.work.id,
+                                  scheme='ISWC', value='T-000000002-1')
+        self.assertEqual(self.get('retrieve', pk=self.work.pk).data['iswc'], 'T-000000002-1')
+
+    def test_missing_objects_are_not_cached(self):
+        self.assertEqual(self.get('retrieve', pk=self.work.pk + 1000).status_code, 404)
+        Work.objects.filter(pk=self.work.pk).update(title='Renamed')
+        self.assertEqual(self.get('retrieve', pk=self.work.pk).data['title'], 'Renamed')
+
+
+class FailOpenRedisCacheTestCase(SimpleTestCase):
+    """Test that an unreachable Redis behaves like an empty cache."""
+
+    def setUp(self):
+        # Nothing listens on port 1, so every command fails to connect
+        self.cache = FailOpenRedisCache('redis://127.0.0.1:1/0', {
+            'OPTIONS': {'socket_connect_timeout': 0.1},
+        })
+
+    def test_reads_miss_and_writes_are_dropped(self):
+        with self.assertLogs('config.cache_backends', level='WARNING'):
+            self.cache.set('key', 'value')
+            self.assertIsNone(self.cache.get('key'))
+            self.assertEqual(self.cache.get_many(['key']), {})
+            self.assertFalse(self.cache.add('key', 'value'))
@@ -0,0 +1,92 @@
+"""
+Tests for the per-process config registry.
+
+Tests api.config_registry and its registered configs:
+- Configs are loaded once and served from memory
+- Saves invalidate after commit, locally and through the shared version
+- Alert and notification jobs read configs without queries once warm
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.cache import bump_model_version
+from api.config_registry import clear_configs, get_config
+from api.models import COMPANY_SETTINGS_CONFIG, CompanySettings, Department
+from catalog.alert_service import create_daily_alerts, get_alert_config
+from catalog.models import AlertConfiguration
+from crm_extensions.models import Task
+from notifications.models import NotificationPreferences
+from notifications.tasks import check_tasks_due_tomorrow
+
+User = get_user_model()
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'config'}}
+IN_MEMORY_CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES, CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS,
+                   CONFIG_REGISTRY_ENABLED=True, CONFIG_REGISTRY_CHECK_INTERVAL=60)
+class ConfigRegistryTestCase(TestCase):
+    """Test cached config reads and invalidation."""
+
+    def setUp(self):
+        cache.clear()
+        clear_configs()
+        self.addCleanup(clear_configs)
+
+    def test_config_is_loaded_once(self):
+        CompanySettings.objects.create(company_name='HaHaHa Production')
+
+        self.assertEqual(CompanySettings.cached().company_name, 'HaHaHa Production')
+        with self.assertNumQueries(0):
+            self.assertEqual(CompanySettings.cached().company_name, 'HaHaHa Production')
+
+    def test_save_invalidates_after_commit(self):
+        config = AlertConfiguration.objects.create(
+            alert_type='overdue', title_template='Overdue', message_template='Late',
+        )
+        self.assertEqual(get_alert_config('overdue'), config)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            config.enabled = False
+            config.save()
+            # Not invalidated before the transaction commits
+            self.assertIsNotNone(get_alert_config('overdue'))
+
+        self.assertIsNone(get_alert_config('overdue'))
+
+    def test_other_process_change_is_picked_up_on_version_check(self):
+        settings_obj = CompanySettings.cached()
+        CompanySettings.objects.filter(pk=settings_obj.pk).update(company_name='Renamed')
+
+        with override_settings(CONFIG_REGISTRY_CHECK_INTERVAL=0):
+            # Same shared version: still served from memory
+            with self.assertNumQueries(0):
+                self.assertEqual(get_config(COMPANY_SETTINGS_CONFIG).company_name, '')
+
+            # Another process bumped the version
+            bump_model_version(CompanySettings)
+            self.assertEqual(get_config(COMPANY_SETTINGS_CONFIG).company_name, 'Renamed')
+
+    def test_jobs_skip_config_queries_once_warm(self):
+        user = User.objects.create(username='assignee')
+        NotificationPreferences.objects.create(user=user, deadline_tomorrow_enabled=False)
+        department = Department.objects.create(code='digital', name='Digital')
+        due = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        Task.objects.create(title='Mix', department=department, assigned_to=user, due_date=due)
+        AlertConfiguration.objects.create(
+            alert_type='overdue', title_template='Overdue', message_template='Late',
+        )
+
+        check_tasks_due_tomorrow()
+        create_daily_alerts()
+
+        with self.assertNumQueries(1):  # tasks
+            self.assertEqual(check_tasks_due_tomorrow(), 'Sent 0 tomorrow deadline notifications')
+        with self.assertNumQueries(3):  # overdue, approaching and release songs
+            create_daily_alerts()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Campaign, CampaignAssignment
+from .models import Campaign, CampaignAssignment, CampaignFinancialRollup, ExchangeRate
 
 
 class CampaignAssignmentInline(admin.TabularInline):
@@ -54,3 +54,27 @@ class CampaignAdmin(admin.ModelAdmin):
         if not change:  # Only set created_by on creation
             obj.created_by = request.user
         super().save_model(request, obj, form, change)
+
+
+@admin.register(CampaignFinancialRollup)
+class CampaignFinancialRollupAdmin(admin.ModelAdmin):
+    """Read-only view of the financial rollup (maintained by signals and a nightly task)."""
+    list_display = [
+        'start_date', 'client', 'brand', 'currency', 'status', 'invoice_status',
+        'campaign_count', 'value', 'value_eur', 'updated_at',
+    ]
+    list_filter = ['currency', 'status', 'invoice_status']
+    search_fields = ['client__display_name', 'brand__display_name']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ['date', 'currency', 'rate', 'source', 'updated_at']
+    list_filter = ['currency', 'source']
+    date_hierarchy = 'date'
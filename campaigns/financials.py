@@ -0,0 +1,297 @@
+"""
+Currency-normalized financial aggregation for Digital department campaigns.
+
+Campaign amounts are stored in their own currency. Instead of converting
+every campaign in Python, the engine sums amounts in SQL grouped by currency
+(plus month, service combination or client), then applies one EUR exchange
+rate per currency group. The cost of a dashboard is a handful of grouped
+queries whatever the number of campaigns.
+
+Because groups are converted after summing, totals can differ from the sum
+of individually rounded per-campaign conversions by a few cents.
+
+Every aggregation accepts either a Campaign queryset (live computation) or a
+CampaignFinancialRollup queryset (pre-aggregated, what the endpoints use);
+both give identical results.
+
+Usage:
+    queryset = apply_financial_filters(digital_rollups(), request.query_params)
+    totals = get_financial_totals(queryset)
+    months = get_monthly_totals(queryset)
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Campaign, CampaignFinancialRollup
+from .services import currency_converter
+
+
+ZERO = Decimal('0.00')
+CENT = Decimal('0.01')
+
+# Invoice statuses counted as pending collections
+PENDING_INVOICE_STATUSES = ['issued', 'delayed']
+
+# Campaign statuses counted as active clients
+ACTIVE_CLIENT_STATUSES = ['active', 'confirmed']
+
+# Amount fields summed per group: result key -> Campaign field
+AMOUNT_FIELDS = {
+    'revenue': 'value',
+    'profit': 'profit',
+    'spent': 'budget_spent',
+}
+
+
+def digital_campaigns():
+    """Return the base queryset of Digital department campaigns."""
+    return Campaign.objects.filter(department__name='Digital Department')
+
+
+def digital_rollups():
+    """Return the base queryset of Digital department financial rollup rows."""
+    return CampaignFinancialRollup.objects.filter(department__name='Digital Department')
+
+
+def _is_rollup(queryset):
+    return queryset.model is CampaignFinancialRollup
+
+
+def _campaign_count(queryset, filter=None):
+    """Aggregate counting campaigns, for either source."""
+    if _is_rollup(queryset):
+        return Sum('campaign_count', filter=filter, default=0)
+    return Count('id', filter=filter)
+
+
+def service_display(service):
+    """Return the display name of a service type code."""
+    return dict(Campaign.SERVICE_TYPE_CHOICES).get(service, service.replace('_', ' ').title())
+
+
+# ==================== Currency Conversion ====================
+
+def get_eur_rates(currencies):
+    """
+    Return the EUR exchange rate of each currency (at most one query).
+
+    Args:
+        currencies: Iterable of currency codes
+
+    Returns:
+        dict: {currency: Decimal rate}
+    """
+    return currency_converter.get_rates_to_eur(currencies)
+
+
+def to_eur(amount, currency, rates):
+    """
+    Convert an amount with a pre-fetched rate table.
+
+    Args:
+        amount: Decimal amount or None
+        currency: Source currency code
+        rates: Result of get_eur_rates()
+
+    Returns:
+        Decimal or None: Amount in EUR rounded to cents (None stays None)
+    """
+    if amount is None:
+        return None
+    currency = currency.upper()
+    if currency == 'EUR':
+        return Decimal(amount)
+    return (Decimal(amount) * rates[currency]).quantize(CENT)
+
+
+def _amount_sums(extra_filter=None):
+    """Sum() aggregates for every AMOUNT_FIELDS entry."""
+    return {key: Sum(field, filter=extra_filter) for key, field in AMOUNT_FIELDS.items()}
+
+
+def _convert_rows(rows, keys):
+    """Fetch rates for the rows' currencies and convert the given keys in place."""
+    rates = get_eur_rates(row['currency'] for row in rows)
+    for row in rows:
+        for key in keys:
+            row[key] = to_eur(row[key], row['currency'], rates) or ZERO
+    return rows
+
+
+# ==================== Aggregations ====================
+
+def get_financial_totals(queryset, month_start=None, month_end=None):
+    """
+    Total revenue, profit, budget spent and pending collections in EUR.
+
+    Args:
+        queryset: Filtered Campaign or CampaignFinancialRollup queryset
+        month_start: Optional first day of a month whose revenue is also summed
+        month_end: Optional first day of the following month
+
+    Returns:
+        dict: {'revenue', 'profit', 'spent', 'pending', 'month_revenue'} as Decimals
+    """
+    aggregates = _amount_sums()
+    aggregates['pending'] = Sum('value', filter=Q(invoice_status__in=PENDING_INVOICE_STATUSES))
+    if month_start and month_end:
+        aggregates['month_revenue'] = Sum(
+            'value', filter=Q(start_date__gte=month_start, start_date__lt=month_end)
+        )
+
+    rows = list(queryset.order_by().values('currency').annotate(**aggregates))
+    keys = list(aggregates)
+    _convert_rows(rows, keys)
+
+    totals = {key: ZERO for key in [*AMOUNT_FIELDS, 'pending', 'month_revenue']}
+    for row in rows:
+        for key in keys:
+            totals[key] += row[key]
+    return totals
+
+
+def get_monthly_totals(queryset):
+    """
+    Revenue, profit and budget spent in EUR per start month, oldest first.
+
+    Campaigns without a start date are ignored.
+
+    Returns:
+        list: [{'month': date, 'revenue', 'profit', 'spent'}]
+    """
+    rows = list(
+        queryset.filter(start_date__isnull=False)
+        .order_by()
+        .annotate(month=TruncMonth('start_date'))
+        .values('month', 'currency')
+        .annotate(**_amount_sums())
+    )
+    _convert_rows(rows, AMOUNT_FIELDS)
+
+    months = {}
+    for row in rows:
+        totals = months.setdefault(row['month'], {'month': row['month'], **{key: ZERO for key in AMOUNT_FIELDS}})
+        for key in AMOUNT_FIELDS:
+            totals[key] += row[key]
+    return [months[month] for month in sorted(months)]
+
+
+def get_service_breakdown(queryset):
+    """
+    Per-service revenue, ROI inputs and delivery time.
+
+    Campaigns are grouped in SQL by (service combination, currency); each
+    group's amounts are then split evenly across its services, as a campaign
+    with several services contributes an equal share to each. Campaigns
+    without services are reported under 'unknown'. Delivery time uses the full
+    start-to-end duration of every campaign with both dates.
+
+    Returns:
+        dict: {service: {
+            'service', 'service_display', 'campaign_count',
+            'revenue', 'profit', 'spent',           # EUR Decimals
+            'delivery_days', 'delivery_count',      # totals for averaging
+        }}
+    """
+    if _is_rollup(queryset):
+        delivery = {
+            'delivery_count': Sum('delivery_count'),
+            'delivery_time': Sum('delivery_days'),
+        }
+    else:
+        has_dates = Q(start_date__isnull=False, end_date__isnull=False)
+        delivery = {
+            'delivery_count': Count('id', filter=has_dates),
+            'delivery_time': Sum(
+                ExpressionWrapper(F('end_date') - F('start_date'), output_field=DurationField()),
+                filter=has_dates,
+            ),
+        }
+
+    rows = list(
+        queryset.order_by()
+        .values('service_types', 'currency')
+        .annotate(campaign_count=_campaign_count(queryset), **delivery, **_amount_sums())
+    )
+    _convert_rows(rows, AMOUNT_FIELDS)
+
+    services = {}
+    for row in rows:
+        service_types = row['service_types'] or ['unknown']
+        share = len(service_types)
+        delivery_days = row['delivery_time'] or 0
+        if isinstance(delivery_days, timedelta):
+            delivery_days = delivery_days.days
+        for service in service_types:
+            data = services.setdefault(service, {
+                'service': service,
+                'service_display': service_display(service),
+                'campaign_count': 0,
+                'delivery_days': 0,
+                'delivery_count': 0,
+                **{key: ZERO for key in AMOUNT_FIELDS},
+            })
+            data['campaign_count'] += row['campaign_count']
+            data['delivery_days'] += delivery_days
+            data['delivery_count'] += row['delivery_count'] or 0
+            for key in AMOUNT_FIELDS:
+                data[key] += row[key] / share
+    return services
+
+
+def get_top_clients(queryset, limit=5):
+    """
+    Clients ranked by EUR revenue.
+
+    Returns:
+        list: [{'client_id', 'client_name', 'revenue', 'campaign_count'}]
+    """
+    rows = list(
+        queryset.filter(client__isnull=False)
+        .order_by()
+        .values('client_id', 'client__display_name', 'currency')
+        .annotate(revenue=Sum('value'), campaign_count=_campaign_count(queryset))
+    )
+    _convert_rows(rows, ['revenue'])
+
+    clients = {}
+    for row in rows:
+        data = clients.setdefault(row['client_id'], {
+            'client_id': row['client_id'],
+            'client_name': row['client__display_name'],
+            'revenue': ZERO,
+            'campaign_count': 0,
+        })
+        data['revenue'] += row['revenue']
+        data['campaign_count'] += row['campaign_count']
+    return sorted(clients.values(), key=lambda data: (-data['revenue'], data['client_id']))[:limit]
+
+
+def get_activity_counts(queryset):
+    """
+    Active client and in-progress campaign counts in one query.
+
+    Returns:
+        dict: {'active_clients': int, 'campaigns_in_progress': int}
+    """
+    return queryset.order_by().aggregate(
+        active_clients=Count(
+            'client', distinct=True,
+            filter=Q(status__in=ACTIVE_CLIENT_STATUSES, client__isnull=False),
+        ),
+        campaigns_in_progress=_campaign_count(queryset, filter=Q(status='active')),
+    )
+
+
+def current_month_bounds(today=None):
+    """Return (first day of the current month, first day of the next month)."""
+    today = today or timezone.now().date()
+    month_start = today.replace(day=1)
+    if today.month == 12:
+        return month_start, today.replace(year=today.year + 1, month=1, day=1)
+    return month_start, today.replace(month=today.month + 1, day=1)
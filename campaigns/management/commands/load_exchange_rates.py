@@ -0,0 +1,48 @@
+"""
+Management command to load daily EUR reference rates into ExchangeRate.
+
+Load from a local file (offline environments, backfills):
+    python manage.py load_exchange_rates rates.csv     # date,currency,rate
+    python manage.py load_exchange_rates rates.json    # {"2024-01-02": {"USD": 1.09}}
+
+Seed today's rates from the built-in fallback table:
+    python manage.py load_exchange_rates --fallback
+
+Fetch from the exchange rate API (latest, or a daily series):
+    python manage.py load_exchange_rates --fetch [--start 2024-01-01 [--end 2024-03-31]]
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from campaigns.services import fetch_exchange_rates, load_fallback_rates, load_rates_file
+
+
+class Command(BaseCommand):
+    help = 'Loads daily EUR exchange rates from a file, the fallback table or the exchange rate API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', help='CSV or JSON file of rates (units per 1 EUR)')
+        parser.add_argument('--fallback', action='store_true', help="Store the fallback rates as today's rates")
+        parser.add_argument('--fetch', action='store_true', help='Fetch rates from the exchange rate API')
+        parser.add_argument('--start', type=date.fromisoformat, help='First date to fetch (with --fetch)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last date to fetch (with --fetch)')
+
+    def handle(self, *args, **options):
+        """Load rates from the selected source."""
+        sources = [bool(options['path']), options['fallback'], options['fetch']]
+        if sum(sources) != 1:
+            raise CommandError('Pass exactly one of: a file path, --fallback, --fetch')
+
+        if options['path']:
+            stored = load_rates_file(options['path'])
+        elif options['fallback']:
+            stored = load_fallback_rates()
+        else:
+            try:
+                stored = fetch_exchange_rates(options['start'], options['end'])
+            except Exception as e:
+                raise CommandError(f'Failed to fetch exchange rates: {e}')
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Stored {stored} exchange rate(s)'))
@@ -0,0 +1,120 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:02
+
+import hashlib
+from datetime import timedelta
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+
+
+DIMENSIONS = [
+    'department_id', 'client_id', 'brand_id', 'start_date',
+    'service_types', 'currency', 'status', 'invoice_status',
+]
+
+
+def populate_financial_rollups(apps, schema_editor):
+    """
+    Build rollup rows from existing campaigns.
+
+    The EUR snapshot is left empty (no exchange rate lookups during migrate);
+    the nightly campaigns.reconcile_financial_rollups task fills it in.
+    """
+    Campaign = apps.get_model('campaigns', 'Campaign')
+    CampaignFinancialRollup = apps.get_model('campaigns', 'CampaignFinancialRollup')
+
+    has_dates = Q(start_date__isnull=False, end_date__isnull=False)
+    rows = (
+        Campaign.objects
+        .order_by()
+        .values(*DIMENSIONS)
+        .annotate(
+            campaign_count=Count('id'),
+            value_sum=Sum('value'),
+            profit_sum=Sum('profit'),
+            budget_spent_sum=Sum('budget_spent'),
+            pending_sum=Sum('value', filter=Q(invoice_status__in=['issued', 'delayed'])),
+            delivery_time=Sum(
+                ExpressionWrapper(F('end_date') - F('start_date'), output_field=DurationField()),
+                filter=has_dates,
+            ),
+            delivery_count=Count('id', filter=has_dates),
+        )
+    )
+
+    def cell_key(row):
+        parts = []
+        for field in DIMENSIONS:
+            value = row[field]
+            if field == 'service_types':
+                value = ','.join(value or [])
+            elif value is not None and field == 'start_date':
+                value = value.isoformat()
+            parts.append('' if value is None else str(value))
+        return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+    CampaignFinancialRollup.objects.bulk_create(
+        [
+            CampaignFinancialRollup(
+                cell_key=cell_key(row),
+                **{field: row[field] for field in DIMENSIONS},
+                campaign_count=row['campaign_count'],
+                value=row['value_sum'],
+                profit=row['profit_sum'],
+                budget_spent=row['budget_spent_sum'],
+                pending=row['pending_sum'],
+                delivery_days=(row['delivery_time'] or timedelta()).days,
+                delivery_count=row['delivery_count'],
+            )
+            for row in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_alter_departmentrequest_requested_department'),
+        ('campaigns', '0017_add_campaign_type'),
+        ('identity', '0019_remove_entity_entity_name_trgm_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CampaignFinancialRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cell_key', models.CharField(help_text='Hash of the dimension values identifying this row', max_length=40, unique=True)),
+                ('start_date', models.DateField(blank=True, help_text='Campaign start date (day grain)', null=True)),
+                ('service_types', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=50), blank=True, default=list, size=None)),
+                ('currency', models.CharField(max_length=3)),
+                ('status', models.CharField(max_length=20)),
+                ('invoice_status', models.CharField(max_length=20)),
+                ('campaign_count', models.PositiveIntegerField(default=0)),
+                ('value', models.DecimalField(blank=True, decimal_places=2, help_text='Sum of campaign values (revenue)', max_digits=14, null=True)),
+                ('profit', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('budget_spent', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('pending', models.DecimalField(blank=True, decimal_places=2, help_text='Revenue with issued or delayed invoices', max_digits=14, null=True)),
+                ('delivery_days', models.IntegerField(default=0, help_text='Sum of start-to-end days of campaigns with both dates')),
+                ('delivery_count', models.PositiveIntegerField(default=0, help_text='Number of campaigns with both start and end dates')),
+                ('eur_rate', models.DecimalField(blank=True, decimal_places=8, max_digits=18, null=True)),
+                ('value_eur', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('profit_eur', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('budget_spent_eur', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('pending_eur', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('brand', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='identity.entity')),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='identity.entity')),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.department')),
+            ],
+            options={
+                'verbose_name': 'Campaign Financial Rollup',
+                'verbose_name_plural': 'Campaign Financial Rollups',
+                'indexes': [models.Index(fields=['department', 'start_date'], name='campaigns_c_departm_01ee27_idx'), models.Index(fields=['client', 'currency'], name='campaigns_c_client__b6dede_idx')],
+            },
+        ),
+        migrations.RunPython(populate_financial_rollups, migrations.RunPython.noop),
+    ]
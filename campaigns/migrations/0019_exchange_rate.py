@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0018_financial_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(db_index=True)),
+                ('currency', models.CharField(max_length=3)),
+                ('rate', models.DecimalField(decimal_places=8, help_text='Units of this currency per 1 EUR', max_digits=18)),
+                ('source', models.CharField(choices=[('api', 'Exchange Rate API'), ('file', 'File Import'), ('fallback', 'Fallback Table')], default='api', max_length=20)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Exchange Rate',
+                'verbose_name_plural': 'Exchange Rates',
+                'ordering': ['-date', 'currency'],
+                'unique_together': {('currency', 'date')},
+            },
+        ),
+    ]
@@ -426,3 +426,140 @@ class CampaignAssignment(models.Model):
 
     def __str__(self):
         return f"{self.user.email} - {self.campaign.campaign_name} ({self.get_role_display()})"
+
+
+class CampaignFinancialRollup(models.Model):
+    """
+    Pre-aggregated campaign financials per day and reporting dimension.
+
+    One row per distinct (department, client, brand, start_date, service_types,
+    currency, status, invoice_status) combination of existing campaigns. The
+    dimensions are exactly the fields the Digital financial endpoints filter
+    and group on, and keep Campaign's field names, so
+    campaigns.views_financial.apply_financial_filters() and
+    campaigns.financials work unchanged on either model. Monthly figures are
+    derived by truncating start_date.
+
+    Amounts are stored in the rollup currency; EUR columns are a convenience
+    snapshot converted with eur_rate at refresh time. The financial endpoints
+    convert the native sums with current rates, like the live computation.
+
+    Kept current by campaigns.signals on every Campaign save/delete and
+    reconciled nightly by the campaigns.reconcile_financial_rollups task
+    (which also refreshes the EUR snapshot).
+    """
+
+    cell_key = models.CharField(
+        max_length=40,
+        unique=True,
+        help_text="Hash of the dimension values identifying this row"
+    )
+
+    # ============ DIMENSIONS ============
+    department = models.ForeignKey(
+        'api.Department',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    client = models.ForeignKey(
+        'identity.Entity',
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    brand = models.ForeignKey(
+        'identity.Entity',
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    start_date = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Campaign start date (day grain)"
+    )
+    service_types = ArrayField(
+        models.CharField(max_length=50),
+        default=list,
+        blank=True
+    )
+    currency = models.CharField(max_length=3)
+    status = models.CharField(max_length=20)
+    invoice_status = models.CharField(max_length=20)
+
+    # ============ MEASURES (rollup currency) ============
+    campaign_count = models.PositiveIntegerField(default=0)
+    value = models.DecimalField(
+        max_digits=14, decimal_places=2, null=True, blank=True,
+        help_text="Sum of campaign values (revenue)"
+    )
+    profit = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    budget_spent = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    pending = models.DecimalField(
+        max_digits=14, decimal_places=2, null=True, blank=True,
+        help_text="Revenue with issued or delayed invoices"
+    )
+    delivery_days = models.IntegerField(
+        default=0,
+        help_text="Sum of start-to-end days of campaigns with both dates"
+    )
+    delivery_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of campaigns with both start and end dates"
+    )
+
+    # ============ EUR SNAPSHOT ============
+    eur_rate = models.DecimalField(max_digits=18, decimal_places=8, null=True, blank=True)
+    value_eur = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    profit_eur = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    budget_spent_eur = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    pending_eur = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['department', 'start_date']),
+            models.Index(fields=['client', 'currency']),
+        ]
+        verbose_name = 'Campaign Financial Rollup'
+        verbose_name_plural = 'Campaign Financial Rollups'
+
+    def __str__(self):
+        return f"{self.start_date} {self.currency} x{self.campaign_count} ({self.cell_key[:8]})"
+
+
+class ExchangeRate(models.Model):
+    """
+    Daily EUR reference rate of a currency (ECB convention: units per 1 EUR).
+
+    Filled by the campaigns.fetch_exchange_rates beat task, or offline with
+    `python manage.py load_exchange_rates <file>` / `--fallback`. Lookups
+    for a date use the latest rate on or before it, so weekends and
+    holidays resolve to the previous business day.
+    """
+
+    SOURCE_CHOICES = [
+        ('api', 'Exchange Rate API'),
+        ('file', 'File Import'),
+        ('fallback', 'Fallback Table'),
+    ]
+
+    date = models.DateField(db_index=True)
+    currency = models.CharField(max_length=3)
+    rate = models.DecimalField(
+        max_digits=18,
+        decimal_places=8,
+        help_text="Units of this currency per 1 EUR"
+    )
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='api')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['currency', 'date']
+        ordering = ['-date', 'currency']
+        verbose_name = 'Exchange Rate'
+        verbose_name_plural = 'Exchange Rates'
+
+    def __str__(self):
+        return f"{self.date} EUR/{self.currency} {self.rate}"
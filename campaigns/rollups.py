@@ -0,0 +1,213 @@
+"""
+Maintenance of the CampaignFinancialRollup table.
+
+Each rollup row ("cell") aggregates the campaigns sharing one combination of
+ROLLUP_DIMENSIONS. A campaign save only touches the cells of its old and new
+dimension values, so refresh_financial_rollup() recomputes at most two rows
+from their campaigns. rebuild_financial_rollups() compares the whole table with
+a single grouped query over Campaign, repairs drift left by bulk updates and
+refreshes the EUR snapshot with current exchange rates.
+"""
+
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.utils import timezone
+
+from .financials import PENDING_INVOICE_STATUSES, to_eur
+from .models import Campaign, CampaignFinancialRollup
+from .services import currency_converter
+
+logger = logging.getLogger(__name__)
+
+
+# Campaign fields identifying a rollup cell (same names on CampaignFinancialRollup)
+ROLLUP_DIMENSIONS = [
+    'department_id', 'client_id', 'brand_id', 'start_date',
+    'service_types', 'currency', 'status', 'invoice_status',
+]
+
+# Measures compared when checking for drift
+ROLLUP_MEASURES = [
+    'campaign_count', 'value', 'profit', 'budget_spent', 'pending',
+    'delivery_days', 'delivery_count',
+]
+
+# Amount measures mirrored in the EUR snapshot
+EUR_MEASURES = ['value', 'profit', 'budget_spent', 'pending']
+
+
+def rollup_dimensions(campaign):
+    """Return the rollup dimension values of a campaign."""
+    return {field: getattr(campaign, field) for field in ROLLUP_DIMENSIONS}
+
+
+def rollup_cell_key(dimensions):
+    """Return the stable hash identifying a rollup cell."""
+    parts = []
+    for field in ROLLUP_DIMENSIONS:
+        value = dimensions[field]
+        if field == 'service_types':
+            value = ','.join(value or [])
+        elif value is not None and field == 'start_date':
+            value = value.isoformat()
+        parts.append('' if value is None else str(value))
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+
+def _measure_aggregates():
+    """Aggregates computing rollup measures from Campaign rows (named <measure>_sum)."""
+    has_dates = Q(start_date__isnull=False, end_date__isnull=False)
+    return {
+        'campaign_count_sum': Count('id'),
+        'value_sum': Sum('value'),
+        'profit_sum': Sum('profit'),
+        'budget_spent_sum': Sum('budget_spent'),
+        'pending_sum': Sum('value', filter=Q(invoice_status__in=PENDING_INVOICE_STATUSES)),
+        'delivery_time_sum': Sum(
+            ExpressionWrapper(F('end_date') - F('start_date'), output_field=DurationField()),
+            filter=has_dates,
+        ),
+        'delivery_count_sum': Count('id', filter=has_dates),
+    }
+
+
+def _measures(aggregated):
+    """Normalize aggregate() / annotate() output into rollup measure values."""
+    measures = {
+        field: aggregated[f'{field}_sum']
+        for field in ROLLUP_MEASURES if field != 'delivery_days'
+    }
+    measures['delivery_days'] = (aggregated['delivery_time_sum'] or timedelta()).days
+    return measures
+
+
+def _eur_snapshot(currency, measures, rates):
+    """EUR snapshot columns for a cell."""
+    snapshot = {'eur_rate': rates[currency.upper()]}
+    for field in EUR_MEASURES:
+        snapshot[f'{field}_eur'] = to_eur(measures[field], currency, rates)
+    return snapshot
+
+
+def refresh_financial_rollup(dimensions):
+    """
+    Recompute one rollup cell from its campaigns.
+
+    Deletes the cell when no campaign has these dimension values any more.
+    When two refreshes create the cell at once, the one losing the insert
+    retries and updates the row the other committed.
+
+    Args:
+        dimensions: Dict of ROLLUP_DIMENSIONS values (see rollup_dimensions)
+    """
+    try:
+        _refresh_financial_rollup(dimensions)
+    except IntegrityError:
+        _refresh_financial_rollup(dimensions)
+
+
+def _refresh_financial_rollup(dimensions):
+    key = rollup_cell_key(dimensions)
+    with transaction.atomic():
+        aggregated = Campaign.objects.filter(**dimensions).order_by().aggregate(**_measure_aggregates())
+        if not aggregated['campaign_count_sum']:
+            CampaignFinancialRollup.objects.filter(cell_key=key).delete()
+            return
+
+        measures = _measures(aggregated)
+        currency = dimensions['currency']
+        rates = currency_converter.get_rates_to_eur([currency])
+        CampaignFinancialRollup.objects.update_or_create(
+            cell_key=key,
+            defaults={
+                **dimensions,
+                **measures,
+                **_eur_snapshot(currency, measures, rates),
+            },
+        )
+
+
+def rebuild_financial_rollups(check_only=False):
+    """
+    Compare the rollup table with live Campaign aggregates and optionally repair it.
+
+    Repairs also refresh the EUR snapshot of every row with current rates.
+
+    Args:
+        check_only: If True, report drift without writing anything
+
+    Returns:
+        dict: {
+            'expected': int,   # cells that have at least one campaign
+            'missing': [...],  # cell keys with campaigns but no rollup row
+            'stale': [...],    # cell keys whose stored measures differ
+            'orphaned': [...], # cell keys of rows with no campaigns left
+        }
+    """
+    live = {}
+    for row in Campaign.objects.order_by().values(*ROLLUP_DIMENSIONS).annotate(**_measure_aggregates()):
+        dimensions = {field: row[field] for field in ROLLUP_DIMENSIONS}
+        live[rollup_cell_key(dimensions)] = (dimensions, _measures(row))
+
+    stored = {row.cell_key: row for row in CampaignFinancialRollup.objects.all()}
+
+    missing = sorted(key for key in live if key not in stored)
+    orphaned = sorted(key for key in stored if key not in live)
+    stale = sorted(
+        key for key, (_dimensions, measures) in live.items()
+        if key in stored and any(getattr(stored[key], field) != measures[field] for field in ROLLUP_MEASURES)
+    )
+
+    if not check_only:
+        if missing or stale or orphaned:
+            logger.warning(
+                f"Repairing financial rollups: {len(missing)} missing, "
+                f"{len(stale)} stale, {len(orphaned)} orphaned"
+            )
+        rates = currency_converter.get_rates_to_eur(
+            dimensions['currency'] for dimensions, _measures in live.values()
+        )
+        now = timezone.now()
+
+        with transaction.atomic():
+            if orphaned:
+                CampaignFinancialRollup.objects.filter(cell_key__in=orphaned).delete()
+
+            existing = []
+            for key, row in stored.items():
+                if key not in live:
+                    continue
+                dimensions, measures = live[key]
+                for field, value in {**measures, **_eur_snapshot(dimensions['currency'], measures, rates)}.items():
+                    setattr(row, field, value)
+                row.updated_at = now
+                existing.append(row)
+            CampaignFinancialRollup.objects.bulk_update(
+                existing,
+                [*ROLLUP_MEASURES, 'eur_rate', *(f'{field}_eur' for field in EUR_MEASURES), 'updated_at'],
+                batch_size=500,
+            )
+
+            CampaignFinancialRollup.objects.bulk_create(
+                [
+                    CampaignFinancialRollup(
+                        cell_key=key,
+                        **live[key][0],
+                        **live[key][1],
+                        **_eur_snapshot(live[key][0]['currency'], live[key][1], rates),
+                    )
+                    for key in missing
+                ],
+                batch_size=500,
+            )
+
+    return {
+        'expected': len(live),
+        'missing': missing,
+        'stale': stale,
+        'orphaned': orphaned,
+    }
@@ -1,24 +1,37 @@
 """
 Currency conversion service for financial calculations.
 
-This service provides currency conversion functionality with Redis caching
-for exchange rates. It fetches rates from an external API and caches them
-to minimize API calls and improve performance.
+Exchange rates are read from the persisted daily ExchangeRate table, with a
+small in-process LRU in front of it, so conversions never make an outbound
+HTTP call inside a request. The table is filled by the
+campaigns.fetch_exchange_rates beat task (fetch_exchange_rates() below) or
+offline from a file (load_rates_file()).
+
+Every lookup can be made for a date (the latest rate on or before it), and
+the bulk methods resolve all the rates a report needs in one query.
 """
 
+import bisect
+import csv
+import json
 import logging
-import requests
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
 from decimal import Decimal
-from typing import Dict, Optional
-from django.core.cache import cache
+from typing import Dict, Iterable, Optional
+
+import requests
 from django.conf import settings
+from django.utils import timezone
 
 
 logger = logging.getLogger(__name__)
 
 
 # Fallback exchange rates (updated periodically)
-# These are used if the external API is unavailable
+# These are used if no stored rate exists for a currency
 FALLBACK_RATES = {
     'USD': Decimal('1.08'),  # 1 EUR = 1.08 USD
     'GBP': Decimal('0.86'),  # 1 EUR = 0.86 GBP
@@ -28,23 +41,62 @@ FALLBACK_RATES = {
     'EUR': Decimal('1.00'),  # EUR to EUR
 }
 
+# Days searched before the earliest requested date for historical lookups
+# (covers weekends and holiday gaps in daily reference rates)
+HISTORY_LOOKBACK_DAYS = 10
+
+
+class RateLRU:
+    """
+    Thread-safe LRU of resolved rates with a time-to-live.
+
+    Keys are (currency, date) pairs; values are EUR per unit of currency.
+    The TTL bounds how long a process keeps serving a rate after a newer
+    one was loaded for the same day.
+    """
+
+    def __init__(self, maxsize=2048, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
 
 class CurrencyConverter:
     """
-    Currency conversion service with Redis caching.
+    Currency conversion service backed by the daily ExchangeRate table.
 
-    Fetches exchange rates from an external API and caches them in Redis
-    to improve performance and reduce API calls.
+    Rates are resolved as EUR per unit of currency; cross rates go through
+    EUR. Missing currencies fall back to FALLBACK_RATES.
     """
 
     def __init__(self):
-        """Initialize the currency converter with cache settings."""
-        # Cache TTL in seconds (1 hour by default)
-        self.cache_ttl = getattr(settings, 'EXCHANGE_RATE_CACHE_TTL', 3600)
-
-        # Exchange rate API endpoint
-        # Using exchangerate-api.io (free tier: 1,500 requests/month)
-        # Alternative: https://api.frankfurter.app/ (no API key needed, ECB data)
+        """Initialize the currency converter with lookup settings."""
+        # Exchange rate API endpoint, used only by fetch_exchange_rates()
+        # https://api.frankfurter.app/ (no API key needed, ECB data)
         self.api_url = getattr(
             settings,
             'EXCHANGE_RATE_API_URL',
@@ -54,113 +106,158 @@ class CurrencyConverter:
         # API key (if using a service that requires it)
         self.api_key = getattr(settings, 'EXCHANGE_RATE_API_KEY', None)
 
-    def get_cache_key(self, from_currency: str, to_currency: str = 'EUR') -> str:
-        """Generate cache key for exchange rate."""
-        return f"exchange_rate:{from_currency}:{to_currency}"
+        # In-process LRU in front of the table
+        self.lru = RateLRU(
+            maxsize=getattr(settings, 'EXCHANGE_RATE_LRU_SIZE', 2048),
+            ttl=getattr(settings, 'EXCHANGE_RATE_LRU_TTL', 300),
+        )
 
-    def get_exchange_rate(
+    # ==================== Rate Resolution ====================
+
+    def get_rates_to_eur(
         self,
-        from_currency: str,
-        to_currency: str = 'EUR'
-    ) -> Decimal:
+        currencies: Iterable[str],
+        on_date: Optional[date] = None
+    ) -> Dict[str, Decimal]:
         """
-        Get exchange rate from one currency to another.
+        Get the EUR value of one unit of each currency, in at most one query.
 
         Args:
-            from_currency: Source currency code (e.g., 'USD')
-            to_currency: Target currency code (default: 'EUR')
+            currencies: Currency codes
+            on_date: Date of the rates (default: today); the latest stored
+                     rate on or before it is used
 
         Returns:
-            Decimal: Exchange rate
+            Dict mapping currency codes to EUR per unit
 
         Raises:
-            ValueError: If currency codes are invalid
+            ValueError: If a currency has neither a stored nor a fallback rate
         """
-        # Normalize currency codes
-        from_currency = from_currency.upper()
-        to_currency = to_currency.upper()
+        from .models import ExchangeRate
 
-        # Same currency - rate is 1.0
-        if from_currency == to_currency:
-            return Decimal('1.00')
-
-        # Try cache first
-        cache_key = self.get_cache_key(from_currency, to_currency)
-        cached_rate = cache.get(cache_key)
-
-        if cached_rate is not None:
-            logger.debug(
-                f"Cache hit for {from_currency} -> {to_currency}: {cached_rate}"
+        on_date = on_date or timezone.now().date()
+        rates = {}
+        pending = set()
+        for currency in {currency.upper() for currency in currencies}:
+            if currency == 'EUR':
+                rates[currency] = Decimal('1.00')
+                continue
+            cached = self.lru.get((currency, on_date))
+            if cached is not None:
+                rates[currency] = cached
+            else:
+                pending.add(currency)
+
+        if pending:
+            stored = (
+                ExchangeRate.objects
+                .filter(currency__in=pending, date__lte=on_date)
+                .order_by('currency', '-date')
+                .distinct('currency')
+                .values_list('currency', 'rate')
             )
-            return Decimal(str(cached_rate))
+            for currency, units_per_eur in stored:
+                rates[currency] = Decimal('1.00') / units_per_eur
+                self.lru.set((currency, on_date), rates[currency])
+                pending.discard(currency)
 
-        # Fetch from API
-        try:
-            rate = self._fetch_rate_from_api(from_currency, to_currency)
+        for currency in pending:
+            rates[currency] = self._get_fallback_rate(currency, 'EUR')
+            self.lru.set((currency, on_date), rates[currency])
 
-            # Cache the rate
-            cache.set(cache_key, str(rate), self.cache_ttl)
+        return rates
 
-            logger.info(
-                f"Fetched exchange rate from API: "
-                f"{from_currency} -> {to_currency} = {rate}"
-            )
+    def get_historical_rates_to_eur(self, pairs: Iterable[tuple]) -> Dict[tuple, Decimal]:
+        """
+        Get EUR per unit for many (currency, date) pairs in one query.
 
-            return rate
+        Args:
+            pairs: Iterable of (currency code, date) tuples
 
-        except Exception as e:
-            logger.error(
-                f"Error fetching exchange rate for {from_currency} -> {to_currency}: {e}",
-                exc_info=True
+        Returns:
+            Dict mapping each (currency, date) pair to EUR per unit
+        """
+        from .models import ExchangeRate
+
+        rates = {}
+        pending = set()
+        for currency, on_date in pairs:
+            currency = currency.upper()
+            if currency == 'EUR':
+                rates[(currency, on_date)] = Decimal('1.00')
+                continue
+            cached = self.lru.get((currency, on_date))
+            if cached is not None:
+                rates[(currency, on_date)] = cached
+            else:
+                pending.add((currency, on_date))
+
+        if not pending:
+            return rates
+
+        dates = [on_date for _currency, on_date in pending]
+        history = {}
+        stored = (
+            ExchangeRate.objects
+            .filter(
+                currency__in={currency for currency, _on_date in pending},
+                date__gte=min(dates) - timedelta(days=HISTORY_LOOKBACK_DAYS),
+                date__lte=max(dates),
             )
+            .order_by('currency', 'date')
+            .values_list('currency', 'date', 'rate')
+        )
+        for currency, rate_date, units_per_eur in stored:
+            dates_list, rates_list = history.setdefault(currency, ([], []))
+            dates_list.append(rate_date)
+            rates_list.append(Decimal('1.00') / units_per_eur)
+
+        unresolved = set()
+        for currency, on_date in pending:
+            dates_list, rates_list = history.get(currency, ([], []))
+            index = bisect.bisect_right(dates_list, on_date) - 1
+            if index >= 0:
+                rates[(currency, on_date)] = rates_list[index]
+                self.lru.set((currency, on_date), rates_list[index])
+            else:
+                unresolved.add((currency, on_date))
+
+        # Gaps longer than the lookback window: resolve one date at a time
+        for currency, on_date in unresolved:
+            rates[(currency, on_date)] = self.get_rates_to_eur([currency], on_date)[currency]
 
-            # Fall back to hardcoded rates
-            return self._get_fallback_rate(from_currency, to_currency)
+        return rates
 
-    def _fetch_rate_from_api(
+    def get_exchange_rate(
         self,
         from_currency: str,
-        to_currency: str
+        to_currency: str = 'EUR',
+        on_date: Optional[date] = None
     ) -> Decimal:
         """
-        Fetch exchange rate from external API.
-
-        Uses https://api.frankfurter.app (European Central Bank data)
-        which is free and doesn't require an API key.
+        Get exchange rate from one currency to another.
 
         Args:
-            from_currency: Source currency code
-            to_currency: Target currency code
+            from_currency: Source currency code (e.g., 'USD')
+            to_currency: Target currency code (default: 'EUR')
+            on_date: Date of the rate (default: today)
 
         Returns:
             Decimal: Exchange rate
 
         Raises:
-            requests.RequestException: If API request fails
-            ValueError: If response is invalid
+            ValueError: If currency codes are invalid
         """
-        # Frankfurter API: GET /latest?from=USD&to=EUR
-        params = {
-            'from': from_currency,
-            'to': to_currency,
-        }
-
-        response = requests.get(
-            self.api_url,
-            params=params,
-            timeout=5  # 5 second timeout
-        )
-        response.raise_for_status()
-
-        data = response.json()
+        # Normalize currency codes
+        from_currency = from_currency.upper()
+        to_currency = to_currency.upper()
 
-        # Extract rate from response
-        # Frankfurter API format: {"amount": 1.0, "base": "USD", "date": "2024-01-01", "rates": {"EUR": 0.92}}
-        if 'rates' not in data or to_currency not in data['rates']:
-            raise ValueError(f"Invalid API response: {data}")
+        # Same currency - rate is 1.0
+        if from_currency == to_currency:
+            return Decimal('1.00')
 
-        rate = Decimal(str(data['rates'][to_currency]))
-        return rate
+        rates = self.get_rates_to_eur([from_currency, to_currency], on_date)
+        return rates[from_currency] / rates[to_currency]
 
     def _get_fallback_rate(
         self,
@@ -210,11 +307,14 @@ class CurrencyConverter:
             rate_from_eur = FALLBACK_RATES[to_currency]
             return rate_to_eur * rate_from_eur
 
+    # ==================== Conversion ====================
+
     def convert(
         self,
         amount: Decimal,
         from_currency: str,
-        to_currency: str = 'EUR'
+        to_currency: str = 'EUR',
+        on_date: Optional[date] = None
     ) -> Decimal:
         """
         Convert amount from one currency to another.
@@ -223,6 +323,7 @@ class CurrencyConverter:
             amount: Amount to convert
             from_currency: Source currency code
             to_currency: Target currency code (default: 'EUR')
+            on_date: Date of the rate (default: today)
 
         Returns:
             Decimal: Converted amount
@@ -236,7 +337,7 @@ class CurrencyConverter:
         if from_currency.upper() == to_currency.upper():
             return amount
 
-        rate = self.get_exchange_rate(from_currency, to_currency)
+        rate = self.get_exchange_rate(from_currency, to_currency, on_date)
         converted = amount * rate
 
         # Round to 2 decimal places for currency
@@ -245,7 +346,8 @@ class CurrencyConverter:
     def convert_to_eur(
         self,
         amount: Decimal,
-        from_currency: str
+        from_currency: str,
+        on_date: Optional[date] = None
     ) -> Decimal:
         """
         Convenience method to convert any currency to EUR.
@@ -253,64 +355,74 @@ class CurrencyConverter:
         Args:
             amount: Amount to convert
             from_currency: Source currency code
+            on_date: Date of the rate (default: today)
 
         Returns:
             Decimal: Amount in EUR
         """
-        return self.convert(amount, from_currency, 'EUR')
+        return self.convert(amount, from_currency, 'EUR', on_date)
 
     def get_multiple_rates(
         self,
         from_currency: str,
-        to_currencies: list
+        to_currencies: list,
+        on_date: Optional[date] = None
     ) -> Dict[str, Decimal]:
         """
-        Get exchange rates for multiple target currencies at once.
+        Get exchange rates for multiple target currencies at once (one query).
 
         Args:
             from_currency: Source currency code
             to_currencies: List of target currency codes
+            on_date: Date of the rates (default: today)
 
         Returns:
-            Dict mapping currency codes to exchange rates
+            Dict mapping currency codes to exchange rates (None if unavailable)
         """
+        from_currency = from_currency.upper()
+        currencies = {from_currency, *(currency.upper() for currency in to_currencies)}
+        try:
+            available = self.get_rates_to_eur(currencies, on_date)
+        except ValueError:
+            # Resolve one by one so a single unknown currency does not hide the others
+            available = {}
+            for currency in currencies:
+                try:
+                    available.update(self.get_rates_to_eur([currency], on_date))
+                except ValueError as e:
+                    logger.error(f"Failed to get rate for {from_currency} -> {currency}: {e}")
+
         rates = {}
         for to_currency in to_currencies:
-            try:
-                rates[to_currency] = self.get_exchange_rate(
-                    from_currency,
-                    to_currency
-                )
-            except Exception as e:
-                logger.error(
-                    f"Failed to get rate for {from_currency} -> {to_currency}: {e}"
-                )
+            if from_currency in available and to_currency.upper() in available:
+                rates[to_currency] = available[from_currency] / available[to_currency.upper()]
+            else:
                 rates[to_currency] = None
-
         return rates
 
-    def refresh_cache(self, from_currency: str, to_currency: str = 'EUR') -> None:
+    def refresh_cache(self, from_currency: str = None, to_currency: str = 'EUR') -> None:
         """
-        Force refresh of cached exchange rate.
+        Fetch today's rates into the table and drop this process's LRU.
 
         Args:
-            from_currency: Source currency code
-            to_currency: Target currency code
+            from_currency: Unused, kept for backwards compatibility
+            to_currency: Unused, kept for backwards compatibility
         """
-        cache_key = self.get_cache_key(from_currency, to_currency)
-        cache.delete(cache_key)
+        fetch_exchange_rates()
+        self.lru.clear()
 
-        # Fetch new rate
-        self.get_exchange_rate(from_currency, to_currency)
-
-        logger.info(f"Refreshed cache for {from_currency} -> {to_currency}")
+        logger.info("Refreshed exchange rates")
 
 
 # Singleton instance for use throughout the application
 currency_converter = CurrencyConverter()
 
 
-def convert_to_eur(amount: Optional[Decimal], currency: str) -> Optional[Decimal]:
+def convert_to_eur(
+    amount: Optional[Decimal],
+    currency: str,
+    on_date: Optional[date] = None
+) -> Optional[Decimal]:
     """
     Convenience function to convert any amount to EUR.
 
@@ -319,6 +431,7 @@ def convert_to_eur(amount: Optional[Decimal], currency: str) -> Optional[Decimal
     Args:
         amount: Amount to convert (can be None)
         currency: Source currency code
+        on_date: Date of the rate (default: today)
 
     Returns:
         Converted amount in EUR, or None if amount is None
@@ -330,4 +443,120 @@ def convert_to_eur(amount: Optional[Decimal], currency: str) -> Optional[Decimal
     if amount is None:
         return None
 
-    return currency_converter.convert_to_eur(amount, currency)
+    return currency_converter.convert_to_eur(amount, currency, on_date)
+
+
+# ==================== Rate Loading ====================
+
+def store_rates(rates_by_date, source='api'):
+    """
+    Upsert daily rates into the ExchangeRate table.
+
+    Args:
+        rates_by_date: {date: {currency: units per 1 EUR}}
+        source: ExchangeRate.source value
+
+    Returns:
+        int: Number of rates stored
+    """
+    from .models import ExchangeRate
+
+    rows = [
+        ExchangeRate(date=rate_date, currency=currency.upper(), rate=Decimal(str(rate)), source=source)
+        for rate_date, rates in rates_by_date.items()
+        for currency, rate in rates.items()
+        if currency.upper() != 'EUR'
+    ]
+    ExchangeRate.objects.bulk_create(
+        rows,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['currency', 'date'],
+        update_fields=['rate', 'source', 'updated_at'],
+    )
+    return len(rows)
+
+
+def fetch_exchange_rates(start_date=None, end_date=None):
+    """
+    Fetch EUR reference rates from the exchange rate API and store them.
+
+    Without dates, fetches the latest published rates. With a start date,
+    fetches the daily series up to end_date (default: today).
+
+    Args:
+        start_date: Optional first date of a backfill
+        end_date: Optional last date of a backfill
+
+    Returns:
+        int: Number of rates stored
+
+    Raises:
+        requests.RequestException: If the API request fails
+    """
+    base_url = currency_converter.api_url.rsplit('/', 1)[0]
+    if start_date:
+        end_date = end_date or timezone.now().date()
+        url = f"{base_url}/{start_date.isoformat()}..{end_date.isoformat()}"
+    else:
+        url = currency_converter.api_url
+
+    response = requests.get(url, params={'from': 'EUR'}, timeout=10)
+    response.raise_for_status()
+    data = response.json()
+
+    # Latest: {"base": "EUR", "date": "2024-01-02", "rates": {"USD": 1.09, ...}}
+    # Series: {"base": "EUR", "start_date": ..., "rates": {"2024-01-02": {"USD": 1.09}, ...}}
+    if 'rates' not in data:
+        raise ValueError(f"Invalid API response: {data}")
+    if 'date' in data:
+        rates_by_date = {date.fromisoformat(data['date']): data['rates']}
+    else:
+        rates_by_date = {date.fromisoformat(day): rates for day, rates in data['rates'].items()}
+
+    stored = store_rates(rates_by_date, source='api')
+    logger.info(f"Stored {stored} exchange rates from {url}")
+    return stored
+
+
+def load_rates_file(path):
+    """
+    Load daily rates from a local file (offline environments, backfills).
+
+    Supported formats:
+    - CSV with a header row: date,currency,rate
+    - JSON: {"2024-01-02": {"USD": 1.09, ...}, ...}, optionally wrapped in
+      {"rates": {...}} as returned by the API's time series endpoint
+
+    Rates are units of currency per 1 EUR.
+
+    Args:
+        path: File path
+
+    Returns:
+        int: Number of rates stored
+    """
+    rates_by_date = {}
+    if str(path).lower().endswith('.csv'):
+        with open(path, newline='') as handle:
+            for row in csv.DictReader(handle):
+                day = date.fromisoformat(row['date'].strip())
+                rates_by_date.setdefault(day, {})[row['currency'].strip()] = row['rate'].strip()
+    else:
+        with open(path) as handle:
+            data = json.load(handle)
+        data = data.get('rates', data)
+        rates_by_date = {date.fromisoformat(day): rates for day, rates in data.items()}
+
+    return store_rates(rates_by_date, source='file')
+
+
+def load_fallback_rates(on_date=None):
+    """
+    Store FALLBACK_RATES as the rates of a date (default: today).
+
+    Returns:
+        int: Number of rates stored
+    """
+    on_date = on_date or timezone.now().date()
+    return store_rates({on_date: FALLBACK_RATES}, source='fallback')
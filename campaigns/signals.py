@@ -5,9 +5,11 @@ Handles automation for Campaign changes.
 """
 
 import logging
-from django.db.models.signals import post_save, pre_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from .models import Campaign
+from .rollups import refresh_financial_rollup, rollup_dimensions
 
 logger = logging.getLogger(__name__)
 
@@ -19,10 +21,13 @@ def track_campaign_field_changes(sender, instance, **kwargs):
         try:
             old_campaign = Campaign.objects.get(pk=instance.pk)
             instance._old_status = old_campaign.status
+            instance._old_rollup_dimensions = rollup_dimensions(old_campaign)
         except Campaign.DoesNotExist:
             instance._old_status = None
+            instance._old_rollup_dimensions = None
     else:
         instance._old_status = None
+        instance._old_rollup_dimensions = None
 
 
 @receiver(post_save, sender=Campaign)
@@ -44,3 +49,43 @@ def on_campaign_saved(sender, instance, created, **kwargs):
 
     except Exception as e:
         logger.error(f"Error in campaign post_save signal for Campaign {instance.id}: {e}")
+
+
+# ==================== Financial Rollup Signals ====================
+
+def refresh_rollup_cells(campaign_id, cells):
+    """
+    Refresh rollup cells once the campaign change is committed.
+
+    Failures (e.g. no exchange rate for the campaign's currency) are logged;
+    the nightly reconciliation repairs the rollup.
+    """
+    try:
+        for dimensions in cells:
+            refresh_financial_rollup(dimensions)
+
+    except Exception as e:
+        logger.error(f"Error refreshing financial rollup for Campaign {campaign_id}: {e}")
+
+
+@receiver(post_save, sender=Campaign)
+def refresh_rollup_on_campaign_saved(sender, instance, raw=False, **kwargs):
+    """Refresh the rollup cells a campaign left and joined, after commit."""
+    if raw:
+        return
+
+    cells = [rollup_dimensions(instance)]
+    old_dimensions = getattr(instance, '_old_rollup_dimensions', None)
+    if old_dimensions and old_dimensions != cells[0]:
+        cells.append(old_dimensions)
+
+    campaign_id = instance.id
+    transaction.on_commit(lambda: refresh_rollup_cells(campaign_id, cells))
+
+
+@receiver(post_delete, sender=Campaign)
+def refresh_rollup_on_campaign_deleted(sender, instance, **kwargs):
+    """Refresh the rollup cell of a deleted campaign, after commit."""
+    cells = [rollup_dimensions(instance)]
+    campaign_id = instance.id
+    transaction.on_commit(lambda: refresh_rollup_cells(campaign_id, cells))
@@ -0,0 +1,52 @@
+"""
+Celery tasks for campaign financial reporting.
+
+Exchange rates are fetched here, off the request path, and financial rollups
+are reconciled nightly.
+"""
+
+from celery import shared_task
+
+from campaigns.rollups import rebuild_financial_rollups
+from campaigns.services import currency_converter, fetch_exchange_rates
+
+
+@shared_task(name='campaigns.reconcile_financial_rollups')
+def reconcile_financial_rollups():
+    """
+    Nightly reconciliation of CampaignFinancialRollup with Campaign.
+
+    Repairs drift left by writes that bypass signals (queryset.update(),
+    bulk_create()) and refreshes the EUR snapshot with current rates.
+
+    Returns:
+        Dictionary with drift counts
+    """
+    drift = rebuild_financial_rollups()
+    return {
+        'expected': drift['expected'],
+        'missing': len(drift['missing']),
+        'stale': len(drift['stale']),
+        'orphaned': len(drift['orphaned']),
+    }
+
+
+@shared_task(
+    name='campaigns.fetch_exchange_rates',
+    autoretry_for=(Exception,),
+    retry_backoff=300,
+    max_retries=5,
+)
+def fetch_daily_exchange_rates():
+    """
+    Daily task storing the latest EUR reference rates in ExchangeRate.
+
+    Scheduled after the ECB publishes its daily rates via Celery Beat.
+    Conversions keep using the previous business day's rates until it runs.
+
+    Returns:
+        Number of rates stored
+    """
+    stored = fetch_exchange_rates()
+    currency_converter.lru.clear()
+    return stored
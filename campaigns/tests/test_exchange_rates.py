@@ -0,0 +1,83 @@
+"""
+Tests for the persisted exchange rate store.
+
+Tests campaigns.services:
+- Latest-on-or-before lookups, bulk and historical resolution in one query
+- In-process LRU in front of the table
+- Fallback rates and file loading
+"""
+
+import json
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+
+from campaigns.models import ExchangeRate
+from campaigns.services import currency_converter, load_rates_file, store_rates
+
+
+class ExchangeRateStoreTestCase(TestCase):
+    """Test rate resolution from the ExchangeRate table."""
+
+    def setUp(self):
+        currency_converter.lru.clear()
+        self.addCleanup(currency_converter.lru.clear)
+        store_rates({
+            date(2024, 1, 5): {'USD': '2.00', 'RON': '5.00'},
+            date(2024, 1, 8): {'USD': '4.00'},
+        })
+
+    def test_latest_rate_on_or_before_date(self):
+        self.assertEqual(currency_converter.get_exchange_rate('USD', 'EUR', date(2024, 1, 7)), Decimal('0.5'))
+        self.assertEqual(currency_converter.get_exchange_rate('usd', 'EUR', date(2024, 1, 9)), Decimal('0.25'))
+        self.assertEqual(currency_converter.get_exchange_rate('EUR', 'USD', date(2024, 1, 9)), Decimal('4'))
+        self.assertEqual(currency_converter.convert_to_eur(Decimal('10'), 'RON', date(2024, 2, 1)), Decimal('2.00'))
+
+    def test_bulk_rates_use_one_query_then_lru(self):
+        with self.assertNumQueries(1):
+            rates = currency_converter.get_rates_to_eur(['USD', 'RON', 'EUR'], date(2024, 1, 6))
+        self.assertEqual(rates, {'USD': Decimal('0.5'), 'RON': Decimal('0.2'), 'EUR': Decimal('1.00')})
+
+        with self.assertNumQueries(0):
+            currency_converter.get_rates_to_eur(['USD', 'RON'], date(2024, 1, 6))
+
+    def test_historical_rates_for_many_dates(self):
+        pairs = [('USD', date(2024, 1, 5)), ('USD', date(2024, 1, 7)),
+                 ('USD', date(2024, 1, 10)), ('RON', date(2024, 1, 10)), ('EUR', date(2024, 1, 10))]
+        with self.assertNumQueries(1):
+            rates = currency_converter.get_historical_rates_to_eur(pairs)
+        self.assertEqual(rates[('USD', date(2024, 1, 7))], Decimal('0.5'))
+        self.assertEqual(rates[('USD', date(2024, 1, 10))], Decimal('0.25'))
+        self.assertEqual(rates[('RON', date(2024, 1, 10))], Decimal('0.2'))
+        self.assertEqual(rates[('EUR', date(2024, 1, 10))], Decimal('1.00'))
+
+    def test_missing_rates_fall_back(self):
+        self.assertEqual(
+            currency_converter.get_rates_to_eur(['GBP'], date(2024, 1, 6))['GBP'],
+            Decimal('1.00') / Decimal('0.86'),
+        )
+        with self.assertRaises(ValueError):
+            currency_converter.get_exchange_rate('XYZ', 'EUR')
+
+        rates = currency_converter.get_multiple_rates('EUR', ['USD', 'XYZ'], date(2024, 1, 6))
+        self.assertEqual(rates, {'USD': Decimal('2'), 'XYZ': None})
+
+    def test_load_rates_file_upserts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, 'rates.csv')
+            with open(csv_path, 'w') as handle:
+                handle.write('date,currency,rate\n2024-01-08,USD,3.00\n2024-01-08,GBP,0.80\n')
+            json_path = os.path.join(directory, 'rates.json')
+            with open(json_path, 'w') as handle:
+                json.dump({'rates': {'2024-01-09': {'CHF': 0.9}}}, handle)
+
+            self.assertEqual(load_rates_file(csv_path), 2)
+            self.assertEqual(load_rates_file(json_path), 1)
+
+        usd = ExchangeRate.objects.get(currency='USD', date=date(2024, 1, 8))
+        self.assertEqual(usd.rate, Decimal('3.00'))
+        self.assertEqual(usd.source, 'file')
+        self.assertEqual(ExchangeRate.objects.count(), 5)
@@ -0,0 +1,224 @@
+"""
+Tests for currency-normalized financial aggregation.
+
+Tests campaigns.financials, campaigns.rollups and the Digital financial views:
+- Per-currency SQL grouping with one exchange rate per currency
+- Monthly, per-service and per-client breakdowns
+- KPI overview in a constant number of queries
+- Rollup table kept identical to the live computation by signals and rebuilds
+- Rollup cells refreshed after commit, retrying a lost insert race
+"""
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.models import Department, Role, UserProfile
+from campaigns.financials import (
+    digital_campaigns, digital_rollups, get_activity_counts, get_financial_totals,
+    get_monthly_totals, get_service_breakdown, get_top_clients,
+)
+from campaigns.models import Campaign, CampaignFinancialRollup, ExchangeRate
+from campaigns.rollups import rebuild_financial_rollups, refresh_financial_rollup, rollup_dimensions
+from campaigns.services import currency_converter
+from campaigns.views_financial import apply_financial_filters, kpis_overview
+from identity.models import Entity
+
+User = get_user_model()
+
+# Units of each currency per 1 EUR (1 USD = 0.50 EUR, 1 GBP = 2.00 EUR)
+RATES = {'USD': Decimal('2.00'), 'GBP': Decimal('0.50')}
+
+
+class FinancialAggregationTestCase(TestCase):
+    """Test grouped financial aggregation."""
+
+    def setUp(self):
+        for currency, rate in RATES.items():
+            ExchangeRate.objects.create(date=date(2024, 1, 1), currency=currency, rate=rate)
+        currency_converter.lru.clear()
+        self.addCleanup(currency_converter.lru.clear)
+
+        self.dept = Department.objects.create(code='digital', name='Digital Department')
+        other_dept = Department.objects.create(code='sales', name='Sales Department')
+        self.user = User.objects.create(username='finance')
+        self.acme = Entity.objects.create(display_name='Acme', kind='PJ')
+        self.globex = Entity.objects.create(display_name='Globex', kind='PJ')
+
+        self.create(self.acme, 'EUR', '1000', '400', '600', ['seo'], date(2024, 1, 10), date(2024, 1, 20),
+                    invoice_status='issued', status='active')
+        self.create(self.acme, 'USD', '2000', '1000', '1000', ['seo', 'email_marketing'],
+                    date(2024, 1, 15), date(2024, 2, 14), status='confirmed')
+        self.create(self.globex, 'GBP', '500', '100', '400', [], date(2024, 2, 1), None,
+                    invoice_status='delayed')
+        Campaign.objects.create(campaign_name='Sales', client=self.acme, brand=self.acme,
+                                department=other_dept, created_by=self.user, value='99999')
+        self.queryset = Campaign.objects.filter(department=self.dept)
+
+    def create(self, client, currency, value, spent, profit, services, start, end, **kwargs):
+        return Campaign.objects.create(
+            campaign_name=f'{client.display_name} {currency}', client=client, brand=client,
+            department=self.dept, created_by=self.user, currency=currency, value=value,
+            budget_spent=spent, profit=profit, service_types=services,
+            start_date=start, end_date=end, **kwargs
+        )
+
+    def test_totals_convert_once_per_currency(self):
+        currency_converter.lru.clear()
+        with self.assertNumQueries(2):  # grouped amounts + every rate at once
+            totals = get_financial_totals(self.queryset)
+
+        self.assertEqual(totals['revenue'], Decimal('3000.00'))   # 1000 + 1000 + 1000
+        self.assertEqual(totals['spent'], Decimal('1100.00'))     # 400 + 500 + 200
+        self.assertEqual(totals['profit'], Decimal('1900.00'))    # 600 + 500 + 800
+        self.assertEqual(totals['pending'], Decimal('2000.00'))   # issued EUR + delayed GBP
+
+    def test_monthly_totals(self):
+        months = get_monthly_totals(self.queryset)
+        self.assertEqual([item['month'] for item in months], [date(2024, 1, 1), date(2024, 2, 1)])
+        self.assertEqual(months[0]['revenue'], Decimal('2000.00'))
+        self.assertEqual(months[1]['revenue'], Decimal('1000.00'))
+
+    def test_service_breakdown_splits_multi_service_campaigns(self):
+        services = get_service_breakdown(self.queryset)
+
+        self.assertEqual(services['seo']['revenue'], Decimal('1500.00'))
+        self.assertEqual(services['seo']['campaign_count'], 2)
+        self.assertEqual(services['email_marketing']['revenue'], Decimal('500.00'))
+        self.assertEqual(services['unknown']['revenue'], Decimal('1000.00'))
+        self.assertEqual(services['seo']['delivery_days'], 40)
+        self.assertEqual(services['seo']['delivery_count'], 2)
+        self.assertEqual(services['unknown']['delivery_count'], 0)
+
+    def test_top_clients_combine_currencies(self):
+        clients = get_top_clients(self.queryset)
+        self.assertEqual([item['client_name'] for item in clients], ['Acme', 'Globex'])
+        self.assertEqual(clients[0]['revenue'], Decimal('2000.00'))
+        self.assertEqual(clients[0]['campaign_count'], 2)
+
+    def test_kpis_overview_query_count_is_constant(self):
+        admin_role = Role.objects.create(code='administrator', name='Administrator', level=1000)
+        UserProfile.objects.update_or_create(user=self.user, defaults={'role': admin_role})
+        factory = APIRequestFactory()
+
+        def fetch():
+            request = factory.get('/api/v1/digital/financial/kpis/', {'period': 'custom'})
+            force_authenticate(request, user=self.user)
+            return kpis_overview(request)
+
+        response = fetch()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_active_clients'], 1)
+        self.assertEqual(response.data['campaigns_in_progress'], 1)
+        self.assertEqual(response.data['top_clients'][0]['revenue'], 2000.0)
+        seo = next(item for item in response.data['roi_by_campaign_type'] if item['service_type'] == 'seo')
+        self.assertEqual(seo['roi'], round(850 / 650 * 100, 2))
+
+        for i in range(5):
+            self.create(self.globex, 'USD', '100', '50', '50', ['seo'], date(2024, 3, i + 1), date(2024, 3, 28))
+        with self.assertNumQueries(4):
+            fetch()
+
+
+class FinancialRollupTestCase(FinancialAggregationTestCase):
+    """Test that the rollup table answers exactly like the live computation."""
+
+    def setUp(self):
+        # Rollup cells are refreshed after commit
+        with self.captureOnCommitCallbacks(execute=True):
+            super().setUp()
+
+    def create(self, *args, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return super().create(*args, **kwargs)
+
+    def assertMatchesLive(self, filters=None):
+        filters = filters or {}
+        live = apply_financial_filters(digital_campaigns(), filters)
+        rollup = apply_financial_filters(digital_rollups(), filters)
+        self.assertEqual(get_financial_totals(rollup), get_financial_totals(live))
+        self.assertEqual(get_monthly_totals(rollup), get_monthly_totals(live))
+        self.assertEqual(get_service_breakdown(rollup), get_service_breakdown(live))
+        self.assertEqual(get_top_clients(rollup), get_top_clients(live))
+        self.assertEqual(get_activity_counts(rollup), get_activity_counts(live))
+
+    def test_rollup_matches_live_computation(self):
+        self.assertMatchesLive({'period': 'custom'})
+        self.assertMatchesLive({'period': 'custom', 'service_type': 'seo'})
+        self.assertMatchesLive({'period': 'custom', 'status': 'active'})
+        self.assertMatchesLive({'start_date': '2024-01-12', 'end_date': '2024-01-31'})
+
+    def test_same_day_campaigns_share_a_cell(self):
+        self.create(self.acme, 'EUR', '10', '5', '5', ['seo'], date(2024, 1, 10), date(2024, 1, 12),
+                    invoice_status='issued', status='active')
+        cell = CampaignFinancialRollup.objects.get(department=self.dept, client=self.acme, currency='EUR')
+        self.assertEqual(cell.campaign_count, 2)
+        self.assertEqual(cell.value, Decimal('1010.00'))
+        self.assertEqual(cell.delivery_days, 12)
+        self.assertMatchesLive({'period': 'custom'})
+
+    def test_signals_move_campaigns_between_cells(self):
+        campaign = Campaign.objects.get(client=self.globex)
+        campaign.currency = 'USD'
+        campaign.status = 'active'
+        with self.captureOnCommitCallbacks(execute=True):
+            campaign.save()
+        self.assertFalse(CampaignFinancialRollup.objects.filter(client=self.globex, currency='GBP').exists())
+        self.assertEqual(CampaignFinancialRollup.objects.get(client=self.globex).value_eur, Decimal('250.00'))
+        self.assertMatchesLive({'period': 'custom'})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            campaign.delete()
+        self.assertFalse(CampaignFinancialRollup.objects.filter(client=self.globex).exists())
+        self.assertMatchesLive({'period': 'custom'})
+
+    def test_rollup_failures_do_not_block_saves(self):
+        campaign = self.create(self.globex, 'SEK', '100', '0', '100', [], date(2024, 3, 1), None)
+        self.assertFalse(CampaignFinancialRollup.objects.filter(currency='SEK').exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            campaign.delete()
+        self.assertFalse(Campaign.objects.filter(pk=campaign.pk).exists())
+
+    def test_refresh_waits_for_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            super().create(self.globex, 'EUR', '10', '0', '10', [], date(2024, 3, 1), None)
+            self.assertFalse(CampaignFinancialRollup.objects.filter(client=self.globex, currency='EUR').exists())
+
+        for callback in callbacks:
+            callback()
+        self.assertTrue(CampaignFinancialRollup.objects.filter(client=self.globex, currency='EUR').exists())
+
+    def test_lost_insert_race_is_retried(self):
+        dimensions = rollup_dimensions(Campaign.objects.get(client=self.globex))
+        original = CampaignFinancialRollup.objects.update_or_create
+        calls = []
+
+        def update_or_create(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                raise IntegrityError('duplicate key value violates unique constraint')
+            return original(**kwargs)
+
+        with patch.object(CampaignFinancialRollup.objects, 'update_or_create', side_effect=update_or_create):
+            refresh_financial_rollup(dimensions)
+
+        self.assertEqual(len(calls), 2)
+        self.assertMatchesLive({'period': 'custom'})
+
+    def test_rebuild_repairs_bulk_updates(self):
+        Campaign.objects.filter(client=self.acme).update(value='1.00')
+        drift = rebuild_financial_rollups(check_only=True)
+        self.assertEqual(len(drift['stale']), 3)  # including Acme's sales campaign
+
+        rebuild_financial_rollups()
+        self.assertEqual(rebuild_financial_rollups(check_only=True)['stale'], [])
+        self.assertMatchesLive({'period': 'custom'})
+
+        CampaignFinancialRollup.objects.all().delete()
+        self.assertEqual(len(rebuild_financial_rollups()['missing']), 4)
+        self.assertMatchesLive({'period': 'custom'})
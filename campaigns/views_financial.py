@@ -2,8 +2,10 @@
 Digital Financial Views
 
 These views provide financial reporting endpoints for the Digital department.
-All calculations, aggregations, and currency conversions are done on the backend
-using database aggregations for optimal performance.
+All calculations, aggregations, and currency conversions are done on the backend:
+amounts are summed in SQL per currency group and converted with one exchange
+rate per currency (see campaigns.financials). The aggregate endpoints read the
+pre-aggregated CampaignFinancialRollup table instead of raw campaigns.
 
 Endpoints:
 1. /api/v1/digital/financial/metrics/ - Financial overview metrics
@@ -14,20 +16,20 @@ Endpoints:
 """
 
 import logging
-from datetime import datetime, timedelta
-from decimal import Decimal
+from datetime import timedelta
 
-from django.db.models import Sum, Count, Q, F, ExpressionWrapper, DecimalField
-from django.db.models.functions import TruncMonth, Coalesce
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 
+from .financials import (
+    current_month_bounds, digital_campaigns, digital_rollups, get_activity_counts, get_eur_rates,
+    get_financial_totals, get_monthly_totals, get_service_breakdown, get_top_clients, to_eur,
+)
 from .models import Campaign
 from .permissions import HasDigitalDepartmentAccess
-from .services import convert_to_eur
 
 
 logger = logging.getLogger(__name__)
@@ -130,33 +132,14 @@ def financial_metrics(request):
     - invoice_status: Filter by invoice status
     """
     try:
-        # Get all digital campaigns
-        queryset = Campaign.objects.filter(
-            department__name='Digital Department'
-        ).select_related('client', 'brand')
-
-        # Apply filters
-        queryset = apply_financial_filters(queryset, request.query_params)
-
-        # Calculate totals - we'll convert each campaign's values to EUR
-        total_revenue = Decimal('0.00')
-        total_profit = Decimal('0.00')
-        total_budget_spent = Decimal('0.00')
-        pending_collections = Decimal('0.00')
-
-        for campaign in queryset:
-            # Convert values to EUR
-            value_eur = convert_to_eur(campaign.value, campaign.currency) or Decimal('0.00')
-            profit_eur = convert_to_eur(campaign.profit, campaign.currency) or Decimal('0.00')
-            budget_eur = convert_to_eur(campaign.budget_spent, campaign.currency) or Decimal('0.00')
-
-            total_revenue += value_eur
-            total_profit += profit_eur
-            total_budget_spent += budget_eur
-
-            # Pending collections (issued or delayed invoices)
-            if campaign.invoice_status in ['issued', 'delayed']:
-                pending_collections += value_eur
+        queryset = apply_financial_filters(digital_rollups(), request.query_params)
+
+        # Sum per currency in SQL, one exchange rate per currency
+        totals = get_financial_totals(queryset)
+        total_revenue = totals['revenue']
+        total_profit = totals['profit']
+        total_budget_spent = totals['spent']
+        pending_collections = totals['pending']
 
         # Calculate profit margin
         if total_revenue > 0:
@@ -195,49 +178,18 @@ def revenue_by_month(request):
     Query Parameters: Same as financial_metrics
     """
     try:
-        # Get filtered campaigns
-        queryset = Campaign.objects.filter(
-            department__name='Digital Department'
-        ).select_related('client', 'brand')
-
-        queryset = apply_financial_filters(queryset, request.query_params)
-
-        # Group by month
-        monthly_data = {}
-
-        for campaign in queryset:
-            if not campaign.start_date:
-                continue
-
-            # Get month key (YYYY-MM format)
-            month_key = campaign.start_date.strftime('%Y-%m')
-            month_label = campaign.start_date.strftime('%b %Y')
-
-            if month_key not in monthly_data:
-                monthly_data[month_key] = {
-                    'month': month_label,
-                    'revenue': Decimal('0.00'),
-                    'profit': Decimal('0.00'),
-                    'spent': Decimal('0.00')
-                }
-
-            # Convert and accumulate
-            value_eur = convert_to_eur(campaign.value, campaign.currency) or Decimal('0.00')
-            profit_eur = convert_to_eur(campaign.profit, campaign.currency) or Decimal('0.00')
-            budget_eur = convert_to_eur(campaign.budget_spent, campaign.currency) or Decimal('0.00')
-
-            monthly_data[month_key]['revenue'] += value_eur
-            monthly_data[month_key]['profit'] += profit_eur
-            monthly_data[month_key]['spent'] += budget_eur
-
-        # Convert to list and sort by month
-        results = sorted(monthly_data.values(), key=lambda x: x['month'])
-
-        # Convert Decimals to floats for JSON
-        for item in results:
-            item['revenue'] = float(item['revenue'])
-            item['profit'] = float(item['profit'])
-            item['spent'] = float(item['spent'])
+        queryset = apply_financial_filters(digital_rollups(), request.query_params)
+
+        # Grouped by month and currency in SQL, oldest month first
+        results = [
+            {
+                'month': item['month'].strftime('%b %Y'),
+                'revenue': float(item['revenue']),
+                'profit': float(item['profit']),
+                'spent': float(item['spent']),
+            }
+            for item in get_monthly_totals(queryset)
+        ]
 
         return Response(results)
 
@@ -264,55 +216,21 @@ def revenue_by_service(request):
     Query Parameters: Same as financial_metrics
     """
     try:
-        # Get filtered campaigns
-        queryset = Campaign.objects.filter(
-            department__name='Digital Department'
-        ).select_related('client', 'brand')
-
-        queryset = apply_financial_filters(queryset, request.query_params)
-
-        # Group by service type (campaigns can have multiple service types)
-        service_data = {}
-
-        for campaign in queryset:
-            # Get all service types for this campaign
-            services = campaign.service_types if campaign.service_types else ['unknown']
-
-            # Convert revenue once per campaign
-            value_eur = convert_to_eur(campaign.value, campaign.currency) or Decimal('0.00')
-
-            # Distribute to each service type (split revenue if multiple services)
-            revenue_per_service = value_eur / len(services) if services else value_eur
-
-            for service in services:
-                if service not in service_data:
-                    # Get display name from choices
-                    service_display = dict(Campaign.SERVICE_TYPE_CHOICES).get(
-                        service,
-                        service.replace('_', ' ').title()
-                    )
-
-                    service_data[service] = {
-                        'service': service,
-                        'service_display': service_display,
-                        'revenue': Decimal('0.00'),
-                        'campaign_count': 0
-                    }
-
-                # Accumulate (revenue is split among service types)
-                service_data[service]['revenue'] += revenue_per_service
-                service_data[service]['campaign_count'] += 1
-
-        # Convert to list and sort by revenue (descending)
-        results = sorted(
-            service_data.values(),
-            key=lambda x: x['revenue'],
-            reverse=True
-        )
-
-        # Convert Decimals to floats for JSON
-        for item in results:
-            item['revenue'] = float(item['revenue'])
+        queryset = apply_financial_filters(digital_rollups(), request.query_params)
+
+        # Revenue of multi-service campaigns is split evenly among their services
+        services = get_service_breakdown(queryset)
+
+        # Sort by revenue (descending)
+        results = [
+            {
+                'service': data['service'],
+                'service_display': data['service_display'],
+                'revenue': float(data['revenue']),
+                'campaign_count': data['campaign_count'],
+            }
+            for data in sorted(services.values(), key=lambda x: (-x['revenue'], x['service']))
+        ]
 
         return Response(results)
 
@@ -339,43 +257,10 @@ def revenue_by_client(request):
     Query Parameters: Same as financial_metrics
     """
     try:
-        # Get filtered campaigns
-        queryset = Campaign.objects.filter(
-            department__name='Digital Department'
-        ).select_related('client', 'brand')
-
-        queryset = apply_financial_filters(queryset, request.query_params)
-
-        # Group by client
-        client_data = {}
-
-        for campaign in queryset:
-            # Skip campaigns without a client
-            if not campaign.client:
-                continue
-
-            client_id = campaign.client.id
-            client_name = campaign.client.display_name
-
-            if client_id not in client_data:
-                client_data[client_id] = {
-                    'client_id': client_id,
-                    'client_name': client_name,
-                    'revenue': Decimal('0.00'),
-                    'campaign_count': 0
-                }
-
-            # Convert and accumulate
-            value_eur = convert_to_eur(campaign.value, campaign.currency) or Decimal('0.00')
-            client_data[client_id]['revenue'] += value_eur
-            client_data[client_id]['campaign_count'] += 1
-
-        # Convert to list and sort by revenue (descending)
-        results = sorted(
-            client_data.values(),
-            key=lambda x: x['revenue'],
-            reverse=True
-        )[:5]  # Top 5 clients only
+        queryset = apply_financial_filters(digital_rollups(), request.query_params)
+
+        # Top 5 clients only
+        results = get_top_clients(queryset, limit=5)
 
         # Convert Decimals to floats for JSON
         for item in results:
@@ -409,12 +294,10 @@ def campaign_financials(request):
     Query Parameters: Same as financial_metrics + pagination
     """
     try:
-        # Get filtered campaigns
-        queryset = Campaign.objects.filter(
-            department__name='Digital Department'
-        ).select_related('client', 'brand')
-
-        queryset = apply_financial_filters(queryset, request.query_params)
+        queryset = apply_financial_filters(
+            digital_campaigns().select_related('client', 'brand'),
+            request.query_params
+        )
 
         # Order by most recent first
         queryset = queryset.order_by('-start_date', '-created_at')
@@ -423,17 +306,17 @@ def campaign_financials(request):
         paginator = FinancialPagination()
         paginated_queryset = paginator.paginate_queryset(queryset, request)
 
+        # One exchange rate lookup per currency on the page
+        rates = get_eur_rates(campaign.currency for campaign in paginated_queryset)
+
         # Build response data
         results = []
         for campaign in paginated_queryset:
             # Convert all values to EUR
-            value_eur = convert_to_eur(campaign.value, campaign.currency)
-            budget_spent_eur = convert_to_eur(campaign.budget_spent, campaign.currency)
-            profit_eur = convert_to_eur(campaign.profit, campaign.currency)
-            internal_cost_eur = convert_to_eur(
-                campaign.internal_cost_estimate,
-                campaign.currency
-            )
+            value_eur = to_eur(campaign.value, campaign.currency, rates)
+            budget_spent_eur = to_eur(campaign.budget_spent, campaign.currency, rates)
+            profit_eur = to_eur(campaign.profit, campaign.currency, rates)
+            internal_cost_eur = to_eur(campaign.internal_cost_estimate, campaign.currency, rates)
 
             # Get service types display names
             service_types_display = []
@@ -498,181 +381,53 @@ def kpis_overview(request):
     Query Parameters: Same as financial_metrics
     """
     try:
-        # Get all digital campaigns
-        queryset = Campaign.objects.filter(
-            department__name='Digital Department'
-        ).select_related('client', 'brand')
-
-        # Apply filters
-        queryset = apply_financial_filters(queryset, request.query_params)
-
-        # ===== KPI 1: Total Active Clients =====
-        # Count unique clients with active or confirmed campaigns
-        active_client_ids = queryset.filter(
-            status__in=['active', 'confirmed'],
-            client__isnull=False
-        ).values_list('client', flat=True).distinct()
-        total_active_clients = len(set(active_client_ids))
+        queryset = apply_financial_filters(digital_rollups(), request.query_params)
 
-        # ===== KPI 2: Campaigns in Progress =====
-        campaigns_in_progress = queryset.filter(status='active').count()
+        # ===== KPI 1 & 2: Active Clients, Campaigns in Progress =====
+        counts = get_activity_counts(queryset)
 
         # ===== KPI 3: Total Revenue Current Month =====
-        today = timezone.now().date()
-        month_start = today.replace(day=1)
-        # Get first day of next month
-        if today.month == 12:
-            next_month_start = today.replace(year=today.year + 1, month=1, day=1)
-        else:
-            next_month_start = today.replace(month=today.month + 1, day=1)
-
-        current_month_campaigns = queryset.filter(
-            start_date__gte=month_start,
-            start_date__lt=next_month_start
-        )
-
-        total_revenue_current_month = Decimal('0.00')
-        for campaign in current_month_campaigns:
-            value_eur = convert_to_eur(campaign.value, campaign.currency) or Decimal('0.00')
-            total_revenue_current_month += value_eur
-
-        # ===== KPI 4: Average Delivery Time per Service =====
-        service_delivery_data = {}
-
-        for campaign in queryset:
-            if not campaign.start_date or not campaign.end_date:
-                continue
-
-            services = campaign.service_types if campaign.service_types else ['unknown']
-
-            # Calculate delivery time in days
-            delivery_days = (campaign.end_date - campaign.start_date).days
-
-            # Distribute to each service type
-            for service in services:
-                if service not in service_delivery_data:
-                    service_display = dict(Campaign.SERVICE_TYPE_CHOICES).get(
-                        service,
-                        service.replace('_', ' ').title()
-                    )
-                    service_delivery_data[service] = {
-                        'service_type': service,
-                        'service_display': service_display,
-                        'total_days': 0,
-                        'campaign_count': 0
-                    }
-
-                service_delivery_data[service]['total_days'] += delivery_days
-                service_delivery_data[service]['campaign_count'] += 1
-
-        # Calculate averages
-        avg_delivery_by_service = []
-        for service_data in service_delivery_data.values():
-            if service_data['campaign_count'] > 0:
-                avg_days = service_data['total_days'] / service_data['campaign_count']
-                avg_delivery_by_service.append({
-                    'service_type': service_data['service_type'],
-                    'service_display': service_data['service_display'],
-                    'avg_delivery_days': round(avg_days, 1),
-                    'campaign_count': service_data['campaign_count']
-                })
-
-        # Sort by avg delivery days descending
+        month_start, next_month_start = current_month_bounds()
+        totals = get_financial_totals(queryset, month_start, next_month_start)
+
+        # ===== KPI 4 & 5: Delivery Time and ROI per Service =====
+        services = get_service_breakdown(queryset).values()
+
+        avg_delivery_by_service = [
+            {
+                'service_type': data['service'],
+                'service_display': data['service_display'],
+                'avg_delivery_days': round(data['delivery_days'] / data['delivery_count'], 1),
+                'campaign_count': data['delivery_count']
+            }
+            for data in services if data['delivery_count'] > 0
+        ]
         avg_delivery_by_service.sort(key=lambda x: x['avg_delivery_days'], reverse=True)
 
-        # ===== KPI 5: ROI per Campaign Type =====
         # ROI = (profit / budget_spent) * 100
-        roi_data = {}
-
-        for campaign in queryset:
-            services = campaign.service_types if campaign.service_types else ['unknown']
-
-            # Convert to EUR
-            profit_eur = convert_to_eur(campaign.profit, campaign.currency) or Decimal('0.00')
-            budget_eur = convert_to_eur(campaign.budget_spent, campaign.currency) or Decimal('0.00')
-
-            # Split profit and budget among service types if multiple
-            profit_per_service = profit_eur / len(services) if services else profit_eur
-            budget_per_service = budget_eur / len(services) if services else budget_eur
-
-            for service in services:
-                if service not in roi_data:
-                    service_display = dict(Campaign.SERVICE_TYPE_CHOICES).get(
-                        service,
-                        service.replace('_', ' ').title()
-                    )
-                    roi_data[service] = {
-                        'service_type': service,
-                        'service_display': service_display,
-                        'total_profit': Decimal('0.00'),
-                        'total_budget': Decimal('0.00'),
-                        'campaign_count': 0
-                    }
-
-                roi_data[service]['total_profit'] += profit_per_service
-                roi_data[service]['total_budget'] += budget_per_service
-                roi_data[service]['campaign_count'] += 1
-
-        # Calculate ROI percentages
-        roi_by_campaign_type = []
-        for service_data in roi_data.values():
-            if service_data['total_budget'] > 0:
-                roi_percentage = (service_data['total_profit'] / service_data['total_budget']) * 100
-            else:
-                roi_percentage = 0.0
-
-            roi_by_campaign_type.append({
-                'service_type': service_data['service_type'],
-                'service_display': service_data['service_display'],
-                'roi': round(float(roi_percentage), 2),
-                'total_profit_eur': float(service_data['total_profit']),
-                'total_budget_spent_eur': float(service_data['total_budget']),
-                'campaign_count': service_data['campaign_count']
-            })
-
-        # Sort by ROI descending
+        roi_by_campaign_type = [
+            {
+                'service_type': data['service'],
+                'service_display': data['service_display'],
+                'roi': round(float(data['profit'] / data['spent'] * 100), 2) if data['spent'] > 0 else 0.0,
+                'total_profit_eur': float(data['profit']),
+                'total_budget_spent_eur': float(data['spent']),
+                'campaign_count': data['campaign_count']
+            }
+            for data in services
+        ]
         roi_by_campaign_type.sort(key=lambda x: x['roi'], reverse=True)
 
         # ===== KPI 6: Top 5 Clients =====
-        client_data = {}
-
-        for campaign in queryset:
-            # Skip campaigns without a client
-            if not campaign.client:
-                continue
-
-            client_id = campaign.client.id
-            client_name = campaign.client.display_name
-
-            if client_id not in client_data:
-                client_data[client_id] = {
-                    'client_id': client_id,
-                    'client_name': client_name,
-                    'revenue': Decimal('0.00'),
-                    'campaign_count': 0
-                }
-
-            # Convert and accumulate
-            value_eur = convert_to_eur(campaign.value, campaign.currency) or Decimal('0.00')
-            client_data[client_id]['revenue'] += value_eur
-            client_data[client_id]['campaign_count'] += 1
-
-        # Convert to list and sort by revenue (descending)
-        top_clients = sorted(
-            client_data.values(),
-            key=lambda x: x['revenue'],
-            reverse=True
-        )[:5]  # Top 5 clients only
-
-        # Convert Decimals to floats for JSON
+        top_clients = get_top_clients(queryset, limit=5)
         for item in top_clients:
             item['revenue'] = float(item['revenue'])
 
         # ===== Build Response =====
         response_data = {
-            'total_active_clients': total_active_clients,
-            'campaigns_in_progress': campaigns_in_progress,
-            'total_revenue_current_month': float(total_revenue_current_month),
+            'total_active_clients': counts['active_clients'],
+            'campaigns_in_progress': counts['campaigns_in_progress'],
+            'total_revenue_current_month': float(totals['month_revenue']),
             'avg_delivery_time_by_service': avg_delivery_by_service,
             'roi_by_campaign_type': roi_by_campaign_type,
             'top_clients': top_clients
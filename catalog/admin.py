@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from .models import Work, Recording, Release, Track, Asset
+from rights.aggregation import annotate_split_totals
 
 
 class RecordingInline(admin.TabularInline):
@@ -69,6 +70,9 @@ class WorkAdmin(admin.ModelAdmin):
 
     inlines = [RecordingInline]
 
+    def get_queryset(self, request):
+        return annotate_split_totals(super().get_queryset(request), 'work')
+
     def get_iswc(self, obj):
         return obj.get_iswc() or '-'
     get_iswc.short_description = 'ISWC'
@@ -81,6 +85,7 @@ class WorkAdmin(admin.ModelAdmin):
         return obj.has_complete_publishing_splits
     has_complete_publishing_splits.boolean = True
     has_complete_publishing_splits.short_description = 'Splits OK'
+    has_complete_publishing_splits.admin_order_field = 'splits_complete'
 
 
 @admin.register(Recording)
@@ -121,6 +126,9 @@ class RecordingAdmin(admin.ModelAdmin):
 
     inlines = [AssetInline]
 
+    def get_queryset(self, request):
+        return annotate_split_totals(super().get_queryset(request), 'recording')
+
     def get_isrc(self, obj):
         return obj.get_isrc() or '-'
     get_isrc.short_description = 'ISRC'
@@ -137,6 +145,7 @@ class RecordingAdmin(admin.ModelAdmin):
         return obj.has_complete_master_splits
     has_complete_master_splits.boolean = True
     has_complete_master_splits.short_description = 'Master Splits OK'
+    has_complete_master_splits.admin_order_field = 'splits_complete'
 
 
 @admin.register(Release)
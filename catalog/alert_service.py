@@ -3,27 +3,201 @@ Alert generation service for Song Workflow system.
 
 Creates in-app notifications when workflow events occur.
 Now supports configuration from database via AlertConfiguration model.
+
+Daily alerts (overdue, deadline approaching, release approaching) are built
+in batch by create_daily_alerts(): configurations, candidate songs, manager
+lists and already-sent alerts are each loaded once, and alerts are written
+with bulk_create(), so the nightly run scales with alerts written, not songs.
 """
 
+from datetime import timedelta
+
+from django.db.models import F
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# Stages whose deadlines are tracked by the daily alerts
+DEADLINE_ALERT_STAGES = [
+    'publishing', 'label_recording', 'marketing_assets',
+    'label_review', 'ready_for_digital', 'digital_distribution',
+]
+
+# Minimum role level of department managers
+MANAGER_ROLE_LEVEL = 300
+
+# Days before the stage deadline / target release date that alerts are sent
+DEADLINE_ALERT_DAYS = 2
+RELEASE_ALERT_DAYS = 7
+
+# Rows per INSERT when writing alerts in bulk
+ALERT_BATCH_SIZE = 500
+
+
+# Config registry entry holding the enabled alert configurations (see api.config_registry)
+ALERT_CONFIGS = 'catalog.alert_configs'
+
+
+def load_alert_configs():
+    """Load {alert_type: AlertConfiguration} for every enabled alert type (one query)."""
+    from catalog.models import AlertConfiguration
+
+    return {config.alert_type: config for config in AlertConfiguration.objects.filter(enabled=True)}
+
 
 def get_alert_config(alert_type):
     """
-    Get alert configuration from database.
+    Get alert configuration (cached per process, see api.config_registry).
 
     Returns None if alert type is disabled or doesn't exist.
     """
-    from catalog.models import AlertConfiguration
+    return get_enabled_alert_configs().get(alert_type)
+
+
+def get_enabled_alert_configs():
+    """Return {alert_type: AlertConfiguration} for every enabled alert type (cached per process)."""
+    from api.config_registry import get_config
+
+    return get_config(ALERT_CONFIGS)
+
+
+def get_department_managers(department_ids):
+    """
+    Return the manager-level users of several departments in one query.
+
+    Args:
+        department_ids: Iterable of Department IDs
+
+    Returns:
+        dict: {department_id: [User]}
+    """
+    department_ids = {dept_id for dept_id in department_ids if dept_id}
+    managers = {dept_id: [] for dept_id in department_ids}
+    if not department_ids:
+        return managers
+
+    users = User.objects.filter(
+        profile__department_id__in=department_ids,
+        profile__role__level__gte=MANAGER_ROLE_LEVEL,
+    ).annotate(managed_department_id=F('profile__department_id'))
+    for user in users:
+        managers[user.managed_department_id].append(user)
+    return managers
+
+
+# ==================== Daily Alert Builders ====================
+# Build unsaved SongAlert instances; callers save them (in bulk).
+
+def _song_alert(song, alert_type, priority, title, message, target_user=None, target_department=None):
+    from catalog.models import SongAlert
+
+    return SongAlert(
+        song=song,
+        alert_type=alert_type,
+        target_user=target_user,
+        target_department=target_department,
+        title=title,
+        message=message,
+        action_url=f'/songs/{song.id}/',
+        action_label='View Song',
+        priority=priority,
+    )
+
+
+def build_overdue_alerts(song, config, managers):
+    """
+    Overdue alerts for one song, per the 'overdue' AlertConfiguration.
 
-    try:
-        config = AlertConfiguration.objects.get(alert_type=alert_type, enabled=True)
-        return config
-    except AlertConfiguration.DoesNotExist:
-        return None
+    Args:
+        song: Overdue Song (assigned_user and created_by preferably selected)
+        config: Enabled 'overdue' AlertConfiguration
+        managers: Managers of the song's assigned department
+
+    Returns:
+        list: Unsaved SongAlert instances
+    """
+    template_vars = {
+        'song_title': song.title,
+        'stage': song.stage,
+        'deadline': song.stage_deadline,
+        'assigned_user': song.assigned_user.get_full_name() if song.assigned_user else 'unassigned'
+    }
+    title = config.title_template.format(**template_vars)
+    message = config.message_template.format(**template_vars)
+
+    recipients = []
+    # Alert assigned user
+    if song.assigned_user and config.notify_assigned_user:
+        recipients.append(song.assigned_user)
+    # Also alert department managers
+    if song.assigned_department_id and config.notify_department_managers:
+        recipients.extend(managers)
+    # Alert song creator if configured
+    if song.created_by and config.notify_song_creator and song.created_by != song.assigned_user:
+        recipients.append(song.created_by)
+
+    return [
+        _song_alert(song, 'overdue', config.priority, title, message, target_user=user)
+        for user in recipients
+    ]
+
+
+def build_deadline_approaching_alerts(song, managers):
+    """
+    Deadline-approaching alerts for one song (assigned user and department managers).
+
+    Returns:
+        list: Unsaved SongAlert instances
+    """
+    alerts = []
+    if song.assigned_user:
+        alerts.append(_song_alert(
+            song, 'deadline_approaching', 'important',
+            title=f'Deadline Approaching: {song.title}',
+            message=f'"{song.title}" is due in 2 days ({song.stage_deadline}). Please complete checklist items.',
+            target_user=song.assigned_user,
+        ))
+
+    if song.assigned_department_id:
+        assignee = song.assigned_user.get_full_name() if song.assigned_user else "unassigned"
+        for manager in managers:
+            alerts.append(_song_alert(
+                song, 'deadline_approaching', 'important',
+                title=f'Team Song Deadline: {song.title}',
+                message=f'"{song.title}" assigned to {assignee} is due in 2 days.',
+                target_user=manager,
+            ))
+    return alerts
+
+
+def build_release_approaching_alerts(song, departments):
+    """
+    Release-approaching alerts for one song (Digital and Label departments).
+
+    Args:
+        song: Song with a target release date 7 days away
+        departments: {code: Department} ('digital' and 'label' when they exist)
+
+    Returns:
+        list: Unsaved SongAlert instances
+    """
+    alerts = []
+    if 'digital' in departments:
+        alerts.append(_song_alert(
+            song, 'release_approaching', 'important',
+            title=f'Release in 7 Days: {song.title}',
+            message=f'"{song.title}" is scheduled for release in 7 days ({song.target_release_date}). Ensure all distribution is complete.',
+            target_department=departments['digital'],
+        ))
+    if 'label' in departments:
+        alerts.append(_song_alert(
+            song, 'release_approaching', 'important',
+            title=f'Release in 7 Days: {song.title}',
+            message=f'"{song.title}" is scheduled for release in 7 days ({song.target_release_date}).',
+            target_department=departments['label'],
+        ))
+    return alerts
 
 
 class SongAlertService:
@@ -102,77 +276,21 @@ class SongAlertService:
         Returns:
             List of SongAlert instances created
         """
-        from catalog.models import SongAlert
-
         # Check if alert type is enabled
         config = get_alert_config('overdue')
         if not config:
             return []  # Alert disabled
 
-        alerts = []
-
         if not song.stage_deadline:
-            return alerts
+            return []
 
         if song.stage_deadline >= timezone.now().date():
-            return alerts  # Not overdue yet
-
-        # Prepare template variables
-        template_vars = {
-            'song_title': song.title,
-            'stage': song.stage,
-            'deadline': song.stage_deadline,
-            'assigned_user': song.assigned_user.get_full_name() if song.assigned_user else 'unassigned'
-        }
-
-        # Alert assigned user
-        if song.assigned_user and config.notify_assigned_user:
-            alert = SongAlert.objects.create(
-                song=song,
-                alert_type='overdue',
-                target_user=song.assigned_user,
-                title=config.title_template.format(**template_vars),
-                message=config.message_template.format(**template_vars),
-                action_url=f'/songs/{song.id}/',
-                action_label='View Song',
-                priority=config.priority
-            )
-            alerts.append(alert)
-
-        # Also alert department managers
-        if song.assigned_department and config.notify_department_managers:
-            dept_managers = User.objects.filter(
-                profile__department=song.assigned_department,
-                profile__role__level__gte=300  # Manager level
-            )
-
-            for manager in dept_managers:
-                alert = SongAlert.objects.create(
-                    song=song,
-                    alert_type='overdue',
-                    target_user=manager,
-                    title=config.title_template.format(**template_vars),
-                    message=config.message_template.format(**template_vars),
-                    action_url=f'/songs/{song.id}/',
-                    action_label='View Song',
-                    priority=config.priority
-                )
-                alerts.append(alert)
-
-        # Alert song creator if configured
-        if song.created_by and config.notify_song_creator and song.created_by != song.assigned_user:
-            alert = SongAlert.objects.create(
-                song=song,
-                alert_type='overdue',
-                target_user=song.created_by,
-                title=config.title_template.format(**template_vars),
-                message=config.message_template.format(**template_vars),
-                action_url=f'/songs/{song.id}/',
-                action_label='View Song',
-                priority=config.priority
-            )
-            alerts.append(alert)
+            return []  # Not overdue yet
 
+        managers = get_department_managers([song.assigned_department_id]).get(song.assigned_department_id, [])
+        alerts = build_overdue_alerts(song, config, managers)
+        for alert in alerts:
+            alert.save()
         return alerts
 
     @staticmethod
@@ -306,52 +424,18 @@ class SongAlertService:
         Returns:
             List of SongAlert instances created
         """
-        from catalog.models import SongAlert
-
-        alerts = []
-
         if not song.stage_deadline:
-            return alerts
+            return []
 
         days_until_deadline = (song.stage_deadline - timezone.now().date()).days
 
-        if days_until_deadline != 2:
-            return alerts  # Only alert 2 days before
-
-        # Alert assigned user
-        if song.assigned_user:
-            alert = SongAlert.objects.create(
-                song=song,
-                alert_type='deadline_approaching',
-                target_user=song.assigned_user,
-                title=f'Deadline Approaching: {song.title}',
-                message=f'"{song.title}" is due in 2 days ({song.stage_deadline}). Please complete checklist items.',
-                action_url=f'/songs/{song.id}/',
-                action_label='View Song',
-                priority='important'
-            )
-            alerts.append(alert)
-
-        # Also alert department managers
-        if song.assigned_department:
-            dept_managers = User.objects.filter(
-                profile__department=song.assigned_department,
-                profile__role__level__gte=300  # Manager level
-            )
-
-            for manager in dept_managers:
-                alert = SongAlert.objects.create(
-                    song=song,
-                    alert_type='deadline_approaching',
-                    target_user=manager,
-                    title=f'Team Song Deadline: {song.title}',
-                    message=f'"{song.title}" assigned to {song.assigned_user.get_full_name() if song.assigned_user else "unassigned"} is due in 2 days.',
-                    action_url=f'/songs/{song.id}/',
-                    action_label='View Song',
-                    priority='important'
-                )
-                alerts.append(alert)
+        if days_until_deadline != DEADLINE_ALERT_DAYS:
+            return []  # Only alert 2 days before
 
+        managers = get_department_managers([song.assigned_department_id]).get(song.assigned_department_id, [])
+        alerts = build_deadline_approaching_alerts(song, managers)
+        for alert in alerts:
+            alert.save()
         return alerts
 
     @staticmethod
@@ -483,69 +567,51 @@ class SongAlertService:
         Returns:
             List of SongAlert instances created
         """
-        from catalog.models import SongAlert
         from api.models import Department
 
-        alerts = []
-
         if not song.target_release_date:
-            return alerts
+            return []
 
         days_until_release = (song.target_release_date - timezone.now().date()).days
 
-        if days_until_release != 7:
-            return alerts  # Only alert 7 days before
+        if days_until_release != RELEASE_ALERT_DAYS:
+            return []  # Only alert 7 days before
 
-        # Alert Digital department
-        try:
-            digital_dept = Department.objects.get(code='digital')
-            alert = SongAlert.objects.create(
-                song=song,
-                alert_type='release_approaching',
-                target_department=digital_dept,
-                title=f'Release in 7 Days: {song.title}',
-                message=f'"{song.title}" is scheduled for release in 7 days ({song.target_release_date}). Ensure all distribution is complete.',
-                action_url=f'/songs/{song.id}/',
-                action_label='View Song',
-                priority='important'
-            )
-            alerts.append(alert)
-        except Department.DoesNotExist:
-            pass
+        departments = {dept.code: dept for dept in Department.objects.filter(code__in=['digital', 'label'])}
+        alerts = build_release_approaching_alerts(song, departments)
+        for alert in alerts:
+            alert.save()
+        return alerts
 
-        # Alert Label department
-        try:
-            label_dept = Department.objects.get(code='label')
-            alert = SongAlert.objects.create(
-                song=song,
-                alert_type='release_approaching',
-                target_department=label_dept,
-                title=f'Release in 7 Days: {song.title}',
-                message=f'"{song.title}" is scheduled for release in 7 days ({song.target_release_date}).',
-                action_url=f'/songs/{song.id}/',
-                action_label='View Song',
-                priority='important'
-            )
-            alerts.append(alert)
-        except Department.DoesNotExist:
-            pass
 
-        return alerts
+# ==================== Daily Alerts ====================
 
+def _alert_dedupe_key(alert):
+    return (alert.song_id, alert.alert_type, alert.target_user_id, alert.target_department_id)
 
-# Convenience function for bulk operations
-def create_daily_alerts():
+
+def create_daily_alerts(today=None, batch_size=ALERT_BATCH_SIZE):
     """
     Creates all daily alerts (overdue, approaching deadlines, etc.).
 
-    This should be called by a daily cron job or Celery task.
+    This should be called by a daily cron job or Celery task. Runs a fixed
+    number of queries whatever the number of songs: configurations, songs,
+    managers and today's alerts are loaded once, and new alerts are inserted
+    with bulk_create() in batches. Alerts already sent today (same song,
+    type and recipient) are skipped, so re-running the job is harmless.
+
+    Args:
+        today: Date to generate alerts for (defaults to the current date)
+        batch_size: Rows per INSERT
 
     Returns:
         Dictionary with summary of alerts created
     """
-    from catalog.models import Song
-    from datetime import timedelta
+    from catalog.models import Song, SongAlert
+    from api.models import Department
+    from notifications.counters import adjust_unread, song_alert_deltas
 
+    today = today or timezone.now().date()
     summary = {
         'overdue_alerts': 0,
         'deadline_approaching_alerts': 0,
@@ -553,41 +619,63 @@ def create_daily_alerts():
         'total_alerts': 0
     }
 
-    # Find overdue songs
-    overdue_songs = Song.objects.filter(
-        stage_deadline__lt=timezone.now().date(),
-        is_archived=False,
-        stage__in=['publishing', 'label_recording', 'marketing_assets', 'label_review', 'ready_for_digital', 'digital_distribution']
-    )
+    configs = get_enabled_alert_configs()
+    songs = Song.objects.select_related('assigned_user', 'created_by').filter(is_archived=False)
 
-    for song in overdue_songs:
-        alerts = SongAlertService.create_overdue_alert(song)
-        summary['overdue_alerts'] += len(alerts)
-        summary['total_alerts'] += len(alerts)
+    # Find overdue songs (only when the alert type is enabled)
+    overdue_songs = []
+    if 'overdue' in configs:
+        overdue_songs = list(songs.filter(
+            stage_deadline__lt=today,
+            stage__in=DEADLINE_ALERT_STAGES,
+        ))
 
     # Find songs with approaching deadlines (2 days)
-    approaching_deadline = timezone.now().date() + timedelta(days=2)
-    approaching_songs = Song.objects.filter(
-        stage_deadline=approaching_deadline,
-        is_archived=False,
-        stage__in=['publishing', 'label_recording', 'marketing_assets', 'label_review', 'ready_for_digital', 'digital_distribution']
-    )
-
-    for song in approaching_songs:
-        alerts = SongAlertService.create_deadline_approaching_alert(song)
-        summary['deadline_approaching_alerts'] += len(alerts)
-        summary['total_alerts'] += len(alerts)
+    approaching_songs = list(songs.filter(
+        stage_deadline=today + timedelta(days=DEADLINE_ALERT_DAYS),
+        stage__in=DEADLINE_ALERT_STAGES,
+    ))
 
     # Find songs with approaching release dates (7 days)
-    approaching_release = timezone.now().date() + timedelta(days=7)
-    release_songs = Song.objects.filter(
-        target_release_date=approaching_release,
-        is_archived=False
+    release_songs = list(songs.filter(target_release_date=today + timedelta(days=RELEASE_ALERT_DAYS)))
+
+    if not (overdue_songs or approaching_songs or release_songs):
+        return summary
+
+    managers = get_department_managers(
+        song.assigned_department_id for song in overdue_songs + approaching_songs
     )
+    departments = {}
+    if release_songs:
+        departments = {dept.code: dept for dept in Department.objects.filter(code__in=['digital', 'label'])}
 
+    candidates = []
+    for song in overdue_songs:
+        candidates += build_overdue_alerts(song, configs['overdue'], managers.get(song.assigned_department_id, []))
+    for song in approaching_songs:
+        candidates += build_deadline_approaching_alerts(song, managers.get(song.assigned_department_id, []))
     for song in release_songs:
-        alerts = SongAlertService.create_release_approaching_alert(song)
-        summary['release_approaching_alerts'] += len(alerts)
-        summary['total_alerts'] += len(alerts)
+        candidates += build_release_approaching_alerts(song, departments)
+
+    # Skip alerts already sent today and duplicates within this run
+    sent = set(
+        SongAlert.objects.filter(
+            created_at__date=today,
+            alert_type__in={alert.alert_type for alert in candidates},
+            song_id__in={alert.song_id for alert in candidates},
+        ).values_list('song_id', 'alert_type', 'target_user_id', 'target_department_id')
+    )
+    alerts = []
+    for alert in candidates:
+        key = _alert_dedupe_key(alert)
+        if key not in sent:
+            sent.add(key)
+            alerts.append(alert)
+
+    SongAlert.objects.bulk_create(alerts, batch_size=batch_size)
+    adjust_unread(song_alert_deltas(alerts))
 
+    for alert in alerts:
+        summary[f'{alert.alert_type}_alerts'] += 1
+    summary['total_alerts'] = len(alerts)
     return summary
@@ -8,3 +8,10 @@ class CatalogConfig(AppConfig):
     def ready(self):
         """Register signal handlers for task automation."""
         from . import signals
+        from api.cache import register_cache_invalidation
+        from api.config_registry import register_config
+        from .alert_service import ALERT_CONFIGS, load_alert_configs
+        from .views import CATALOG_CACHE_DEPENDENCIES
+
+        register_cache_invalidation(*CATALOG_CACHE_DEPENDENCIES)
+        register_config(ALERT_CONFIGS, 'catalog.AlertConfiguration', load_alert_configs)
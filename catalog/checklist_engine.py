@@ -0,0 +1,322 @@
+"""
+Dependency-indexed revalidation of auto-validated song checklist items.
+
+An auto-validated SongChecklistItem reads a small, fixed set of
+(entity, field) pairs determined by its validation_type and validation_rule.
+CHECKLIST_DEPENDENCIES indexes, for each pair, the rules reading it, so a
+change to a Work, Recording, Split or Identifier selects only the items it
+can affect. Selected items are evaluated together against one
+ChecklistSnapshot, which bulk-loads works, recordings, releases, identifiers
+and split totals for all their songs, and status changes are written with a
+single bulk_update().
+
+Usage:
+    revalidate_checklists('work', work.id, fields=['title'])
+    revalidate_checklists('recording', recording_id, fields=['splits'], sync=True)
+"""
+
+import functools
+import logging
+import operator
+
+from django.db.models import Count, Q
+
+from identity.prefetch import get_identifier_value, prefetch_identifiers
+from rights.aggregation import attach_split_totals, get_instance_split_totals, is_complete
+
+from .models import Song, SongChecklistItem, Work
+
+logger = logging.getLogger(__name__)
+
+
+# (entity, field) -> checklist rules reading it, as (validation_type, rule entity).
+# 'splits' stands for the entity's rights splits; song fields are relations.
+CHECKLIST_DEPENDENCIES = {
+    ('song', 'work'): [
+        ('auto_entity_exists', 'work'),
+        ('auto_field_exists', 'work'),
+        ('auto_split_validated', 'work'),
+        ('auto_count_minimum', 'work_writers'),
+        ('auto_count_minimum', 'work_publishers'),
+    ],
+    ('song', 'recordings'): [
+        ('auto_entity_exists', 'recording'),
+        ('auto_field_exists', 'recording'),
+        ('auto_split_validated', 'recording'),
+        ('auto_count_minimum', 'recording'),
+    ],
+    ('song', 'releases'): [
+        ('auto_entity_exists', 'release'),
+        ('auto_count_minimum', 'release'),
+    ],
+    ('work', 'splits'): [
+        ('auto_split_validated', 'work'),
+        ('auto_count_minimum', 'work_writers'),
+        ('auto_count_minimum', 'work_publishers'),
+    ],
+    ('recording', 'splits'): [
+        ('auto_split_validated', 'recording'),
+    ],
+}
+
+# Any other field of these entities is read by auto_field_exists rules naming it
+FIELD_RULE_ENTITIES = ('work', 'recording')
+
+# Checklist fields backed by identifiers: entity -> {field: scheme}
+IDENTIFIER_FIELDS = {
+    'work': {'iswc': 'ISWC'},
+    'recording': {'isrc': 'ISRC'},
+}
+
+
+def changed_fields(old, new):
+    """
+    Return the names of concrete fields whose values differ between two instances.
+
+    Args:
+        old: Instance as stored in the database
+        new: Instance about to be saved
+
+    Returns:
+        set: Field names (attnames for foreign keys)
+    """
+    return {
+        field.attname for field in new._meta.concrete_fields
+        if not field.primary_key and getattr(old, field.attname) != getattr(new, field.attname)
+    }
+
+
+def dependency_filter(entity, fields=None):
+    """
+    Build the SongChecklistItem filter matching items that read the changed fields.
+
+    Args:
+        entity: 'song', 'work', 'recording' or 'release'
+        fields: Changed field names; None means any field of the entity
+
+    Returns:
+        Q or None: Filter, or None when no checklist rule reads these fields
+    """
+    matches = []
+    if fields is None:
+        fields = [dep_field for dep_entity, dep_field in CHECKLIST_DEPENDENCIES if dep_entity == entity]
+        if entity in FIELD_RULE_ENTITIES:
+            matches.append(Q(validation_type='auto_field_exists', validation_rule__entity=entity))
+    else:
+        for field in fields:
+            if entity in FIELD_RULE_ENTITIES and (entity, field) not in CHECKLIST_DEPENDENCIES:
+                matches.append(Q(
+                    validation_type='auto_field_exists',
+                    validation_rule__entity=entity,
+                    validation_rule__field__iexact=field,
+                ))
+
+    for field in fields:
+        matches.extend(
+            Q(validation_type=validation_type, validation_rule__entity=rule_entity)
+            for validation_type, rule_entity in CHECKLIST_DEPENDENCIES.get((entity, field), ())
+        )
+    if not matches:
+        return None
+    return functools.reduce(operator.or_, matches)
+
+
+def songs_for(entity, object_id):
+    """Return the queryset of songs using an entity."""
+    if entity == 'song':
+        return Song.objects.filter(pk=object_id)
+    if entity == 'work':
+        return Song.objects.filter(work_id=object_id)
+    if entity == 'recording':
+        return Song.objects.filter(recordings=object_id)
+    if entity == 'release':
+        return Song.objects.filter(releases=object_id)
+    return Song.objects.none()
+
+
+class ChecklistSnapshot:
+    """
+    Validation inputs for a set of songs, loaded in bulk on first use.
+
+    Each kind of data (works, recordings, releases, identifiers, split totals)
+    is fetched for every song of the snapshot at once, the first time an item
+    needs it. The snapshot loads its own Work and Recording instances, so it
+    never leaves caches on the caller's objects.
+    """
+
+    def __init__(self, songs):
+        self.songs = {song.pk: song for song in songs}
+        self._works = None
+        self._recordings = None
+        self._release_counts = None
+        self._identifiers_loaded = set()
+        self._splits_loaded = set()
+
+    def work(self, song_id):
+        """Return the song's Work, or None."""
+        if self._works is None:
+            work_ids = {song.work_id for song in self.songs.values() if song.work_id}
+            self._works = Work.objects.in_bulk(work_ids)
+        return self._works.get(self.songs[song_id].work_id)
+
+    def recordings(self, song_id):
+        """Return the song's recordings."""
+        if self._recordings is None:
+            self._recordings = {pk: [] for pk in self.songs}
+            links = Song.recordings.through.objects.filter(
+                song_id__in=list(self.songs)
+            ).select_related('recording')
+            for link in links:
+                self._recordings[link.song_id].append(link.recording)
+        return self._recordings[song_id]
+
+    def release_count(self, song_id):
+        """Return the number of releases linked to the song."""
+        if self._release_counts is None:
+            rows = (
+                Song.releases.through.objects.filter(song_id__in=list(self.songs))
+                .values('song_id').annotate(count=Count('id')).order_by()
+            )
+            self._release_counts = {row['song_id']: row['count'] for row in rows}
+        return self._release_counts.get(song_id, 0)
+
+    def _owners(self, scope):
+        if scope == 'work':
+            return [self.work(song_id) for song_id in self.songs]
+        return [recording for song_id in self.songs for recording in self.recordings(song_id)]
+
+    def field_value(self, instance, entity, field):
+        """Return a checklist field of a Work or Recording (identifier fields included)."""
+        scheme = IDENTIFIER_FIELDS[entity].get(field.lower())
+        if scheme is None:
+            return getattr(instance, field, None)
+        if entity not in self._identifiers_loaded:
+            prefetch_identifiers(self._owners(entity), entity)
+            self._identifiers_loaded.add(entity)
+        return get_identifier_value(instance, entity, scheme)
+
+    def split_totals(self, instance, scope):
+        """Return the split totals of a Work or Recording."""
+        if scope not in self._splits_loaded:
+            attach_split_totals(self._owners(scope), scope)
+            self._splits_loaded.add(scope)
+        return get_instance_split_totals(instance, scope)
+
+    def evaluate(self, item):
+        """
+        Decide whether a checklist item's requirement is met.
+
+        Args:
+            item: SongChecklistItem of one of the snapshot's songs
+
+        Returns:
+            bool: True if validation passes
+        """
+        validation_type = item.validation_type
+        if validation_type == 'manual':
+            return item.is_complete
+
+        rule = item.validation_rule or {}
+        entity = rule.get('entity')
+        song_id = item.song_id
+
+        if validation_type == 'auto_entity_exists':
+            if entity == 'work':
+                return self.songs[song_id].work_id is not None
+            if entity == 'recording':
+                return bool(self.recordings(song_id))
+            if entity == 'release':
+                return self.release_count(song_id) > 0
+
+        elif validation_type == 'auto_field_exists':
+            field = rule.get('field')
+            if entity == 'work' and field:
+                work = self.work(song_id)
+                return bool(work and self.field_value(work, 'work', field))
+            if entity == 'recording' and field:
+                return any(
+                    self.field_value(recording, 'recording', field)
+                    for recording in self.recordings(song_id)
+                )
+
+        elif validation_type == 'auto_split_validated':
+            if entity == 'work':
+                work = self.work(song_id)
+                return bool(work and is_complete('work', self.split_totals(work, 'work')))
+            if entity == 'recording':
+                return any(
+                    is_complete('recording', self.split_totals(recording, 'recording'))
+                    for recording in self.recordings(song_id)
+                )
+
+        elif validation_type == 'auto_count_minimum':
+            min_count = rule.get('min_count', 1)
+            if entity == 'recording':
+                return len(self.recordings(song_id)) >= min_count
+            if entity == 'release':
+                return self.release_count(song_id) >= min_count
+            if entity in ('work_writers', 'work_publishers'):
+                work = self.work(song_id)
+                right_type = 'writer' if entity == 'work_writers' else 'publisher'
+                return bool(work) and self.split_totals(work, 'work')[right_type]['count'] >= min_count
+
+        return False
+
+
+def revalidate_items(items, sync=False):
+    """
+    Evaluate checklist items against one snapshot and save status changes in bulk.
+
+    Args:
+        items: SongChecklistItem instances (any number of songs)
+        sync: Also mark complete items incomplete when validation now fails;
+              by default items are only ever completed
+
+    Returns:
+        list: The items whose is_complete changed
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    snapshot = ChecklistSnapshot({item.song_id: item.song for item in items}.values())
+    changed = []
+    for item in items:
+        is_valid = snapshot.evaluate(item)
+        if is_valid != item.is_complete and (is_valid or sync):
+            item.is_complete = is_valid
+            changed.append(item)
+            logger.info(
+                f"Song {item.song_id}: {'✓ Auto-completed' if is_valid else '✗ Marked incomplete'} "
+                f"checklist item '{item.item_name}'"
+            )
+
+    if changed:
+        from .signals import sync_checklist_item_tasks
+
+        SongChecklistItem.objects.bulk_update(changed, ['is_complete'])
+        sync_checklist_item_tasks(changed)
+    return changed
+
+
+def revalidate_checklists(entity, object_id, fields=None, sync=False):
+    """
+    Re-evaluate the checklist items affected by a change to one entity.
+
+    Args:
+        entity: 'song', 'work', 'recording' or 'release'
+        object_id: ID of the changed object
+        fields: Changed field names ('splits' for rights splits); None means any
+        sync: See revalidate_items()
+
+    Returns:
+        list: The items whose is_complete changed
+    """
+    condition = dependency_filter(entity, fields)
+    if condition is None:
+        return []
+
+    items = SongChecklistItem.objects.filter(condition, song__in=songs_for(entity, object_id))
+    if not sync:
+        items = items.filter(is_complete=False)
+    return revalidate_items(items.select_related('song'), sync=sync)
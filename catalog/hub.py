@@ -0,0 +1,536 @@
+"""
+Payload builders for the Song Hub and Track Preview aggregate endpoints.
+
+Both payloads are assembled from a fixed set of bulk queries (one per relation
+and owner type) joined in memory, so the query count does not grow with the
+number of recordings, releases, credits or publications of a work.
+
+Payloads can optionally be cached (settings.AGGREGATE_VIEW_CACHE_TIMEOUT,
+seconds; 0 disables). Cache keys embed a version per "graph" - a work and
+everything hanging off it, or a recording that has no work - plus a global
+version for catalog-wide contracts. Signals in catalog.signals bump those
+versions whenever a Work, Recording, Release, Track, Asset, Credit, Split,
+Publication, Identifier or ContractScope of the graph changes - or a Contract
+or Entity shown on it - so stale entries are simply never read again and
+expire on their own.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, OuterRef, Q, Subquery
+
+from contracts.models import ContractScope
+from rights.aggregation import annotate_split_totals
+from rights.models import Credit, Split
+from .models import Recording, Release, Track
+from .prefetch import GenericPrefetch, get_generic, prefetch_generic
+
+
+CACHE_PREFIX = 'catalog:hub'
+GLOBAL_GRAPH_KEY = 'global'
+
+
+# ==================== Cache versioning ====================
+
+def hub_cache_timeout():
+    """Return the payload cache timeout in seconds (0 when caching is disabled)."""
+    return getattr(settings, 'AGGREGATE_VIEW_CACHE_TIMEOUT', 0) or 0
+
+
+def work_graph_key(work_id):
+    """Graph key for a work and everything attached to it."""
+    return f'work:{work_id}'
+
+
+def recording_graph_key(recording_id, work_id):
+    """Graph key for a recording: its work's graph, or its own if it has no work."""
+    return work_graph_key(work_id) if work_id else f'recording:{recording_id}'
+
+
+def graph_keys_for(object_type, object_ids):
+    """
+    Resolve the graph keys affected by a change to catalog objects.
+
+    Args:
+        object_type: 'work', 'recording' or 'release'
+        object_ids: Iterable of object IDs
+
+    Returns:
+        set: Graph keys to bump
+    """
+    object_ids = [obj_id for obj_id in object_ids if obj_id]
+    if not object_ids:
+        return set()
+
+    if object_type == 'work':
+        return {work_graph_key(obj_id) for obj_id in object_ids}
+
+    if object_type == 'recording':
+        rows = Recording.objects.filter(pk__in=object_ids).values_list('id', 'work_id')
+    elif object_type == 'release':
+        rows = Recording.objects.filter(tracks__release_id__in=object_ids).values_list('id', 'work_id').distinct()
+    else:
+        return set()
+
+    return {recording_graph_key(recording_id, work_id) for recording_id, work_id in rows}
+
+
+def _version_cache_key(graph_key):
+    return f'{CACHE_PREFIX}:version:{graph_key}'
+
+
+def get_graph_versions(graph_keys):
+    """Return {graph_key: version}, initialising missing versions."""
+    cache_keys = {_version_cache_key(key): key for key in graph_keys}
+    stored = cache.get_many(list(cache_keys))
+
+    missing = {cache_key: time.time_ns() for cache_key in cache_keys if cache_key not in stored}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        stored.update(missing)
+
+    return {cache_keys[cache_key]: version for cache_key, version in stored.items()}
+
+
+def bump_graph_versions(graph_keys):
+    """Invalidate every cached payload that depends on the given graphs."""
+    if not graph_keys or not hub_cache_timeout():
+        return
+    version = time.time_ns()
+    cache.set_many({_version_cache_key(key): version for key in graph_keys}, timeout=None)
+
+
+def _payload_cache_key(kind, object_id, graph_key):
+    versions = get_graph_versions([GLOBAL_GRAPH_KEY, graph_key])
+    return f'{CACHE_PREFIX}:{kind}:{object_id}:{versions[GLOBAL_GRAPH_KEY]}:{versions[graph_key]}'
+
+
+def _cached(kind, object_id, graph_key, build):
+    timeout = hub_cache_timeout()
+    if not timeout:
+        return build()
+
+    key = _payload_cache_key(kind, object_id, graph_key)
+    payload = cache.get(key)
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, timeout=timeout)
+    return payload
+
+
+# ==================== Shared helpers ====================
+
+def _split_queryset():
+    return Split.objects.select_related('entity')
+
+
+def _credit_queryset():
+    return Credit.objects.select_related('entity')
+
+
+def _contract_scope_type(scope, order):
+    """Name the scope by the first foreign key set, checked in the given order."""
+    for scope_type in order:
+        if getattr(scope, f'{scope_type}_id'):
+            return scope_type
+    return 'catalog' if scope.all_in_term else 'unknown'
+
+
+# ==================== Song Hub ====================
+
+def get_song_hub(work):
+    """Return the Song Hub payload for a work, from cache when enabled."""
+    return _cached('song_hub', work.id, work_graph_key(work.id), lambda: build_song_hub(work))
+
+
+def build_song_hub(work):
+    """
+    Build the Song Hub payload for a work.
+
+    Args:
+        work: Work instance (annotate_split_totals() avoids one extra query)
+
+    Returns:
+        dict: Work, credits, splits, recordings (with releases, credits, splits
+              and publications), contracts and statistics
+    """
+    recordings = list(annotate_split_totals(Recording.objects.filter(work=work), 'recording'))
+
+    # Every track of every recording, releases in Release.Meta.ordering and the
+    # lowest disc/track number first within a release
+    tracks = Track.objects.filter(recording__in=recordings).select_related('release').order_by(
+        '-release__release_date', '-release__created_at', 'release_id', 'disc_number', 'track_number'
+    )
+    releases = {}
+    releases_by_recording = {recording.id: {} for recording in recordings}
+    for track in tracks:
+        release = releases.setdefault(track.release_id, track.release)
+        releases_by_recording[track.recording_id].setdefault(release.id, (release, track))
+
+    prefetch_generic([work] + recordings + list(releases.values()), 'identifiers')
+    prefetch_generic(
+        [work] + recordings,
+        GenericPrefetch('credits', queryset=_credit_queryset()),
+        GenericPrefetch('splits', queryset=_split_queryset()),
+    )
+    prefetch_generic(recordings, 'publications')
+
+    recordings_data = []
+    for recording in recordings:
+        releases_data = [{
+            'id': release.id,
+            'title': release.title,
+            'upc': release.get_upc(),
+            'type': release.type,
+            'status': release.status,
+            'release_date': release.release_date,
+            'label_name': release.label_name,
+            'catalog_number': release.catalog_number,
+            'track_number': track.track_number,
+            'disc_number': track.disc_number,
+            'track_version': track.version
+        } for release, track in releases_by_recording[recording.id].values()]
+
+        recordings_data.append({
+            'id': recording.id,
+            'title': recording.title,
+            'isrc': recording.get_isrc(),
+            'type': recording.type,
+            'status': recording.status,
+            'duration_seconds': recording.duration_seconds,
+            'formatted_duration': recording.formatted_duration,
+            'recording_date': recording.recording_date,
+            'studio': recording.studio,
+            'version': recording.version,
+            'has_complete_master_splits': recording.has_complete_master_splits,
+            'releases': releases_data,
+            'credits': [{
+                'id': credit.id,
+                'entity_id': credit.entity.id,
+                'entity_name': credit.entity.display_name,
+                'role': credit.role,
+                'role_display': credit.get_role_display(),
+                'credited_as': credit.credited_as
+            } for credit in get_generic(recording, 'credits')],
+            'splits': [{
+                'id': split.id,
+                'entity_id': split.entity.id,
+                'entity_name': split.entity.display_name,
+                'right_type': split.right_type,
+                'share': float(split.share),
+                'is_locked': split.is_locked,
+                'source': split.source
+            } for split in get_generic(recording, 'splits')],
+            'publications': [{
+                'id': pub.id,
+                'platform': pub.platform,
+                'platform_display': pub.get_platform_display(),
+                'territory': pub.territory,
+                'status': pub.status,
+                'url': pub.url,
+                'is_monetized': pub.is_monetized,
+                'published_at': pub.published_at
+            } for pub in get_generic(recording, 'publications')]
+        })
+
+    work_credits_data = [{
+        'id': credit.id,
+        'entity_id': credit.entity.id,
+        'entity_name': credit.entity.display_name,
+        'role': credit.role,
+        'role_display': credit.get_role_display(),
+        'credited_as': credit.credited_as,
+        'share_kind': credit.share_kind,
+        'share_value': credit.share_value
+    } for credit in get_generic(work, 'credits')]
+
+    work_splits = list(get_generic(work, 'splits'))
+    work_splits_data = [{
+        'id': split.id,
+        'entity_id': split.entity.id,
+        'entity_name': split.entity.display_name,
+        'right_type': split.right_type,
+        'right_type_display': split.get_right_type_display(),
+        'share': float(split.share),
+        'is_locked': split.is_locked,
+        'source': split.source
+    } for split in work_splits]
+
+    def splits_complete(right_type):
+        shares = [{'share': split.share} for split in work_splits if split.right_type == right_type]
+        return Split.build_validation_result(right_type, shares)['is_complete']
+
+    # Contracts covering this work, or the whole catalog
+    contract_scopes = ContractScope.objects.filter(
+        Q(work=work) | Q(all_in_term=True)
+    ).select_related('contract', 'contract__counterparty_entity')
+
+    contracts_data = []
+    for scope in contract_scopes:
+        contract = scope.contract
+        counterparty = contract.counterparty_entity
+        contracts_data.append({
+            'id': contract.id,
+            'contract_number': contract.contract_number,
+            'title': contract.title,
+            'entity_id': counterparty.id if counterparty else None,
+            'entity_name': counterparty.display_name if counterparty else None,
+            'status': contract.status,
+            'effective_date': contract.term_start,
+            'scope_type': _contract_scope_type(scope, ('work', 'recording', 'release')),
+            'include_derivatives': scope.include_derivatives,
+            'all_in_term': scope.all_in_term
+        })
+
+    return {
+        'work': {
+            'id': work.id,
+            'title': work.title,
+            'alternate_titles': work.alternate_titles,
+            'iswc': work.get_iswc(),
+            'language': work.language,
+            'genre': work.genre,
+            'sub_genre': work.sub_genre,
+            'year_composed': work.year_composed,
+            'lyrics': work.lyrics,
+            'notes': work.notes,
+            'has_complete_publishing_splits': work.has_complete_publishing_splits,
+            'created_at': work.created_at,
+            'updated_at': work.updated_at
+        },
+        'credits': work_credits_data,
+        'splits': {
+            'writer': [s for s in work_splits_data if s['right_type'] == 'writer'],
+            'publisher': [s for s in work_splits_data if s['right_type'] == 'publisher']
+        },
+        'recordings': recordings_data,
+        'contracts': contracts_data,
+        'statistics': {
+            'total_recordings': len(recordings_data),
+            'total_releases': sum(len(r['releases']) for r in recordings_data),
+            'total_publications': sum(len(r['publications']) for r in recordings_data),
+            'has_complete_writer_splits': splits_complete('writer'),
+            'has_complete_publisher_splits': splits_complete('publisher'),
+            'platforms_covered': list(set(
+                pub['platform'] for r in recordings_data
+                for pub in r['publications']
+            ))
+        }
+    }
+
+
+# ==================== Track Preview ====================
+
+def get_track_preview(recording):
+    """Return the Track Preview payload for a recording, from cache when enabled."""
+    graph_key = recording_graph_key(recording.id, recording.work_id)
+    return _cached('track_preview', recording.id, graph_key, lambda: build_track_preview(recording))
+
+
+def build_track_preview(recording):
+    """
+    Build the Track Preview payload for a recording.
+
+    Args:
+        recording: Recording instance with work selected (and ideally
+                   annotate_split_totals() applied)
+
+    Returns:
+        dict: Recording, work, releases, credits, master splits,
+              publications, assets, contracts and statistics
+    """
+    work = recording.work
+
+    # Releases containing this recording, with their full track count
+    track_count = Track.objects.filter(release=OuterRef('pk')).order_by().values('release').annotate(
+        count=Count('id')
+    ).values('count')
+    releases = list(Release.objects.filter(
+        pk__in=Track.objects.filter(recording=recording).values('release_id')
+    ).annotate(track_count=Subquery(track_count)))
+
+    # All tracks of those releases, split into this recording's and the others
+    own_tracks = {}
+    other_tracks = {release.id: [] for release in releases}
+    for track in Track.objects.filter(release__in=releases).select_related('recording'):
+        if track.recording_id == recording.id:
+            own_tracks.setdefault(track.release_id, track)
+        else:
+            other_tracks[track.release_id].append(track)
+
+    prefetch_generic([recording, work] + releases, 'identifiers')
+    prefetch_generic(
+        [recording, work],
+        GenericPrefetch('splits', queryset=_split_queryset()),
+    )
+    prefetch_generic(
+        [recording],
+        GenericPrefetch('credits', queryset=_credit_queryset()),
+        'publications',
+    )
+
+    work_data = None
+    if work:
+        work_splits = get_generic(work, 'splits')
+        work_data = {
+            'id': work.id,
+            'title': work.title,
+            'iswc': work.get_iswc(),
+            'language': work.language,
+            'genre': work.genre,
+            'year_composed': work.year_composed,
+            'writer_splits': [{
+                'entity_id': split.entity.id,
+                'entity_name': split.entity.display_name,
+                'share': float(split.share)
+            } for split in work_splits if split.right_type == 'writer'],
+            'publisher_splits': [{
+                'entity_id': split.entity.id,
+                'entity_name': split.entity.display_name,
+                'share': float(split.share)
+            } for split in work_splits if split.right_type == 'publisher']
+        }
+
+    releases_data = []
+    for release in releases:
+        track = own_tracks.get(release.id)
+        releases_data.append({
+            'id': release.id,
+            'title': release.title,
+            'upc': release.get_upc(),
+            'type': release.type,
+            'status': release.status,
+            'release_date': release.release_date,
+            'label_name': release.label_name,
+            'catalog_number': release.catalog_number,
+            'artwork_url': release.artwork_url,
+            'track_info': {
+                'track_number': track.track_number if track else None,
+                'disc_number': track.disc_number if track else None,
+                'version': track.version if track else None,
+                'is_bonus': track.is_bonus if track else False,
+                'is_hidden': track.is_hidden if track else False
+            },
+            'track_count': release.track_count or 0,
+            'other_tracks': [{
+                'track_number': t.track_number,
+                'disc_number': t.disc_number,
+                'recording_id': t.recording.id,
+                'recording_title': t.recording.title,
+                'duration': t.recording.duration_seconds
+            } for t in other_tracks[release.id][:5]]  # Limit to 5 for payload size
+        })
+
+    credits_data = [{
+        'id': credit.id,
+        'entity_id': credit.entity.id,
+        'entity_name': credit.entity.display_name,
+        'role': credit.role,
+        'role_display': credit.get_role_display(),
+        'credited_as': credit.credited_as
+    } for credit in get_generic(recording, 'credits')]
+
+    splits_data = [{
+        'id': split.id,
+        'entity_id': split.entity.id,
+        'entity_name': split.entity.display_name,
+        'share': float(split.share),
+        'is_locked': split.is_locked,
+        'source': split.source
+    } for split in get_generic(recording, 'splits') if split.right_type == 'master']
+
+    publications_data = [{
+        'id': pub.id,
+        'platform': pub.platform,
+        'platform_display': pub.get_platform_display(),
+        'platform_icon': pub.platform_icon,
+        'territory': pub.territory,
+        'territory_display': pub.territory,  # free-form code, no choices
+        'status': pub.status,
+        'url': pub.url,
+        'external_id': pub.external_id,
+        'is_monetized': pub.is_monetized,
+        'published_at': pub.published_at,
+        'metrics': pub.metrics
+    } for pub in get_generic(recording, 'publications')]
+
+    assets_data = [{
+        'id': asset.id,
+        'kind': asset.kind,
+        'file_name': asset.file_name,
+        'file_size': asset.file_size,
+        'formatted_file_size': asset.formatted_file_size,
+        'mime_type': asset.mime_type,
+        'is_master': asset.is_master,
+        'is_public': asset.is_public,
+        'sample_rate': asset.sample_rate,
+        'bit_depth': asset.bit_depth,
+        'bitrate': asset.bitrate
+    } for asset in recording.assets.all()]
+
+    # Contracts covering this recording, its work, or the whole catalog
+    q_filter = Q(recording=recording) | Q(all_in_term=True)
+    if work:
+        q_filter |= Q(work=work)
+
+    contract_scopes = ContractScope.objects.filter(q_filter).select_related(
+        'contract', 'contract__counterparty_entity'
+    )
+
+    contracts_data = []
+    for scope in contract_scopes:
+        contract = scope.contract
+        counterparty = contract.counterparty_entity
+        contracts_data.append({
+            'id': contract.id,
+            'contract_number': contract.contract_number,
+            'title': contract.title,
+            'entity_id': counterparty.id if counterparty else None,
+            'entity_name': counterparty.display_name if counterparty else None,
+            'status': contract.status,
+            'scope_type': _contract_scope_type(scope, ('recording', 'work', 'release')),
+            'include_derivatives': scope.include_derivatives,
+            'all_in_term': scope.all_in_term
+        })
+
+    return {
+        'recording': {
+            'id': recording.id,
+            'title': recording.title,
+            'isrc': recording.get_isrc(),
+            'type': recording.type,
+            'status': recording.status,
+            'duration_seconds': recording.duration_seconds,
+            'formatted_duration': recording.formatted_duration,
+            'bpm': recording.bpm,
+            'key': recording.key,
+            'recording_date': recording.recording_date,
+            'studio': recording.studio,
+            'version': recording.version,
+            'notes': recording.notes,
+            'has_complete_master_splits': recording.has_complete_master_splits,
+            'created_at': recording.created_at,
+            'updated_at': recording.updated_at
+        },
+        'work': work_data,
+        'releases': releases_data,
+        'credits': credits_data,
+        'master_splits': splits_data,
+        'publications': publications_data,
+        'assets': assets_data,
+        'contracts': contracts_data,
+        'statistics': {
+            'total_releases': len(releases_data),
+            'total_publications': len(publications_data),
+            'total_assets': len(assets_data),
+            'has_master_asset': any(a['is_master'] for a in assets_data),
+            'platforms_covered': list(set(pub['platform'] for pub in publications_data)),
+            'territories_covered': list(set(pub['territory'] for pub in publications_data)),
+            'monetized_platforms': [
+                pub['platform'] for pub in publications_data
+                if pub['is_monetized']
+            ]
+        }
+    }
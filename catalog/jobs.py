@@ -0,0 +1,358 @@
+"""
+Deferred, coalesced side-effect jobs for catalog signals.
+
+Signal handlers enqueue jobs instead of doing the work inside the saving
+request. A job is a handler name, a key (the object it concerns) and a set of
+string payloads. Jobs are buffered per transaction (per savepoint, so a
+rolled back savepoint drops its jobs) and merged by (name, key), then handed
+to Celery after commit with a CATALOG_JOB_WINDOW countdown. Jobs for the same
+key enqueued during that window, by any process, are added to the pending
+run's payload set in the shared cache (a Redis set, so concurrent commits
+never overwrite each other), so rapid edits on the same song run its side
+effects once. Write latency no longer depends on the song's graph.
+
+Handlers must be idempotent: they may see payloads twice, e.g. when the cache
+is unavailable and jobs cannot be coalesced. A run whose payload set is gone
+when it starts (evicted, expired behind a long queue, or already collected by
+an earlier run) may have lost payloads of other commits, so its handler is
+called with payloads=None and recomputes everything for the key.
+
+With CATALOG_JOBS_EAGER (default under the test runner) jobs run inline as
+soon as they are enqueued.
+
+Usage:
+    schedule_revalidation('work', work.id, fields=['genre'])
+    schedule_task_sync([item])
+    schedule_stage_tasks(song, 'marketing_assets')
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from api.cache import make_key
+
+logger = logging.getLogger(__name__)
+
+
+# Payload meaning "every field" for revalidation jobs
+ALL_FIELDS = '*'
+
+# Member stored in every pending payload set, so a missing set can be told from an empty one
+PENDING_MARKER = ''
+
+# Attribute holding the current transaction's job buffers ({savepoint ID: buffer}) on the DB connection
+BUFFER_ATTR = '_catalog_job_buffers'
+
+# Serializes payload set updates on caches without native sets (process-local, e.g. locmem)
+_payloads_lock = threading.Lock()
+
+JOB_HANDLERS = {}
+
+
+def job_handler(name):
+    """Register a function(key, payloads) as the handler of a job name (payloads None means everything)."""
+    def decorator(func):
+        JOB_HANDLERS[name] = func
+        return func
+    return decorator
+
+
+def jobs_eager():
+    """Return True if jobs run inline instead of after commit."""
+    return getattr(settings, 'CATALOG_JOBS_EAGER', False)
+
+
+def job_window():
+    """Return the coalescing window (seconds) for deferred jobs."""
+    return getattr(settings, 'CATALOG_JOB_WINDOW', 2)
+
+
+def job_payload_ttl():
+    """Return how long (seconds) pending payloads wait for their run, covering queue latency."""
+    return getattr(settings, 'CATALOG_JOB_PAYLOAD_TTL', 24 * 60 * 60)
+
+
+def _pending_key(name, key):
+    return make_key('jobs', name, key)
+
+
+def _scheduled_key(name, key):
+    return make_key('jobs', name, key, 'scheduled')
+
+
+def _redis_client():
+    """Return the Redis client behind the default cache, or None for other backends."""
+    backend = getattr(cache, '_cache', None)
+    if backend is None or not hasattr(backend, 'get_client'):
+        return None
+    return backend.get_client(write=True)
+
+
+def store_payloads(name, key, payloads, timeout):
+    """
+    Add payloads to a job's pending set in one atomic step.
+
+    Returns:
+        bool: False if the cache is unavailable (payloads not stored)
+    """
+    pending_key = _pending_key(name, key)
+    try:
+        client = _redis_client()
+        if client is None:
+            with _payloads_lock:
+                stored = set(cache.get(pending_key) or [])
+                cache.set(pending_key, sorted(stored | payloads | {PENDING_MARKER}), timeout=timeout)
+            return True
+
+        redis_key = cache.make_and_validate_key(pending_key)
+        pipeline = client.pipeline()
+        pipeline.sadd(redis_key, PENDING_MARKER, *sorted(payloads))
+        pipeline.expire(redis_key, timeout)
+        pipeline.execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Could not store payloads of catalog job {name}:{key}: {e}")
+        return False
+
+
+def pop_payloads(name, key):
+    """
+    Remove and return a job's pending payloads in one atomic step.
+
+    Returns:
+        set or None: None if there is no pending set (or the cache is unavailable)
+    """
+    pending_key = _pending_key(name, key)
+    try:
+        client = _redis_client()
+        if client is None:
+            with _payloads_lock:
+                stored = set(cache.get(pending_key) or [])
+                cache.delete(pending_key)
+        else:
+            redis_key = cache.make_and_validate_key(pending_key)
+            pipeline = client.pipeline()
+            pipeline.smembers(redis_key)
+            pipeline.delete(redis_key)
+            members, _deleted = pipeline.execute()
+            stored = {member.decode() for member in members}
+    except Exception as e:
+        logger.warning(f"Could not collect payloads of catalog job {name}:{key}: {e}")
+        return None
+
+    if PENDING_MARKER not in stored:
+        return None
+    return stored - {PENDING_MARKER}
+
+
+# ==================== Enqueueing ====================
+
+class JobBuffer:
+    """Jobs enqueued in one transaction or savepoint, dispatched once the transaction commits."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.flushed = False
+
+    def add(self, name, key, payloads):
+        self.jobs.setdefault((name, key), set()).update(payloads)
+
+    def flush(self):
+        self.flushed = True
+        dispatch_jobs(self.jobs)
+
+    def is_pending(self, connection):
+        """Return True while the buffer's transaction is open (not committed or rolled back)."""
+        # Rolling back a savepoint removes the on_commit callbacks registered in it
+        return not self.flushed and any(entry[1] == self.flush for entry in connection.run_on_commit)
+
+
+def enqueue_job(name, key, payloads=()):
+    """
+    Enqueue a job, merged with pending jobs of the same name and key.
+
+    Args:
+        name: Registered handler name
+        key: String identifying the object the job concerns
+        payloads: Iterable of strings passed to the handler
+    """
+    key = str(key)
+    payloads = {str(payload) for payload in payloads}
+
+    if jobs_eager():
+        run_job(name, key, payloads)
+        return
+
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        dispatch_jobs({(name, key): payloads})
+        return
+
+    # One buffer per savepoint, registered inside it: jobs of a rolled back
+    # savepoint are dropped with its on_commit callback (atomic blocks without
+    # a savepoint roll back with their enclosing one)
+    savepoint = next((sid for sid in reversed(connection.savepoint_ids) if sid is not None), None)
+    buffers = getattr(connection, BUFFER_ATTR, {})
+    buffer = buffers.get(savepoint)
+    if buffer is None or not buffer.is_pending(connection):
+        buffers = {
+            buffer_savepoint: pending
+            for buffer_savepoint, pending in buffers.items() if pending.is_pending(connection)
+        }
+        buffer = buffers[savepoint] = JobBuffer()
+        setattr(connection, BUFFER_ATTR, buffers)
+        transaction.on_commit(buffer.flush)
+    buffer.add(name, key, payloads)
+
+
+def dispatch_jobs(jobs):
+    """
+    Hand committed jobs to Celery, coalescing with runs already scheduled.
+
+    Payloads are added to a set in the cache under the job's key (kept for
+    CATALOG_JOB_PAYLOAD_TTL); only the first job of a window schedules a Celery
+    run, which collects every payload stored until it starts. If the broker is
+    unreachable, jobs run inline.
+
+    Args:
+        jobs: {(name, key): set of payloads}
+    """
+    from .tasks import run_catalog_job
+
+    window = job_window()
+    for (name, key), payloads in jobs.items():
+        # Stored before the schedule token is checked: a run releases the token
+        # before collecting, so it sees these payloads if the token is still held
+        stored = store_payloads(name, key, payloads, timeout=job_payload_ttl())
+
+        if stored and not cache.add(_scheduled_key(name, key), 1, timeout=window):
+            if cache.get(_scheduled_key(name, key)) is not None:
+                continue  # a run is already scheduled and will pick these payloads up
+
+        try:
+            run_catalog_job.apply_async(args=[name, key, sorted(payloads), stored], countdown=window)
+        except Exception as e:
+            logger.warning(f"Could not schedule catalog job {name}:{key}, running inline: {e}")
+            run_job(name, key, payloads)
+
+
+def collect_payloads(name, key, payloads=(), coalesced=False):
+    """
+    Release a job's schedule slot and return its payloads merged with the stored ones.
+
+    Args:
+        name: Registered handler name
+        key: Job key
+        payloads: Payloads enqueued with the scheduling job
+        coalesced: Whether the scheduling job stored its payloads in the cache
+
+    Returns:
+        set or None: None if coalesced payloads were lost (the run recomputes everything)
+    """
+    cache.delete(_scheduled_key(name, key))
+    stored = pop_payloads(name, key)
+    if stored is None:
+        if coalesced:
+            logger.warning(f"Payloads of catalog job {name}:{key} are missing, recomputing everything")
+            return None
+        stored = set()
+    return set(payloads) | stored
+
+
+def run_job(name, key, payloads):
+    """Run a job handler (payloads None means everything), logging instead of raising errors."""
+    try:
+        JOB_HANDLERS[name](key, None if payloads is None else set(payloads))
+    except Exception as e:
+        logger.error(f"Error running catalog job {name}:{key}: {e}", exc_info=True)
+
+
+# ==================== Jobs ====================
+
+def schedule_revalidation(entity, object_id, fields=None, sync=False):
+    """
+    Revalidate the checklist items affected by a change (see checklist_engine.revalidate_checklists).
+
+    Args:
+        entity: 'song', 'work', 'recording' or 'release'
+        object_id: ID of the changed object
+        fields: Changed field names; None means any
+        sync: Also reopen items that no longer pass
+    """
+    name = 'resync_checklists' if sync else 'revalidate_checklists'
+    enqueue_job(name, f'{entity}:{object_id}', [ALL_FIELDS] if fields is None else fields)
+
+
+@job_handler('revalidate_checklists')
+def run_revalidation(key, payloads, sync=False):
+    from .checklist_engine import revalidate_checklists
+
+    entity, object_id = key.split(':')
+    fields = None if payloads is None or ALL_FIELDS in payloads else sorted(payloads)
+    if fields != []:
+        revalidate_checklists(entity, int(object_id), fields=fields, sync=sync)
+
+
+@job_handler('resync_checklists')
+def run_resync(key, payloads):
+    run_revalidation(key, payloads, sync=True)
+
+
+def schedule_task_sync(items):
+    """
+    Sync related tasks and marketing task completion with checklist items.
+
+    Args:
+        items: SongChecklistItem instances (any songs)
+    """
+    by_song = {}
+    for item in items:
+        by_song.setdefault(item.song_id, []).append(item.pk)
+    for song_id, item_ids in by_song.items():
+        enqueue_job('sync_checklist_tasks', song_id, item_ids)
+
+
+@job_handler('sync_checklist_tasks')
+def run_task_sync(key, payloads):
+    from .models import SongChecklistItem
+    from .signals import sync_checklist_item_tasks
+
+    items = SongChecklistItem.objects.filter(song_id=int(key)).select_related('song')
+    if payloads is not None:
+        items = items.filter(pk__in=[int(pk) for pk in payloads])
+    sync_checklist_item_tasks(list(items))
+
+
+def schedule_stage_tasks(song, stage):
+    """
+    Create the department task (and notifications) for a song entering a stage.
+
+    Args:
+        song: Song instance
+        stage: 'marketing_assets' or 'digital_distribution'
+    """
+    enqueue_job('create_stage_tasks', song.pk, [stage])
+
+
+@job_handler('create_stage_tasks')
+def run_stage_tasks(key, payloads):
+    from .models import Song
+    from .signals import _create_digital_release_task, _create_marketing_task_and_notification
+
+    song = Song.objects.filter(pk=int(key)).first()
+    if song is None:
+        return
+
+    # The song may have moved on (or back) since the job was enqueued; when the
+    # payloads were lost, the task of its current stage is created if missing
+    if payloads is not None and song.stage not in payloads:
+        logger.info(f"Song {song.id}: Skipping stage tasks for {sorted(payloads)}, now in {song.stage}")
+        return
+    if song.stage == 'marketing_assets':
+        _create_marketing_task_and_notification(song)
+    elif song.stage == 'digital_distribution':
+        _create_digital_release_task(song)
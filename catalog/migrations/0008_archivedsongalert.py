@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_alter_departmentrequest_requested_department'),
+        ('catalog', '0007_songchecklistitem_asset_url'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedSongAlert',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('alert_type', models.CharField(choices=[('stage_transition', 'Stage Transition'), ('assignment', 'Assigned to You'), ('deadline_approaching', 'Deadline Approaching'), ('overdue', 'Overdue'), ('asset_submitted', 'Assets Submitted'), ('asset_approved', 'Assets Approved'), ('asset_rejected', 'Assets Rejected'), ('ready_for_review', 'Ready for Review'), ('sent_to_digital', 'Sent to Digital'), ('checklist_incomplete', 'Checklist Item Incomplete'), ('blocking_issue', 'Blocking Issue')], max_length=50)),
+                ('title', models.CharField(max_length=255)),
+                ('message', models.TextField()),
+                ('action_url', models.CharField(blank=True, max_length=500)),
+                ('action_label', models.CharField(blank=True, max_length=100)),
+                ('priority', models.CharField(choices=[('info', 'Info'), ('important', 'Important'), ('urgent', 'Urgent')], default='info', max_length=20)),
+                ('created_at', models.DateTimeField(help_text='When the alert was created')),
+                ('read_at', models.DateTimeField(blank=True, help_text='When the alert was read', null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True, help_text='When the alert was archived')),
+                ('song', models.ForeignKey(help_text='Associated song', on_delete=django.db.models.deletion.CASCADE, related_name='archived_alerts', to='catalog.song')),
+                ('target_department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_song_alerts', to='api.department')),
+                ('target_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_song_alerts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived Song Alert',
+                'verbose_name_plural': 'Archived Song Alerts',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['target_department', '-created_at'], name='catalog_arc_target__7b29fc_idx'), models.Index(fields=['target_user', '-created_at'], name='catalog_arc_target__43b31f_idx'), models.Index(fields=['alert_type', 'created_at'], name='catalog_arc_alert_t_50a976_idx')],
+            },
+        ),
+    ]
@@ -3,7 +3,7 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from identity.models import Identifier
+from identity.prefetch import get_identifier_value
 
 User = get_user_model()
 
@@ -108,43 +108,20 @@ class Work(models.Model):
         return self.title
 
     def get_iswc(self):
-        """Get ISWC identifier if exists."""
-        try:
-            identifier = Identifier.objects.get(
-                owner_type='work',
-                owner_id=self.id,
-                scheme='ISWC'
-            )
-            return identifier.value
-        except Identifier.DoesNotExist:
-            return None
+        """Get ISWC identifier if exists (uses prefetch_identifiers() cache when present)."""
+        return get_identifier_value(self, 'work', 'ISWC')
 
     @property
     def has_complete_publishing_splits(self):
-        """Check if publishing splits (writer/publisher) are complete."""
-        from rights.models import Split
-
-        # Check writer splits
-        writer_splits = Split.objects.filter(
-            scope='work',
-            object_id=self.id,
-            right_type='writer'
-        )
-        writer_total = sum(s.share for s in writer_splits)
-
-        # Check publisher splits (only if publishers exist)
-        publisher_splits = Split.objects.filter(
-            scope='work',
-            object_id=self.id,
-            right_type='publisher'
-        )
-        publisher_total = sum(s.share for s in publisher_splits) if publisher_splits.exists() else 0
+        """
+        Check if publishing splits (writer/publisher) are complete.
 
-        # Writers must equal 100%, publishers must equal 100% if they exist
-        writer_complete = abs(writer_total - 100) < 0.01
-        publisher_complete = not publisher_splits.exists() or abs(publisher_total - 100) < 0.01
+        Reads totals attached by rights.aggregation (annotations or bulk cache)
+        when available, otherwise runs a single grouped query.
+        """
+        from rights.aggregation import get_instance_split_totals, is_complete
 
-        return writer_complete and publisher_complete
+        return is_complete('work', get_instance_split_totals(self, 'work'))
 
 
 class Recording(models.Model):
@@ -285,16 +262,8 @@ class Recording(models.Model):
         return f"{self.title} - {self.get_type_display()}"
 
     def get_isrc(self):
-        """Get ISRC identifier if exists."""
-        try:
-            identifier = Identifier.objects.get(
-                owner_type='recording',
-                owner_id=self.id,
-                scheme='ISRC'
-            )
-            return identifier.value
-        except Identifier.DoesNotExist:
-            return None
+        """Get ISRC identifier if exists (uses prefetch_identifiers() cache when present)."""
+        return get_identifier_value(self, 'recording', 'ISRC')
 
     @property
     def formatted_duration(self):
@@ -307,16 +276,15 @@ class Recording(models.Model):
 
     @property
     def has_complete_master_splits(self):
-        """Check if master splits are complete (100%)."""
-        from rights.models import Split
+        """
+        Check if master splits are complete (100%).
 
-        master_splits = Split.objects.filter(
-            scope='recording',
-            object_id=self.id,
-            right_type='master'
-        )
-        total = sum(s.share for s in master_splits)
-        return abs(total - 100) < 0.01
+        Reads totals attached by rights.aggregation (annotations or bulk cache)
+        when available, otherwise runs a single grouped query.
+        """
+        from rights.aggregation import get_instance_split_totals, is_complete
+
+        return is_complete('recording', get_instance_split_totals(self, 'recording'))
 
 
 class Release(models.Model):
@@ -425,16 +393,8 @@ class Release(models.Model):
         return self.title
 
     def get_upc(self):
-        """Get UPC identifier if exists."""
-        try:
-            identifier = Identifier.objects.get(
-                owner_type='release',
-                owner_id=self.id,
-                scheme='UPC'
-            )
-            return identifier.value
-        except Identifier.DoesNotExist:
-            return None
+        """Get UPC identifier if exists (uses prefetch_identifiers() cache when present)."""
+        return get_identifier_value(self, 'release', 'UPC')
 
     @property
     def total_duration(self):
@@ -698,6 +658,13 @@ WORKFLOW_STAGES = [
 ]
 
 
+def checklist_progress_percent(total, completed):
+    """Return the completion percentage of required checklist items (100 when there are none)."""
+    if not total:
+        return 100.0
+    return (completed / total) * 100
+
+
 class Song(models.Model):
     """
     Song workflow orchestrator for HaHaHa Production's record label.
@@ -979,35 +946,43 @@ class Song(models.Model):
 
     def calculate_checklist_progress(self):
         """
-        Calculate percentage of required checklist items complete.
+        Calculate percentage of required checklist items complete (one query).
 
         Returns:
             float: Percentage complete (0-100)
         """
-        items = self.get_current_checklist().filter(required=True)
-        if not items.exists():
-            return 100.0
-        completed = items.filter(is_complete=True).count()
-        return (completed / items.count()) * 100
+        counts = self.get_current_checklist().filter(required=True).aggregate(
+            total=models.Count('id'),
+            completed=models.Count('id', filter=models.Q(is_complete=True)),
+        )
+        return checklist_progress_percent(counts['total'], counts['completed'])
 
-    def update_computed_fields(self):
-        """Update computed fields (checklist_progress, is_overdue, days_in_current_stage)."""
-        # Update checklist progress
-        self.checklist_progress = self.calculate_checklist_progress()
+    def set_computed_fields(self, checklist_progress, now=None):
+        """
+        Set computed fields in memory from a known checklist progress (no queries, no save).
+
+        Args:
+            checklist_progress: Percentage of required current-stage items complete
+            now: Reference time (defaults to timezone.now())
+        """
+        now = now or timezone.now()
+        self.checklist_progress = checklist_progress
 
         # Update is_overdue
         if self.stage_deadline:
-            self.is_overdue = timezone.now().date() > self.stage_deadline
+            self.is_overdue = now.date() > self.stage_deadline
         else:
             self.is_overdue = False
 
         # Update days in current stage
         if self.stage_entered_at:
-            delta = timezone.now() - self.stage_entered_at
-            self.days_in_current_stage = delta.days
+            self.days_in_current_stage = (now - self.stage_entered_at).days
         else:
             self.days_in_current_stage = 0
 
+    def update_computed_fields(self):
+        """Update computed fields (checklist_progress, is_overdue, days_in_current_stage)."""
+        self.set_computed_fields(self.calculate_checklist_progress())
         self.save()
 
     def get_all_artists(self):
@@ -1314,88 +1289,9 @@ class SongChecklistItem(models.Model):
         Returns:
             bool: True if validation passes
         """
-        if self.validation_type == 'manual':
-            return self.is_complete
-
-        elif self.validation_type == 'auto_entity_exists':
-            # Check if Work/Recording/Release exists
-            entity = self.validation_rule.get('entity') if self.validation_rule else None
-            if entity == 'work':
-                return self.song.work is not None
-            elif entity == 'recording':
-                return self.song.recordings.exists()
-            elif entity == 'release':
-                return self.song.releases.exists()
-
-        elif self.validation_type == 'auto_field_exists':
-            # Check if specified field has value
-            if self.validation_rule:
-                entity = self.validation_rule.get('entity')
-                field = self.validation_rule.get('field')
-                if entity and field:
-                    if entity == 'work' and self.song.work:
-                        # Special handling for identifier fields (iswc, isrc, upc)
-                        if field.lower() == 'iswc':
-                            return bool(self.song.work.get_iswc())
-                        else:
-                            return bool(getattr(self.song.work, field, None))
-                    elif entity == 'recording':
-                        for recording in self.song.recordings.all():
-                            # Special handling for ISRC
-                            if field.lower() == 'isrc':
-                                if recording.get_isrc():
-                                    return True
-                            elif getattr(recording, field, None):
-                                return True
-
-        elif self.validation_type == 'auto_split_validated':
-            # Check if splits = 100%
-            if self.validation_rule:
-                entity = self.validation_rule.get('entity')
-                if entity == 'work' and self.song.work:
-                    return self.song.work.has_complete_publishing_splits
-                elif entity == 'recording':
-                    # Check if at least one recording has complete splits
-                    for recording in self.song.recordings.all():
-                        if recording.has_complete_master_splits:
-                            return True
-
-        elif self.validation_type == 'auto_count_minimum':
-            # Check minimum count
-            if self.validation_rule:
-                entity = self.validation_rule.get('entity')
-                min_count = self.validation_rule.get('min_count', 1)
-
-                if entity == 'recording':
-                    return self.song.recordings.count() >= min_count
-                elif entity == 'release':
-                    return self.song.releases.count() >= min_count
-                elif entity == 'work_writers' and self.song.work:
-                    # Count writer splits for this work
-                    from rights.models import Split
-                    writer_count = Split.objects.filter(
-                        scope='work',
-                        object_id=self.song.work.id,
-                        right_type='writer'
-                    ).count()
-                    return writer_count >= min_count
-                elif entity == 'work_publishers' and self.song.work:
-                    # Count publisher splits for this work
-                    from rights.models import Split
-                    publisher_count = Split.objects.filter(
-                        scope='work',
-                        object_id=self.song.work.id,
-                        right_type='publisher'
-                    ).count()
-                    return publisher_count >= min_count
-                elif entity == 'recording_credits':
-                    # Count recording credits
-                    for recording in self.song.recordings.all():
-                        # Assuming credits are stored somewhere - adjust as needed
-                        # For now, just pass
-                        pass
-
-        return False
+        from .checklist_engine import ChecklistSnapshot
+
+        return ChecklistSnapshot([self.song]).evaluate(self)
 
 
 class SongStageTransition(models.Model):
@@ -1928,6 +1824,63 @@ class SongAlert(models.Model):
         return f"{self.song.title} - {self.get_alert_type_display()} → {target}"
 
 
+class ArchivedSongAlert(models.Model):
+    """
+    Read song alerts moved out of SongAlert by the retention job
+    (see notifications.retention). Rows keep their original ID.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+
+    song = models.ForeignKey(
+        Song,
+        on_delete=models.CASCADE,
+        related_name='archived_alerts',
+        help_text="Associated song"
+    )
+
+    alert_type = models.CharField(max_length=50, choices=SongAlert.ALERT_TYPE_CHOICES)
+
+    target_department = models.ForeignKey(
+        'api.Department',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='archived_song_alerts'
+    )
+
+    target_user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='archived_song_alerts'
+    )
+
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    action_url = models.CharField(max_length=500, blank=True)
+    action_label = models.CharField(max_length=100, blank=True)
+    priority = models.CharField(max_length=20, choices=SongAlert.PRIORITY_CHOICES, default='info')
+
+    created_at = models.DateTimeField(help_text="When the alert was created")
+    read_at = models.DateTimeField(null=True, blank=True, help_text="When the alert was read")
+    archived_at = models.DateTimeField(auto_now_add=True, help_text="When the alert was archived")
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['target_department', '-created_at']),
+            models.Index(fields=['target_user', '-created_at']),
+            models.Index(fields=['alert_type', 'created_at']),
+        ]
+        verbose_name = "Archived Song Alert"
+        verbose_name_plural = "Archived Song Alerts"
+
+    def __str__(self):
+        return f"{self.song_id} - {self.get_alert_type_display()} (archived)"
+
+
 class AlertConfiguration(models.Model):
     """
     Configurable settings for Song Workflow alerts.
@@ -0,0 +1,186 @@
+"""
+Polymorphic prefetch for relations attached through (type, object_id) pairs.
+
+Credit, Split, Publication and Identifier point at Works, Recordings and
+Releases through hand-rolled scope/object_type + object_id columns instead of
+foreign keys, so prefetch_related() cannot follow them. prefetch_generic()
+fills the gap: one query per relation for any number of parent objects, with
+results cached on each parent and the parent cached on each related object.
+
+Usage:
+    recordings = list(song.recordings.all())
+    prefetch_generic(
+        recordings,
+        'credits',
+        GenericPrefetch('splits', queryset=Split.objects.filter(right_type='master')),
+    )
+    for recording in recordings:
+        get_generic(recording, 'credits')  # no query
+        get_generic(recording, 'splits')   # master splits only, no query
+
+Serializers call get_generic() and transparently fall back to a query when
+the parent was not prefetched.
+"""
+
+from django.apps import apps
+
+from identity.prefetch import IDENTIFIERS_CACHE_ATTR, prefetch_identifiers
+
+
+# relation name -> (model label, type field, id field, select_related)
+GENERIC_RELATIONS = {
+    'credits': ('rights.Credit', 'scope', 'object_id', ('entity',)),
+    'splits': ('rights.Split', 'scope', 'object_id', ('entity',)),
+    'publications': ('distribution.Publication', 'object_type', 'object_id', ()),
+    'identifiers': ('identity.Identifier', 'owner_type', 'owner_id', ()),
+}
+
+# Attribute on related objects holding the parent they were prefetched for
+PARENT_CACHE_ATTR = '_prefetched_parent'
+
+
+class GenericPrefetch:
+    """
+    Describe one generic relation to prefetch, like django.db.models.Prefetch.
+
+    Args:
+        relation: Key of GENERIC_RELATIONS ('credits', 'splits', 'publications', 'identifiers')
+        queryset: Optional base queryset of the related model (extra filters, select_related)
+        to_attr: Optional cache name, so differently filtered prefetches of the
+                 same relation can live side by side
+    """
+
+    def __init__(self, relation, queryset=None, to_attr=None):
+        if relation not in GENERIC_RELATIONS:
+            raise ValueError(f"Unknown generic relation '{relation}'")
+        self.relation = relation
+        self.queryset = queryset
+        self.to_attr = to_attr or relation
+
+    @property
+    def cache_attr(self):
+        if self.relation == 'identifiers' and self.queryset is None and self.to_attr == 'identifiers':
+            # Shared with identity.prefetch so get_iswc()/get_isrc()/get_upc() use it
+            return IDENTIFIERS_CACHE_ATTR
+        return f'_prefetched_{self.to_attr}'
+
+    def get_queryset(self):
+        label, _type_field, _id_field, select_related = GENERIC_RELATIONS[self.relation]
+        if self.queryset is not None:
+            return self.queryset
+        queryset = apps.get_model(label).objects.all()
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if 'entity' in select_related:
+            # EntityListSerializer lists role names for nested entities
+            queryset = queryset.prefetch_related('entity__entity_roles')
+        return queryset
+
+
+def get_owner_type(instance):
+    """Return the generic type value for a parent object ('work', 'recording', 'release')."""
+    return instance._meta.model_name
+
+
+def prefetch_generic(instances, *lookups):
+    """
+    Batch-load generic relations for many parent objects.
+
+    Parents may be of mixed types; each (relation, parent type) pair costs one
+    query. Parents that already have a relation cached are skipped.
+
+    Args:
+        instances: Iterable of Work/Recording/Release instances (None entries are ignored)
+        *lookups: Relation names or GenericPrefetch objects
+
+    Returns:
+        list: The instances, for chaining
+    """
+    instances = [obj for obj in instances if obj is not None]
+
+    for lookup in lookups:
+        if not isinstance(lookup, GenericPrefetch):
+            lookup = GenericPrefetch(lookup)
+
+        cache_attr = lookup.cache_attr
+        pending = [obj for obj in instances if getattr(obj, cache_attr, None) is None]
+        if not pending:
+            continue
+
+        if cache_attr == IDENTIFIERS_CACHE_ATTR:
+            by_type = {}
+            for obj in pending:
+                by_type.setdefault(get_owner_type(obj), []).append(obj)
+            for owner_type, owners in by_type.items():
+                prefetch_identifiers(owners, owner_type)
+            continue
+
+        _label, type_field, id_field, _select_related = GENERIC_RELATIONS[lookup.relation]
+
+        by_type = {}
+        for obj in pending:
+            by_type.setdefault(get_owner_type(obj), {})[obj.pk] = obj
+
+        for owner_type, parents in by_type.items():
+            related = {pk: [] for pk in parents}
+            queryset = lookup.get_queryset().filter(**{
+                type_field: owner_type,
+                f'{id_field}__in': list(parents),
+            })
+            for obj in queryset:
+                setattr(obj, PARENT_CACHE_ATTR, parents[getattr(obj, id_field)])
+                related[getattr(obj, id_field)].append(obj)
+
+            for pk, parent in parents.items():
+                setattr(parent, cache_attr, related[pk])
+
+    return instances
+
+
+def get_generic(instance, relation, to_attr=None):
+    """
+    Return a parent's related objects, from the prefetch cache if available.
+
+    Args:
+        instance: Work/Recording/Release instance
+        relation: Key of GENERIC_RELATIONS
+        to_attr: Cache name used in GenericPrefetch, if any
+
+    Returns:
+        list or QuerySet: The related objects
+    """
+    lookup = GenericPrefetch(relation, to_attr=to_attr)
+    cached = getattr(instance, lookup.cache_attr, None)
+    if cached is not None:
+        return cached
+
+    _label, type_field, id_field, _select_related = GENERIC_RELATIONS[relation]
+    return lookup.get_queryset().filter(**{
+        type_field: get_owner_type(instance),
+        id_field: instance.pk,
+    })
+
+
+def fetch_generic(instance, relation):
+    """
+    Load one parent's related objects, the single-object counterpart of prefetch_generic().
+
+    One query (none if already prefetched); the parent is cached on each
+    related object so serializers don't query it back.
+
+    Args:
+        instance: Work/Recording/Release instance
+        relation: Key of GENERIC_RELATIONS
+
+    Returns:
+        list: The related objects
+    """
+    related = list(get_generic(instance, relation))
+    for obj in related:
+        setattr(obj, PARENT_CACHE_ATTR, instance)
+    return related
+
+
+def get_prefetched_parent(obj):
+    """Return the parent a related object was prefetched for, or None."""
+    return getattr(obj, PARENT_CACHE_ATTR, None)
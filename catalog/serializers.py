@@ -8,7 +8,7 @@ import os
 import re
 import uuid
 from django.utils import timezone
-from identity.models import Identifier
+from identity.prefetch import get_identifiers
 from identity.serializers import IdentifierSerializer
 
 
@@ -85,10 +85,7 @@ class WorkDetailSerializer(serializers.ModelSerializer):
 
     def get_identifiers(self, obj):
         """Get all identifiers for this work."""
-        identifiers = Identifier.objects.filter(
-            owner_type='work',
-            owner_id=obj.id
-        )
+        identifiers = get_identifiers(obj, 'work')
         return IdentifierSerializer(identifiers, many=True).data
 
 
@@ -159,10 +156,7 @@ class RecordingDetailSerializer(serializers.ModelSerializer):
 
     def get_identifiers(self, obj):
         """Get all identifiers for this recording."""
-        identifiers = Identifier.objects.filter(
-            owner_type='recording',
-            owner_id=obj.id
-        )
+        identifiers = get_identifiers(obj, 'recording')
         return IdentifierSerializer(identifiers, many=True).data
 
 
@@ -247,10 +241,7 @@ class ReleaseDetailSerializer(serializers.ModelSerializer):
 
     def get_identifiers(self, obj):
         """Get all identifiers for this release."""
-        identifiers = Identifier.objects.filter(
-            owner_type='release',
-            owner_id=obj.id
-        )
+        identifiers = get_identifiers(obj, 'release')
         return IdentifierSerializer(identifiers, many=True).data
 
 
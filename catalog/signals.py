@@ -2,11 +2,13 @@
 Catalog signals for Universal Task Automation System.
 
 Handles automation for Work, Recording, Song, and SongChecklistItem changes.
+Checklist revalidation, task sync and stage task creation are deferred to
+after commit and coalesced per object (see catalog.jobs).
 """
 
 import logging
 from django.db import models
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from .models import Work, Recording, Song, SongChecklistItem, SongStageStatus, WORKFLOW_STAGES
@@ -19,15 +21,8 @@ logger = logging.getLogger(__name__)
 
 @receiver(pre_save, sender=Work)
 def track_work_field_changes(sender, instance, **kwargs):
-    """Track old field values for change detection."""
-    if instance.pk:
-        try:
-            old_work = Work.objects.get(pk=instance.pk)
-            instance._old_iswc = old_work.iswc
-        except Work.DoesNotExist:
-            instance._old_iswc = None
-    else:
-        instance._old_iswc = None
+    """Track changed fields for checklist revalidation."""
+    instance._changed_fields = _changed_fields(instance)
 
 
 @receiver(post_save, sender=Work)
@@ -36,41 +31,14 @@ def on_work_saved(sender, instance, created, **kwargs):
     Handle Work save events.
 
     Actions:
-    1. Auto-validate and complete checklist items based on Work field changes
+    1. Schedule revalidation of the checklist items (of songs using the work) reading the changed fields
     """
+    if created:
+        return
     try:
-        # Get all songs that use this work
-        songs = Song.objects.filter(work=instance)
-
-        for song in songs:
-            # Get ALL incomplete checklist items for this song
-            checklist_items = SongChecklistItem.objects.filter(
-                song=song,
-                is_complete=False
-            )
-
-            for item in checklist_items:
-                # Check if this item validates against work
-                validation_rule = item.validation_rule or {}
-                entity = validation_rule.get('entity')
-
-                # Only process items that validate against 'work'
-                if entity == 'work':
-                    # Run validation
-                    is_valid = item.validate()
-                    logger.debug(
-                        f"Work {instance.id}: Checking item '{item.item_name}' "
-                        f"(validation_type={item.validation_type}, rule={item.validation_rule}) -> {is_valid}"
-                    )
-
-                    if is_valid:
-                        item.is_complete = True
-                        item.save(update_fields=['is_complete'])
-                        logger.info(
-                            f"Work {instance.id}: ✓ Auto-completed checklist item '{item.item_name}' "
-                            f"for Song {song.id}"
-                        )
+        from .jobs import schedule_revalidation
 
+        schedule_revalidation('work', instance.pk, fields=getattr(instance, '_changed_fields', None))
     except Exception as e:
         logger.error(f"Error in work post_save signal for Work {instance.id}: {e}", exc_info=True)
 
@@ -79,15 +47,8 @@ def on_work_saved(sender, instance, created, **kwargs):
 
 @receiver(pre_save, sender=Recording)
 def track_recording_field_changes(sender, instance, **kwargs):
-    """Track old field values for change detection."""
-    if instance.pk:
-        try:
-            old_recording = Recording.objects.get(pk=instance.pk)
-            instance._old_status = getattr(old_recording, 'status', None)
-        except Recording.DoesNotExist:
-            instance._old_status = None
-    else:
-        instance._old_status = None
+    """Track changed fields for checklist revalidation."""
+    instance._changed_fields = _changed_fields(instance)
 
 
 @receiver(post_save, sender=Recording)
@@ -96,43 +57,26 @@ def on_recording_saved(sender, instance, created, **kwargs):
     Handle Recording save events.
 
     Actions:
-    1. Auto-validate and complete checklist items based on Recording field changes
+    1. Schedule revalidation of the checklist items (of songs using the recording) reading the changed fields
     """
+    if created:
+        return
     try:
-        # Get the song associated with this recording
-        if hasattr(instance, 'song') and instance.song:
-            song = instance.song
+        from .jobs import schedule_revalidation
 
-            # Get ALL incomplete checklist items for this song
-            checklist_items = SongChecklistItem.objects.filter(
-                song=song,
-                is_complete=False
-            )
+        schedule_revalidation('recording', instance.pk, fields=getattr(instance, '_changed_fields', None))
+    except Exception as e:
+        logger.error(f"Error in recording post_save signal for Recording {instance.id}: {e}", exc_info=True)
 
-            for item in checklist_items:
-                # Check if this item validates against recording
-                validation_rule = item.validation_rule or {}
-                entity = validation_rule.get('entity')
-
-                # Only process items that validate against 'recording'
-                if entity == 'recording':
-                    # Run validation
-                    is_valid = item.validate()
-                    logger.debug(
-                        f"Recording {instance.id}: Checking item '{item.item_name}' "
-                        f"(validation_type={item.validation_type}, rule={item.validation_rule}) -> {is_valid}"
-                    )
 
-                    if is_valid:
-                        item.is_complete = True
-                        item.save(update_fields=['is_complete'])
-                        logger.info(
-                            f"Recording {instance.id}: ✓ Auto-completed checklist item '{item.item_name}' "
-                            f"for Song {song.id}"
-                        )
+def _changed_fields(instance):
+    """Return the fields of an instance that differ from its stored row (None if unknown)."""
+    from .checklist_engine import changed_fields
 
-    except Exception as e:
-        logger.error(f"Error in recording post_save signal for Recording {instance.id}: {e}", exc_info=True)
+    if not instance.pk:
+        return None
+    old = type(instance).objects.filter(pk=instance.pk).first()
+    return changed_fields(old, instance) if old else None
 
 
 # ==================== Song Signals ====================
@@ -144,10 +88,13 @@ def track_song_field_changes(sender, instance, **kwargs):
         try:
             old_song = Song.objects.get(pk=instance.pk)
             instance._old_stage = old_song.stage
+            instance._old_work_id = old_song.work_id
         except Song.DoesNotExist:
             instance._old_stage = None
+            instance._old_work_id = None
     else:
         instance._old_stage = None
+        instance._old_work_id = None
 
 
 @receiver(post_save, sender=Song)
@@ -184,18 +131,52 @@ def on_song_saved(sender, instance, created, **kwargs):
 
                 logger.info(f"Song {instance.id}: Updated {old_tasks.count()} task(s) from previous stage")
 
-                # Create marketing task and notification when entering marketing_assets stage
-                if instance.stage == 'marketing_assets':
-                    _create_marketing_task_and_notification(instance)
-
-                # Create digital release task when moving to digital_distribution
-                if instance.stage == 'digital_distribution':
-                    _create_digital_release_task(instance)
+                # Create marketing task and notification when entering marketing_assets stage,
+                # digital release task when moving to digital_distribution (deferred)
+                if instance.stage in ('marketing_assets', 'digital_distribution'):
+                    from .jobs import schedule_stage_tasks
+                    schedule_stage_tasks(instance, instance.stage)
 
     except Exception as e:
         logger.error(f"Error in song post_save signal for Song {instance.id}: {e}")
 
 
+@receiver(post_save, sender=Song)
+def revalidate_on_song_work_change(sender, instance, created, **kwargs):
+    """Revalidate work-dependent checklist items when a song is linked to another work."""
+    if created or getattr(instance, '_old_work_id', None) == instance.work_id:
+        return
+    try:
+        from .jobs import schedule_revalidation
+
+        schedule_revalidation('song', instance.pk, fields=['work'])
+    except Exception as e:
+        logger.error(f"Error revalidating checklist for Song {instance.id}: {e}", exc_info=True)
+
+
+@receiver(m2m_changed, sender=Song.recordings.through)
+@receiver(m2m_changed, sender=Song.releases.through)
+def revalidate_on_song_links_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Revalidate checklist items reading a song's recordings or releases when links change."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    field = 'recordings' if sender is Song.recordings.through else 'releases'
+    try:
+        from .jobs import schedule_revalidation
+
+        if not reverse:
+            song_ids = [instance.pk]
+        elif pk_set:
+            song_ids = list(pk_set)
+        else:
+            # Reverse clear() does not report the songs that were unlinked
+            return
+        for song_id in song_ids:
+            schedule_revalidation('song', song_id, fields=[field])
+    except Exception as e:
+        logger.error(f"Error revalidating checklist after {field} change: {e}", exc_info=True)
+
+
 @receiver(post_save, sender=Song)
 def create_song_stage_statuses(sender, instance, created, **kwargs):
     """
@@ -286,32 +267,9 @@ def on_checklist_item_saved(sender, instance, created, **kwargs):
                         f"Auto-completed because asset_url was added"
                     )
 
-        # 2. Bidirectional sync: checklist ↔ task
-        if hasattr(instance, 'tasks') and instance.tasks.exists():
-            # Get related task
-            task = instance.tasks.first()
-
-            # If checklist item completed, mark task as done
-            if instance.is_complete and task.status != 'done':
-                task.status = 'done'
-                task.completed_at = timezone.now()
-                task.save(update_fields=['status', 'completed_at'])
-                logger.info(
-                    f"ChecklistItem {instance.id}: Marked related task {task.id} as done"
-                )
-
-            # If checklist item uncompleted, revert task status
-            elif not instance.is_complete and task.status == 'done':
-                task.status = 'todo'
-                task.completed_at = None
-                task.save(update_fields=['status', 'completed_at'])
-                logger.info(
-                    f"ChecklistItem {instance.id}: Reverted related task {task.id} to todo"
-                )
-
-        # 3. Check if this is a marketing_assets item and handle marketing task completion
-        if instance.stage == 'marketing_assets':
-            _check_marketing_task_completion(instance.song)
+        # 2-3. Bidirectional sync with the related task, marketing task completion (deferred)
+        from .jobs import schedule_task_sync
+        schedule_task_sync([instance])
 
     except Exception as e:
         logger.error(
@@ -320,6 +278,48 @@ def on_checklist_item_saved(sender, instance, created, **kwargs):
         )
 
 
+def sync_checklist_item_tasks(items):
+    """
+    Sync related tasks with checklist item completion.
+
+    Marks the related task done when its item is complete (and back to todo
+    when it is not), then re-checks marketing task completion for songs with
+    marketing_assets items. Also used after bulk_update(), which bypasses
+    on_checklist_item_saved.
+
+    Args:
+        items: SongChecklistItem instances
+    """
+    from django.utils import timezone
+    from crm_extensions.models import Task
+
+    items_by_id = {item.pk: item for item in items}
+    first_tasks = {}
+    for task in Task.objects.filter(song_checklist_item_id__in=list(items_by_id)):
+        first_tasks.setdefault(task.song_checklist_item_id, task)
+
+    for item_id, task in first_tasks.items():
+        item = items_by_id[item_id]
+
+        # If checklist item completed, mark task as done
+        if item.is_complete and task.status != 'done':
+            task.status = 'done'
+            task.completed_at = timezone.now()
+            task.save(update_fields=['status', 'completed_at'])
+            logger.info(f"ChecklistItem {item.id}: Marked related task {task.id} as done")
+
+        # If checklist item uncompleted, revert task status
+        elif not item.is_complete and task.status == 'done':
+            task.status = 'todo'
+            task.completed_at = None
+            task.save(update_fields=['status', 'completed_at'])
+            logger.info(f"ChecklistItem {item.id}: Reverted related task {task.id} to todo")
+
+    marketing_songs = {item.song_id: item.song for item in items if item.stage == 'marketing_assets'}
+    for song in marketing_songs.values():
+        _check_marketing_task_completion(song)
+
+
 def _check_marketing_task_completion(song):
     """
     Check if all required marketing_assets checklist items are complete.
@@ -539,7 +539,6 @@ def on_stage_status_changed(sender, instance, created, **kwargs):
     1. Create checklist items for that stage if they don't exist
     2. For marketing_assets stage, create task and notification
     """
-    from catalog import checklist_templates
 
     try:
         # Check if status changed to 'in_progress'
@@ -600,25 +599,194 @@ def on_stage_status_changed(sender, instance, created, **kwargs):
             logger.info(
                 f"Song {song.id}: Creating checklist items for stage {stage}"
             )
-            checklist_items_data = checklist_templates.generate_checklist_for_stage(
-                song, stage
-            )
-            for item_data in checklist_items_data:
-                SongChecklistItem.objects.create(**item_data)
+            from .transitions import create_stage_checklist
+
+            created_items = create_stage_checklist(song, stage)
             logger.info(
-                f"Song {song.id}: Created {len(checklist_items_data)} checklist items for {stage}"
+                f"Song {song.id}: Created {len(created_items)} checklist items for {stage}"
             )
         else:
             logger.info(
                 f"Song {song.id}: Checklist items already exist for {stage} ({existing_items} items)"
             )
 
-        # 3. For marketing_assets stage, create task and notification
+        # 3. For marketing_assets stage, create task and notification (deferred)
         if stage == 'marketing_assets':
-            _create_marketing_task_and_notification(song)
+            from .jobs import schedule_stage_tasks
+            schedule_stage_tasks(song, stage)
 
     except Exception as e:
         logger.error(
             f"Error in stage status post_save signal for "
             f"SongStageStatus {instance.id}: {e}"
         )
+
+
+# ==================== Aggregate View Cache Signals ====================
+
+def _bump_hub_graphs(*targets, catalog_wide=False):
+    """
+    Invalidate cached Song Hub / Track Preview payloads for changed objects.
+
+    Args:
+        *targets: (object_type, object_id) pairs ('work', 'recording' or 'release')
+        catalog_wide: Also bump the global version (catalog-wide contracts)
+    """
+    from .hub import GLOBAL_GRAPH_KEY, bump_graph_versions, graph_keys_for, hub_cache_timeout
+
+    if not hub_cache_timeout():
+        return
+
+    try:
+        graph_keys = {GLOBAL_GRAPH_KEY} if catalog_wide else set()
+        for object_type, object_id in targets:
+            graph_keys |= graph_keys_for(object_type, [object_id])
+        bump_graph_versions(graph_keys)
+    except Exception as e:
+        logger.error(f"Error invalidating aggregate view cache for {targets}: {e}")
+
+
+@receiver(pre_save, sender=Recording)
+def track_recording_work_change(sender, instance, **kwargs):
+    """Remember the previous work so moving a recording invalidates both hubs."""
+    from .hub import hub_cache_timeout
+
+    instance._hub_old_work_id = None
+    if instance.pk and hub_cache_timeout():
+        instance._hub_old_work_id = Recording.objects.filter(
+            pk=instance.pk
+        ).values_list('work_id', flat=True).first()
+
+
+@receiver(post_save, sender=Work)
+@receiver(post_delete, sender=Work)
+def invalidate_hub_on_work_change(sender, instance, **kwargs):
+    _bump_hub_graphs(('work', instance.pk))
+
+
+@receiver(post_save, sender=Recording)
+@receiver(post_delete, sender=Recording)
+def invalidate_hub_on_recording_change(sender, instance, **kwargs):
+    from .hub import bump_graph_versions, hub_cache_timeout, recording_graph_key
+
+    if not hub_cache_timeout():
+        return
+    graph_keys = {recording_graph_key(instance.pk, instance.work_id)}
+    old_work_id = getattr(instance, '_hub_old_work_id', None)
+    if old_work_id:
+        graph_keys.add(recording_graph_key(instance.pk, old_work_id))
+    bump_graph_versions(graph_keys)
+
+
+@receiver(post_save, sender='catalog.Release')
+@receiver(post_delete, sender='catalog.Release')
+def invalidate_hub_on_release_change(sender, instance, **kwargs):
+    _bump_hub_graphs(('release', instance.pk))
+
+
+@receiver(post_save, sender='catalog.Track')
+@receiver(post_delete, sender='catalog.Track')
+def invalidate_hub_on_track_change(sender, instance, **kwargs):
+    _bump_hub_graphs(('recording', instance.recording_id), ('release', instance.release_id))
+
+
+@receiver(post_save, sender='catalog.Asset')
+@receiver(post_delete, sender='catalog.Asset')
+def invalidate_hub_on_asset_change(sender, instance, **kwargs):
+    _bump_hub_graphs(('recording', instance.recording_id))
+
+
+@receiver(post_save, sender='rights.Credit')
+@receiver(post_delete, sender='rights.Credit')
+@receiver(post_save, sender='rights.Split')
+@receiver(post_delete, sender='rights.Split')
+def invalidate_hub_on_rights_change(sender, instance, **kwargs):
+    _bump_hub_graphs((instance.scope, instance.object_id))
+
+
+@receiver(post_save, sender='distribution.Publication')
+@receiver(post_delete, sender='distribution.Publication')
+def invalidate_hub_on_publication_change(sender, instance, **kwargs):
+    _bump_hub_graphs((instance.object_type, instance.object_id))
+
+
+@receiver(post_save, sender='identity.Identifier')
+@receiver(post_delete, sender='identity.Identifier')
+def invalidate_hub_on_identifier_change(sender, instance, **kwargs):
+    _bump_hub_graphs((instance.owner_type, instance.owner_id))
+
+
+@receiver(post_save, sender='contracts.ContractScope')
+@receiver(post_delete, sender='contracts.ContractScope')
+def invalidate_hub_on_contract_scope_change(sender, instance, **kwargs):
+    _bump_hub_graphs(
+        ('work', instance.work_id),
+        ('recording', instance.recording_id),
+        ('release', instance.release_id),
+        catalog_wide=instance.all_in_term,
+    )
+
+
+def _bump_hub_contract_scopes(scopes):
+    """Invalidate the hubs showing the contracts of ContractScope rows (a queryset)."""
+    rows = list(scopes.values_list('work_id', 'recording_id', 'release_id', 'all_in_term'))
+    targets = [
+        target
+        for work_id, recording_id, release_id, _all_in_term in rows
+        for target in (('work', work_id), ('recording', recording_id), ('release', release_id))
+    ]
+    _bump_hub_graphs(*targets, catalog_wide=any(row[3] for row in rows))
+
+
+@receiver(post_save, sender='contracts.Contract')
+@receiver(post_delete, sender='contracts.Contract')
+def invalidate_hub_on_contract_change(sender, instance, **kwargs):
+    """Contract status, number and title are shown on the hubs of its scopes."""
+    from contracts.models import ContractScope
+    from .hub import hub_cache_timeout
+
+    if not hub_cache_timeout():
+        return
+    try:
+        _bump_hub_contract_scopes(ContractScope.objects.filter(contract_id=instance.pk))
+    except Exception as e:
+        logger.error(f"Error invalidating aggregate view cache for Contract {instance.pk}: {e}")
+
+
+@receiver(post_save, sender='identity.Entity')
+@receiver(post_delete, sender='identity.Entity')
+def invalidate_hub_on_entity_change(sender, instance, **kwargs):
+    """Entity names are shown on the hubs of its credits, splits and contracts."""
+    from contracts.models import ContractScope
+    from rights.models import Credit, Split
+    from .hub import hub_cache_timeout
+
+    if not hub_cache_timeout():
+        return
+    try:
+        targets = set(Credit.objects.filter(entity_id=instance.pk).values_list('scope', 'object_id'))
+        targets |= set(Split.objects.filter(entity_id=instance.pk).values_list('scope', 'object_id'))
+        _bump_hub_graphs(*targets)
+        _bump_hub_contract_scopes(ContractScope.objects.filter(contract__counterparty_entity_id=instance.pk))
+    except Exception as e:
+        logger.error(f"Error invalidating aggregate view cache for Entity {instance.pk}: {e}")
+
+
+# ==================== Song Alert Unread Counters ====================
+
+@receiver(post_save, sender='catalog.SongAlert')
+def count_created_song_alert(sender, instance, created, **kwargs):
+    """Count new unread alerts (bulk_create() callers adjust counters themselves)."""
+    if created and not instance.is_read:
+        from notifications.counters import adjust_unread, song_alert_deltas
+
+        adjust_unread(song_alert_deltas([instance]))
+
+
+@receiver(post_delete, sender='catalog.SongAlert')
+def count_deleted_song_alert(sender, instance, **kwargs):
+    """Uncount deleted unread alerts."""
+    if not instance.is_read:
+        from notifications.counters import adjust_unread, song_alert_deltas
+
+        adjust_unread(song_alert_deltas([instance], delta=-1))
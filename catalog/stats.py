@@ -0,0 +1,99 @@
+"""
+Department song statistics computed with conditional aggregation.
+
+Every bucket (totals, overdue, blocked, per stage, per priority) of every
+requested department is a filtered COUNT in a single aggregate() call, so a
+dashboard costs one query whatever the number of departments, stages or
+priorities.
+
+Usage:
+    stats = get_department_stats(['label', 'marketing'])
+    stats['label']['by_stage']['label_review']['count']
+"""
+
+from django.db.models import Count, Q
+
+from .models import Song
+
+
+# Stages counted in each department's dashboard
+DEPARTMENT_STATS_STAGES = {
+    'publishing': ['draft', 'publishing'],
+    'label': ['label_recording', 'label_review', 'ready_for_digital'],
+    'marketing': ['marketing_assets'],
+    'digital': ['digital_distribution'],
+}
+
+
+def get_department_stats(departments, stage_map=None, queryset=None):
+    """
+    Compute song statistics for several departments in one query.
+
+    Args:
+        departments: Iterable of department codes
+        stage_map: {department code: [stage codes]} (defaults to DEPARTMENT_STATS_STAGES);
+                   departments missing from it get empty statistics
+        queryset: Base Song queryset (defaults to non-archived songs)
+
+    Returns:
+        dict: {department code: {
+            'total_songs': int,
+            'overdue_songs': int,
+            'blocked_songs': int,
+            'by_stage': {stage: {'count': int, 'display': str}},
+            'by_priority': {priority: {'count': int, 'display': str}},
+        }}
+    """
+    if stage_map is None:
+        stage_map = DEPARTMENT_STATS_STAGES
+    if queryset is None:
+        queryset = Song.objects.filter(is_archived=False)
+
+    departments = list(dict.fromkeys(departments))
+    dept_stages = {dept: list(stage_map.get(dept, [])) for dept in departments}
+    all_stages = {stage for stages in dept_stages.values() for stage in stages}
+    stage_choices = [
+        (code, display) for code, display in Song._meta.get_field('stage').choices
+        if code in all_stages
+    ]
+
+    aggregates = {}
+    for stage_code, _display in stage_choices:
+        aggregates[f'stage__{stage_code}'] = Count('id', filter=Q(stage=stage_code))
+    for index, dept in enumerate(departments):
+        in_dept = Q(stage__in=dept_stages[dept])
+        aggregates[f'd{index}__total'] = Count('id', filter=in_dept)
+        aggregates[f'd{index}__overdue'] = Count('id', filter=in_dept & Q(is_overdue=True))
+        aggregates[f'd{index}__blocked'] = Count('id', filter=in_dept & Q(is_blocked=True))
+        for priority_code, _display in Song.PRIORITY_CHOICES:
+            aggregates[f'd{index}__priority__{priority_code}'] = Count(
+                'id', filter=in_dept & Q(priority=priority_code)
+            )
+
+    counts = {}
+    if all_stages:
+        counts = queryset.filter(stage__in=all_stages).aggregate(**aggregates)
+
+    stats = {}
+    for index, dept in enumerate(departments):
+        stats[dept] = {
+            'total_songs': counts.get(f'd{index}__total', 0),
+            'overdue_songs': counts.get(f'd{index}__overdue', 0),
+            'blocked_songs': counts.get(f'd{index}__blocked', 0),
+            'by_stage': {
+                stage_code: {
+                    'count': counts.get(f'stage__{stage_code}', 0),
+                    'display': stage_display,
+                }
+                for stage_code, stage_display in stage_choices
+                if stage_code in dept_stages[dept]
+            },
+            'by_priority': {
+                priority_code: {
+                    'count': counts.get(f'd{index}__priority__{priority_code}', 0),
+                    'display': priority_display,
+                }
+                for priority_code, priority_display in Song.PRIORITY_CHOICES
+            },
+        }
+    return stats
@@ -1,7 +1,8 @@
 """
 Celery tasks for Song Workflow system.
 
-These tasks run periodically to generate alerts and maintain workflow health.
+These tasks run periodically to generate alerts and maintain workflow health,
+and run the deferred side-effect jobs enqueued by catalog signals.
 """
 
 from celery import shared_task
@@ -28,3 +29,22 @@ def run_daily_song_alerts():
     print(f"  - Total alerts created: {summary['total_alerts']}")
 
     return summary
+
+
+@shared_task(name='catalog.run_job')
+def run_catalog_job(name, key, payloads=(), coalesced=False):
+    """
+    Run a deferred catalog side-effect job (see catalog.jobs).
+
+    Collects every payload coalesced under the job's key since it was
+    scheduled, so a burst of edits on one object is handled in one run.
+
+    Args:
+        name: Registered job handler name
+        key: Job key
+        payloads: Payloads enqueued with the scheduling job
+        coalesced: Whether they were also stored in the cache for coalescing
+    """
+    from catalog.jobs import collect_payloads, run_job
+
+    run_job(name, key, collect_payloads(name, key, payloads, coalesced))
@@ -0,0 +1,155 @@
+"""
+Tests for the dependency-indexed checklist revalidation engine.
+
+Tests catalog.checklist_engine:
+- Dependency filter selects only the items a change can affect
+- Snapshot evaluation matches SongChecklistItem.validate() with bounded queries
+- Signal-driven revalidation and bulk status writes
+"""
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from api.models import Department
+from catalog.checklist_engine import (
+    ChecklistSnapshot, dependency_filter, revalidate_checklists,
+)
+from catalog.models import Recording, Release, Song, SongChecklistItem, Work
+from crm_extensions.models import Task
+from identity.models import Entity, Identifier
+from rights.models import Split
+
+User = get_user_model()
+
+
+class ChecklistEngineTestCase(TestCase):
+    """Test incremental checklist revalidation."""
+
+    def setUp(self):
+        self.user = User.objects.create(username='engine', email='engine@example.com')
+        self.artist = Entity.objects.create(kind='PF', display_name='Artist')
+        self.work = Work.objects.create(title='Hit Single')
+        self.songs = [
+            Song.objects.create(title=f'Song {i}', artist=self.artist, created_by=self.user, work=self.work)
+            for i in range(3)
+        ]
+
+    def add_item(self, song, validation_type, rule, **kwargs):
+        return SongChecklistItem.objects.create(
+            song=song,
+            stage='publishing',
+            category='Checks',
+            item_name=f'{validation_type} {rule}',
+            description='Check',
+            validation_type=validation_type,
+            validation_rule=rule,
+            **kwargs,
+        )
+
+    def test_dependency_filter_selects_affected_rules(self):
+        song = self.songs[0]
+        iswc = self.add_item(song, 'auto_field_exists', {'entity': 'work', 'field': 'iswc'})
+        genre = self.add_item(song, 'auto_field_exists', {'entity': 'work', 'field': 'genre'})
+        splits = self.add_item(song, 'auto_split_validated', {'entity': 'work', 'split_type': 'writer'})
+        writers = self.add_item(song, 'auto_count_minimum', {'entity': 'work_writers', 'min_count': 1})
+        recording = self.add_item(song, 'auto_entity_exists', {'entity': 'recording'})
+        self.add_item(song, 'manual', None)
+
+        def matching(entity, fields):
+            return set(SongChecklistItem.objects.filter(dependency_filter(entity, fields)))
+
+        self.assertEqual(matching('work', ['iswc']), {iswc})
+        self.assertEqual(matching('work', ['splits']), {splits, writers})
+        self.assertEqual(matching('work', None), {iswc, genre, splits, writers})
+        self.assertEqual(matching('song', ['recordings']), {recording})
+        self.assertIsNone(dependency_filter('release', ['upc']))
+
+    def test_snapshot_matches_validate(self):
+        recording = Recording.objects.create(title='Hit Single', work=self.work)
+        self.songs[0].recordings.add(recording)
+        self.songs[0].releases.add(Release.objects.create(title='Hit Single - Single'))
+        Identifier.objects.create(owner_type='work', owner_id=self.work.id, scheme='ISWC', value='T-000000001-0')
+        Split.objects.create(scope='work', object_id=self.work.id, entity=self.artist,
+                             right_type='writer', share=Decimal('100.00'))
+        Split.objects.create(scope='recording', object_id=recording.id, entity=self.artist,
+                             right_type='master', share=Decimal('50.00'))
+
+        rules = [
+            ('manual', None),
+            ('auto_entity_exists', {'entity': 'work'}),
+            ('auto_entity_exists', {'entity': 'release'}),
+            ('auto_field_exists', {'entity': 'work', 'field': 'iswc'}),
+            ('auto_field_exists', {'entity': 'recording', 'field': 'isrc'}),
+            ('auto_split_validated', {'entity': 'work'}),
+            ('auto_split_validated', {'entity': 'recording'}),
+            ('auto_count_minimum', {'entity': 'recording', 'min_count': 1}),
+            ('auto_count_minimum', {'entity': 'work_publishers', 'min_count': 1}),
+            ('auto_count_minimum', {'entity': 'work_writers', 'min_count': 1}),
+        ]
+        items = [
+            self.add_item(song, validation_type, rule)
+            for song in self.songs for validation_type, rule in rules
+        ]
+        expected = [item.validate() for item in items]
+
+        items = list(SongChecklistItem.objects.select_related('song').order_by('id'))
+        snapshot = ChecklistSnapshot({item.song_id: item.song for item in items}.values())
+        # works, recordings, releases, identifiers x2, split totals x2
+        with self.assertNumQueries(7):
+            results = [snapshot.evaluate(item) for item in items]
+
+        self.assertEqual(results, expected)
+        self.assertEqual(results[:len(rules)], [False, True, True, True, False, True, False, True, False, True])
+
+    def test_work_change_revalidates_only_dependent_items(self):
+        genre_items = [
+            self.add_item(song, 'auto_field_exists', {'entity': 'work', 'field': 'genre'})
+            for song in self.songs
+        ]
+        title_item = self.add_item(self.songs[0], 'auto_field_exists', {'entity': 'work', 'field': 'lyrics'})
+        department = Department.objects.create(code='publishing', name='Publishing')
+        task = Task.objects.create(title='Genre', song=self.songs[0], department=department,
+                                   song_checklist_item=genre_items[0])
+
+        self.work.genre = 'Pop'
+        self.work.save()
+
+        for item in genre_items:
+            item.refresh_from_db()
+            self.assertTrue(item.is_complete)
+        title_item.refresh_from_db()
+        self.assertFalse(title_item.is_complete)
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'done')
+
+        # Changes no rule reads select nothing
+        self.assertEqual(revalidate_checklists('work', self.work.id, fields=['sub_genre']), [])
+        with self.assertNumQueries(0):
+            revalidate_checklists('release', 1, fields=['upc'])
+
+    def test_identifier_and_split_signals(self):
+        iswc = self.add_item(self.songs[0], 'auto_field_exists', {'entity': 'work', 'field': 'iswc'})
+        splits = self.add_item(self.songs[0], 'auto_split_validated', {'entity': 'work'})
+
+        Identifier.objects.create(owner_type='work', owner_id=self.work.id, scheme='ISWC', value='T-000000002-0')
+        split = Split.objects.create(scope='work', object_id=self.work.id, entity=self.artist,
+                                     right_type='writer', share=Decimal('100.00'))
+        iswc.refresh_from_db()
+        splits.refresh_from_db()
+        self.assertTrue(iswc.is_complete)
+        self.assertTrue(splits.is_complete)
+
+        # Removing the split reopens the item
+        split.delete()
+        splits.refresh_from_db()
+        self.assertFalse(splits.is_complete)
+
+    def test_linking_recording_revalidates_song(self):
+        item = self.add_item(self.songs[1], 'auto_entity_exists', {'entity': 'recording'})
+
+        self.songs[1].recordings.add(Recording.objects.create(title='Take 1', work=self.work))
+
+        item.refresh_from_db()
+        self.assertTrue(item.is_complete)
@@ -0,0 +1,123 @@
+"""
+Tests for the batch daily alert generator.
+
+Tests create_daily_alerts() from alert_service.py:
+- Recipients match the per-song SongAlertService methods
+- Query count does not grow with the number of songs
+- Re-running on the same day creates no duplicates
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import Department, Role, UserProfile
+from catalog.alert_service import create_daily_alerts
+from catalog.models import AlertConfiguration, Song, SongAlert
+from identity.models import Entity
+
+User = get_user_model()
+
+
+class DailyAlertsTestCase(TestCase):
+    """Test create_daily_alerts()."""
+
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.publishing = Department.objects.create(code='publishing', name='Publishing')
+        self.digital = Department.objects.create(code='digital', name='Digital')
+        self.label = Department.objects.create(code='label', name='Label')
+        manager_role = Role.objects.create(code='publishing_manager', name='Publishing Manager', level=300)
+
+        self.assignee = User.objects.create(username='assignee', first_name='Ana', last_name='Lee')
+        self.creator = User.objects.create(username='creator')
+        self.manager = User.objects.create(username='manager')
+        UserProfile.objects.update_or_create(
+            user=self.manager, defaults={'role': manager_role, 'department': self.publishing}
+        )
+
+        AlertConfiguration.objects.create(
+            alert_type='overdue',
+            notify_song_creator=True,
+            priority='urgent',
+            title_template='Overdue: {song_title}',
+            message_template='"{song_title}" was due {deadline} ({assigned_user}).',
+        )
+        self.artist = Entity.objects.create(kind='PF', display_name='Artist')
+
+    def make_songs(self, count, **kwargs):
+        return [
+            Song.objects.create(
+                title=f'Song {i}',
+                artist=self.artist,
+                created_by=self.creator,
+                assigned_user=self.assignee,
+                assigned_department=self.publishing,
+                stage='publishing',
+                **kwargs,
+            )
+            for i in range(count)
+        ]
+
+    def test_recipients(self):
+        overdue, = self.make_songs(1, stage_deadline=self.today - timedelta(days=1))
+        approaching, = self.make_songs(1, stage_deadline=self.today + timedelta(days=2))
+        release, = self.make_songs(1, target_release_date=self.today + timedelta(days=7))
+
+        summary = create_daily_alerts()
+
+        self.assertEqual(summary, {
+            'overdue_alerts': 3,
+            'deadline_approaching_alerts': 2,
+            'release_approaching_alerts': 2,
+            'total_alerts': 7,
+        })
+        self.assertEqual(
+            set(SongAlert.objects.filter(song=overdue).values_list('target_user', 'priority')),
+            {(self.assignee.id, 'urgent'), (self.manager.id, 'urgent'), (self.creator.id, 'urgent')},
+        )
+        self.assertEqual(
+            SongAlert.objects.get(song=overdue, target_user=self.assignee).message,
+            f'"Song 0" was due {overdue.stage_deadline} (Ana Lee).',
+        )
+        self.assertEqual(
+            set(SongAlert.objects.filter(song=approaching).values_list('target_user', 'title')),
+            {(self.assignee.id, 'Deadline Approaching: Song 0'), (self.manager.id, 'Team Song Deadline: Song 0')},
+        )
+        self.assertEqual(
+            set(SongAlert.objects.filter(song=release).values_list('target_department', flat=True)),
+            {self.digital.id, self.label.id},
+        )
+
+    def test_query_count_is_constant(self):
+        self.make_songs(2, stage_deadline=self.today - timedelta(days=1))
+        self.make_songs(2, target_release_date=self.today + timedelta(days=7))
+        # configs, 3 song queries, managers, departments, sent today, insert
+        with self.assertNumQueries(8):
+            create_daily_alerts()
+
+        SongAlert.objects.all().delete()
+        self.make_songs(20, stage_deadline=self.today - timedelta(days=1))
+        self.make_songs(20, target_release_date=self.today + timedelta(days=7))
+        with self.assertNumQueries(8):
+            summary = create_daily_alerts()
+        self.assertEqual(summary['total_alerts'], 22 * 3 + 22 * 2)
+
+    def test_rerun_skips_alerts_sent_today(self):
+        self.make_songs(2, stage_deadline=self.today - timedelta(days=1))
+        self.assertEqual(create_daily_alerts()['total_alerts'], 6)
+
+        self.make_songs(1, stage_deadline=self.today - timedelta(days=3))
+        summary = create_daily_alerts()
+
+        self.assertEqual(summary['overdue_alerts'], 3)
+        self.assertEqual(SongAlert.objects.count(), 9)
+
+    def test_disabled_overdue_config(self):
+        AlertConfiguration.objects.filter(alert_type='overdue').update(enabled=False)
+        self.make_songs(2, stage_deadline=self.today - timedelta(days=1))
+
+        self.assertEqual(create_daily_alerts()['total_alerts'], 0)
+        self.assertFalse(SongAlert.objects.exists())
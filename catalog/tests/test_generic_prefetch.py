@@ -0,0 +1,142 @@
+"""
+Tests for polymorphic prefetch of generic catalog relations.
+
+Tests catalog.prefetch:
+- prefetch_generic() / get_generic() for credits, splits, publications, identifiers
+- fetch_generic() for a single parent
+- GenericPrefetch with filtered querysets and to_attr
+- Parent caching used by Credit/Split serializers
+- Constant query count for SongViewSet.recordings
+"""
+
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.models import Department, Role, UserProfile
+from catalog.models import Work, Recording, Song
+from catalog.prefetch import GenericPrefetch, fetch_generic, get_generic, prefetch_generic
+from catalog.views import SongViewSet
+from identity.models import Entity, Identifier
+from rights.models import Credit, Split
+from rights.serializers import CreditSerializer
+
+User = get_user_model()
+
+
+class GenericPrefetchTestCase(TestCase):
+    """Test batched loading of scope/object_id relations."""
+
+    def setUp(self):
+        """Set up a work with several recordings, each with credits and splits."""
+        self.artist = Entity.objects.create(kind='PF', display_name='Artist')
+        self.producer = Entity.objects.create(kind='PF', display_name='Producer')
+        self.work = Work.objects.create(title='Work')
+        Credit.objects.create(scope='work', object_id=self.work.id, entity=self.artist, role='composer')
+
+        self.recordings = []
+        for i in range(3):
+            recording = Recording.objects.create(title=f'Recording {i}', work=self.work)
+            Credit.objects.create(scope='recording', object_id=recording.id,
+                                  entity=self.artist, role='artist')
+            Credit.objects.create(scope='recording', object_id=recording.id,
+                                  entity=self.producer, role='producer')
+            Split.objects.create(scope='recording', object_id=recording.id,
+                                 entity=self.artist, right_type='master', share=Decimal('100.00'))
+            Identifier.objects.create(owner_type='recording', owner_id=recording.id,
+                                      scheme='ISRC', value=f'ROABC240000{i}')
+            self.recordings.append(recording)
+
+    def test_one_query_per_relation(self):
+        """Credits, splits and identifiers for all recordings cost one query each."""
+        recordings = list(Recording.objects.order_by('id'))
+
+        # credits + entity roles, splits + entity roles, identifiers
+        with self.assertNumQueries(5):
+            prefetch_generic(recordings, 'credits', 'splits', 'identifiers')
+
+        with self.assertNumQueries(0):
+            credit_counts = [len(get_generic(r, 'credits')) for r in recordings]
+            split_entities = [get_generic(r, 'splits')[0].entity.display_name for r in recordings]
+            isrcs = [r.get_isrc() for r in recordings]
+
+        self.assertEqual(credit_counts, [2, 2, 2])
+        self.assertEqual(split_entities, ['Artist'] * 3)
+        self.assertEqual(isrcs, ['ROABC2400000', 'ROABC2400001', 'ROABC2400002'])
+
+    def test_mixed_parent_types(self):
+        """Works and recordings can be prefetched together without mixing results."""
+        parents = [Work.objects.get(pk=self.work.pk)] + list(Recording.objects.order_by('id'))
+        prefetch_generic(parents, 'credits')
+
+        self.assertEqual([c.role for c in get_generic(parents[0], 'credits')], ['composer'])
+        self.assertEqual(len(get_generic(parents[1], 'credits')), 2)
+
+    def test_filtered_prefetch_with_to_attr(self):
+        """A filtered GenericPrefetch is cached under its own name."""
+        recordings = prefetch_generic(
+            Recording.objects.order_by('id'),
+            GenericPrefetch('credits', queryset=Credit.objects.filter(role='producer'),
+                            to_attr='producer_credits'),
+        )
+
+        self.assertEqual(
+            [c.entity_id for c in get_generic(recordings[0], 'credits', to_attr='producer_credits')],
+            [self.producer.id]
+        )
+        # The unfiltered relation was not prefetched and falls back to a query
+        self.assertEqual(get_generic(recordings[0], 'credits').count(), 2)
+
+    def test_serializer_uses_prefetched_parent(self):
+        """Credit object titles and entity roles come from the prefetch."""
+        recordings = prefetch_generic(Recording.objects.order_by('id'), 'credits')
+        credits = [c for r in recordings for c in get_generic(r, 'credits')]
+
+        with self.assertNumQueries(0):
+            data = CreditSerializer(credits, many=True).data
+
+        self.assertEqual(data[0]['object_title'], 'Recording 0')
+
+    def test_fetch_generic_for_one_parent(self):
+        """A single parent's credits load in one query (plus entity roles) and keep the parent."""
+        recording = Recording.objects.get(pk=self.recordings[0].pk)
+
+        with self.assertNumQueries(2):
+            credits = fetch_generic(recording, 'credits')
+        with self.assertNumQueries(0):
+            data = CreditSerializer(credits, many=True).data
+
+        self.assertEqual([c['object_title'] for c in data], ['Recording 0'] * 2)
+
+    def test_song_recordings_query_count_is_constant(self):
+        """SongViewSet.recordings does not issue per-recording queries."""
+        department = Department.objects.create(code='label', name='Label Department')
+        role = Role.objects.create(code='label_manager', name='Label Manager', level=1000,
+                                   department=department)
+        user = User.objects.create(username='label', email='label@example.com')
+        UserProfile.objects.create(user=user, role=role, department=department, setup_completed=True)
+
+        song = Song.objects.create(title='Song', artist=self.artist, work=self.work, created_by=user)
+        view = SongViewSet.as_view({'get': 'recordings'})
+
+        def fetch():
+            request = APIRequestFactory().get(f'/api/songs/{song.id}/recordings/')
+            force_authenticate(request, user=user)
+            return view(request, pk=song.id)
+
+        song.recordings.add(self.recordings[0])
+        with CaptureQueriesContext(connection) as one_recording:
+            response = fetch()
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['splits'][0]['entity_name'], 'Artist')
+
+        song.recordings.add(*self.recordings[1:])
+        with CaptureQueriesContext(connection) as three_recordings:
+            response = fetch()
+        self.assertEqual(len(response.data), 3)
+
+        self.assertEqual(len(one_recording), len(three_recordings))
@@ -0,0 +1,169 @@
+"""
+Tests for the Song Hub and Track Preview aggregate payloads.
+
+Tests catalog.hub and catalog.aggregate_views:
+- Constant query count regardless of recordings/releases
+- Payload contents (releases, track info, identifiers, splits)
+- Versioned payload cache and signal-driven invalidation
+"""
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from catalog.aggregate_views import song_hub, track_preview
+from catalog.models import Work, Recording, Release, Track
+from distribution.models import Publication
+from identity.models import Entity, Identifier
+from rights.models import Credit, Split
+
+User = get_user_model()
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'hub'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class HubTestCase(TestCase):
+    """Test aggregate payload construction."""
+
+    def setUp(self):
+        """Set up a work whose graph can be grown recording by recording."""
+        cache.clear()
+        self.user = User.objects.create(username='hub', email='hub@example.com')
+        self.artist = Entity.objects.create(kind='PF', display_name='Artist')
+        self.work = Work.objects.create(title='Hit Single')
+        Identifier.objects.create(owner_type='work', owner_id=self.work.id,
+                                  scheme='ISWC', value='T-000000001-0')
+        Split.objects.create(scope='work', object_id=self.work.id, entity=self.artist,
+                             right_type='writer', share=Decimal('100.00'))
+        Credit.objects.create(scope='work', object_id=self.work.id, entity=self.artist, role='composer')
+        self.recording_count = 0
+
+    def add_recording(self, releases=2):
+        """Add a recording with credits, splits, a publication and its own releases."""
+        self.recording_count += 1
+        n = self.recording_count
+        recording = Recording.objects.create(title=f'Recording {n}', work=self.work)
+        Identifier.objects.create(owner_type='recording', owner_id=recording.id,
+                                  scheme='ISRC', value=f'ROABC24{n:05d}')
+        Credit.objects.create(scope='recording', object_id=recording.id, entity=self.artist, role='artist')
+        Split.objects.create(scope='recording', object_id=recording.id, entity=self.artist,
+                             right_type='master', share=Decimal('100.00'))
+        Publication.objects.create(object_type='recording', object_id=recording.id,
+                                   platform='spotify_track', url=f'https://example.com/{n}')
+        for i in range(releases):
+            release = Release.objects.create(title=f'Release {n}.{i}')
+            Identifier.objects.create(owner_type='release', owner_id=release.id,
+                                      scheme='UPC', value=f'{n:06d}{i:06d}')
+            Track.objects.create(release=release, recording=recording, track_number=1)
+        return recording
+
+    def get(self, view, **kwargs):
+        request = APIRequestFactory().get('/')
+        force_authenticate(request, user=self.user)
+        return view(request, **kwargs)
+
+    def test_song_hub_query_count_is_constant(self):
+        """Song Hub costs the same number of queries for 1 or 5 recordings."""
+        self.add_recording()
+        with CaptureQueriesContext(connection) as small:
+            response = self.get(song_hub, work_id=self.work.id)
+        self.assertEqual(response.status_code, 200)
+
+        for _ in range(4):
+            self.add_recording(releases=3)
+        with CaptureQueriesContext(connection) as large:
+            response = self.get(song_hub, work_id=self.work.id)
+
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(response.data['statistics']['total_recordings'], 5)
+        self.assertEqual(response.data['statistics']['total_releases'], 14)
+
+    def test_song_hub_payload(self):
+        """Identifiers, track info and split statistics are joined correctly."""
+        recording = self.add_recording(releases=1)
+        data = self.get(song_hub, work_id=self.work.id).data
+
+        self.assertEqual(data['work']['iswc'], 'T-000000001-0')
+        self.assertTrue(data['work']['has_complete_publishing_splits'])
+        self.assertTrue(data['statistics']['has_complete_writer_splits'])
+        self.assertTrue(data['statistics']['has_complete_publisher_splits'])
+
+        recording_data = data['recordings'][0]
+        self.assertEqual(recording_data['id'], recording.id)
+        self.assertEqual(recording_data['isrc'], 'ROABC2400001')
+        self.assertEqual(recording_data['releases'][0]['upc'], '000001000000')
+        self.assertEqual(recording_data['releases'][0]['track_number'], 1)
+        self.assertEqual(len(recording_data['splits']), 1)
+        self.assertEqual(data['statistics']['platforms_covered'], ['spotify_track'])
+
+    def test_track_preview_query_count_is_constant(self):
+        """Track Preview costs the same number of queries for 1 or 4 releases."""
+        recording = self.add_recording(releases=1)
+        with CaptureQueriesContext(connection) as small:
+            response = self.get(track_preview, recording_id=recording.id)
+        self.assertEqual(response.status_code, 200)
+
+        other = self.add_recording(releases=0)
+        for i in range(3):
+            release = Release.objects.create(title=f'Compilation {i}')
+            Track.objects.create(release=release, recording=recording, track_number=1)
+            Track.objects.create(release=release, recording=other, track_number=2)
+        with CaptureQueriesContext(connection) as large:
+            response = self.get(track_preview, recording_id=recording.id)
+
+        self.assertEqual(len(small), len(large))
+        releases = {r['title']: r for r in response.data['releases']}
+        self.assertEqual(releases['Compilation 0']['track_count'], 2)
+        self.assertEqual(releases['Compilation 0']['other_tracks'][0]['recording_id'], other.id)
+        self.assertEqual(response.data['work']['writer_splits'][0]['share'], 100.0)
+        self.assertEqual(len(response.data['master_splits']), 1)
+
+    @override_settings(AGGREGATE_VIEW_CACHE_TIMEOUT=60)
+    def test_cached_payload_is_invalidated_by_graph_changes(self):
+        """Cached hubs are reused until something in the work's graph changes."""
+        recording = self.add_recording(releases=1)
+        first = self.get(song_hub, work_id=self.work.id).data
+
+        # Cache hit: only the work lookup remains
+        with CaptureQueriesContext(connection) as cached:
+            self.assertEqual(self.get(song_hub, work_id=self.work.id).data, first)
+        self.assertEqual(len(cached), 1)
+
+        Credit.objects.create(scope='recording', object_id=recording.id,
+                              entity=self.artist, role='producer')
+        data = self.get(song_hub, work_id=self.work.id).data
+        self.assertEqual(len(data['recordings'][0]['credits']), 2)
+
+        Identifier.objects.filter(owner_type='release').update(value='999999999999')
+        Release.objects.first().save()
+        data = self.get(song_hub, work_id=self.work.id).data
+        self.assertEqual(data['recordings'][0]['releases'][0]['upc'], '999999999999')
+
+    @override_settings(AGGREGATE_VIEW_CACHE_TIMEOUT=60)
+    def test_cached_payload_is_invalidated_by_entity_and_contract_changes(self):
+        """Entity names and contract status shown on a hub are never served stale."""
+        from contracts.models import Contract, ContractScope, ContractTemplate
+
+        template = ContractTemplate.objects.create(name='Publishing', series='HUB', created_by=self.user,
+                                                   gdrive_template_file_id='template', gdrive_output_folder_id='folder')
+        contract = Contract.objects.create(template=template, contract_number='HUB-1', title='Publishing',
+                                           status='draft', counterparty_entity=self.artist, created_by=self.user)
+        ContractScope.objects.create(contract=contract, work=self.work)
+        self.get(song_hub, work_id=self.work.id)
+
+        self.artist.display_name = 'Renamed Artist'
+        self.artist.save()
+        data = self.get(song_hub, work_id=self.work.id).data
+        self.assertEqual(data['splits']['writer'][0]['entity_name'], 'Renamed Artist')
+        self.assertEqual(data['contracts'][0]['entity_name'], 'Renamed Artist')
+
+        contract.status = 'signed'
+        contract.save()
+        data = self.get(song_hub, work_id=self.work.id).data
+        self.assertEqual(data['contracts'][0]['status'], 'signed')
@@ -0,0 +1,89 @@
+"""
+Tests for batched identifier resolution.
+
+Tests identity.prefetch as used by catalog models, serializers and viewsets:
+- prefetch_identifiers()
+- Work.get_iswc() / Recording.get_isrc() with and without prefetch
+- Serializer identifier fields on prefetched pages
+"""
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from catalog.models import Work, Recording, Release, Track
+from catalog.serializers import WorkDetailSerializer
+from catalog.views import TrackViewSet
+from identity.models import Identifier
+from identity.prefetch import prefetch_identifiers
+from rights.aggregation import annotate_split_totals
+
+User = get_user_model()
+
+
+class IdentifierPrefetchTestCase(TestCase):
+    """Test batched identifier resolution for catalog objects."""
+
+    def setUp(self):
+        """Set up works, recordings and tracks with identifiers."""
+        self.works = [Work.objects.create(title=f'Work {i}') for i in range(3)]
+        Identifier.objects.create(owner_type='work', owner_id=self.works[0].id,
+                                  scheme='ISWC', value='T-000000001-0')
+        Identifier.objects.create(owner_type='work', owner_id=self.works[1].id,
+                                  scheme='ISWC', value='T-000000002-0')
+
+        self.release = Release.objects.create(title='Release')
+        self.recordings = []
+        for i in range(3):
+            recording = Recording.objects.create(title=f'Recording {i}', work=self.works[0])
+            Identifier.objects.create(owner_type='recording', owner_id=recording.id,
+                                      scheme='ISRC', value=f'ROABC240000{i}')
+            Track.objects.create(release=self.release, recording=recording, track_number=i + 1)
+            self.recordings.append(recording)
+
+    def test_prefetch_identifiers_single_query(self):
+        """Identifiers for a page of works are loaded with one query."""
+        works = list(Work.objects.order_by('id'))
+
+        with self.assertNumQueries(1):
+            prefetch_identifiers(works, 'work')
+
+        with self.assertNumQueries(0):
+            iswcs = [work.get_iswc() for work in works]
+            # Repeated prefetch is a no-op
+            prefetch_identifiers(works, 'work')
+
+        self.assertEqual(iswcs, ['T-000000001-0', 'T-000000002-0', None])
+
+    def test_unprefetched_instances_fall_back_to_query(self):
+        """Model getters still work without a prefetch."""
+        recording = Recording.objects.get(pk=self.recordings[0].pk)
+        self.assertEqual(recording.get_isrc(), 'ROABC2400000')
+        self.assertIsNone(Work.objects.get(pk=self.works[2].pk).get_iswc())
+
+    def test_serializer_uses_prefetched_identifiers(self):
+        """Serializing a prefetched page does not query identifiers per row."""
+        works = prefetch_identifiers(
+            annotate_split_totals(Work.objects.order_by('id'), 'work'), 'work'
+        )
+
+        with self.assertNumQueries(0):
+            data = WorkDetailSerializer(works, many=True).data
+
+        self.assertEqual(data[0]['iswc'], 'T-000000001-0')
+        self.assertEqual([i['value'] for i in data[1]['identifiers']], ['T-000000002-0'])
+        self.assertEqual(data[2]['identifiers'], [])
+
+    def test_track_list_query_count_is_constant(self):
+        """Track list resolves recording ISRCs with a single identifier query."""
+        user = User.objects.create(username='tracks', email='tracks@example.com')
+        request = APIRequestFactory().get('/api/tracks/')
+        force_authenticate(request, user=user)
+        view = TrackViewSet.as_view({'get': 'list'})
+
+        # count + page + identifiers
+        with self.assertNumQueries(3):
+            response = view(request)
+
+        isrcs = sorted(track['recording_isrc'] for track in response.data['results'])
+        self.assertEqual(isrcs, ['ROABC2400000', 'ROABC2400001', 'ROABC2400002'])
@@ -0,0 +1,152 @@
+"""
+Tests for deferred catalog side-effect jobs.
+
+Tests catalog.jobs:
+- Jobs are buffered until commit and merged per object
+- Jobs scheduled within the window coalesce through the cache
+- Runs whose coalesced payloads were lost recompute everything
+- Jobs of a rolled back savepoint are dropped
+- Stage jobs are skipped once the song has left the stage
+- Broker failures fall back to running inline
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from catalog.jobs import run_job
+from catalog.models import Song, SongChecklistItem, Work
+from catalog.tasks import run_catalog_job
+from identity.models import Entity
+
+User = get_user_model()
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'jobs'}}
+
+
+@override_settings(CATALOG_JOBS_EAGER=False, CACHES=LOCMEM_CACHES)
+class CatalogJobsTestCase(TestCase):
+    """Test post-commit, coalesced job dispatch."""
+
+    def setUp(self):
+        cache.clear()
+        patcher = patch.object(run_catalog_job, 'apply_async')
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_fixtures()
+        cache.clear()
+        self.apply_async.reset_mock()
+
+    def create_fixtures(self):
+        user = User.objects.create(username='jobs', email='jobs@example.com')
+        artist = Entity.objects.create(kind='PF', display_name='Artist')
+        self.work = Work.objects.create(title='Hit Single')
+        self.song = Song.objects.create(title='Song', artist=artist, created_by=user, work=self.work)
+        self.items = [
+            SongChecklistItem.objects.create(
+                song=self.song, stage='publishing', category='Metadata', item_name=field,
+                description='Check', validation_type='auto_field_exists',
+                validation_rule={'entity': 'work', 'field': field},
+            )
+            for field in ('genre', 'lyrics')
+        ]
+
+    def assert_complete(self, *expected):
+        for item, is_complete in zip(self.items, expected):
+            item.refresh_from_db()
+            self.assertEqual(item.is_complete, is_complete)
+
+    def test_jobs_run_once_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.work.genre = 'Pop'
+            self.work.save()
+            self.work.lyrics = 'La la la'
+            self.work.save()
+            self.assertFalse(self.apply_async.called)
+            self.assert_complete(False, False)
+
+        self.assertEqual(len(callbacks), 1)
+        self.apply_async.assert_called_once()
+        args = self.apply_async.call_args.kwargs['args']
+        self.assertEqual(args, ['revalidate_checklists', f'work:{self.work.id}', ['genre', 'lyrics'], True])
+
+        run_catalog_job(*args)
+        self.assert_complete(True, True)
+
+    def test_jobs_within_window_coalesce(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.work.genre = 'Pop'
+            self.work.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.work.lyrics = 'La la la'
+            self.work.save()
+
+        # The second commit only stored its payload for the scheduled run
+        self.apply_async.assert_called_once()
+        run_catalog_job(*self.apply_async.call_args.kwargs['args'])
+        self.assert_complete(True, True)
+
+    def test_lost_payloads_recompute_everything(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.work.genre = 'Pop'
+            self.work.save()
+        Work.objects.filter(pk=self.work.pk).update(lyrics='La la la')
+
+        # The payload set expired or was evicted before the run started
+        cache.clear()
+        run_catalog_job(*self.apply_async.call_args.kwargs['args'])
+        self.assert_complete(True, True)
+
+    def test_rolled_back_jobs_are_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.work.genre = 'Pop'
+                    self.work.save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            self.work.refresh_from_db()
+            self.work.lyrics = 'La la la'
+            self.work.save()
+
+        self.apply_async.assert_called_once()
+        self.assertEqual(self.apply_async.call_args.kwargs['args'][2], ['lyrics'])
+
+    def test_rolled_back_savepoint_drops_its_jobs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.work.lyrics = 'La la la'
+            self.work.save()
+            try:
+                with transaction.atomic():
+                    self.work.genre = 'Pop'
+                    self.work.save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.apply_async.assert_called_once()
+        self.assertEqual(self.apply_async.call_args.kwargs['args'][2], ['lyrics'])
+
+    @patch('catalog.signals._create_marketing_task_and_notification')
+    def test_stage_tasks_skip_songs_that_moved_on(self, create_marketing_task):
+        Song.objects.filter(pk=self.song.pk).update(stage='digital_distribution')
+        run_job('create_stage_tasks', str(self.song.pk), {'marketing_assets'})
+        create_marketing_task.assert_not_called()
+
+        Song.objects.filter(pk=self.song.pk).update(stage='marketing_assets')
+        run_job('create_stage_tasks', str(self.song.pk), {'marketing_assets'})
+        create_marketing_task.assert_called_once()
+
+    def test_broker_failure_runs_inline(self):
+        self.apply_async.side_effect = ConnectionError('broker down')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.work.genre = 'Pop'
+            self.work.save()
+
+        self.assert_complete(True, False)
@@ -0,0 +1,87 @@
+"""
+Tests for department song statistics.
+
+Tests catalog.stats and SongViewSet.stats:
+- All buckets of several departments computed in one query
+- Per-department stage/priority breakdowns
+- Admin-only multi-department requests
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.models import Department, Role, UserProfile
+from catalog.models import Song
+from catalog.stats import get_department_stats
+from catalog.views import SongViewSet
+
+User = get_user_model()
+
+
+class DepartmentStatsTestCase(TestCase):
+    """Test conditional-aggregation statistics."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.label_dept = Department.objects.create(code='label', name='Label')
+        self.admin_role = Role.objects.create(code='administrator', name='Administrator', level=1000)
+        self.label_role = Role.objects.create(code='label_employee', name='Label Employee',
+                                              level=200, department=self.label_dept)
+
+        self.admin = User.objects.create(username='stats_admin')
+        UserProfile.objects.update_or_create(user=self.admin, defaults={'role': self.admin_role})
+        self.label_user = User.objects.create(username='stats_label')
+        UserProfile.objects.update_or_create(
+            user=self.label_user, defaults={'role': self.label_role, 'department': self.label_dept}
+        )
+
+        for stage, priority in [('draft', 'normal'), ('publishing', 'urgent'),
+                                ('label_recording', 'high'), ('label_review', 'high'),
+                                ('marketing_assets', 'low')]:
+            Song.objects.create(title=f'{stage} song', created_by=self.admin, stage=stage, priority=priority)
+        Song.objects.filter(stage='label_review').update(is_blocked=True, is_overdue=True)
+        Song.objects.create(title='Archived', created_by=self.admin, stage='label_recording', is_archived=True)
+
+    def get_stats(self, user, **params):
+        request = self.factory.get('/api/v1/songs/stats/', params)
+        force_authenticate(request, user=user)
+        return SongViewSet.as_view({'get': 'stats'})(request)
+
+    def test_several_departments_in_one_query(self):
+        with self.assertNumQueries(1):
+            stats = get_department_stats(['publishing', 'label', 'marketing', 'digital'])
+
+        self.assertEqual(stats['publishing']['total_songs'], 2)
+        self.assertEqual(stats['publishing']['by_priority']['urgent']['count'], 1)
+        self.assertEqual(stats['label']['total_songs'], 2)
+        self.assertEqual(stats['label']['overdue_songs'], 1)
+        self.assertEqual(stats['label']['blocked_songs'], 1)
+        self.assertEqual(stats['label']['by_priority']['high']['count'], 2)
+        self.assertEqual(stats['label']['by_stage']['label_recording']['count'], 1)
+        self.assertEqual(list(stats['label']['by_stage']),
+                         ['label_recording', 'label_review', 'ready_for_digital'])
+        self.assertEqual(stats['marketing']['total_songs'], 1)
+        self.assertEqual(stats['digital']['total_songs'], 0)
+
+    def test_custom_stage_map_and_unknown_department(self):
+        stats = get_department_stats(['review', 'sales'], stage_map={'review': ['label_review']})
+        self.assertEqual(stats['review']['total_songs'], 1)
+        self.assertEqual(stats['sales']['total_songs'], 0)
+        self.assertEqual(stats['sales']['by_stage'], {})
+
+    def test_stats_action_uses_user_department(self):
+        response = self.get_stats(self.label_user)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_songs'], 2)
+        self.assertEqual(response.data['by_stage']['label_review']['display'], 'Label - Review')
+
+    def test_multi_department_stats_are_admin_only(self):
+        response = self.get_stats(self.label_user, departments='publishing')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.get_stats(self.admin, departments='all')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['departments']), {'publishing', 'label', 'marketing', 'digital'})
+        self.assertEqual(response.data['departments']['publishing']['total_songs'], 2)
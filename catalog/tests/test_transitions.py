@@ -0,0 +1,102 @@
+"""
+Tests for the song stage transition pipeline.
+
+Tests catalog.transitions and SongViewSet.transition:
+- Checklist bulk-inserted, query count independent of checklist size
+- Computed fields derived in memory match the database
+- Transition endpoint response
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.models import Department, Role, UserProfile
+from catalog import checklist_templates
+from catalog.models import Song, SongChecklistItem, SongStageTransition
+from catalog.transitions import transition_song
+from catalog.views import SongViewSet
+
+User = get_user_model()
+
+
+def template(size):
+    return [
+        {
+            'category': 'Metadata',
+            'item_name': f'Item {i}',
+            'description': 'Check',
+            'order': i,
+            'required': i % 3 != 0,
+            'validation_type': 'manual',
+        }
+        for i in range(size)
+    ]
+
+
+class SongTransitionTestCase(TestCase):
+    """Test bulk checklist generation and the single song save."""
+
+    def setUp(self):
+        Department.objects.create(code='publishing', name='Publishing')
+        role = Role.objects.create(code='administrator', name='Administrator', level=1000)
+        self.admin = User.objects.create(username='transition_admin')
+        UserProfile.objects.update_or_create(user=self.admin, defaults={'role': role})
+
+    def make_song(self):
+        return Song.objects.create(title='Song', created_by=self.admin, stage='draft')
+
+    def transition(self, song, size):
+        templates = {**checklist_templates.CHECKLIST_TEMPLATES, 'publishing': template(size)}
+        with patch.object(checklist_templates, 'CHECKLIST_TEMPLATES', templates):
+            with CaptureQueriesContext(connection) as queries:
+                transition_song(song, 'publishing', self.admin, notes='Go')
+        return len(queries)
+
+    def test_query_count_independent_of_checklist_size(self):
+        small = self.transition(self.make_song(), 2)
+        large = self.transition(self.make_song(), 30)
+
+        self.assertEqual(small, large)
+        self.assertEqual(SongChecklistItem.objects.filter(stage='publishing').count(), 32)
+
+    def test_computed_fields_match_database(self):
+        song = self.make_song()
+        # A required, complete item left from an earlier visit to the stage
+        SongChecklistItem.objects.create(song=song, stage='publishing', category='Metadata',
+                                         item_name='Old', description='Old', is_complete=True)
+
+        with patch.object(Song, 'save', autospec=True, side_effect=Song.save) as save:
+            self.transition(song, 6)
+        self.assertEqual(save.call_count, 1)
+
+        song.refresh_from_db()
+        self.assertEqual(song.stage, 'publishing')
+        self.assertEqual(song.assigned_department.code, 'publishing')
+        self.assertEqual(song.checklist_progress, round(song.calculate_checklist_progress(), 2))
+        self.assertEqual(float(song.checklist_progress), 20.0)  # 1 of 5 required items
+        self.assertEqual(song.days_in_current_stage, 0)
+        self.assertFalse(song.is_overdue)
+
+        record = SongStageTransition.objects.get(song=song)
+        self.assertEqual((record.from_stage, record.to_stage), ('draft', 'publishing'))
+        self.assertEqual(record.checklist_completion_at_transition, 100)
+
+    def test_transition_endpoint(self):
+        song = self.make_song()
+        request = APIRequestFactory().post(
+            f'/api/v1/songs/{song.id}/transition/', {'target_stage': 'publishing'}, format='json'
+        )
+        force_authenticate(request, user=self.admin)
+        response = SongViewSet.as_view({'post': 'transition'})(request, pk=song.id)
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['current_stage'], 'publishing')
+        self.assertEqual(
+            SongChecklistItem.objects.filter(song=song, stage='publishing').count(),
+            len(checklist_templates.CHECKLIST_TEMPLATES['publishing']),
+        )
@@ -0,0 +1,116 @@
+"""
+Song stage transition pipeline.
+
+A transition costs a fixed number of queries whatever the size of the stage
+checklist: the new checklist is bulk-inserted, the song's computed fields are
+derived in memory from one aggregate over the existing items plus the freshly
+built ones, and the song is saved once. bulk_create() bypasses the checklist
+item signals, so their side effects (task sync, marketing task completion)
+are enqueued as one job per song and dispatched after commit together with
+the song's stage jobs (see catalog.jobs).
+
+Usage:
+    with transaction.atomic():
+        transition = transition_song(song, 'publishing', request.user, notes='Ready')
+"""
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from . import checklist_templates
+from .jobs import schedule_task_sync
+from .models import SongChecklistItem, SongStageTransition, checklist_progress_percent
+from .permissions import get_department_for_stage
+
+
+def create_stage_checklist(song, stage):
+    """
+    Bulk-create the template checklist of a stage for a song.
+
+    Args:
+        song: Song instance
+        stage: Workflow stage code
+
+    Returns:
+        list: The created SongChecklistItem instances
+    """
+    items = [
+        SongChecklistItem(**item_data)
+        for item_data in checklist_templates.generate_checklist_for_stage(song, stage)
+    ]
+    if items:
+        SongChecklistItem.objects.bulk_create(items)
+        schedule_task_sync(items)
+    return items
+
+
+def transition_song(song, target_stage, user, notes='', transition_type='forward'):
+    """
+    Move a song to another stage, generate its checklist and persist the song once.
+
+    Permission checks are the caller's responsibility.
+
+    Args:
+        song: Song instance (updated in place)
+        target_stage: Target stage code
+        user: User performing the transition
+        notes: Transition notes
+        transition_type: SongStageTransition.TRANSITION_TYPE_CHOICES code
+
+    Returns:
+        SongStageTransition: The recorded transition
+    """
+    from api.models import Department
+
+    now = timezone.now()
+    from_stage = song.stage
+    current_stage = from_stage or 'draft'  # Treat null stage as draft
+
+    with transaction.atomic():
+        # Required items of the current stage (for the record) and of the target stage
+        # (it may have been visited before), in one query
+        counts = SongChecklistItem.objects.filter(
+            song=song, required=True, stage__in={current_stage, target_stage}
+        ).aggregate(
+            current_total=Count('id', filter=Q(stage=current_stage)),
+            current_completed=Count('id', filter=Q(stage=current_stage, is_complete=True)),
+            target_total=Count('id', filter=Q(stage=target_stage)),
+            target_completed=Count('id', filter=Q(stage=target_stage, is_complete=True)),
+        )
+
+        transition = SongStageTransition.objects.create(
+            song=song,
+            from_stage=from_stage,
+            to_stage=target_stage,
+            transitioned_by=user,
+            transition_type=transition_type,
+            notes=notes,
+            checklist_completion_at_transition=checklist_progress_percent(
+                counts['current_total'], counts['current_completed']
+            ),
+        )
+
+        song.stage = target_stage
+        song.stage_entered_at = now
+        song.stage_updated_by = user
+
+        # Assign to department for new stage
+        target_dept_code = get_department_for_stage(target_stage)
+        if target_dept_code:
+            target_dept = Department.objects.filter(code=target_dept_code).first()
+            if target_dept:
+                song.assigned_department = target_dept
+
+        items = create_stage_checklist(song, target_stage)
+        required = [item for item in items if item.required]
+        song.set_computed_fields(
+            checklist_progress_percent(
+                counts['target_total'] + len(required),
+                counts['target_completed'] + sum(item.is_complete for item in required),
+            ),
+            now=now,
+        )
+        song.save()
+
+    return transition
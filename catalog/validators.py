@@ -7,6 +7,7 @@ These functions validate checklist items based on their validation_type.
 from decimal import Decimal
 from identity.models import Identifier
 from rights.models import Split, Credit
+from rights.aggregation import get_split_totals
 
 
 def validate_auto_field_exists(item):
@@ -182,14 +183,9 @@ def validate_auto_split_validated(item):
     if not entity:
         return False
 
-    # Get splits for this entity
-    splits = Split.objects.filter(
-        scope=entity_type,
-        object_id=entity.id,
-        right_type=split_type
-    )
-
-    total = sum(s.share for s in splits)
+    # Get split total for this entity (single aggregate query)
+    totals = get_split_totals(entity_type, [entity.id], right_types=[split_type])[entity.id]
+    total = totals.get(split_type, {'total': Decimal('0')})['total']
 
     # Special case: publishers can be 0% (no publishers)
     if skip_if_empty and total == Decimal('0'):
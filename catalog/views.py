@@ -4,8 +4,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters import rest_framework as django_filters
-from django.db.models import Q, Count, Sum, Prefetch, Exists, OuterRef, Value, Subquery
-from django.db.models.functions import Coalesce
+from django.db.models import Q, Count, Prefetch, Exists, OuterRef, QuerySet
 from django.utils import timezone
 from django.db import transaction
 from .models import (
@@ -25,14 +24,57 @@ from .serializers import (
 )
 from . import permissions as song_permissions
 from . import validators
-from . import checklist_templates
 from .alert_service import SongAlertService
+from .transitions import transition_song
 from identity.models import Identifier
-from rights.models import Credit, Split
-from distribution.models import Publication
+from identity.prefetch import prefetch_identifiers
+from .prefetch import GenericPrefetch, fetch_generic, get_generic, prefetch_generic
+from rights.models import Split, SplitTotal
+from rights.aggregation import annotate_split_totals
+from api.cache import cache_response
 from api.permissions import IsNotGuest
 
 
+# Models read by the cached Work/Recording/Release list and retrieve responses.
+# Catalog data is shared by every user allowed past the permission checks.
+CATALOG_CACHE_DEPENDENCIES = (Work, Recording, Release, Track, Asset, SplitTotal, Identifier)
+
+
+class IdentifierPrefetchMixin:
+    """
+    Batch-load identifiers for everything a viewset serializes.
+
+    Hooks get_serializer() so list pages and retrieved objects get their
+    ISWC/ISRC/UPC and identifier lists in one query per owner type instead of
+    one per row. Override get_identifier_owners() to include nested owners.
+    """
+
+    identifier_owner_type = None
+
+    def get_identifier_owners(self, instances):
+        """Return {owner_type: [instances]} to prefetch identifiers for."""
+        return {self.identifier_owner_type: instances}
+
+    def prefetch_identifiers(self, instances):
+        """Prefetch identifiers for the given instances and their nested owners."""
+        for owner_type, owners in self.get_identifier_owners(list(instances)).items():
+            prefetch_identifiers(owners, owner_type)
+        return instances
+
+    def get_serializer(self, *args, **kwargs):
+        # Only read serializers; write serializers validate incoming data
+        if args and 'data' not in kwargs:
+            instance = args[0]
+            if isinstance(instance, QuerySet):
+                instance = list(instance)
+                args = (instance,) + args[1:]
+            if kwargs.get('many'):
+                self.prefetch_identifiers(instance)
+            elif instance is not None:
+                self.prefetch_identifiers([instance])
+        return super().get_serializer(*args, **kwargs)
+
+
 class WorkFilter(django_filters.FilterSet):
     """Filter for Work model."""
 
@@ -57,38 +99,8 @@ class WorkFilter(django_filters.FilterSet):
             return queryset.annotate(rec_count=Count('recordings')).filter(rec_count=0)
 
     def filter_has_complete_splits(self, queryset, name, value):
-        """Filter works with/without complete splits using DB annotations."""
-        from rights.models import Split
-
-        writer_sum_sq = Split.objects.filter(
-            scope='work',
-            object_id=OuterRef('id'),
-            right_type='writer',
-        ).values('object_id').annotate(total=Sum('share')).values('total')[:1]
-
-        publisher_sum_sq = Split.objects.filter(
-            scope='work',
-            object_id=OuterRef('id'),
-            right_type='publisher',
-        ).values('object_id').annotate(total=Sum('share')).values('total')[:1]
-
-        publisher_exists = Exists(
-            Split.objects.filter(scope='work', object_id=OuterRef('id'), right_type='publisher')
-        )
-
-        annotated = queryset.annotate(
-            writer_total=Coalesce(Subquery(writer_sum_sq), Value(0)),
-            publisher_total=Coalesce(Subquery(publisher_sum_sq), Value(0)),
-            publisher_exists=publisher_exists,
-        )
-
-        # Works are complete when writers sum to 100 and publishers either don't exist or sum to 100
-        complete_q = Q(writer_total=100) & (Q(publisher_exists=False) | Q(publisher_total=100))
-
-        if value:
-            return annotated.filter(complete_q)
-        else:
-            return annotated.exclude(complete_q)
+        """Filter works with/without complete splits using SplitTotal annotations."""
+        return annotate_split_totals(queryset, 'work').filter(splits_complete=value)
 
     def filter_search(self, queryset, name, value):
         """Search works by title, lyrics, alternate titles, or identifiers (ISWC)."""
@@ -110,7 +122,7 @@ class WorkFilter(django_filters.FilterSet):
         ).distinct()
 
 
-class WorkViewSet(viewsets.ModelViewSet):
+class WorkViewSet(IdentifierPrefetchMixin, viewsets.ModelViewSet):
     """
     ViewSet for Work model.
     Access: All authenticated users except guests can view works.
@@ -119,13 +131,14 @@ class WorkViewSet(viewsets.ModelViewSet):
     queryset = Work.objects.all()
     permission_classes = [IsAuthenticated, IsNotGuest]
     filterset_class = WorkFilter
+    identifier_owner_type = 'work'
     filter_backends = [
         django_filters.DjangoFilterBackend,
         filters.SearchFilter,
         filters.OrderingFilter
     ]
     search_fields = ['title', 'alternate_titles', 'lyrics', 'notes']
-    ordering_fields = ['title', 'year_composed', 'created_at']
+    ordering_fields = ['title', 'year_composed', 'created_at', 'splits_complete']
     ordering = ['-created_at']
 
     def get_serializer_class(self):
@@ -136,14 +149,23 @@ class WorkViewSet(viewsets.ModelViewSet):
             return WorkCreateUpdateSerializer
         return WorkDetailSerializer
 
+    @cache_response(depends_on=CATALOG_CACHE_DEPENDENCIES, vary_on_user=False)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response(depends_on=CATALOG_CACHE_DEPENDENCIES, vary_on_user=False)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def get_queryset(self):
         """Optimize queryset with annotations."""
         queryset = super().get_queryset()
-        # Annotate recordings count for list and retrieve actions
+        # Annotate recordings count and split totals for list and retrieve actions
         if self.action in ['list', 'retrieve']:
             queryset = queryset.annotate(
                 recordings_count=Count('recordings', distinct=True)
             )
+            queryset = annotate_split_totals(queryset, 'work')
         return queryset
 
     # DISABLED: Direct work creation is not allowed.
@@ -197,10 +219,7 @@ class WorkViewSet(viewsets.ModelViewSet):
     def credits(self, request, pk=None):
         """Get credits for this work."""
         work = self.get_object()
-        credits = Credit.objects.filter(
-            scope='work',
-            object_id=work.id
-        ).select_related('entity')
+        credits = fetch_generic(work, 'credits')
 
         from rights.serializers import CreditSerializer
         serializer = CreditSerializer(credits, many=True)
@@ -210,10 +229,7 @@ class WorkViewSet(viewsets.ModelViewSet):
     def splits(self, request, pk=None):
         """Get splits for this work."""
         work = self.get_object()
-        splits = Split.objects.filter(
-            scope='work',
-            object_id=work.id
-        ).select_related('entity')
+        splits = fetch_generic(work, 'splits')
 
         from rights.serializers import SplitSerializer
         serializer = SplitSerializer(splits, many=True)
@@ -223,7 +239,8 @@ class WorkViewSet(viewsets.ModelViewSet):
     def recordings(self, request, pk=None):
         """Get all recordings of this work."""
         work = self.get_object()
-        recordings = work.recordings.all()
+        recordings = list(annotate_split_totals(work.recordings.all(), 'recording'))
+        prefetch_identifiers(recordings, 'recording')
         serializer = RecordingListSerializer(recordings, many=True)
         return Response(serializer.data)
 
@@ -252,19 +269,8 @@ class RecordingFilter(django_filters.FilterSet):
             return queryset.annotate(asset_count=Count('assets')).filter(asset_count=0)
 
     def filter_has_complete_splits(self, queryset, name, value):
-        """Filter recordings with/without complete splits."""
-        if value:
-            recording_ids = []
-            for recording in queryset:
-                if recording.has_complete_master_splits:
-                    recording_ids.append(recording.id)
-            return queryset.filter(id__in=recording_ids)
-        else:
-            recording_ids = []
-            for recording in queryset:
-                if not recording.has_complete_master_splits:
-                    recording_ids.append(recording.id)
-            return queryset.filter(id__in=recording_ids)
+        """Filter recordings with/without complete splits using SplitTotal annotations."""
+        return annotate_split_totals(queryset, 'recording').filter(splits_complete=value)
 
     def filter_search(self, queryset, name, value):
         """Search recordings by title, notes, or ISRC."""
@@ -275,7 +281,7 @@ class RecordingFilter(django_filters.FilterSet):
         ).distinct()
 
 
-class RecordingViewSet(viewsets.ModelViewSet):
+class RecordingViewSet(IdentifierPrefetchMixin, viewsets.ModelViewSet):
     """
     ViewSet for Recording model.
     Access: All authenticated users except guests can view recordings.
@@ -285,13 +291,14 @@ class RecordingViewSet(viewsets.ModelViewSet):
     queryset = Recording.objects.all()
     permission_classes = [IsAuthenticated, IsNotGuest]
     filterset_class = RecordingFilter
+    identifier_owner_type = 'recording'
     filter_backends = [
         django_filters.DjangoFilterBackend,
         filters.SearchFilter,
         filters.OrderingFilter
     ]
     search_fields = ['title', 'notes', 'studio', 'version']
-    ordering_fields = ['title', 'recording_date', 'created_at']
+    ordering_fields = ['title', 'recording_date', 'created_at', 'splits_complete']
     ordering = ['-created_at']
 
     def get_serializer_class(self):
@@ -302,6 +309,14 @@ class RecordingViewSet(viewsets.ModelViewSet):
             return RecordingCreateUpdateSerializer
         return RecordingDetailSerializer
 
+    @cache_response(depends_on=CATALOG_CACHE_DEPENDENCIES, vary_on_user=False)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response(depends_on=CATALOG_CACHE_DEPENDENCIES, vary_on_user=False)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def get_queryset(self):
         """Optimize queryset with prefetch."""
         queryset = super().get_queryset()
@@ -309,10 +324,12 @@ class RecordingViewSet(viewsets.ModelViewSet):
             queryset = queryset.select_related('work').annotate(
                 release_count=Count('tracks__release', distinct=True)
             )
+            queryset = annotate_split_totals(queryset, 'recording')
         elif self.action == 'retrieve':
             queryset = queryset.select_related('work', 'derived_from').prefetch_related('assets').annotate(
                 release_count=Count('tracks__release', distinct=True)
             )
+            queryset = annotate_split_totals(queryset, 'recording')
         else:
             queryset = queryset.select_related('work', 'derived_from').prefetch_related('assets')
         return queryset
@@ -368,10 +385,7 @@ class RecordingViewSet(viewsets.ModelViewSet):
     def credits(self, request, pk=None):
         """Get credits for this recording."""
         recording = self.get_object()
-        credits = Credit.objects.filter(
-            scope='recording',
-            object_id=recording.id
-        ).select_related('entity')
+        credits = fetch_generic(recording, 'credits')
 
         from rights.serializers import CreditSerializer
         serializer = CreditSerializer(credits, many=True)
@@ -381,10 +395,7 @@ class RecordingViewSet(viewsets.ModelViewSet):
     def splits(self, request, pk=None):
         """Get splits for this recording."""
         recording = self.get_object()
-        splits = Split.objects.filter(
-            scope='recording',
-            object_id=recording.id
-        ).select_related('entity')
+        splits = fetch_generic(recording, 'splits')
 
         from rights.serializers import SplitSerializer
         serializer = SplitSerializer(splits, many=True)
@@ -394,9 +405,10 @@ class RecordingViewSet(viewsets.ModelViewSet):
     def releases(self, request, pk=None):
         """Get all releases containing this recording."""
         recording = self.get_object()
-        releases = Release.objects.filter(
+        releases = list(Release.objects.filter(
             tracks__recording=recording
-        ).distinct()
+        ).distinct())
+        prefetch_identifiers(releases, 'release')
         serializer = ReleaseListSerializer(releases, many=True)
         return Response(serializer.data)
 
@@ -404,10 +416,7 @@ class RecordingViewSet(viewsets.ModelViewSet):
     def publications(self, request, pk=None):
         """Get all publications of this recording."""
         recording = self.get_object()
-        publications = Publication.objects.filter(
-            object_type='recording',
-            object_id=recording.id
-        )
+        publications = fetch_generic(recording, 'publications')
 
         from distribution.serializers import PublicationListSerializer
         serializer = PublicationListSerializer(publications, many=True)
@@ -480,12 +489,13 @@ class ReleaseFilter(django_filters.FilterSet):
         ).distinct()
 
 
-class ReleaseViewSet(viewsets.ModelViewSet):
+class ReleaseViewSet(IdentifierPrefetchMixin, viewsets.ModelViewSet):
     """ViewSet for Release model."""
 
     queryset = Release.objects.all()
     permission_classes = [IsAuthenticated]
     filterset_class = ReleaseFilter
+    identifier_owner_type = 'release'
     filter_backends = [
         django_filters.DjangoFilterBackend,
         filters.SearchFilter,
@@ -495,6 +505,15 @@ class ReleaseViewSet(viewsets.ModelViewSet):
     ordering_fields = ['title', 'release_date', 'created_at']
     ordering = ['-release_date', '-created_at']
 
+    def get_identifier_owners(self, instances):
+        """Releases, plus the recordings of their tracks on detail views (for ISRCs)."""
+        owners = {'release': instances}
+        if self.action == 'retrieve':
+            owners['recording'] = [
+                track.recording for release in instances for track in release.tracks.all()
+            ]
+        return owners
+
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
         if self.action == 'list':
@@ -503,6 +522,14 @@ class ReleaseViewSet(viewsets.ModelViewSet):
             return ReleaseCreateUpdateSerializer
         return ReleaseDetailSerializer
 
+    @cache_response(depends_on=CATALOG_CACHE_DEPENDENCIES, vary_on_user=False)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response(depends_on=CATALOG_CACHE_DEPENDENCIES, vary_on_user=False)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def get_queryset(self):
         """Optimize queryset with annotations."""
         queryset = super().get_queryset()
@@ -565,10 +592,7 @@ class ReleaseViewSet(viewsets.ModelViewSet):
     def publications(self, request, pk=None):
         """Get all publications of this release."""
         release = self.get_object()
-        publications = Publication.objects.filter(
-            object_type='release',
-            object_id=release.id
-        )
+        publications = fetch_generic(release, 'publications')
 
         from distribution.serializers import PublicationListSerializer
         serializer = PublicationListSerializer(publications, many=True)
@@ -585,8 +609,10 @@ class ReleaseViewSet(viewsets.ModelViewSet):
 
         page = self.paginate_queryset(upcoming)
         if page is not None:
+            prefetch_identifiers(page, 'release')
             serializer = ReleaseListSerializer(page, many=True)
             return self.get_paginated_response(serializer.data)
+        upcoming = prefetch_identifiers(upcoming, 'release')
         serializer = ReleaseListSerializer(upcoming, many=True)
         return Response(serializer.data)
 
@@ -603,13 +629,15 @@ class ReleaseViewSet(viewsets.ModelViewSet):
 
         page = self.paginate_queryset(recent)
         if page is not None:
+            prefetch_identifiers(page, 'release')
             serializer = ReleaseListSerializer(page, many=True)
             return self.get_paginated_response(serializer.data)
+        recent = prefetch_identifiers(recent, 'release')
         serializer = ReleaseListSerializer(recent, many=True)
         return Response(serializer.data)
 
 
-class TrackViewSet(viewsets.ModelViewSet):
+class TrackViewSet(IdentifierPrefetchMixin, viewsets.ModelViewSet):
     """ViewSet for Track model."""
 
     queryset = Track.objects.all()
@@ -623,6 +651,10 @@ class TrackViewSet(viewsets.ModelViewSet):
     ordering_fields = ['track_number', 'disc_number']
     ordering = ['disc_number', 'track_number']
 
+    def get_identifier_owners(self, instances):
+        """Tracks expose their recording's ISRC."""
+        return {'recording': [track.recording for track in instances]}
+
     def get_queryset(self):
         """Optimize with select_related."""
         return super().get_queryset().select_related('release', 'recording')
@@ -842,47 +874,10 @@ class SongViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # Perform transition
+        # Perform transition (bulk checklist, single song save)
         with transaction.atomic():
-            # Record current state
             from_stage = song.stage
-            checklist_completion = song.calculate_checklist_progress()
-
-            # Create transition record
-            SongStageTransition.objects.create(
-                song=song,
-                from_stage=from_stage,
-                to_stage=target_stage,
-                transitioned_by=request.user,
-                transition_type=transition_type,
-                notes=notes,
-                checklist_completion_at_transition=checklist_completion
-            )
-
-            # Update song
-            song.stage = target_stage
-            song.stage_entered_at = timezone.now()
-            song.stage_updated_by = request.user
-
-            # Assign to department for new stage
-            target_dept_code = song_permissions.get_department_for_stage(target_stage)
-            if target_dept_code:
-                from api.models import Department
-                try:
-                    target_dept = Department.objects.get(code=target_dept_code)
-                    song.assigned_department = target_dept
-                except Department.DoesNotExist:
-                    pass
-
-            song.save()
-
-            # Generate new checklist for target stage
-            checklist_items_data = checklist_templates.generate_checklist_for_stage(song, target_stage)
-            for item_data in checklist_items_data:
-                SongChecklistItem.objects.create(**item_data)
-
-            # Update computed fields
-            song.update_computed_fields()
+            transition_song(song, target_stage, request.user, notes=notes, transition_type=transition_type)
 
             # Create alert for target department
             SongAlertService.create_stage_transition_alert(song, from_stage, target_stage, request.user)
@@ -1148,53 +1143,32 @@ class SongViewSet(viewsets.ModelViewSet):
         Get department statistics.
 
         GET /songs/stats/
+        GET /songs/stats/?departments=label,marketing  (admins only; 'all' for every department)
+
+        All buckets are computed in a single query (see catalog.stats).
         """
+        from .stats import DEPARTMENT_STATS_STAGES, get_department_stats
+
         user = request.user
+        departments_param = request.query_params.get('departments')
+
+        if departments_param:
+            if not hasattr(user, 'profile') or not user.profile.role or user.profile.role.level < 1000:
+                return Response(
+                    {'error': 'Only administrators can request statistics for other departments'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+            if departments_param == 'all':
+                departments = list(DEPARTMENT_STATS_STAGES)
+            else:
+                departments = [code.strip().lower() for code in departments_param.split(',') if code.strip()]
+            return Response({'departments': get_department_stats(departments)})
 
         if not hasattr(user, 'profile') or not user.profile.department:
             return Response({'error': 'No department assigned'}, status=status.HTTP_400_BAD_REQUEST)
 
         dept_code = user.profile.department.code.lower()
-
-        # Map departments to their stages
-        stage_map = {
-            'publishing': ['draft', 'publishing'],
-            'label': ['label_recording', 'label_review', 'ready_for_digital'],
-            'marketing': ['marketing_assets'],
-            'digital': ['digital_distribution']
-        }
-
-        dept_stages = stage_map.get(dept_code, [])
-
-        # Calculate stats
-        songs_in_dept = Song.objects.filter(stage__in=dept_stages, is_archived=False)
-
-        stats = {
-            'total_songs': songs_in_dept.count(),
-            'overdue_songs': songs_in_dept.filter(is_overdue=True).count(),
-            'blocked_songs': songs_in_dept.filter(is_blocked=True).count(),
-            'by_stage': {},
-            'by_priority': {}
-        }
-
-        # Count by stage
-        for stage_code, stage_display in Song._meta.get_field('stage').choices:
-            if stage_code in dept_stages:
-                count = songs_in_dept.filter(stage=stage_code).count()
-                stats['by_stage'][stage_code] = {
-                    'count': count,
-                    'display': stage_display
-                }
-
-        # Count by priority
-        for priority_code, priority_display in Song.PRIORITY_CHOICES:
-            count = songs_in_dept.filter(priority=priority_code).count()
-            stats['by_priority'][priority_code] = {
-                'count': count,
-                'display': priority_display
-            }
-
-        return Response(stats)
+        return Response(get_department_stats([dept_code])[dept_code])
 
     @action(detail=True, methods=['get'])
     def recordings(self, request, pk=None):
@@ -1210,8 +1184,24 @@ class SongViewSet(viewsets.ModelViewSet):
         song = self.get_object()
         user = request.user
 
-        # Get all recordings linked to this song (M2M relationship)
-        recordings = song.recordings.all().select_related('work').prefetch_related('assets')
+        # Get all recordings linked to this song (M2M relationship), with
+        # identifiers, credits and master splits batched per relation
+        recordings = prefetch_generic(
+            annotate_split_totals(
+                song.recordings.all().select_related('work').prefetch_related('assets'),
+                'recording'
+            ),
+            'identifiers',
+            'credits',
+            GenericPrefetch(
+                'splits',
+                queryset=Split.objects.filter(right_type='master').select_related('entity')
+                .prefetch_related('entity__entity_roles'),
+                to_attr='master_splits'
+            ),
+        )
+
+        from rights.serializers import CreditSerializer, SplitSerializer
 
         # Serialize recordings
         serialized_recordings = []
@@ -1221,12 +1211,7 @@ class SongViewSet(viewsets.ModelViewSet):
             recording_data = RecordingDetailSerializer(recording).data
 
             # Add credits (filtered by department)
-            credits = Credit.objects.filter(
-                scope='recording',
-                object_id=recording.id
-            ).select_related('entity')
-
-            from rights.serializers import CreditSerializer
+            credits = get_generic(recording, 'credits')
 
             # Department-based filtering
             if hasattr(user, 'profile') and user.profile.department:
@@ -1250,13 +1235,7 @@ class SongViewSet(viewsets.ModelViewSet):
                     recording_data['credits'] = CreditSerializer(credits, many=True).data
 
                     # Add master splits
-                    splits = Split.objects.filter(
-                        scope='recording',
-                        object_id=recording.id,
-                        right_type='master'
-                    ).select_related('entity')
-
-                    from rights.serializers import SplitSerializer
+                    splits = get_generic(recording, 'splits', to_attr='master_splits')
                     recording_data['splits'] = SplitSerializer(splits, many=True).data
 
                 # Sales, Publishing see basic info
@@ -1367,13 +1346,21 @@ class SongViewSet(viewsets.ModelViewSet):
         user = request.user
 
         # Check if work exists
-        if not song.work:
+        if not song.work_id:
             return Response(
                 {'error': 'No work linked to this song'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        work = song.work
+        # Identifiers and splits in one query each, reused by the serializer and below
+        work = prefetch_generic(
+            [annotate_split_totals(Work.objects.filter(pk=song.work_id), 'work').get()],
+            'identifiers',
+            'splits',
+        )[0]
+        splits = list(get_generic(work, 'splits'))
+        writer_splits = [s for s in splits if s.right_type == 'writer']
+        publisher_splits = [s for s in splits if s.right_type == 'publisher']
 
         # Base work data
         work_data = WorkDetailSerializer(work).data
@@ -1400,18 +1387,6 @@ class SongViewSet(viewsets.ModelViewSet):
 
         # Digital can see names but not percentages
         elif dept_code == 'digital':
-            writer_splits = Split.objects.filter(
-                scope='work',
-                object_id=work.id,
-                right_type='writer'
-            ).select_related('entity')
-
-            publisher_splits = Split.objects.filter(
-                scope='work',
-                object_id=work.id,
-                right_type='publisher'
-            ).select_related('entity')
-
             # Return names only
             work_data['writer_splits'] = [
                 {'entity_name': s.entity.display_name if s.entity else 'Unknown', 'role': 'Writer'}
@@ -1425,18 +1400,6 @@ class SongViewSet(viewsets.ModelViewSet):
 
         # Publishing, Label, Sales can see full splits
         else:
-            writer_splits = Split.objects.filter(
-                scope='work',
-                object_id=work.id,
-                right_type='writer'
-            ).select_related('entity')
-
-            publisher_splits = Split.objects.filter(
-                scope='work',
-                object_id=work.id,
-                right_type='publisher'
-            ).select_related('entity')
-
             work_data['writer_splits'] = SplitSerializer(writer_splits, many=True).data
             work_data['publisher_splits'] = SplitSerializer(publisher_splits, many=True).data
             work_data['can_view_splits'] = True
@@ -2313,12 +2276,15 @@ class SongAlertViewSet(viewsets.ReadOnlyModelViewSet):
 
         POST /alerts/{id}/mark_read/
         """
+        from notifications.counters import adjust_unread, song_alert_deltas
+
         alert = self.get_object()
 
         if not alert.is_read:
             alert.is_read = True
             alert.read_at = timezone.now()
             alert.save()
+            adjust_unread(song_alert_deltas([alert], delta=-1))
 
         serializer = SongAlertSerializer(alert)
         return Response(serializer.data)
@@ -2330,10 +2296,24 @@ class SongAlertViewSet(viewsets.ReadOnlyModelViewSet):
 
         POST /alerts/mark_all_read/
         """
-        updated = self.get_queryset().filter(is_read=False).update(
-            is_read=True,
-            read_at=timezone.now()
-        )
+        from notifications.counters import SONG_ALERTS, adjust_unread
+
+        unread = self.get_queryset().filter(is_read=False)
+        with transaction.atomic():
+            # Unread alerts per counter owner (department, or user for personal alerts)
+            deltas = {}
+            for row in unread.order_by().values('target_user_id', 'target_department_id').annotate(count=Count('id')):
+                if row['target_department_id']:
+                    owner = (SONG_ALERTS, 'department', row['target_department_id'])
+                else:
+                    owner = (SONG_ALERTS, 'user', row['target_user_id'])
+                deltas[owner] = deltas.get(owner, 0) - row['count']
+
+            updated = unread.update(
+                is_read=True,
+                read_at=timezone.now()
+            )
+            adjust_unread(deltas)
 
         return Response({'success': True, 'updated': updated})
 
@@ -2344,7 +2324,11 @@ class SongAlertViewSet(viewsets.ReadOnlyModelViewSet):
 
         GET /alerts/unread_count/
         """
-        count = self.get_queryset().filter(is_read=False).count()
+        from notifications.counters import SONG_ALERTS, get_unread_counts
+
+        user = request.user
+        department_id = user.profile.department_id if hasattr(user, 'profile') else None
+        count = get_unread_counts(user.id, department_id)[SONG_ALERTS]
 
         return Response({'unread_count': count})
 
@@ -0,0 +1,91 @@
+"""
+Custom cache backends.
+
+The shared cache lives on the Redis instance already used by Celery and
+Channels. Caching is an optimization, so a Redis outage must not take the API
+down with it: FailOpenRedisCache logs connection errors and degrades to cache
+misses instead of raising.
+"""
+
+import logging
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.redis import RedisCache
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+logger = logging.getLogger(__name__)
+
+REDIS_UNAVAILABLE = (RedisConnectionError, RedisTimeoutError)
+
+
+class FailOpenRedisCache(RedisCache):
+    """
+    Django's RedisCache, treating an unreachable Redis as an empty cache.
+
+    Reads return their miss value and writes are dropped. incr()/decr() still
+    raise so callers that depend on atomic counters can decide what to do.
+    """
+
+    def _fail_open(self, operation, fallback):
+        logger.warning(f"Cache {operation} failed: Redis unavailable", exc_info=True)
+        return fallback
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        try:
+            return super().add(key, value, timeout, version)
+        except REDIS_UNAVAILABLE:
+            return self._fail_open('add', False)
+
+    def get(self, key, default=None, version=None):
+        try:
+            return super().get(key, default, version)
+        except REDIS_UNAVAILABLE:
+            return self._fail_open('get', default)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        try:
+            super().set(key, value, timeout, version)
+        except REDIS_UNAVAILABLE:
+            self._fail_open('set', None)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        try:
+            return super().touch(key, timeout, version)
+        except REDIS_UNAVAILABLE:
+            return self._fail_open('touch', False)
+
+    def delete(self, key, version=None):
+        try:
+            return super().delete(key, version)
+        except REDIS_UNAVAILABLE:
+            return self._fail_open('delete', False)
+
+    def get_many(self, keys, version=None):
+        try:
+            return super().get_many(keys, version)
+        except REDIS_UNAVAILABLE:
+            return self._fail_open('get_many', {})
+
+    def has_key(self, key, version=None):
+        try:
+            return super().has_key(key, version)
+        except REDIS_UNAVAILABLE:
+            return self._fail_open('has_key', False)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        try:
+            return super().set_many(data, timeout, version)
+        except REDIS_UNAVAILABLE:
+            return self._fail_open('set_many', list(data))
+
+    def delete_many(self, keys, version=None):
+        try:
+            super().delete_many(keys, version)
+        except REDIS_UNAVAILABLE:
+            self._fail_open('delete_many', None)
+
+    def clear(self):
+        try:
+            return super().clear()
+        except REDIS_UNAVAILABLE:
+            return self._fail_open('clear', False)
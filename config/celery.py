@@ -50,11 +50,41 @@ app.conf.beat_schedule = {
         'schedule': crontab(hour='8-20/4', minute=0),  # Every 4 hours from 8 AM to 8 PM
     },
 
+    # Repair drift in cached unread counters (every 15 minutes)
+    'reconcile-unread-counters': {
+        'task': 'notifications.reconcile_unread_counters',
+        'schedule': crontab(minute='*/15'),  # Every 15 minutes
+    },
+
+    # Notification and song alert retention and archival (3:00 AM)
+    'apply-notification-retention': {
+        'task': 'notifications.apply_retention',
+        'schedule': crontab(hour=3, minute=0),  # 3:00 AM daily
+    },
+
     # Song workflow daily alerts (midnight)
     'daily-song-alerts': {
         'task': 'catalog.run_daily_song_alerts',
         'schedule': crontab(hour=0, minute=0),  # Midnight daily
     },
+
+    # Daily EUR reference rates (5:00 PM, after the ECB publishes)
+    'fetch-exchange-rates': {
+        'task': 'campaigns.fetch_exchange_rates',
+        'schedule': crontab(hour=17, minute=0),  # 5:00 PM daily
+    },
+
+    # Finalize contract batches whose generation stalled (every 15 minutes)
+    'expire-stale-contract-batches': {
+        'task': 'contracts.expire_stale_contract_batches',
+        'schedule': crontab(minute='*/15'),  # Every 15 minutes
+    },
+
+    # Campaign financial rollup reconciliation (2:30 AM)
+    'reconcile-financial-rollups': {
+        'task': 'campaigns.reconcile_financial_rollups',
+        'schedule': crontab(hour=2, minute=30),  # 2:30 AM daily
+    },
 }
 
 
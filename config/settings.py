@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import sys
 from pathlib import Path
 from decouple import config, Csv
 
@@ -436,6 +437,190 @@ CELERY_WORKER_LOG_FORMAT = '[%(asctime)s: %(levelname)s/%(processName)s] %(messa
 CELERY_WORKER_TASK_LOG_FORMAT = '[%(asctime)s: %(levelname)s/%(processName)s] [%(task_name)s(%(task_id)s)] %(message)s'
 
 
+# ===================================================
+# CACHE CONFIGURATION
+# ===================================================
+
+# Shared cache on the same Redis instance as Celery/Channels (separate DB), so
+# cached data, DRF throttle counters and cache-based rate limits are shared by
+# every web and worker process. Redis outages degrade to cache misses.
+# Set CACHE_BACKEND=locmem to run without Redis (local development, tests).
+CACHE_BACKEND = config('CACHE_BACKEND', default='redis')
+CACHE_REDIS_URL = config('CACHE_REDIS_URL', default='redis://localhost:6379/1')
+
+if CACHE_BACKEND == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'haos-default',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'config.cache_backends.FailOpenRedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'KEY_PREFIX': config('CACHE_KEY_PREFIX', default='haos'),
+            'TIMEOUT': 300,
+            'OPTIONS': {
+                'socket_connect_timeout': 1,
+                'socket_timeout': 1,
+            },
+        }
+    }
+
+# Default TTL (seconds) for api.cache cache-aside entries and cached viewset responses
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=60, cast=int)
+
+
+# ===================================================
+# CATALOG SIDE-EFFECT JOBS
+# ===================================================
+
+# Checklist revalidation, task sync and stage task creation triggered by
+# catalog signals run after commit on Celery, coalesced per object over
+# CATALOG_JOB_WINDOW seconds. Eager mode runs them inline in the saving
+# request instead; it is the default under the test runner.
+RUNNING_TESTS = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+CATALOG_JOBS_EAGER = config('CATALOG_JOBS_EAGER', default=RUNNING_TESTS, cast=bool)
+CATALOG_JOB_WINDOW = config('CATALOG_JOB_WINDOW', default=2, cast=int)
+# How long coalesced payloads wait for their run (must cover queue latency)
+CATALOG_JOB_PAYLOAD_TTL = config('CATALOG_JOB_PAYLOAD_TTL', default=24 * 60 * 60, cast=int)
+
+
+# ===================================================
+# CONFIG REGISTRY
+# ===================================================
+
+# Read-mostly config tables (alert configurations, notification preferences,
+# company settings) are cached per process and invalidated through versions in
+# the shared cache; other processes pick changes up within
+# CONFIG_REGISTRY_CHECK_INTERVAL seconds. Disabled by default under the test
+# runner, whose rolled-back transactions never broadcast invalidations.
+CONFIG_REGISTRY_ENABLED = config('CONFIG_REGISTRY_ENABLED', default=not RUNNING_TESTS, cast=bool)
+CONFIG_REGISTRY_CHECK_INTERVAL = config('CONFIG_REGISTRY_CHECK_INTERVAL', default=5, cast=int)
+
+
+# ===================================================
+# NOTIFICATION DELIVERY
+# ===================================================
+
+# Periodic alert tasks merge a user's alerts of one type into a single digest
+# notification when a run produces more than this many (0 disables digests).
+NOTIFICATION_DIGEST_THRESHOLD = config('NOTIFICATION_DIGEST_THRESHOLD', default=3, cast=int)
+
+# Per-user token bucket for real-time pushes of bulk notifications:
+# NOTIFICATION_PUSH_BURST pushes at once, refilled at NOTIFICATION_PUSH_RATE
+# per minute (0 disables the limit). Held-back notifications are still stored.
+NOTIFICATION_PUSH_RATE = config('NOTIFICATION_PUSH_RATE', default=30, cast=int)
+NOTIFICATION_PUSH_BURST = config('NOTIFICATION_PUSH_BURST', default=10, cast=int)
+
+# WebSocket consumer: notifications replayed on resume (older ones are fetched
+# over REST) and the window (ms) over which live bursts are sent as one frame.
+NOTIFICATION_BACKLOG_LIMIT = config('NOTIFICATION_BACKLOG_LIMIT', default=100, cast=int)
+NOTIFICATION_BATCH_WINDOW_MS = config('NOTIFICATION_BATCH_WINDOW_MS', default=50, cast=int)
+
+
+# ===================================================
+# NOTIFICATION RETENTION
+# ===================================================
+
+# Read notifications and song alerts older than this many days are moved to
+# archive tables by the nightly retention job, so inbox queries only read
+# recent rows (0 disables archiving).
+NOTIFICATION_ARCHIVE_AFTER_DAYS = config('NOTIFICATION_ARCHIVE_AFTER_DAYS', default=30, cast=int)
+
+# Days notifications and song alerts are kept at all, read or not, by type.
+# 'default' covers unlisted types; None keeps rows forever.
+NOTIFICATION_RETENTION_DAYS = {
+    'default': config('NOTIFICATION_RETENTION_DAYS', default=365, cast=int),
+    'system': 180,
+}
+SONG_ALERT_RETENTION_DAYS = {
+    'default': config('SONG_ALERT_RETENTION_DAYS', default=365, cast=int),
+    'deadline_approaching': 90,
+    'overdue': 180,
+}
+
+# Rows moved or deleted per transaction, and transactions per run.
+RETENTION_BATCH_SIZE = config('RETENTION_BATCH_SIZE', default=1000, cast=int)
+RETENTION_MAX_BATCHES = config('RETENTION_MAX_BATCHES', default=100, cast=int)
+
+
+# ===================================================
+# CONTRACT TEMPLATE CACHE
+# ===================================================
+
+# Exported contract templates are stored (private S3 bucket with USE_S3,
+# MEDIA_ROOT otherwise) under this prefix, keyed by Drive file ID and
+# modifiedTime, so generations upload from cached bytes instead of exporting.
+CONTRACT_TEMPLATE_CACHE_ENABLED = config('CONTRACT_TEMPLATE_CACHE_ENABLED', default=True, cast=bool)
+CONTRACT_TEMPLATE_CACHE_PREFIX = config('CONTRACT_TEMPLATE_CACHE_PREFIX', default='template_snapshots')
+
+
+# ===================================================
+# CONTRACT RENDERING
+# ===================================================
+
+# 'google_docs' fills a Drive copy of the template through the Docs API;
+# 'local' fills the cached .docx in the worker and converts it to PDF with
+# LibreOffice, storing both on the contract (rendered_docx / rendered_pdf).
+CONTRACT_RENDER_BACKEND = config('CONTRACT_RENDER_BACKEND', default='google_docs')
+
+# LibreOffice binary used to convert locally rendered contracts to PDF
+CONTRACT_PDF_CONVERTER = config('CONTRACT_PDF_CONVERTER', default='soffice')
+CONTRACT_PDF_CONVERTER_TIMEOUT = config('CONTRACT_PDF_CONVERTER_TIMEOUT', default=120, cast=int)
+
+# With the local backend, also upload the rendered files to the template's output folder
+CONTRACT_LOCAL_DRIVE_UPLOAD = config('CONTRACT_LOCAL_DRIVE_UPLOAD', default=True, cast=bool)
+
+
+# ===================================================
+# CONTRACT BATCH GENERATION
+# ===================================================
+
+# Maximum contracts per bulk generation request
+CONTRACT_BATCH_MAX_SIZE = config('CONTRACT_BATCH_MAX_SIZE', default=200, cast=int)
+
+# Contracts of a batch generated at once (parallel lanes), bounded by Google API quotas
+CONTRACT_BATCH_CONCURRENCY = config('CONTRACT_BATCH_CONCURRENCY', default=4, cast=int)
+
+# Seconds without progress after which a processing batch is finalized as stalled
+# (must exceed CELERY_TASK_TIME_LIMIT)
+CONTRACT_BATCH_STALE_AFTER = config('CONTRACT_BATCH_STALE_AFTER', default=45 * 60, cast=int)
+
+
+# ===================================================
+# GOOGLE API CLIENTS
+# ===================================================
+
+# Requests per window (seconds) for each Google API, shared by every process
+# through the cache. Docs allows 60 write requests per minute per user, and
+# all contracts are generated by one service account.
+GOOGLE_API_RATE_LIMITS = {
+    'drive': (config('GOOGLE_DRIVE_RATE_LIMIT', default=100, cast=int), 10),
+    'docs': (config('GOOGLE_DOCS_RATE_LIMIT', default=60, cast=int), 60),
+}
+
+# Retries of throttled (429/403 rate limit), 5xx and connection failures, with
+# exponential backoff and full jitter between GOOGLE_API_BACKOFF_BASE and _MAX seconds
+GOOGLE_API_MAX_RETRIES = config('GOOGLE_API_MAX_RETRIES', default=5, cast=int)
+GOOGLE_API_BACKOFF_BASE = config('GOOGLE_API_BACKOFF_BASE', default=1.0, cast=float)
+GOOGLE_API_BACKOFF_MAX = config('GOOGLE_API_BACKOFF_MAX', default=64.0, cast=float)
+
+# Socket timeout (seconds) of Google API connections
+GOOGLE_API_TIMEOUT = config('GOOGLE_API_TIMEOUT', default=60, cast=int)
+
+
+# ===================================================
+# AGGREGATE VIEW CACHE
+# ===================================================
+
+# Seconds to cache Song Hub / Track Preview payloads (0 disables caching).
+# Entries are versioned per work graph and invalidated by catalog signals.
+AGGREGATE_VIEW_CACHE_TIMEOUT = config('AGGREGATE_VIEW_CACHE_TIMEOUT', default=0, cast=int)
+
+
 # ===================================================
 # CHANNELS CONFIGURATION (WebSocket Support)
 # ===================================================
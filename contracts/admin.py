@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django import forms
 from .models import (
-    ContractTemplate, ContractTemplateVersion, Contract, ContractSignature,
+    ContractTemplate, ContractTemplateVersion, Contract, ContractBatch, ContractSignature,
     ContractScope, ContractRate, ShareType, ContractShare, WebhookEvent
 )
 
@@ -36,6 +36,14 @@ class ContractTemplateVersionAdmin(admin.ModelAdmin):
     readonly_fields = ['created_by', 'created_at']
 
 
+@admin.register(ContractBatch)
+class ContractBatchAdmin(admin.ModelAdmin):
+    list_display = ['id', 'template', 'status', 'total', 'created_by', 'created_at', 'completed_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['template__name', 'celery_task_id']
+    readonly_fields = ['template', 'department', 'status', 'total', 'celery_task_id', 'created_by', 'created_at', 'completed_at']
+
+
 @admin.register(Contract)
 class ContractAdmin(admin.ModelAdmin):
     list_display = ['contract_number', 'title', 'label_entity', 'template', 'status',
@@ -55,7 +63,7 @@ class ContractAdmin(admin.ModelAdmin):
             'fields': ('status', 'contract_type', 'term_start', 'term_end', 'territory', 'advance')
         }),
         ('Content & Documents', {
-            'fields': ('gdrive_file_id', 'gdrive_file_url', 'gdrive_pdf_file_id', 'gdrive_pdf_file_url'),
+            'fields': ('gdrive_file_id', 'gdrive_file_url', 'gdrive_pdf_file_id', 'gdrive_pdf_file_url', 'rendered_docx', 'rendered_pdf'),
             'classes': ('collapse',)
         }),
         ('Scopes & Rates', {
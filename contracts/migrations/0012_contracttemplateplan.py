@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0011_alter_contract_department_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContractTemplatePlan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gdrive_file_id', models.CharField(db_index=True, help_text='Google Drive file ID of the template', max_length=255)),
+                ('modified_time', models.CharField(help_text='Drive modifiedTime of the compiled revision', max_length=64)),
+                ('plan', models.JSONField(default=dict)),
+                ('compiled_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-compiled_at'],
+                'unique_together': {('gdrive_file_id', 'modified_time')},
+            },
+        ),
+    ]
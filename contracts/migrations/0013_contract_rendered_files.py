@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:00
+
+import contracts.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0012_contracttemplateplan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contract',
+            name='rendered_docx',
+            field=models.FileField(blank=True, help_text='Locally rendered contract (.docx)', storage=contracts.storage.private_storage, upload_to='contracts/rendered/'),
+        ),
+        migrations.AddField(
+            model_name='contract',
+            name='rendered_pdf',
+            field=models.FileField(blank=True, help_text='Locally rendered contract (PDF)', storage=contracts.storage.private_storage, upload_to='contracts/rendered/'),
+        ),
+    ]
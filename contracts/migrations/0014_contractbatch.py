@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_alter_departmentrequest_requested_department'),
+        ('contracts', '0013_contract_rendered_files'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContractBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('processing', 'Processing'), ('completed', 'Completed'), ('completed_with_errors', 'Completed with errors'), ('failed', 'Failed')], default='processing', max_length=30)),
+                ('total', models.PositiveIntegerField(default=0, help_text='Number of contracts in the batch')),
+                ('celery_task_id', models.CharField(blank=True, help_text='Celery task ID of the batch canvas', max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='contract_batches', to=settings.AUTH_USER_MODEL)),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='contract_batches', to='api.department')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='batches', to='contracts.contracttemplate')),
+            ],
+            options={
+                'verbose_name_plural': 'Contract batches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='contract',
+            name='batch',
+            field=models.ForeignKey(blank=True, help_text='Bulk generation job that created this contract', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='contracts', to='contracts.contractbatch'),
+        ),
+    ]
@@ -4,6 +4,7 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
 from identity.models import Entity
 from catalog.models import Work, Recording, Release
+from .storage import private_storage
 
 User = get_user_model()
 
@@ -72,6 +73,17 @@ class ContractTemplate(models.Model):
 
         return f"{self.series}-{next_number}"
 
+    def reserve_contract_numbers(self, count):
+        """
+        Reserve the next `count` contract numbers of this template's series in one step.
+        Uses the same yearly sequence as get_next_contract_number().
+        """
+        from sequences import get_next_values
+        from django.utils import timezone
+
+        sequence_name = f'contract_series_{self.series}_{timezone.now().year}'
+        return [f"{self.series}-{number}" for number in get_next_values(count, sequence_name)]
+
     def get_last_contract_number(self):
         """
         Get the last contract number generated for this series.
@@ -111,6 +123,86 @@ class ContractTemplateVersion(models.Model):
         return f"{self.template.name} v{self.version_number}"
 
 
+class ContractTemplatePlan(models.Model):
+    """
+    Compiled placeholder plan of one revision of a template document.
+    Lists the placeholders, conditional sections and gender/phrase forms the
+    document contains (see contracts.services.template_plan).
+    """
+    gdrive_file_id = models.CharField(max_length=255, db_index=True, help_text="Google Drive file ID of the template")
+    modified_time = models.CharField(max_length=64, help_text="Drive modifiedTime of the compiled revision")
+    plan = models.JSONField(default=dict)
+    compiled_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-compiled_at']
+        unique_together = ['gdrive_file_id', 'modified_time']
+
+    def __str__(self):
+        return f"Plan for {self.gdrive_file_id} @ {self.modified_time}"
+
+
+class ContractBatch(models.Model):
+    """
+    Bulk generation job: many contracts from one template, generated in parallel.
+    Progress is aggregated from the status of its contracts.
+    """
+    STATUS_CHOICES = [
+        ('processing', 'Processing'),
+        ('completed', 'Completed'),
+        ('completed_with_errors', 'Completed with errors'),
+        ('failed', 'Failed'),
+    ]
+
+    template = models.ForeignKey(ContractTemplate, on_delete=models.PROTECT, related_name='batches')
+    department = models.ForeignKey(
+        'api.Department',
+        on_delete=models.PROTECT,
+        related_name='contract_batches',
+        null=True,
+        blank=True
+    )
+    status = models.CharField(max_length=30, choices=STATUS_CHOICES, default='processing')
+    total = models.PositiveIntegerField(default=0, help_text="Number of contracts in the batch")
+    celery_task_id = models.CharField(max_length=255, blank=True, help_text="Celery task ID of the batch canvas")
+
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='contract_batches')
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = 'Contract batches'
+
+    def __str__(self):
+        return f"Batch {self.id} - {self.template.name} ({self.total} contracts)"
+
+    def get_progress(self, contracts=None):
+        """
+        Aggregate generation progress from the batch's contracts.
+
+        Args:
+            contracts: Optional queryset of the batch's contracts (defaults to all of them)
+
+        Returns:
+            dict: {'total', 'processing', 'succeeded', 'failed', 'percent'}
+        """
+        contracts = self.contracts.all() if contracts is None else contracts
+        counts = contracts.aggregate(
+            total=models.Count('id'),
+            processing=models.Count('id', filter=models.Q(status='processing')),
+            failed=models.Count('id', filter=models.Q(status='failed')),
+        )
+        done = counts['total'] - counts['processing']
+        return {
+            'total': counts['total'],
+            'processing': counts['processing'],
+            'succeeded': done - counts['failed'],
+            'failed': counts['failed'],
+            'percent': round(100 * done / counts['total']) if counts['total'] else 100,
+        }
+
+
 class Contract(models.Model):
     """
     Individual contract generated from a template.
@@ -159,6 +251,14 @@ class Contract(models.Model):
         null=True,
         blank=True
     )
+    batch = models.ForeignKey(
+        ContractBatch,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='contracts',
+        help_text="Bulk generation job that created this contract"
+    )
 
     # Contract identification
     contract_number = models.CharField(max_length=100, unique=True, help_text="Unique contract identifier")
@@ -244,6 +344,20 @@ class Contract(models.Model):
     )
     gdrive_pdf_file_url = models.URLField(blank=True, help_text="Google Drive file URL (PDF)")
 
+    # Locally rendered files (CONTRACT_RENDER_BACKEND = 'local')
+    rendered_docx = models.FileField(
+        upload_to='contracts/rendered/',
+        storage=private_storage,
+        blank=True,
+        help_text="Locally rendered contract (.docx)"
+    )
+    rendered_pdf = models.FileField(
+        upload_to='contracts/rendered/',
+        storage=private_storage,
+        blank=True,
+        help_text="Locally rendered contract (PDF)"
+    )
+
     # Public sharing
     is_public = models.BooleanField(default=False, help_text="Whether contract is publicly accessible")
     public_share_url = models.URLField(blank=True, help_text="Public sharing URL")
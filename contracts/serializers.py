@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import ContractTemplate, ContractTemplateVersion, Contract, ContractSignature, ContractTerms, ShareType, ContractShare
+from .models import ContractTemplate, ContractTemplateVersion, Contract, ContractBatch, ContractSignature, ContractTerms, ShareType, ContractShare
 from identity.models import Entity
 from identity.serializers import EntityListSerializer
 from .security_utils import redact_placeholder_values, mask_email
@@ -186,12 +186,12 @@ class ContractSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'template', 'template_name', 'template_version', 'template_version_number',
             'contract_number', 'title', 'contract_type', 'department', 'placeholder_values', 'gdrive_file_id',
-            'gdrive_file_url', 'gdrive_pdf_file_id', 'gdrive_pdf_file_url',
-            'is_public', 'public_share_url', 'status', 'celery_task_id', 'error_message',
+            'gdrive_file_url', 'gdrive_pdf_file_id', 'gdrive_pdf_file_url', 'rendered_docx', 'rendered_pdf',
+            'batch', 'is_public', 'public_share_url', 'status', 'celery_task_id', 'error_message',
             'dropbox_sign_request_id', 'created_by', 'created_by_email', 'created_at',
             'updated_at', 'signed_at', 'signatures', 'shares', 'contract_terms'
         ]
-        read_only_fields = ['contract_number', 'gdrive_file_id', 'gdrive_file_url', 'gdrive_pdf_file_id', 'gdrive_pdf_file_url', 'is_public', 'public_share_url', 'celery_task_id', 'error_message', 'dropbox_sign_request_id', 'created_by', 'created_at', 'updated_at', 'signed_at']
+        read_only_fields = ['contract_number', 'gdrive_file_id', 'gdrive_file_url', 'gdrive_pdf_file_id', 'gdrive_pdf_file_url', 'rendered_docx', 'rendered_pdf', 'batch', 'is_public', 'public_share_url', 'celery_task_id', 'error_message', 'dropbox_sign_request_id', 'created_by', 'created_at', 'updated_at', 'signed_at']
 
 
 class ContractCreateSerializer(serializers.Serializer):
@@ -408,3 +408,70 @@ class ContractGenerationSerializer(serializers.Serializer):
         generate_contract_async.delay(contract.id)
 
         return contract
+
+
+class ContractBatchRowSerializer(serializers.Serializer):
+    """
+    One contract of a bulk generation request (same fields as ContractGenerationSerializer).
+    """
+    entity_id = serializers.IntegerField()
+    contract_terms = ContractTermsSerializer()
+    contract_shares = serializers.ListField(
+        child=serializers.DictField(),
+        required=False,
+        default=list,
+        help_text="List of contract shares"
+    )
+    placeholder_overrides = serializers.JSONField(
+        required=False,
+        default=dict,
+        help_text="Additional placeholders or overrides"
+    )
+
+
+class ContractBatchGenerationSerializer(serializers.Serializer):
+    """
+    Serializer for bulk contract generation: one template, many entity/terms rows.
+    """
+    template_id = serializers.IntegerField()
+    rows = ContractBatchRowSerializer(many=True)
+
+    def validate_template_id(self, value):
+        try:
+            ContractTemplate.objects.get(id=value, is_active=True)
+        except ContractTemplate.DoesNotExist:
+            raise serializers.ValidationError("Active template not found.")
+        return value
+
+    def validate_rows(self, value):
+        from django.conf import settings
+
+        max_size = getattr(settings, 'CONTRACT_BATCH_MAX_SIZE', 200)
+        if not value:
+            raise serializers.ValidationError("At least one row is required.")
+        if len(value) > max_size:
+            raise serializers.ValidationError(f"Maximum {max_size} contracts per batch.")
+
+        entity_ids = {row['entity_id'] for row in value}
+        found = set(Entity.objects.filter(id__in=entity_ids).values_list('id', flat=True))
+        missing = sorted(entity_ids - found)
+        if missing:
+            raise serializers.ValidationError(f"Entities not found: {missing}")
+        return value
+
+
+class ContractBatchSerializer(serializers.ModelSerializer):
+    template_name = serializers.CharField(source='template.name', read_only=True)
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ContractBatch
+        fields = [
+            'id', 'template', 'template_name', 'status', 'total', 'progress',
+            'celery_task_id', 'created_by', 'created_at', 'completed_at'
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, obj):
+        """Progress over the contracts visible to the requester (context['contracts']), or all of them."""
+        return obj.get_progress(self.context.get('contracts'))
@@ -2,10 +2,12 @@
 Contract generation service.
 Handles placeholder replacement and document generation from templates.
 """
-from .google_drive import GoogleDriveService
-from googleapiclient.discovery import build
-from google.oauth2 import service_account
-from decouple import config
+from .google_clients import get_google_client
+from .google_drive import DOCX_MIME_TYPE, GOOGLE_DOC_MIME_TYPE, GoogleDriveService
+from .local_renderer import get_docx_template_plan
+from .template_plan import (
+    SECTION_PATTERN, compile_template, get_template_plan, placeholder_lookup_key, section_visible,
+)
 import tempfile
 import os
 import re
@@ -20,18 +22,11 @@ class ContractGeneratorService:
     def __init__(self):
         self.drive_service = GoogleDriveService()
 
-        # Initialize Google Docs API for document manipulation
-        service_account_file = config('GOOGLE_SERVICE_ACCOUNT_FILE', default='service-account.json')
-        credentials = service_account.Credentials.from_service_account_file(
-            service_account_file,
-            scopes=[
-                'https://www.googleapis.com/auth/drive',
-                'https://www.googleapis.com/auth/documents'
-            ]
-        )
-        self.docs_service = build('docs', 'v1', credentials=credentials)
+        # Google Docs API for document manipulation (process-wide, rate-limited client)
+        self.docs_service = get_google_client('docs')
 
-    def analyze_commission_patterns(self, commission_by_year, enabled_rights):
+    @staticmethod
+    def analyze_commission_patterns(commission_by_year, enabled_rights):
         """
         Analyze year-by-year commission data to detect uniform vs split patterns.
 
@@ -145,13 +140,6 @@ class ContractGeneratorService:
         import logging
         logger = logging.getLogger(__name__)
 
-        # Pattern: {{BEGIN:variable_name}} ... {{END:variable_name}}
-        # DOTALL makes . match newlines, so we can capture multi-line sections
-        section_pattern = re.compile(
-            r'\{\{\s*BEGIN\s*:\s*([a-zA-Z0-9_]+)\s*\}\}(.*?)\{\{\s*END\s*:\s*\1\s*\}\}',
-            re.DOTALL | re.IGNORECASE
-        )
-
         def replace_section(match):
             variable_name = match.group(1)
             section_content = match.group(2)
@@ -159,18 +147,8 @@ class ContractGeneratorService:
             # Get the value of the variable
             value = placeholder_values.get(variable_name, 0)
 
-            # Convert to number to check if it's 0
-            try:
-                if isinstance(value, str):
-                    numeric_value = float(value) if value else 0
-                else:
-                    numeric_value = float(value) if value is not None else 0
-            except (ValueError, TypeError):
-                # If can't convert, treat as boolean
-                numeric_value = 1 if value else 0
-
             # If value is 0, False, empty, or None → hide section (return empty string)
-            if numeric_value == 0 or value is None or value == '' or value is False:
+            if not section_visible(value):
                 logger.info(f"Hiding conditional section '{variable_name}' (value={value})")
                 return ''
 
@@ -179,7 +157,7 @@ class ContractGeneratorService:
             return section_content
 
         # Replace all conditional sections
-        result = section_pattern.sub(replace_section, document_text)
+        result = SECTION_PATTERN.sub(replace_section, document_text)
 
         # Check for unclosed sections (debugging aid)
         open_sections = re.findall(r'\{\{\s*BEGIN\s*:\s*([a-zA-Z0-9_]+)\s*\}\}', result)
@@ -223,20 +201,59 @@ class ContractGeneratorService:
         import logging
         logger = logging.getLogger(__name__)
 
-        # Step 1: Copy the template to create a new document
+        # Step 1: Copy the template (from the snapshot cache) to create a new document
+        template = self.drive_service.get_template_content(template_file_id)
         copy_result = self.drive_service.copy_file(
             file_id=template_file_id,
             new_name=output_file_name,
-            folder_id=output_folder_id
+            folder_id=output_folder_id,
+            template=template
         )
 
         new_file_id = copy_result['file_id']
 
-        # Step 2: Read document content (needed for pattern analysis)
-        logger.info("Reading document content...")
-        doc_text = self.get_document_text(new_file_id)
+        # Step 2: Load the template's compiled plan (the snapshot is only read the
+        # first time a template revision is used; compiled from the .docx like
+        # local rendering, so both backends share stored plans)
+        if template['mime_type'] in (GOOGLE_DOC_MIME_TYPE, DOCX_MIME_TYPE):
+            plan = get_docx_template_plan(template_file_id, template)
+        else:
+            plan = get_template_plan(
+                template_file_id,
+                template['modified_time'],
+                lambda: self.get_document_text(new_file_id)
+            )
+
+        # Step 3: Analyze commission patterns and resolve special placeholders
+        final_placeholders = self.resolve_placeholder_values(plan, placeholder_values)
+
+        # Step 4: Replace the placeholders present in the document
+        logger.info(f"Replacing placeholders ({len(plan['placeholders'])} in document)...")
+        self._replace_placeholders(new_file_id, final_placeholders, plan=plan)
+
+        # Step 5: Return the new document details
+        logger.info("Contract generation completed successfully")
+        return copy_result
+
+    @classmethod
+    def resolve_placeholder_values(cls, plan, placeholder_values):
+        """
+        Compute the final placeholder values of a contract for a template plan.
+
+        Shared by Google Docs and local rendering: adds the commission pattern
+        placeholders when year-by-year data is provided, then resolves the
+        date, gender and phrase placeholders listed in the plan.
+
+        Args:
+            plan: Compiled template plan (see template_plan.compile_template)
+            placeholder_values: Dict of placeholder key-value pairs
+
+        Returns:
+            Dict of placeholder key-value pairs to replace
+        """
+        import logging
+        logger = logging.getLogger(__name__)
 
-        # Step 3: Analyze commission patterns if year-by-year data provided
         all_placeholders = placeholder_values.copy()
 
         if 'commission_by_year' in placeholder_values:
@@ -244,7 +261,7 @@ class ContractGeneratorService:
             enabled_rights = placeholder_values.get('enabled_rights', {})
 
             logger.info("Analyzing commission patterns from year-by-year data...")
-            analyzed_placeholders = self.analyze_commission_patterns(
+            analyzed_placeholders = cls.analyze_commission_patterns(
                 commission_by_year,
                 enabled_rights
             )
@@ -253,21 +270,8 @@ class ContractGeneratorService:
             all_placeholders.update(analyzed_placeholders)
             logger.info(f"Added {len(analyzed_placeholders)} analyzed placeholders")
 
-        # Step 4: Process conditional sections (BEGIN/END)
-        logger.info("Processing conditional sections...")
-        doc_text_after_sections = self._process_conditional_sections(doc_text, all_placeholders)
-
-        # Step 5: Process special placeholders (gender, dates, phrases)
         logger.info("Processing special placeholders (gender, dates, phrases)...")
-        final_placeholders = self._process_special_placeholders(doc_text_after_sections, all_placeholders)
-
-        # Step 6: Replace all standard placeholders in the document
-        logger.info(f"Replacing {len(final_placeholders)} placeholders...")
-        self._replace_placeholders(new_file_id, final_placeholders)
-
-        # Step 7: Return the new document details
-        logger.info("Contract generation completed successfully")
-        return copy_result
+        return cls._resolve_special_placeholders(plan, all_placeholders)
 
     def _process_special_placeholders(self, document_text, placeholder_values):
         """
@@ -280,6 +284,20 @@ class ContractGeneratorService:
         Returns:
             Updated placeholder dict with gender placeholders resolved
         """
+        return self._resolve_special_placeholders(compile_template(document_text), placeholder_values)
+
+    @staticmethod
+    def _resolve_special_placeholders(plan, placeholder_values):
+        """
+        Resolve the special placeholders of a compiled template plan.
+
+        Args:
+            plan: Compiled template plan (see template_plan.compile_template)
+            placeholder_values: Original placeholder dict
+
+        Returns:
+            Updated placeholder dict with date, gender and phrase placeholders resolved
+        """
         import logging
         logger = logging.getLogger(__name__)
 
@@ -299,22 +317,11 @@ class ContractGeneratorService:
             logger.warning("No entity gender found in placeholders, gender placeholders may not work correctly")
             return processed
 
-        # Gender placeholder pattern: {{entity.gender:masculine:feminine}} or {{entity.gender:masculine:feminine:neuter}}
-        # Pattern supports both with and without spaces
-        gender_pattern = re.compile(
-            r'\{\{\s*entity\.gender\s*:\s*([^:}]+)\s*:\s*([^:}]+)\s*(?::\s*([^}]+))?\s*\}\}',
-            re.IGNORECASE
-        )
-
-        # Find all gender placeholders in document
-        matches = gender_pattern.findall(document_text)
-
-        logger.info(f"Found {len(matches)} gender placeholders in document")
+        logger.info(f"Found {len(plan['genders'])} gender placeholders in document")
 
-        for match in matches:
-            masculine = match[0].strip()
-            feminine = match[1].strip()
-            neuter = match[2].strip() if match[2] else masculine  # Default to masculine if neuter not provided
+        for gender in plan['genders']:
+            masculine, feminine = gender['forms'][:2]
+            neuter = gender['forms'][2] if len(gender['forms']) > 2 else masculine  # Default to masculine if neuter not provided
 
             # Select word based on gender
             if entity_gender == 'M':
@@ -324,13 +331,7 @@ class ContractGeneratorService:
             else:  # 'O' or missing -> use neuter (or masculine if only 2 forms)
                 selected_word = neuter
 
-            # Create placeholder key for this specific gender placeholder
-            # We need to reconstruct the exact placeholder to replace it
-            if match[2]:  # 3 forms
-                placeholder_key = f"entity.gender:{masculine}:{feminine}:{neuter}"
-            else:  # 2 forms
-                placeholder_key = f"entity.gender:{masculine}:{feminine}"
-
+            placeholder_key = gender['key']
             processed[placeholder_key] = selected_word
 
             logger.info(f"Gender placeholder '{placeholder_key}' -> '{selected_word}' (gender={entity_gender})")
@@ -338,19 +339,10 @@ class ContractGeneratorService:
         # Process phrase placeholders with pluralization
         # Pattern: {{variable.phrase:singular {n}:plural {n}}}
         # The {n} will be replaced with the actual number value
-        phrase_pattern = re.compile(
-            r'\{\{\s*([a-zA-Z0-9_]+)\.phrase\s*:\s*([^:}]+)\s*:\s*([^}]+)\s*\}\}',
-            re.IGNORECASE
-        )
-
-        phrase_matches = phrase_pattern.findall(document_text)
+        logger.info(f"Found {len(plan['phrases'])} phrase placeholders in document")
 
-        logger.info(f"Found {len(phrase_matches)} phrase placeholders in document")
-
-        for match in phrase_matches:
-            variable_name = match[0].strip()
-            singular_phrase = match[1].strip()
-            plural_phrase = match[2].strip()
+        for phrase in plan['phrases']:
+            variable_name = phrase['variable']
 
             # Get the numeric value
             value = placeholder_values.get(variable_name, 0)
@@ -362,29 +354,28 @@ class ContractGeneratorService:
 
             # Select phrase based on value (1 = singular, anything else = plural)
             if numeric_value == 1:
-                selected_phrase = singular_phrase
+                selected_phrase = phrase['singular']
             else:
-                selected_phrase = plural_phrase
+                selected_phrase = phrase['plural']
 
             # Replace {n} with actual number in the selected phrase
             selected_phrase = selected_phrase.replace('{n}', str(numeric_value))
 
-            # Create placeholder key for this specific phrase placeholder
-            # We need to match the exact pattern in the document
-            placeholder_key = f"{variable_name}.phrase:{singular_phrase}:{plural_phrase}"
-            processed[placeholder_key] = selected_phrase
+            processed[phrase['key']] = selected_phrase
 
             logger.info(f"Phrase placeholder '{variable_name}.phrase' -> '{selected_phrase}' (value={numeric_value})")
 
         return processed
 
-    def _replace_placeholders(self, document_id, placeholder_values):
+    def _replace_placeholders(self, document_id, placeholder_values, plan=None):
         """
         Replace placeholders in a Google Docs document.
 
         Args:
             document_id: Google Docs document ID
             placeholder_values: Dict of placeholder key-value pairs
+            plan: Optional compiled template plan; when given, special forms
+                  (gender, phrase) are replaced only as written in the document
         """
         import logging
         logger = logging.getLogger(__name__)
@@ -398,17 +389,21 @@ class ContractGeneratorService:
             # Strip braces from key if they were included (handle incorrect template definitions)
             clean_key = key.strip('{}').strip()
 
-            # Try multiple placeholder formats to handle different spacing
-            # Format 1: {{key}} (no spaces)
-            placeholder_no_space = f"{{{{{clean_key}}}}}"
-
-            # Format 2: {{ key }} (with spaces)
-            placeholder_with_space = f"{{{{ {clean_key} }}}}"
-
-            logger.info(f"Replacing placeholder '{placeholder_no_space}' (and variants) with value '{replacement_value}'")
-
-            # Add replacement for both formats
-            for placeholder_format in [placeholder_no_space, placeholder_with_space]:
+            placeholder_formats = []
+            if plan is None or ':' not in clean_key:
+                # Try multiple placeholder formats to handle different spacing
+                # Format 1: {{key}} (no spaces)
+                # Format 2: {{ key }} (with spaces)
+                placeholder_formats = [f"{{{{{clean_key}}}}}", f"{{{{ {clean_key} }}}}"]
+                logger.info(f"Replacing placeholder '{placeholder_formats[0]}' (and variants) with value '{replacement_value}'")
+
+            if plan is not None:
+                # Plus the exact tokens written in the document (other spacings, special forms)
+                for token in plan['tokens'].get(placeholder_lookup_key(key), []):
+                    if token not in placeholder_formats:
+                        placeholder_formats.append(token)
+
+            for placeholder_format in placeholder_formats:
                 requests.append({
                     'replaceAllText': {
                         'containsText': {
@@ -438,8 +433,9 @@ class ContractGeneratorService:
 
     def get_document_text(self, document_id):
         """
-        Retrieve all text content from a Google Docs document.
-        Useful for debugging placeholder issues.
+        Retrieve all text content from a Google Docs document: the body
+        (including tables and tables of contents), headers, footers and
+        footnotes. Read errors are raised.
 
         Args:
             document_id: Google Docs document ID
@@ -450,23 +446,31 @@ class ContractGeneratorService:
         import logging
         logger = logging.getLogger(__name__)
 
-        try:
-            document = self.docs_service.documents().get(documentId=document_id).execute()
-            doc_content = document.get('body', {}).get('content', [])
+        document = self.docs_service.documents().get(documentId=document_id).execute()
+
+        text_parts = []
 
-            text_parts = []
-            for element in doc_content:
+        def walk(content):
+            for element in content:
                 if 'paragraph' in element:
                     for text_run in element['paragraph'].get('elements', []):
                         if 'textRun' in text_run:
                             text_parts.append(text_run['textRun'].get('content', ''))
-
-            full_text = ''.join(text_parts)
-            logger.info(f"Document text preview (first 500 chars): {full_text[:500]}")
-            return full_text
-        except Exception as e:
-            logger.error(f"Error reading document text: {str(e)}")
-            return ""
+                elif 'table' in element:
+                    for row in element['table'].get('tableRows', []):
+                        for cell in row.get('tableCells', []):
+                            walk(cell.get('content', []))
+                elif 'tableOfContents' in element:
+                    walk(element['tableOfContents'].get('content', []))
+
+        walk(document.get('body', {}).get('content', []))
+        for segments in ('headers', 'footers', 'footnotes'):
+            for segment in document.get(segments, {}).values():
+                walk(segment.get('content', []))
+
+        full_text = ''.join(text_parts)
+        logger.info(f"Document text preview (first 500 chars): {full_text[:500]}")
+        return full_text
 
     def export_as_pdf(self, document_id, output_path=None):
         """
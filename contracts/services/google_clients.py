@@ -0,0 +1,313 @@
+"""
+Process-wide Google API client manager for Drive and Docs.
+
+Building a client used to read the service-account JSON, parse the discovery
+document and open new HTTPS connections on every service instantiation (once
+per Celery task, once per view call). The manager instead keeps:
+- credentials per scope set, loaded once per process
+- discovery documents, loaded once per process from the library's static copies
+- one authorized HTTP connection and client per thread (httplib2 is not
+  thread-safe), rebuilt after a fork so workers never share sockets
+
+Every request executed through a managed client goes through quota control
+shared by all processes through the cache (Redis):
+- a token bucket per API (GOOGLE_API_RATE_LIMITS: requests per window); when
+  the window's tokens are spent callers wait for the next window
+- exponential backoff with full jitter on 429 and rate-limit 403s, up to
+  GOOGLE_API_MAX_RETRIES retries; a throttled response also sets a shared
+  cooldown so other workers pause instead of piling on more retries
+- 5xx and connection errors are retried the same way for idempotent (read)
+  requests only: a copy or create that timed out may have been applied, and
+  resending it would leave a duplicate document in Drive
+
+Cache outages disable the limiter (requests go straight through) rather than
+failing generation.
+
+Usage:
+    drive = get_google_client('drive')
+    drive.files().get(fileId=file_id).execute()  # rate limited, retried
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from functools import partial
+
+from decouple import config
+from django.conf import settings
+from django.core.cache import cache
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+
+from api.cache import make_key
+
+logger = logging.getLogger(__name__)
+
+
+# api name -> (version, scopes)
+GOOGLE_APIS = {
+    'drive': ('v3', ('https://www.googleapis.com/auth/drive',)),
+    'docs': ('v1', ('https://www.googleapis.com/auth/drive', 'https://www.googleapis.com/auth/documents')),
+}
+
+# Rejected before being applied: safe to resend any request
+THROTTLED_STATUSES = {429}
+
+# Outcome unknown: only resent for idempotent requests
+SERVER_ERROR_STATUSES = {500, 502, 503, 504}
+
+IDEMPOTENT_METHODS = ('GET', 'HEAD')
+
+# 403 reasons Google uses for quota throttling (as opposed to permission errors)
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+
+_lock = threading.Lock()
+_credentials = {}
+_discovery_documents = {}
+_local = threading.local()
+
+
+def rate_limits():
+    """Return {api: (requests, window seconds)}; an API without a limit is not throttled."""
+    return {
+        'drive': (100, 10),
+        'docs': (60, 60),
+        **getattr(settings, 'GOOGLE_API_RATE_LIMITS', {}),
+    }
+
+
+def retry_settings():
+    """Return (max retries, base delay seconds, max delay seconds) of the backoff."""
+    return (
+        getattr(settings, 'GOOGLE_API_MAX_RETRIES', 5),
+        getattr(settings, 'GOOGLE_API_BACKOFF_BASE', 1.0),
+        getattr(settings, 'GOOGLE_API_BACKOFF_MAX', 64.0),
+    )
+
+
+# ==================== Clients ====================
+
+def get_credentials(scopes):
+    """
+    Return the service-account credentials for a scope set, loaded once per process.
+
+    Args:
+        scopes: Tuple of OAuth scopes
+    """
+    from google.oauth2 import service_account
+
+    with _lock:
+        if scopes not in _credentials:
+            service_account_file = config('GOOGLE_SERVICE_ACCOUNT_FILE', default='service-account.json')
+            _credentials[scopes] = service_account.Credentials.from_service_account_file(
+                service_account_file,
+                scopes=list(scopes)
+            )
+        return _credentials[scopes]
+
+
+def get_discovery_document(api, version):
+    """Return an API's discovery document, read once per process from the bundled copy."""
+    from googleapiclient.discovery_cache import get_static_doc
+
+    with _lock:
+        if (api, version) not in _discovery_documents:
+            document = get_static_doc(api, version)
+            if document is None:
+                raise Exception(f'No bundled discovery document for {api} {version}')
+            _discovery_documents[(api, version)] = json.loads(document)
+        return _discovery_documents[(api, version)]
+
+
+def get_google_client(api):
+    """
+    Return this thread's client for a Google API ('drive' or 'docs').
+
+    Clients and their authorized HTTP connections are created once per thread
+    and process, then reused.
+
+    Args:
+        api: Key of GOOGLE_APIS
+
+    Returns:
+        googleapiclient Resource whose requests are rate limited and retried
+    """
+    import google_auth_httplib2
+    import httplib2
+    from googleapiclient.discovery import build_from_document
+
+    if getattr(_local, 'pid', None) != os.getpid():
+        # New thread, or a forked worker that must not reuse its parent's sockets
+        _local.pid = os.getpid()
+        _local.clients = {}
+
+    if api not in _local.clients:
+        version, scopes = GOOGLE_APIS[api]
+        http = google_auth_httplib2.AuthorizedHttp(
+            get_credentials(scopes),
+            http=httplib2.Http(timeout=getattr(settings, 'GOOGLE_API_TIMEOUT', 60))
+        )
+        _local.clients[api] = build_from_document(
+            get_discovery_document(api, version),
+            http=http,
+            requestBuilder=partial(ManagedHttpRequest, api=api)
+        )
+    return _local.clients[api]
+
+
+def reset_google_clients():
+    """Drop cached credentials, documents and this thread's clients (e.g. after rotating the key)."""
+    with _lock:
+        _credentials.clear()
+        _discovery_documents.clear()
+    _local.clients = {}
+
+
+class ManagedHttpRequest(HttpRequest):
+    """
+    HttpRequest executed through the shared rate limiter and backoff.
+    """
+
+    def __init__(self, *args, api='google', **kwargs):
+        super().__init__(*args, **kwargs)
+        self.api = api
+
+    def execute(self, http=None, num_retries=0):
+        return call_with_backoff(
+            self.api,
+            lambda: super(ManagedHttpRequest, self).execute(http=http),
+            idempotent=self.method.upper() in IDEMPOTENT_METHODS
+        )
+
+
+# ==================== Quota Control ====================
+
+def _cooldown_key(api):
+    return make_key('google_api', api, 'cooldown')
+
+
+def _bucket_key(api, window):
+    return make_key('google_api', api, 'bucket', window)
+
+
+def acquire_token(api):
+    """
+    Wait until a request to an API may be sent.
+
+    Honors the shared cooldown set after throttled responses, then takes a
+    token from the API's bucket, sleeping until the next window when empty.
+
+    Args:
+        api: API name
+    """
+    requests, window_seconds = rate_limits().get(api, (None, None))
+
+    while True:
+        try:
+            cooldown_until = cache.get(_cooldown_key(api))
+            if cooldown_until and cooldown_until > time.time():
+                time.sleep(max(0, cooldown_until - time.time()))
+                continue
+
+            if not requests:
+                return
+
+            window = int(time.time() // window_seconds)
+            key = _bucket_key(api, window)
+            cache.add(key, 0, timeout=window_seconds * 2)
+            if cache.incr(key) <= requests:
+                return
+        except Exception as e:
+            # The limiter is an optimization; never block requests on a cache outage
+            logger.warning(f"Google API limiter unavailable, sending {api} request unthrottled: {e}")
+            return
+
+        # Bucket empty: wait for the next window (jittered so waiters don't stampede)
+        time.sleep(max(0, (window + 1) * window_seconds - time.time() + random.uniform(0, 0.1 * window_seconds)))
+
+
+def backoff_delay(attempt, retry_after=None):
+    """
+    Return the delay before a retry: exponential with full jitter, or Retry-After when given.
+
+    Args:
+        attempt: Retry number (0 for the first retry)
+        retry_after: Retry-After header value in seconds, if any
+    """
+    _max_retries, base, cap = retry_settings()
+    if retry_after:
+        try:
+            return min(cap, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def is_retryable(error, idempotent=True):
+    """
+    Return True if a failed Google API call may be resent.
+
+    Throttled requests were rejected unapplied and are always retryable;
+    server and connection errors only for idempotent requests.
+
+    Args:
+        error: Exception raised by the call
+        idempotent: Whether resending the request cannot apply it twice
+    """
+    if isinstance(error, HttpError):
+        status_code = error.resp.status
+        if status_code in THROTTLED_STATUSES:
+            return True
+        if status_code in SERVER_ERROR_STATUSES:
+            return idempotent
+        content = error.content.decode('utf-8', 'replace') if isinstance(error.content, bytes) else str(error.content)
+        return status_code == 403 and any(reason in content for reason in RATE_LIMIT_REASONS)
+    return idempotent and isinstance(error, (ConnectionError, TimeoutError))
+
+
+def _extend_cooldown(api, delay):
+    """Make every worker pause requests to an API for `delay` seconds."""
+    until = time.time() + delay
+    try:
+        current = cache.get(_cooldown_key(api))
+        if not current or current < until:
+            cache.set(_cooldown_key(api), until, timeout=int(delay) + 1)
+    except Exception as e:
+        logger.warning(f"Could not share Google API cooldown: {e}")
+
+
+def call_with_backoff(api, send, idempotent=False):
+    """
+    Send a Google API request through the rate limiter, retrying transient failures.
+
+    Args:
+        api: API name (rate limit and cooldown bucket)
+        send: Zero-argument callable performing the request
+        idempotent: Whether the request may be resent after server or
+                    connection errors (see is_retryable)
+
+    Returns:
+        The request's result
+    """
+    max_retries, _base, _cap = retry_settings()
+
+    for attempt in range(max_retries + 1):
+        acquire_token(api)
+        try:
+            return send()
+        except Exception as e:
+            if attempt == max_retries or not is_retryable(e, idempotent):
+                raise
+
+            retry_after = e.resp.get('retry-after') if isinstance(e, HttpError) else None
+            delay = backoff_delay(attempt, retry_after)
+            if isinstance(e, HttpError) and e.resp.status in (403, 429):
+                _extend_cooldown(api, delay)
+
+            logger.warning(
+                f"Google {api} request failed ({e.__class__.__name__}), retry {attempt + 1}/{max_retries} in {delay:.1f}s"
+            )
+            time.sleep(delay)
@@ -2,15 +2,18 @@
 Google Drive API integration for contract templates and storage.
 Uses Service Account authentication.
 """
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload, MediaIoBaseUpload
 from googleapiclient.errors import HttpError
-from decouple import config
 import io
 import json
 from pathlib import Path
 
+from .google_clients import call_with_backoff, get_google_client
+from .template_cache import get_template_snapshot
+
+GOOGLE_DOC_MIME_TYPE = 'application/vnd.google-apps.document'
+DOCX_MIME_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
 
 class GoogleDriveService:
     """
@@ -21,17 +24,9 @@ class GoogleDriveService:
 
     def __init__(self):
         """
-        Initialize Google Drive service with service account credentials.
+        Initialize Google Drive service with the process-wide, rate-limited client.
         """
-        # Load service account credentials from JSON file
-        service_account_file = config('GOOGLE_SERVICE_ACCOUNT_FILE', default='service-account.json')
-
-        credentials = service_account.Credentials.from_service_account_file(
-            service_account_file,
-            scopes=self.SCOPES
-        )
-
-        self.service = build('drive', 'v3', credentials=credentials)
+        self.service = get_google_client('drive')
 
     def get_file(self, file_id):
         """
@@ -69,7 +64,8 @@ class GoogleDriveService:
 
             done = False
             while not done:
-                status, done = downloader.next_chunk()
+                # Media chunks bypass HttpRequest.execute; send them through the limiter too
+                status, done = call_with_backoff('drive', downloader.next_chunk, idempotent=True)
 
             return file_content.getvalue()
         except HttpError as error:
@@ -110,7 +106,8 @@ class GoogleDriveService:
         except HttpError as error:
             raise Exception(f'Error uploading file: {error}')
 
-    def upload_file_content(self, content, file_name, folder_id=None, mime_type='application/pdf'):
+    def upload_file_content(self, content, file_name, folder_id=None, mime_type='application/pdf',
+                            target_mime_type=None):
         """
         Upload file content directly to Google Drive (from memory).
 
@@ -119,6 +116,8 @@ class GoogleDriveService:
             file_name: Name for the file in Google Drive
             folder_id: Optional folder ID to upload to
             mime_type: MIME type of the file
+            target_mime_type: Optional Google Workspace type to convert to
+                              (e.g. a .docx uploaded as a Google Doc)
 
         Returns:
             File ID and web view link dict
@@ -126,6 +125,9 @@ class GoogleDriveService:
         try:
             file_metadata = {'name': file_name}
 
+            if target_mime_type:
+                file_metadata['mimeType'] = target_mime_type
+
             if folder_id:
                 file_metadata['parents'] = [folder_id]
 
@@ -182,97 +184,107 @@ class GoogleDriveService:
         except HttpError as error:
             raise Exception(f'Error copying file: {error}')
 
-    def copy_file(self, file_id, new_name, folder_id=None):
+    def export_file(self, file_id, mime_type):
         """
-        Create a copy of a file in Google Drive by downloading and re-uploading.
-        This method avoids quota issues with the copy API.
+        Export a Google Workspace file (e.g. a Google Doc) to another format.
 
         Args:
-            file_id: ID of the file to copy
-            new_name: Name for the copied file
-            folder_id: Optional folder ID to copy to
+            file_id: Google Drive file ID
+            mime_type: MIME type to export to
 
         Returns:
-            New file ID and web view link dict
+            Exported content as bytes
+        """
+        try:
+            request = self.service.files().export_media(fileId=file_id, mimeType=mime_type)
+            file_content = io.BytesIO()
+            downloader = MediaIoBaseDownload(file_content, request)
+
+            done = False
+            while not done:
+                # Media chunks bypass HttpRequest.execute; send them through the limiter too
+                status, done = call_with_backoff('drive', downloader.next_chunk, idempotent=True)
+
+            return file_content.getvalue()
+        except HttpError as error:
+            raise Exception(f'Error exporting file: {error}')
+
+    def get_template_content(self, file_id):
+        """
+        Get a template's content from the template snapshot cache, exporting
+        Google Docs as .docx and downloading other files on a miss.
+
+        Args:
+            file_id: Google Drive file ID of the template
+
+        Returns:
+            Dict with content (bytes), mime_type (of the Drive file) and modified_time
         """
         try:
-            # Get file metadata to determine type
+            # Get file metadata to determine type and revision
             file_meta = self.service.files().get(
                 fileId=file_id,
-                fields='mimeType'
+                fields='mimeType, modifiedTime'
             ).execute()
+        except HttpError as error:
+            raise Exception(f'Error getting file: {error}')
 
-            mime_type = file_meta.get('mimeType')
-
-            # For Google Docs, export as .docx then import back as Google Doc
-            if mime_type == 'application/vnd.google-apps.document':
-                # Export as .docx
-                request = self.service.files().export_media(
-                    fileId=file_id,
-                    mimeType='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-                )
-
-                file_content = io.BytesIO()
-                downloader = MediaIoBaseDownload(file_content, request)
-
-                done = False
-                while not done:
-                    status, done = downloader.next_chunk()
-
-                # Upload back as Google Doc
-                file_metadata = {
-                    'name': new_name,
-                    'mimeType': 'application/vnd.google-apps.document'
-                }
-
-                if folder_id:
-                    file_metadata['parents'] = [folder_id]
-
-                media = MediaIoBaseUpload(
-                    file_content,
-                    mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-                    resumable=True
-                )
-
-                file = self.service.files().create(
-                    body=file_metadata,
-                    media_body=media,
-                    fields='id, webViewLink',
-                    supportsAllDrives=True
-                ).execute()
-
-                return {
-                    'file_id': file.get('id'),
-                    'web_view_link': file.get('webViewLink')
-                }
-            else:
-                # For regular files, download and re-upload
-                file_content = self.download_file(file_id)
-
-                file_metadata = {'name': new_name}
-                if folder_id:
-                    file_metadata['parents'] = [folder_id]
-
-                media = MediaIoBaseUpload(
-                    io.BytesIO(file_content),
-                    mimetype=mime_type,
-                    resumable=True
-                )
-
-                file = self.service.files().create(
-                    body=file_metadata,
-                    media_body=media,
-                    fields='id, webViewLink',
-                    supportsAllDrives=True
-                ).execute()
-
-                return {
-                    'file_id': file.get('id'),
-                    'web_view_link': file.get('webViewLink')
-                }
+        mime_type = file_meta.get('mimeType')
+        modified_time = file_meta.get('modifiedTime')
 
-        except HttpError as error:
-            raise Exception(f'Error copying file: {error}')
+        if mime_type == GOOGLE_DOC_MIME_TYPE:
+            fetch = lambda: self.export_file(file_id, DOCX_MIME_TYPE)
+        else:
+            fetch = lambda: self.download_file(file_id)
+
+        return {
+            'content': get_template_snapshot(file_id, modified_time, fetch),
+            'mime_type': mime_type,
+            'modified_time': modified_time
+        }
+
+    def copy_file(self, file_id, new_name, folder_id=None, template=None):
+        """
+        Create a copy of a file in Google Drive by downloading and re-uploading.
+        This method avoids quota issues with the copy API.
+
+        The downloaded (or exported) content is kept in the template snapshot
+        cache, keyed by the file's modifiedTime, so copying an unchanged
+        template again only uploads.
+
+        Args:
+            file_id: ID of the file to copy
+            new_name: Name for the copied file
+            folder_id: Optional folder ID to copy to
+            template: Optional result of get_template_content(file_id), when
+                      the caller already has it
+
+        Returns:
+            New file ID, web view link and the source's modifiedTime dict
+        """
+        if template is None:
+            template = self.get_template_content(file_id)
+
+        if template['mime_type'] == GOOGLE_DOC_MIME_TYPE:
+            # For Google Docs, upload the .docx export back as Google Doc
+            result = self.upload_file_content(
+                template['content'],
+                new_name,
+                folder_id=folder_id,
+                mime_type=DOCX_MIME_TYPE,
+                target_mime_type=GOOGLE_DOC_MIME_TYPE
+            )
+        else:
+            # For regular files, re-upload the downloaded content
+            result = self.upload_file_content(
+                template['content'],
+                new_name,
+                folder_id=folder_id,
+                mime_type=template['mime_type']
+            )
+
+        result['modified_time'] = template['modified_time']
+        return result
 
     def create_folder(self, folder_name, parent_folder_id=None):
         """
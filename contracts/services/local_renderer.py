@@ -0,0 +1,470 @@
+"""
+Local rendering engine for contracts.
+
+Google Docs rendering copies the template in Drive and edits the copy through
+the Docs API: five or more sequential round trips per contract. This engine
+fills the template's cached .docx (see template_cache) in process instead,
+with the same semantics as ContractGeneratorService (compiled placeholder
+plans, conditional sections, gender/phrase/date placeholders, commission
+pattern analysis) and converts it to PDF with LibreOffice, so numbering,
+headers, footers and styles come out as in Word. Uploading the results to
+Drive is an optional last step.
+
+A .docx is a zip of WordprocessingML parts; document, header, footer and
+note parts are edited with ElementTree and every other part is copied unchanged.
+Placeholders split across runs (Word does this freely) are matched on the
+paragraph's whole text; a replacement takes the formatting of the run where
+the placeholder starts and text outside placeholders keeps its own runs.
+
+Usage:
+    renderer = LocalContractRenderer()
+    result = renderer.generate_contract(template_file_id, output_folder_id, 'HAHM-1_Contract', values)
+    result['docx'], result['pdf']
+"""
+
+import io
+import logging
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+
+from django.conf import settings
+
+from .google_drive import DOCX_MIME_TYPE, GOOGLE_DOC_MIME_TYPE
+from .template_plan import get_template_plan, placeholder_lookup_key, section_visible
+
+logger = logging.getLogger(__name__)
+
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W = f'{{{W_NS}}}'
+XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+# Parts of a .docx whose text may contain placeholders
+TEXT_PART_PATTERN = re.compile(r'^word/(document|header\d*|footer\d*|footnotes|endnotes)\.xml$')
+
+# A single {{BEGIN:name}} or {{END:name}} marker
+MARKER_PATTERN = re.compile(r'\{\{\s*(BEGIN|END)\s*:\s*([a-zA-Z0-9_]+)\s*\}\}', re.IGNORECASE)
+
+
+def local_drive_upload():
+    """Return True if locally rendered contracts are also uploaded to Drive by default."""
+    return getattr(settings, 'CONTRACT_LOCAL_DRIVE_UPLOAD', True)
+
+
+# ==================== WordprocessingML ====================
+
+def _register_namespaces(xml_bytes):
+    """Register a part's namespace prefixes so ElementTree writes them back unchanged."""
+    for _event, (prefix, uri) in ET.iterparse(io.BytesIO(xml_bytes), events=['start-ns']):
+        ET.register_namespace(prefix, uri)
+
+
+def _serialize(root, original):
+    """
+    Serialize an edited part, keeping the original root start tag.
+
+    ElementTree drops namespace declarations it doesn't use, but Word resolves
+    prefixes listed in mc:Ignorable and reports the file as corrupt without them.
+    """
+    xml = ET.tostring(root, encoding='unicode')
+    original_text = original.decode('utf-8')
+    original_root = re.search(r'<(?!\?)[^>]+>', original_text).group(0)
+    xml = re.sub(r'<(?!\?)[^>]+>', lambda _match: original_root, xml, count=1)
+    return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n' + xml).encode('utf-8')
+
+
+def _text_elements(paragraph):
+    """Return a paragraph's own w:t elements (direct runs and hyperlinks, not nested text boxes)."""
+    return paragraph.findall(f'{W}r/{W}t') + paragraph.findall(f'{W}hyperlink/{W}r/{W}t')
+
+
+def _paragraph_text(paragraph):
+    return ''.join(element.text or '' for element in _text_elements(paragraph))
+
+
+def _replace_ranges(paragraph, ranges):
+    """
+    Replace ranges of a paragraph's text in place.
+
+    A replacement goes into the run where its range starts and the rest of
+    the range is cut from the following runs, so the text around it keeps the
+    formatting of its own runs.
+
+    Args:
+        paragraph: w:p element
+        ranges: [(start, end, replacement)] in paragraph text offsets, sorted
+                and not overlapping
+    """
+    elements = _text_elements(paragraph)
+    starts = []
+    offset = 0
+    for element in elements:
+        starts.append(offset)
+        offset += len(element.text or '')
+
+    # Right to left, so the offsets of the ranges still to edit stay valid
+    for start, end, replacement in reversed(ranges):
+        first = True
+        for element, element_start in zip(elements, starts):
+            text = element.text or ''
+            if element_start >= end or element_start + len(text) <= start:
+                continue
+            local_start = max(start - element_start, 0)
+            local_end = min(end - element_start, len(text))
+            element.text = text[:local_start] + (replacement if first else '') + text[local_end:]
+            element.set(XML_SPACE, 'preserve')
+            first = False
+
+
+def _paired_markers(paragraph_texts):
+    """
+    Return the positions of section markers that have a matching partner.
+
+    Unmatched markers are left in the document as text, as the Google Docs
+    path does.
+
+    Returns:
+        set: {(paragraph index, marker start)}
+    """
+    open_markers = []
+    paired = set()
+    for index, text in enumerate(paragraph_texts):
+        for match in MARKER_PATTERN.finditer(text):
+            name = match.group(2).lower()
+            if match.group(1).upper() == 'BEGIN':
+                open_markers.append((name, (index, match.start())))
+                continue
+            for position in range(len(open_markers) - 1, -1, -1):
+                if open_markers[position][0] == name:
+                    paired.add(open_markers.pop(position)[1])
+                    paired.add((index, match.start()))
+                    break
+    return paired
+
+
+def apply_conditional_sections(paragraphs, placeholder_values, parents):
+    """
+    Remove hidden conditional sections and every section marker.
+
+    Sections may span paragraphs and nest. Paragraphs left empty by the
+    removal are deleted (kept but emptied when a table cell needs them).
+
+    Args:
+        paragraphs: w:p elements in document order
+        placeholder_values: Dict of placeholder key-value pairs
+        parents: {element: parent element}
+    """
+    texts = [_paragraph_text(paragraph) for paragraph in paragraphs]
+    paired = _paired_markers(texts)
+
+    sections = []  # stack of (name, visible)
+    for index, paragraph in enumerate(paragraphs):
+        text = texts[index]
+        hidden = any(not visible for _name, visible in sections)
+        touched = hidden
+        removed = []
+        position = 0
+
+        for match in MARKER_PATTERN.finditer(text):
+            if (index, match.start()) not in paired:
+                continue
+            if hidden and position < match.start():
+                removed.append((position, match.start(), ''))
+            removed.append((match.start(), match.end(), ''))
+            position = match.end()
+            touched = True
+
+            name = match.group(2)
+            if match.group(1).upper() == 'BEGIN':
+                sections.append((name, section_visible(placeholder_values.get(name, 0))))
+            else:
+                for stack_index in range(len(sections) - 1, -1, -1):
+                    if sections[stack_index][0].lower() == name.lower():
+                        del sections[stack_index]
+                        break
+            hidden = any(not visible for _name, visible in sections)
+
+        if not touched:
+            continue
+        if hidden and position < len(text):
+            removed.append((position, len(text), ''))
+        bounds = [0] + [offset for start, end, _text in removed for offset in (start, end)] + [len(text)]
+        new_text = ''.join(text[bounds[i]:bounds[i + 1]] for i in range(0, len(bounds), 2))
+
+        if new_text.strip():
+            _replace_ranges(paragraph, removed)
+            continue
+
+        parent = parents.get(paragraph)
+        if parent is not None and not (parent.tag == f'{W}tc' and len(parent.findall(f'{W}p')) == 1):
+            parent.remove(paragraph)
+        else:
+            _replace_ranges(paragraph, [(0, len(text), '')])
+
+
+def replacement_map(plan, placeholder_values):
+    """
+    Map each token present in the document to its replacement text.
+
+    Like replaceAllText requests sent in order, the first value given for a
+    token wins.
+
+    Returns:
+        dict: {lowercased token: replacement}
+    """
+    replacements = {}
+    for key, value in placeholder_values.items():
+        for token in plan['tokens'].get(placeholder_lookup_key(key), []):
+            replacements.setdefault(token.lower(), str(value) if value is not None else '')
+    return replacements
+
+
+def replace_tokens(paragraphs, replacements):
+    """Replace placeholder tokens in paragraphs (case-insensitive, as in Google Docs)."""
+    if not replacements:
+        return
+    pattern = re.compile(
+        '|'.join(re.escape(token) for token in sorted(replacements, key=len, reverse=True)),
+        re.IGNORECASE
+    )
+    for paragraph in paragraphs:
+        text = _paragraph_text(paragraph)
+        if '{{' not in text:
+            continue
+        ranges = [
+            (match.start(), match.end(), replacements[match.group(0).lower()])
+            for match in pattern.finditer(text)
+        ]
+        if ranges:
+            _replace_ranges(paragraph, ranges)
+
+
+def docx_text(content):
+    """
+    Return the text of a .docx, one line per paragraph (as read from the Docs API).
+
+    Args:
+        content: .docx bytes
+
+    Returns:
+        str: Document text
+    """
+    lines = []
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        for name in archive.namelist():
+            if TEXT_PART_PATTERN.match(name):
+                root = ET.fromstring(archive.read(name))
+                lines.extend(_paragraph_text(paragraph) for paragraph in root.iter(f'{W}p'))
+    return '\n'.join(lines)
+
+
+def render_docx(content, plan, placeholder_values):
+    """
+    Fill a .docx template.
+
+    Args:
+        content: Template .docx bytes
+        plan: Compiled template plan
+        placeholder_values: Final placeholder values (see
+                            ContractGeneratorService.resolve_placeholder_values)
+
+    Returns:
+        bytes: Rendered .docx
+    """
+    replacements = replacement_map(plan, placeholder_values)
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(content)) as source, \
+            zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if TEXT_PART_PATTERN.match(item.filename):
+                _register_namespaces(data)
+                root = ET.fromstring(data)
+                parents = {child: parent for parent in root.iter() for child in parent}
+                paragraphs = list(root.iter(f'{W}p'))
+                apply_conditional_sections(paragraphs, placeholder_values, parents)
+                replace_tokens([p for p in paragraphs if p in parents], replacements)
+                data = _serialize(root, data)
+            target.writestr(item, data)
+    return output.getvalue()
+
+
+# ==================== PDF ====================
+
+# One LibreOffice profile per worker process: creating a profile costs
+# seconds on every start, and a profile can't be shared by two running
+# instances, so conversions within a process are serialized on it.
+_profile_lock = threading.Lock()
+
+
+def libreoffice_profile_dir():
+    """Return this process's LibreOffice profile directory (created on first start)."""
+    return os.path.join(tempfile.gettempdir(), f'contract-pdf-profile-{os.getpid()}')
+
+
+def docx_to_pdf(content):
+    """
+    Convert a .docx to PDF with LibreOffice (CONTRACT_PDF_CONVERTER).
+
+    The LibreOffice profile is reused for the life of the worker process
+    (see libreoffice_profile_dir); each process has its own, so parallel
+    workers don't block each other.
+
+    Args:
+        content: .docx bytes
+
+    Returns:
+        bytes: PDF content
+    """
+    binary = getattr(settings, 'CONTRACT_PDF_CONVERTER', 'soffice')
+    timeout = getattr(settings, 'CONTRACT_PDF_CONVERTER_TIMEOUT', 120)
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'contract.docx')
+        with open(source, 'wb') as docx_file:
+            docx_file.write(content)
+
+        try:
+            with _profile_lock:
+                subprocess.run(
+                    [
+                        binary, '--headless', '--norestore',
+                        f'-env:UserInstallation=file://{libreoffice_profile_dir()}',
+                        '--convert-to', 'pdf', '--outdir', directory, source,
+                    ],
+                    check=True,
+                    capture_output=True,
+                    timeout=timeout
+                )
+        except FileNotFoundError:
+            raise Exception(f'PDF rendering requires LibreOffice ({binary} not found)')
+        except subprocess.TimeoutExpired:
+            raise Exception(f'PDF conversion timed out after {timeout}s')
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"PDF conversion failed: {e.stderr.decode('utf-8', 'replace').strip()}")
+
+        target = os.path.join(directory, 'contract.pdf')
+        if not os.path.exists(target):
+            raise Exception('PDF conversion produced no file')
+        with open(target, 'rb') as pdf_file:
+            return pdf_file.read()
+
+
+def get_docx_template_plan(file_id, template):
+    """
+    Return the plan of a template snapshot, compiled from its .docx text.
+
+    Google Docs and local rendering both compile plans this way, so the plan
+    stored for a (file ID, modifiedTime) is the same whichever backend
+    compiled it first.
+
+    Args:
+        file_id: Google Drive file ID of the template
+        template: {'content': .docx bytes, 'modified_time': str}
+                  (see GoogleDriveService.get_template_content)
+
+    Returns:
+        dict: Compiled plan
+    """
+    return get_template_plan(file_id, template.get('modified_time'), lambda: docx_text(template['content']))
+
+
+# ==================== Renderer ====================
+
+class LocalContractRenderer:
+    """
+    Renders contracts from cached .docx templates without Google Docs round trips.
+    """
+
+    def __init__(self, drive_service=None):
+        self._drive_service = drive_service
+
+    @property
+    def drive_service(self):
+        """Google Drive client, created on first use (templates not cached yet, uploads)."""
+        if self._drive_service is None:
+            from .google_drive import GoogleDriveService
+
+            self._drive_service = GoogleDriveService()
+        return self._drive_service
+
+    def generate_contract(
+        self,
+        template_file_id,
+        output_folder_id,
+        output_file_name,
+        placeholder_values,
+        template=None,
+        pdf=True,
+        upload=None,
+        upload_pdf=True
+    ):
+        """
+        Render a contract locally, optionally uploading it to Drive.
+
+        Args:
+            template_file_id: Google Drive file ID of the template
+            output_folder_id: Google Drive folder ID for uploads
+            output_file_name: Name for the generated contract
+            placeholder_values: Dict of placeholder key-value pairs (same special
+                                keys as ContractGeneratorService.generate_contract)
+            template: Optional {'content': .docx bytes, 'modified_time': str}
+                      (defaults to the cached template from Drive)
+            pdf: Whether to render the PDF
+            upload: Whether to upload to Drive (defaults to CONTRACT_LOCAL_DRIVE_UPLOAD)
+            upload_pdf: Whether an upload includes the PDF, next to the Google Doc
+
+        Returns:
+            Dict with docx and pdf (bytes, pdf None when not rendered) and
+            file_id, web_view_link, pdf_file_id, pdf_web_link (empty when not uploaded)
+        """
+        from .contract_generator import ContractGeneratorService
+
+        if template is None:
+            template = self.drive_service.get_template_content(template_file_id)
+            if template['mime_type'] not in (GOOGLE_DOC_MIME_TYPE, DOCX_MIME_TYPE):
+                raise Exception(f"Local rendering needs a Google Doc or .docx template, got {template['mime_type']}")
+
+        content = template['content']
+        plan = get_docx_template_plan(template_file_id, template)
+        final_placeholders = ContractGeneratorService.resolve_placeholder_values(plan, placeholder_values)
+
+        docx = render_docx(content, plan, final_placeholders)
+        result = {
+            'docx': docx,
+            'pdf': docx_to_pdf(docx) if pdf else None,
+            'file_id': '',
+            'web_view_link': '',
+            'pdf_file_id': '',
+            'pdf_web_link': '',
+        }
+
+        if local_drive_upload() if upload is None else upload:
+            document = self.drive_service.upload_file_content(
+                docx,
+                output_file_name,
+                folder_id=output_folder_id,
+                mime_type=DOCX_MIME_TYPE,
+                target_mime_type=GOOGLE_DOC_MIME_TYPE
+            )
+            result['file_id'] = document['file_id']
+            result['web_view_link'] = document['web_view_link']
+
+            if result['pdf'] and upload_pdf:
+                uploaded_pdf = self.drive_service.upload_file_content(
+                    result['pdf'],
+                    f"{output_file_name}.pdf",
+                    folder_id=output_folder_id,
+                    mime_type='application/pdf'
+                )
+                result['pdf_file_id'] = uploaded_pdf['file_id']
+                result['pdf_web_link'] = uploaded_pdf['web_view_link']
+
+        logger.info(f"Rendered contract '{output_file_name}' locally ({len(plan['placeholders'])} placeholders)")
+        return result
@@ -0,0 +1,101 @@
+"""
+Template snapshot cache for contract generation.
+
+Generating a contract copies its template by exporting the Google Doc as
+.docx and uploading it back. The export is the slow, quota-hungry half and
+its result only changes when the template is edited, so exported bytes are
+stored in a shared storage backend (the private S3 bucket when USE_S3 is on,
+MEDIA_ROOT otherwise) and reused by every Celery worker.
+
+Snapshots are content-addressed by the template's Drive file ID and its
+modifiedTime: an edit in Drive changes the key, so a stale snapshot is never
+served. Creating a template version drops the file's snapshots so old bytes
+do not accumulate.
+
+Usage:
+    content = get_template_snapshot(file_id, modified_time, lambda: export(file_id))
+    invalidate_template_snapshots(file_id)
+"""
+
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+
+def template_cache_enabled():
+    """Return True if exported templates are cached."""
+    return getattr(settings, 'CONTRACT_TEMPLATE_CACHE_ENABLED', True)
+
+
+def template_cache_prefix():
+    """Return the storage directory holding template snapshots."""
+    return getattr(settings, 'CONTRACT_TEMPLATE_CACHE_PREFIX', 'template_snapshots')
+
+
+def snapshot_storage():
+    """Return the storage backend shared by all workers for template snapshots."""
+    from contracts.storage import private_storage
+
+    return private_storage()
+
+
+def snapshot_name(file_id, modified_time):
+    """Return the storage path of a template file's snapshot at one revision."""
+    digest = hashlib.sha256(f'{file_id}:{modified_time}'.encode()).hexdigest()
+    return f'{template_cache_prefix()}/{file_id}/{digest}'
+
+
+def get_template_snapshot(file_id, modified_time, fetch):
+    """
+    Return a template's exported bytes, fetching and storing them on a miss.
+
+    Args:
+        file_id: Google Drive file ID of the template
+        modified_time: The file's Drive modifiedTime
+        fetch: Zero-argument callable exporting the template's bytes
+
+    Returns:
+        bytes: Exported template content
+    """
+    if not template_cache_enabled() or not modified_time:
+        return fetch()
+
+    storage = snapshot_storage()
+    name = snapshot_name(file_id, modified_time)
+    try:
+        if storage.exists(name):
+            with storage.open(name, 'rb') as snapshot:
+                return snapshot.read()
+    except Exception as e:
+        logger.warning(f"Could not read template snapshot {name}: {e}")
+
+    content = fetch()
+    try:
+        storage.save(name, ContentFile(content))
+    except Exception as e:
+        logger.warning(f"Could not store template snapshot {name}: {e}")
+    return content
+
+
+def invalidate_template_snapshots(*file_ids):
+    """
+    Delete every stored snapshot of the given template files.
+
+    Args:
+        *file_ids: Google Drive file IDs
+    """
+    storage = snapshot_storage()
+    for file_id in {file_id for file_id in file_ids if file_id}:
+        directory = f'{template_cache_prefix()}/{file_id}'
+        try:
+            _dirs, names = storage.listdir(directory)
+            for name in names:
+                storage.delete(f'{directory}/{name}')
+        except FileNotFoundError:
+            pass  # nothing cached locally
+        except Exception as e:
+            logger.warning(f"Could not invalidate template snapshots of {file_id}: {e}")
@@ -0,0 +1,233 @@
+"""
+Compiled placeholder plans for contract templates.
+
+A template document is parsed once per Drive revision into a plan listing
+what it actually contains:
+- plain placeholders ({{person.full_name}}, {{today}}, ...)
+- conditional sections ({{BEGIN:name}}...{{END:name}})
+- gender forms ({{entity.gender:masculine:feminine[:neuter]}})
+- phrase forms ({{variable.phrase:singular:plural}})
+and, for each placeholder key, the exact tokens written in the document.
+
+Plans are stored in ContractTemplatePlan, keyed by file ID and modifiedTime,
+so generation resolves only the special forms a document contains and
+previews read them without calling Drive.
+
+Usage:
+    plan = compile_template(document_text)
+    plan = get_template_plan(file_id, modified_time, lambda: read_text(file_id))
+    plan = find_template_plan(file_id)
+"""
+
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when the plan layout changes; stored plans of another format are recompiled
+PLAN_FORMAT = 2
+
+# Pattern: {{BEGIN:variable_name}} ... {{END:variable_name}}
+# DOTALL makes . match newlines, so we can capture multi-line sections
+SECTION_PATTERN = re.compile(
+    r'\{\{\s*BEGIN\s*:\s*([a-zA-Z0-9_]+)\s*\}\}(.*?)\{\{\s*END\s*:\s*\1\s*\}\}',
+    re.DOTALL | re.IGNORECASE
+)
+
+# Gender placeholder pattern: {{entity.gender:masculine:feminine}} or {{entity.gender:masculine:feminine:neuter}}
+GENDER_PATTERN = re.compile(
+    r'\{\{\s*entity\.gender\s*:\s*([^:}]+)\s*:\s*([^:}]+)\s*(?::\s*([^}]+))?\s*\}\}',
+    re.IGNORECASE
+)
+
+# Phrase placeholder pattern: {{variable.phrase:singular {n}:plural {n}}}
+PHRASE_PATTERN = re.compile(
+    r'\{\{\s*([a-zA-Z0-9_]+)\.phrase\s*:\s*([^:}]+)\s*:\s*([^}]+)\s*\}\}',
+    re.IGNORECASE
+)
+
+# Plain placeholder pattern: {{key}} or {{ key }} (special forms contain ':')
+PLACEHOLDER_PATTERN = re.compile(r'\{\{\s*([^{}:]+?)\s*\}\}')
+
+# Placeholders filled at generation time rather than from contract data
+DATE_PLACEHOLDERS = ('today', 'today.iso', 'today.long')
+
+
+def gender_key(forms):
+    """Return the placeholder key of a gender placeholder from its 2 or 3 forms."""
+    return 'entity.gender:' + ':'.join(forms)
+
+
+def phrase_key(variable, singular, plural):
+    """Return the placeholder key of a phrase placeholder."""
+    return f"{variable}.phrase:{singular}:{plural}"
+
+
+def placeholder_lookup_key(key):
+    """Normalize a placeholder key for matching against a plan (replacements ignore case)."""
+    return key.strip('{}').strip().lower()
+
+
+def compile_template(document_text):
+    """
+    Parse a template document into a plan.
+
+    Args:
+        document_text: Full text of the template document
+
+    Returns:
+        dict: {
+            'format': PLAN_FORMAT,
+            'placeholders': [plain placeholder keys],
+            'sections': [conditional section variable names],
+            'genders': [{'key', 'forms'}],
+            'phrases': [{'key', 'variable', 'singular', 'plural'}],
+            'tokens': {lookup key: [exact tokens in the document]},
+        }
+    """
+    tokens = {}
+
+    def add_token(key, token):
+        key_tokens = tokens.setdefault(placeholder_lookup_key(key), [])
+        if token not in key_tokens:
+            key_tokens.append(token)
+
+    placeholders = []
+    for match in PLACEHOLDER_PATTERN.finditer(document_text):
+        key = match.group(1).strip()
+        if key not in placeholders:
+            placeholders.append(key)
+        add_token(key, match.group(0))
+
+    genders = []
+    for match in GENDER_PATTERN.finditer(document_text):
+        forms = [form.strip() for form in match.groups() if form]
+        key = gender_key(forms)
+        if key not in (gender['key'] for gender in genders):
+            genders.append({'key': key, 'forms': forms})
+        add_token(key, match.group(0))
+
+    phrases = []
+    for match in PHRASE_PATTERN.finditer(document_text):
+        variable, singular, plural = (part.strip() for part in match.groups())
+        key = phrase_key(variable, singular, plural)
+        if key not in (phrase['key'] for phrase in phrases):
+            phrases.append({'key': key, 'variable': variable, 'singular': singular, 'plural': plural})
+        add_token(key, match.group(0))
+
+    sections = []
+    for match in SECTION_PATTERN.finditer(document_text):
+        if match.group(1) not in sections:
+            sections.append(match.group(1))
+
+    return {
+        'format': PLAN_FORMAT,
+        'placeholders': placeholders,
+        'sections': sections,
+        'genders': genders,
+        'phrases': phrases,
+        'tokens': tokens,
+    }
+
+
+def section_visible(value):
+    """
+    Return True if a conditional section whose variable has this value is shown.
+
+    Sections are hidden when the value is 0 (as a number or numeric string),
+    False, empty or None.
+    """
+    # Convert to number to check if it's 0
+    try:
+        if isinstance(value, str):
+            numeric_value = float(value) if value else 0
+        else:
+            numeric_value = float(value) if value is not None else 0
+    except (ValueError, TypeError):
+        # If can't convert, treat as boolean
+        numeric_value = 1 if value else 0
+
+    return not (numeric_value == 0 or value is None or value == '' or value is False)
+
+
+def missing_placeholders(plan, placeholder_values):
+    """
+    Return the plan's placeholders without a value.
+
+    Date placeholders are filled at generation time and never missing.
+
+    Args:
+        plan: Compiled plan
+        placeholder_values: Dict of placeholder key-value pairs
+
+    Returns:
+        list: Placeholder keys as written in the document
+    """
+    provided = {
+        placeholder_lookup_key(key)
+        for key, value in placeholder_values.items()
+        if value not in (None, '')
+    }
+    return [
+        key for key in plan['placeholders']
+        if placeholder_lookup_key(key) not in provided and key.lower() not in DATE_PLACEHOLDERS
+    ]
+
+
+# ==================== Stored Plans ====================
+
+def find_template_plan(file_id):
+    """
+    Return the most recently compiled plan of a template file, without calling Drive.
+
+    Args:
+        file_id: Google Drive file ID of the template
+
+    Returns:
+        dict or None
+    """
+    from contracts.models import ContractTemplatePlan
+
+    stored = ContractTemplatePlan.objects.filter(gdrive_file_id=file_id).values_list('plan', flat=True).first()
+    if stored and stored.get('format') == PLAN_FORMAT:
+        return stored
+    return None
+
+
+def get_template_plan(file_id, modified_time, read_text):
+    """
+    Return the plan of a template revision, compiling and storing it on a miss.
+
+    Args:
+        file_id: Google Drive file ID of the template
+        modified_time: The file's Drive modifiedTime (None compiles without storing)
+        read_text: Zero-argument callable returning the document text
+
+    Returns:
+        dict: Compiled plan
+    """
+    from contracts.models import ContractTemplatePlan
+
+    if modified_time:
+        stored = ContractTemplatePlan.objects.filter(
+            gdrive_file_id=file_id, modified_time=modified_time
+        ).values_list('plan', flat=True).first()
+        if stored and stored.get('format') == PLAN_FORMAT:
+            return stored
+
+    document_text = read_text()
+    plan = compile_template(document_text)
+
+    # Don't store a plan for an empty document (e.g. an export still in progress)
+    if modified_time and document_text:
+        ContractTemplatePlan.objects.update_or_create(
+            gdrive_file_id=file_id,
+            modified_time=modified_time,
+            defaults={'plan': plan}
+        )
+        logger.info(
+            f"Compiled template plan for {file_id}: {len(plan['placeholders'])} placeholders, "
+            f"{len(plan['sections'])} sections"
+        )
+    return plan
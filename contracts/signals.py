@@ -5,9 +5,10 @@ Automatically advances tasks and checks stage advancement when contracts change.
 """
 
 import logging
+from django.db import transaction
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
-from .models import Contract
+from .models import Contract, ContractTemplateVersion
 
 logger = logging.getLogger(__name__)
 
@@ -126,3 +127,30 @@ def _update_contract_task_titles(contract):
 
     except Exception as e:
         logger.error(f"Error updating contract task titles for Contract {contract.id}: {e}")
+
+
+@receiver(post_save, sender=ContractTemplateVersion)
+def on_template_version_created(sender, instance, created, **kwargs):
+    """
+    Refresh template caches when a new template version is created.
+
+    Drops cached template snapshots (keyed by Drive modifiedTime and never
+    served stale; this only discards the bytes of the revisions being
+    replaced) and queues compiling the new revision's placeholder plan.
+    """
+    if created:
+        from .services.template_cache import invalidate_template_snapshots
+
+        file_ids = (instance.gdrive_file_id, instance.template.gdrive_template_file_id)
+        transaction.on_commit(lambda: invalidate_template_snapshots(*file_ids))
+        transaction.on_commit(lambda: _queue_template_plans(sorted(set(file_ids))))
+
+
+def _queue_template_plans(file_ids):
+    from .tasks import compile_template_plans
+
+    try:
+        compile_template_plans.delay(file_ids)
+    except Exception as e:
+        # Plans are compiled on first generation anyway
+        logger.warning(f"Could not queue template plan compilation for {file_ids}: {e}")
@@ -0,0 +1,17 @@
+"""
+Storage for private contract files (generated documents, template snapshots).
+"""
+
+from django.conf import settings
+
+
+def private_storage():
+    """Return the private S3 storage when USE_S3 is on, the default (MEDIA_ROOT) storage otherwise."""
+    if getattr(settings, 'USE_S3', False):
+        from config.storage_backends import PrivateMediaStorage
+
+        return PrivateMediaStorage()
+
+    from django.core.files.storage import default_storage
+
+    return default_storage
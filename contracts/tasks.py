@@ -8,6 +8,60 @@ from django.utils import timezone
 logger = logging.getLogger(__name__)
 
 
+def _render_contract(contract, placeholder_values):
+    """
+    Render a contract with the configured backend (CONTRACT_RENDER_BACKEND) and store the result on it.
+
+    Args:
+        contract: Contract instance (saved by the caller)
+        placeholder_values: Placeholder values to fill
+    """
+    from django.conf import settings
+    from django.core.files.base import ContentFile
+    from django.utils.text import get_valid_filename
+
+    output_file_name = f"{contract.contract_number}_{contract.title}"
+    # Titles may contain '/' and other characters that storage reads as paths
+    storage_name = get_valid_filename(output_file_name)
+
+    # Files of a previous rendering no longer match the new document
+    contract.rendered_docx.delete(save=False)
+    contract.rendered_pdf.delete(save=False)
+    contract.gdrive_pdf_file_id = ''
+    contract.gdrive_pdf_file_url = ''
+
+    if getattr(settings, 'CONTRACT_RENDER_BACKEND', 'google_docs') != 'local':
+        from .services.contract_generator import ContractGeneratorService
+
+        generator = ContractGeneratorService()
+        result = generator.generate_contract(
+            template_file_id=contract.template.gdrive_template_file_id,
+            output_folder_id=contract.template.gdrive_output_folder_id,
+            output_file_name=output_file_name,
+            placeholder_values=placeholder_values
+        )
+        contract.gdrive_file_id = result['file_id']
+        contract.gdrive_file_url = result['web_view_link']
+        return
+
+    from .services.local_renderer import LocalContractRenderer
+
+    result = LocalContractRenderer().generate_contract(
+        template_file_id=contract.template.gdrive_template_file_id,
+        output_folder_id=contract.template.gdrive_output_folder_id,
+        output_file_name=output_file_name,
+        placeholder_values=placeholder_values,
+        upload_pdf=False
+    )
+
+    contract.rendered_docx.save(f"{storage_name}.docx", ContentFile(result['docx']), save=False)
+    contract.rendered_pdf.save(f"{storage_name}.pdf", ContentFile(result['pdf']), save=False)
+
+    # An uploaded Google Doc may be edited, so its signature PDF is exported from Drive
+    contract.gdrive_file_id = result['file_id']
+    contract.gdrive_file_url = result['web_view_link']
+
+
 @shared_task(bind=True, name='contracts.generate_contract_async')
 def generate_contract_async(self, contract_id):
     """
@@ -20,7 +74,6 @@ def generate_contract_async(self, contract_id):
         dict: Result with success status and contract_id (sensitive data saved to database)
     """
     from .models import Contract
-    from .services.contract_generator import ContractGeneratorService
 
     try:
         logger.info(f"Starting async contract generation for contract {contract_id}")
@@ -28,18 +81,9 @@ def generate_contract_async(self, contract_id):
         # Get contract
         contract = Contract.objects.get(id=contract_id)
 
-        # Generate contract in Google Drive
-        generator = ContractGeneratorService()
-        result = generator.generate_contract(
-            template_file_id=contract.template.gdrive_template_file_id,
-            output_folder_id=contract.template.gdrive_output_folder_id,
-            output_file_name=f"{contract.contract_number}_{contract.title}",
-            placeholder_values=contract.placeholder_values
-        )
+        # Generate contract (Google Drive or local rendering)
+        _render_contract(contract, contract.placeholder_values)
 
-        # Update contract with Google Drive info
-        contract.gdrive_file_id = result['file_id']
-        contract.gdrive_file_url = result['web_view_link']
         contract.status = 'draft'
         contract.error_message = ''
         contract.save()
@@ -86,7 +130,6 @@ def regenerate_contract_async(self, contract_id, placeholder_values):
         dict: Result with success status and contract_id (sensitive data saved to database)
     """
     from .models import Contract
-    from .services.contract_generator import ContractGeneratorService
 
     try:
         logger.info(f"Starting async contract regeneration for contract {contract_id}")
@@ -98,18 +141,9 @@ def regenerate_contract_async(self, contract_id, placeholder_values):
         contract.status = 'processing'
         contract.save()
 
-        # Generate new contract file in Google Drive
-        generator = ContractGeneratorService()
-        result = generator.generate_contract(
-            template_file_id=contract.template.gdrive_template_file_id,
-            output_folder_id=contract.template.gdrive_output_folder_id,
-            output_file_name=f"{contract.contract_number}_{contract.title}",
-            placeholder_values=placeholder_values
-        )
+        # Generate new contract file (Google Drive or local rendering)
+        _render_contract(contract, placeholder_values)
 
-        # Update contract with new Google Drive info
-        contract.gdrive_file_id = result['file_id']
-        contract.gdrive_file_url = result['web_view_link']
         contract.placeholder_values = placeholder_values
         contract.status = 'draft'
         contract.error_message = ''
@@ -176,8 +210,15 @@ def send_for_signature_async(self, contract_id, signers_data, test_mode=True):
             generator = ContractGeneratorService()
             drive_service = GoogleDriveService()
 
-            # Export Google Docs as PDF
-            pdf_content = generator.export_as_pdf(contract.gdrive_file_id)
+            # Export the Google Doc (the source of truth when there is one),
+            # or use the PDF of a local rendering that was not uploaded
+            if contract.gdrive_file_id:
+                pdf_content = generator.export_as_pdf(contract.gdrive_file_id)
+            elif contract.rendered_pdf:
+                with contract.rendered_pdf.open('rb') as rendered_pdf:
+                    pdf_content = rendered_pdf.read()
+            else:
+                raise Exception("Contract has no generated document")
 
             # Upload PDF to Google Drive
             pdf_result = drive_service.upload_file_content(
@@ -258,3 +299,167 @@ def send_for_signature_async(self, contract_id, signers_data, test_mode=True):
             logger.error(f"Failed to update contract status: {str(save_error)}")
 
         return {'success': False, 'error': error_msg}
+
+
+@shared_task(name='contracts.compile_template_plans')
+def compile_template_plans(file_ids):
+    """
+    Compile the placeholder plans of template documents (see services.template_plan)
+    from their cached .docx snapshots, warming the snapshot cache as well.
+    Queued when a template version is created, so previews can list the
+    document's placeholders before its first generation.
+
+    Args:
+        file_ids: Google Drive file IDs of the template documents
+
+    Returns:
+        dict: {file_id: number of placeholders, or None on failure}
+    """
+    from .services.google_drive import GoogleDriveService
+    from .services.local_renderer import get_docx_template_plan
+
+    drive_service = GoogleDriveService()
+    compiled = {}
+    for file_id in file_ids:
+        try:
+            plan = get_docx_template_plan(file_id, drive_service.get_template_content(file_id))
+            compiled[file_id] = len(plan['placeholders'])
+        except Exception as e:
+            logger.error(f"Failed to compile template plan for {file_id}: {str(e)}")
+            compiled[file_id] = None
+    return compiled
+
+
+# ==================== Bulk Generation ====================
+
+def start_contract_batch(batch):
+    """
+    Queue the generation of a batch's contracts.
+
+    The canvas warms the template snapshot and plan once, then generates the
+    contracts in CONTRACT_BATCH_CONCURRENCY parallel lanes (each a chain, so at
+    most that many Google API generations run at once) and finalizes the batch
+    as the chord callback. A lane whose task dies without returning never runs
+    the rest of its chain; expire_stale_contract_batches recovers such batches.
+
+    Args:
+        batch: ContractBatch whose contracts are created with status='processing'
+
+    Returns:
+        str: Celery task ID of the canvas
+    """
+    from uuid import uuid4
+    from celery import chain, group
+    from django.conf import settings
+    from .models import Contract
+
+    contracts = list(batch.contracts.order_by('id'))
+    concurrency = max(1, getattr(settings, 'CONTRACT_BATCH_CONCURRENCY', 4))
+
+    # Pre-assign task IDs so every contract can be tracked as with single generation
+    signatures = {}
+    for contract in contracts:
+        contract.celery_task_id = str(uuid4())
+        signatures[contract.id] = generate_contract_async.si(contract.id).set(task_id=contract.celery_task_id)
+    Contract.objects.bulk_update(contracts, ['celery_task_id'])
+
+    lanes = [
+        chain(*(signatures[contract.id] for contract in contracts[lane::concurrency]))
+        for lane in range(min(concurrency, len(contracts)))
+    ]
+    result = chain(
+        prepare_contract_batch.si(batch.id),
+        group(lanes),
+        finalize_contract_batch.si(batch.id),
+    ).apply_async()
+
+    batch.celery_task_id = result.id
+    batch.save(update_fields=['celery_task_id'])
+    return result.id
+
+
+@shared_task(name='contracts.prepare_contract_batch')
+def prepare_contract_batch(batch_id):
+    """
+    Cache a batch template's snapshot and plan before its contracts are generated,
+    so parallel lanes reuse them instead of each exporting the template.
+
+    Failures are logged; generation then fetches the template as usual.
+
+    Args:
+        batch_id: ID of the ContractBatch
+    """
+    from .models import ContractBatch
+
+    try:
+        file_id = ContractBatch.objects.select_related('template').get(id=batch_id).template.gdrive_template_file_id
+        compile_template_plans([file_id])
+    except Exception as e:
+        logger.error(f"Failed to prepare contract batch {batch_id}: {str(e)}")
+
+
+@shared_task(name='contracts.finalize_contract_batch')
+def finalize_contract_batch(batch_id):
+    """
+    Record the outcome of a batch once all its generations have run.
+
+    Args:
+        batch_id: ID of the ContractBatch
+
+    Returns:
+        dict: Batch progress
+    """
+    from .models import ContractBatch
+
+    batch = ContractBatch.objects.get(id=batch_id)
+    progress = batch.get_progress()
+
+    if progress['failed'] == 0:
+        batch.status = 'completed'
+    elif progress['succeeded'] == 0:
+        batch.status = 'failed'
+    else:
+        batch.status = 'completed_with_errors'
+    batch.completed_at = timezone.now()
+    batch.save(update_fields=['status', 'completed_at'])
+
+    logger.info(f"Contract batch {batch_id} {batch.status}: {progress}")
+    return progress
+
+
+@shared_task(name='contracts.expire_stale_contract_batches')
+def expire_stale_contract_batches():
+    """
+    Finalize batches whose generation stopped without reaching the chord callback.
+
+    A batch is stale when it is still processing and none of its contracts
+    changed for CONTRACT_BATCH_STALE_AFTER seconds (longer than the task time
+    limit), e.g. after a lost worker. Its contracts still processing are marked
+    failed and the batch is finalized.
+
+    Returns:
+        list: IDs of the expired batches
+    """
+    from datetime import timedelta
+    from django.conf import settings
+    from django.db.models import Max
+    from .models import Contract, ContractBatch
+
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'CONTRACT_BATCH_STALE_AFTER', 45 * 60))
+    stale_ids = list(
+        ContractBatch.objects.filter(status='processing', created_at__lt=cutoff)
+        .annotate(last_activity=Max('contracts__updated_at'))
+        .filter(last_activity__lt=cutoff)
+        .values_list('id', flat=True)
+    )
+
+    for batch_id in stale_ids:
+        failed = Contract.objects.filter(batch_id=batch_id, status='processing').update(
+            status='failed',
+            error_message='Generation did not complete (worker lost or timed out)',
+            updated_at=timezone.now()
+        )
+        logger.warning(f"Contract batch {batch_id} stalled: marked {failed} unfinished contracts failed")
+        finalize_contract_batch(batch_id)
+
+    return stale_ids
@@ -0,0 +1,196 @@
+"""
+Tests for bulk contract generation.
+
+Tests the bulk_generate / batch_status endpoints and contracts.tasks.start_contract_batch:
+- Contract numbers are reserved in one step, in row order
+- Every contract of a batch is generated and the batch records the outcome
+- Batches whose generation stalled are finalized by the periodic sweep
+- Progress is aggregated from the batch's contracts
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.models import Role, UserProfile
+from config.celery import app
+from contracts.models import Contract, ContractBatch, ContractTemplate
+from contracts.tasks import expire_stale_contract_batches, start_contract_batch
+from identity.models import Entity
+
+User = get_user_model()
+
+
+class ContractBatchTestCase(TestCase):
+    def setUp(self):
+        admin_role = Role.objects.create(code='administrator', name='Administrator', level=1000)
+        self.user = User.objects.create(username='contracts_admin')
+        UserProfile.objects.update_or_create(user=self.user, defaults={'role': admin_role})
+        self.template = ContractTemplate.objects.create(
+            name='Artist Agreement',
+            series='HAHM',
+            gdrive_template_file_id='template',
+            gdrive_output_folder_id='folder',
+            created_by=self.user
+        )
+        self.entities = [
+            Entity.objects.create(kind='PF', display_name=f'Artist {index}') for index in range(3)
+        ]
+
+    def create_batch(self, count=3):
+        batch = ContractBatch.objects.create(template=self.template, total=count, created_by=self.user)
+        for index in range(count):
+            Contract.objects.create(
+                template=self.template,
+                batch=batch,
+                contract_number=f'B-{index}',
+                title=f'Contract {index}',
+                status='processing',
+                created_by=self.user,
+            )
+        return batch
+
+
+class ReserveContractNumbersTest(ContractBatchTestCase):
+    """Test reserving contract numbers in one step."""
+
+    def test_numbers_continue_the_series(self):
+        first = self.template.get_next_contract_number()
+        reserved = self.template.reserve_contract_numbers(3)
+        following = self.template.get_next_contract_number()
+
+        number = int(first.split('-')[1])
+        self.assertEqual(reserved, [f'HAHM-{number + offset}' for offset in (1, 2, 3)])
+        self.assertEqual(following, f'HAHM-{number + 4}')
+
+
+@override_settings(CONTRACT_BATCH_CONCURRENCY=2)
+@patch('contracts.tasks.compile_template_plans')
+class StartContractBatchTest(ContractBatchTestCase):
+    """Test generating a batch's contracts."""
+
+    def setUp(self):
+        super().setUp()
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, 'task_always_eager', False)
+
+    def run_batch(self, batch, render):
+        with patch('contracts.tasks._render_contract', side_effect=render):
+            start_contract_batch(batch)
+        batch.refresh_from_db()
+
+    def test_generates_every_contract(self, compile_plans):
+        batch = self.create_batch()
+
+        def render(contract, placeholder_values):
+            contract.gdrive_file_id = f'doc-{contract.id}'
+
+        self.run_batch(batch, render)
+
+        self.assertEqual(batch.status, 'completed')
+        self.assertIsNotNone(batch.completed_at)
+        self.assertEqual(batch.get_progress()['succeeded'], 3)
+        self.assertFalse(batch.contracts.filter(gdrive_file_id='').exists())
+        self.assertFalse(batch.contracts.filter(celery_task_id='').exists())
+        compile_plans.assert_called_once_with(['template'])
+
+    def test_failures_are_reported(self, compile_plans):
+        batch = self.create_batch()
+        failing = batch.contracts.order_by('id').first()
+
+        def render(contract, placeholder_values):
+            if contract.id == failing.id:
+                raise Exception('Drive quota exceeded')
+
+        self.run_batch(batch, render)
+
+        self.assertEqual(batch.status, 'completed_with_errors')
+        self.assertEqual(
+            batch.get_progress(),
+            {'total': 3, 'processing': 0, 'succeeded': 2, 'failed': 1, 'percent': 100}
+        )
+
+
+class ExpireStaleContractBatchesTest(ContractBatchTestCase):
+    """Test finalizing batches that stopped making progress."""
+
+    def test_stalled_batch_is_finalized(self):
+        batch = self.create_batch()
+        batch.contracts.filter(contract_number='B-0').update(status='draft')
+        long_ago = timezone.now() - timedelta(hours=2)
+        ContractBatch.objects.filter(id=batch.id).update(created_at=long_ago)
+        self.assertEqual(expire_stale_contract_batches(), [])
+
+        batch.contracts.update(updated_at=long_ago)
+        self.assertEqual(expire_stale_contract_batches(), [batch.id])
+
+        batch.refresh_from_db()
+        self.assertEqual(batch.status, 'completed_with_errors')
+        self.assertEqual(batch.get_progress()['failed'], 2)
+
+
+class ContractBatchAPITest(ContractBatchTestCase):
+    """Test the bulk generation endpoints."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def row(self, entity):
+        return {
+            'entity_id': entity.id,
+            'contract_terms': {
+                'entity_id': entity.id,
+                'contract_duration_years': 3,
+                'notice_period_days': 90,
+                'minimum_launches_per_year': 2,
+                'max_investment_per_song': '1000.00',
+                'max_investment_per_year': '5000.00',
+                'start_date': '2026-01-01',
+            },
+            'placeholder_overrides': {'note': '<b>Bulk</b>'},
+        }
+
+    @patch('contracts.tasks.start_contract_batch')
+    def test_bulk_generate(self, start_batch):
+        response = self.client.post('/api/v1/contracts/bulk_generate/', {
+            'template_id': self.template.id,
+            'rows': [self.row(entity) for entity in self.entities],
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        batch = ContractBatch.objects.get(id=response.data['id'])
+        start_batch.assert_called_once_with(batch)
+
+        contracts = list(batch.contracts.order_by('id'))
+        self.assertEqual([contract.counterparty_entity for contract in contracts], self.entities)
+        numbers = [int(contract.contract_number.split('-')[1]) for contract in contracts]
+        self.assertEqual(numbers, list(range(numbers[0], numbers[0] + 3)))
+        self.assertEqual(contracts[0].placeholder_values['note'], 'bBulk/b')
+        self.assertEqual(response.data['progress']['processing'], 3)
+
+    def test_unknown_entity_rejected(self):
+        response = self.client.post('/api/v1/contracts/bulk_generate/', {
+            'template_id': self.template.id,
+            'rows': [self.row(self.entities[0]), {**self.row(self.entities[1]), 'entity_id': 999999}],
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ContractBatch.objects.exists())
+
+    def test_batch_status(self):
+        batch = self.create_batch()
+        batch.contracts.filter(contract_number='B-0').update(status='draft')
+
+        response = self.client.get(f'/api/v1/contracts/batches/{batch.id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['progress']['succeeded'], 1)
+        self.assertEqual(response.data['progress']['processing'], 2)
+        self.assertEqual(response.data['progress']['percent'], 33)
@@ -0,0 +1,141 @@
+"""
+Tests for the Google API client manager.
+
+Tests contracts.services.google_clients:
+- Clients are built once per thread from cached credentials and discovery documents
+- Requests wait for the shared token bucket
+- Transient failures are retried with backoff; throttling pauses every worker
+- Non-idempotent requests are only retried when throttled
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+import httplib2
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from google.auth.credentials import AnonymousCredentials
+from googleapiclient.errors import HttpError
+
+from contracts.services import google_clients
+from contracts.services.google_clients import (
+    ManagedHttpRequest, acquire_token, call_with_backoff, get_google_client, reset_google_clients,
+)
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'google'}}
+
+
+def http_error(status, content=b'{}', headers=None):
+    return HttpError(httplib2.Response({'status': status, **(headers or {})}), content)
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping advances the clock."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class GoogleClientTest(TestCase):
+    """Test client reuse."""
+
+    def setUp(self):
+        reset_google_clients()
+        self.addCleanup(reset_google_clients)
+        patcher = patch(
+            'google.oauth2.service_account.Credentials.from_service_account_file',
+            return_value=AnonymousCredentials()
+        )
+        self.load_credentials = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_client_reused_per_thread(self):
+        drive = get_google_client('drive')
+        other_thread = []
+        thread = threading.Thread(target=lambda: other_thread.append(get_google_client('drive')))
+        thread.start()
+        thread.join()
+
+        self.assertIs(get_google_client('drive'), drive)
+        self.assertIsNot(other_thread[0], drive)
+        self.load_credentials.assert_called_once()
+
+    def test_requests_are_managed(self):
+        request = get_google_client('docs').documents().get(documentId='doc')
+
+        self.assertIsInstance(request, ManagedHttpRequest)
+        self.assertEqual(request.api, 'docs')
+
+
+@override_settings(CACHES=LOCMEM_CACHES, GOOGLE_API_MAX_RETRIES=3)
+class QuotaControlTest(TestCase):
+    """Test the shared rate limiter and backoff."""
+
+    def setUp(self):
+        cache.clear()
+        self.clock = FakeClock()
+        patcher = patch.object(google_clients, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(GOOGLE_API_RATE_LIMITS={'drive': (2, 10)})
+    def test_empty_bucket_waits_for_next_window(self):
+        acquire_token('drive')
+        acquire_token('drive')
+        self.assertEqual(self.clock.sleeps, [])
+
+        acquire_token('drive')
+
+        self.assertEqual(len(self.clock.sleeps), 1)
+        self.assertGreaterEqual(self.clock.now, 1010)
+
+    def test_transient_errors_are_retried(self):
+        send = Mock(side_effect=[http_error(503), ConnectionError(), {'id': 'doc'}])
+
+        self.assertEqual(call_with_backoff('docs', send, idempotent=True), {'id': 'doc'})
+        self.assertEqual(send.call_count, 3)
+
+    def test_non_idempotent_requests_only_retried_when_throttled(self):
+        for error in (http_error(503), ConnectionError()):
+            send = Mock(side_effect=[error, {'id': 'copy'}])
+            with self.assertRaises(type(error)):
+                call_with_backoff('drive', send)
+            send.assert_called_once()
+
+        send = Mock(side_effect=[http_error(429), {'id': 'copy'}])
+        self.assertEqual(call_with_backoff('drive', send), {'id': 'copy'})
+
+    def test_permanent_errors_are_not_retried(self):
+        send = Mock(side_effect=http_error(404))
+
+        with self.assertRaises(HttpError):
+            call_with_backoff('docs', send)
+        send.assert_called_once()
+
+    def test_gives_up_after_max_retries(self):
+        send = Mock(side_effect=http_error(500))
+
+        with self.assertRaises(HttpError):
+            call_with_backoff('docs', send, idempotent=True)
+        self.assertEqual(send.call_count, 4)
+
+    def test_throttling_pauses_other_workers(self):
+        quota_error = http_error(403, b'{"error": {"errors": [{"reason": "userRateLimitExceeded"}]}}',
+                                 headers={'retry-after': '30'})
+        send = Mock(side_effect=[quota_error, 'ok'])
+
+        self.assertEqual(call_with_backoff('docs', send), 'ok')
+        self.assertEqual(self.clock.sleeps, [30.0])
+
+        # Another worker seeing the cooldown set just before the retry waits it out
+        self.clock.now -= 10
+        acquire_token('docs')
+        self.assertEqual(self.clock.sleeps, [30.0, 10.0])
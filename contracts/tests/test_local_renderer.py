@@ -0,0 +1,216 @@
+"""
+Tests for local contract rendering.
+
+Tests contracts.services.local_renderer:
+- Placeholders split across runs are replaced, keeping other parts intact
+- Conditional sections spanning paragraphs are removed with their markers
+- Text outside placeholders keeps the formatting of its runs
+- Rendered documents convert to PDF with LibreOffice
+- Uploading to Drive is optional
+- Switching back to Google Docs drops the files of a local rendering
+"""
+
+import io
+import os
+import tempfile
+import zipfile
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+
+from contracts.models import Contract, ContractTemplate, ContractTemplatePlan
+from contracts.services.local_renderer import (
+    LocalContractRenderer, docx_text, docx_to_pdf, render_docx,
+)
+from contracts.services.template_plan import compile_template
+from contracts.tasks import _render_contract
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+
+def paragraph(*runs, style=None):
+    properties = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ''
+    return '<w:p>' + properties + ''.join(
+        f'<w:r><w:t xml:space="preserve">{text}</w:t></w:r>' for text in runs
+    ) + '</w:p>'
+
+
+def build_docx(*paragraphs, footnotes=()):
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W_NS}" xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml" '
+        'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" mc:Ignorable="w14">'
+        '<w:body>' + ''.join(paragraphs) + '</w:body></w:document>'
+    )
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as archive:
+        archive.writestr('[Content_Types].xml', '<Types/>')
+        archive.writestr('word/document.xml', document)
+        archive.writestr('word/styles.xml', '<w:styles xmlns:w="%s"/>' % W_NS)
+        if footnotes:
+            archive.writestr(
+                'word/footnotes.xml',
+                f'<w:footnotes xmlns:w="{W_NS}"><w:footnote>' + ''.join(footnotes) + '</w:footnote></w:footnotes>'
+            )
+    return output.getvalue()
+
+
+def render(template, values):
+    return docx_text(render_docx(template, compile_template(docx_text(template)), values))
+
+
+class RenderDocxTest(TestCase):
+    """Test filling .docx templates."""
+
+    def test_replaces_placeholders_split_across_runs(self):
+        template = build_docx(
+            paragraph('Artist: {{person.', 'full_name}}, ', '{{ PERSON.FULL_NAME }}'),
+            paragraph('Unknown {{missing}} stays'),
+        )
+
+        rendered = render(template, {'person.full_name': 'Ana Pop'})
+
+        self.assertEqual(rendered, 'Artist: Ana Pop, Ana Pop\nUnknown {{missing}} stays')
+
+    def test_fills_footnotes(self):
+        template = build_docx(paragraph('{{name}}'), footnotes=[paragraph('Signed by {{ name }}')])
+
+        self.assertEqual(render(template, {'name': 'Ana'}), 'Ana\nSigned by Ana')
+
+    def test_keeps_other_parts_and_namespace_declarations(self):
+        template = build_docx(paragraph('{{name}}'))
+        rendered = render_docx(template, compile_template(docx_text(template)), {'name': 'Ana'})
+
+        with zipfile.ZipFile(io.BytesIO(rendered)) as archive:
+            self.assertEqual(archive.read('word/styles.xml'), ('<w:styles xmlns:w="%s"/>' % W_NS).encode())
+            document = archive.read('word/document.xml').decode()
+        self.assertIn('mc:Ignorable="w14"', document)
+        self.assertIn('xmlns:w14=', document)
+
+    def test_conditional_sections(self):
+        template = build_docx(
+            paragraph('Intro'),
+            paragraph('{{BEGIN:has_concert_rights}}'),
+            paragraph('Concert share: {{rate}}%'),
+            paragraph('{{END:has_concert_rights}}'),
+            paragraph('Sync {{BEGIN:has_sync}}included{{END:has_sync}}.'),
+            paragraph('Dangling {{BEGIN:unpaired}} marker'),
+        )
+
+        hidden = render(template, {'has_concert_rights': 0, 'has_sync': '', 'rate': 20})
+        shown = render(template, {'has_concert_rights': 1, 'has_sync': True, 'rate': 20})
+
+        self.assertEqual(hidden, 'Intro\nSync .\nDangling {{BEGIN:unpaired}} marker')
+        self.assertEqual(shown, 'Intro\nConcert share: 20%\nSync included.\nDangling {{BEGIN:unpaired}} marker')
+
+    def test_keeps_run_formatting(self):
+        template = build_docx(
+            '<w:p><w:r><w:t xml:space="preserve">Artist: {{name}}, </w:t></w:r>'
+            '<w:r><w:rPr><w:b/></w:rPr><w:t>exclusive</w:t></w:r></w:p>'
+        )
+        rendered = render_docx(template, compile_template(docx_text(template)), {'name': 'Ana'})
+
+        with zipfile.ZipFile(io.BytesIO(rendered)) as archive:
+            document = archive.read('word/document.xml').decode()
+        self.assertIn('<w:t xml:space="preserve">Artist: Ana, </w:t>', document)
+        self.assertIn('<w:rPr><w:b /></w:rPr><w:t>exclusive</w:t>', document)
+
+    @patch('contracts.services.local_renderer.subprocess.run')
+    def test_docx_to_pdf(self, run):
+        def convert(command, **kwargs):
+            outdir = command[command.index('--outdir') + 1]
+            with open(f'{outdir}/contract.pdf', 'wb') as pdf_file:
+                pdf_file.write(b'%PDF')
+
+        run.side_effect = convert
+
+        self.assertEqual(docx_to_pdf(build_docx(paragraph('Contract'))), b'%PDF')
+        self.assertIn('--convert-to', run.call_args.args[0])
+
+    @patch('contracts.services.local_renderer.subprocess.run')
+    def test_docx_to_pdf_reuses_process_profile(self, run):
+        def convert(command, **kwargs):
+            outdir = command[command.index('--outdir') + 1]
+            with open(f'{outdir}/contract.pdf', 'wb') as pdf_file:
+                pdf_file.write(b'%PDF')
+
+        run.side_effect = convert
+
+        docx_to_pdf(build_docx(paragraph('First')))
+        docx_to_pdf(build_docx(paragraph('Second')))
+
+        profiles = [
+            next(arg for arg in call.args[0] if arg.startswith('-env:UserInstallation='))
+            for call in run.call_args_list
+        ]
+        self.assertEqual(profiles[0], profiles[1])
+        self.assertIn(str(os.getpid()), profiles[0])
+
+
+class LocalContractRendererTest(TestCase):
+    """Test rendering contracts end to end."""
+
+    def setUp(self):
+        self.drive = Mock()
+        self.drive.upload_file_content.return_value = {'file_id': 'doc', 'web_view_link': 'https://docs/doc'}
+        self.renderer = LocalContractRenderer(drive_service=self.drive)
+        self.template = {
+            'content': build_docx(paragraph('{{entity.gender:Subsemnatul:Subsemnata}} {{person.full_name}}')),
+            'modified_time': '2026-01-01T10:00:00.000Z',
+        }
+
+    def test_renders_without_drive(self):
+        result = self.renderer.generate_contract(
+            'template', 'folder', 'C-1', {'person.full_name': 'Ana Pop', 'entity.gender': 'F'},
+            template=self.template, pdf=False, upload=False
+        )
+
+        self.assertEqual(docx_text(result['docx']), 'Subsemnata Ana Pop')
+        self.assertIsNone(result['pdf'])
+        self.assertEqual(result['file_id'], '')
+        self.drive.upload_file_content.assert_not_called()
+        self.assertTrue(ContractTemplatePlan.objects.filter(gdrive_file_id='template').exists())
+
+    def test_uploads_to_drive(self):
+        result = self.renderer.generate_contract(
+            'template', 'folder', 'C-1', {'person.full_name': 'Ana Pop'},
+            template=self.template, pdf=False, upload=True
+        )
+
+        self.assertEqual(result['file_id'], 'doc')
+        self.drive.upload_file_content.assert_called_once()
+        self.assertEqual(
+            self.drive.upload_file_content.call_args.kwargs['target_mime_type'],
+            'application/vnd.google-apps.document'
+        )
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), USE_S3=False, CONTRACT_RENDER_BACKEND='google_docs')
+class RenderContractBackendTest(TestCase):
+    """Test that the stored files always match the last rendering."""
+
+    def test_google_docs_rendering_clears_local_files(self):
+        user = get_user_model().objects.create(username='contracts_admin')
+        template = ContractTemplate.objects.create(
+            name='Artist Agreement', series='HAHM', gdrive_template_file_id='template',
+            gdrive_output_folder_id='folder', created_by=user
+        )
+        contract = Contract.objects.create(
+            template=template, contract_number='HAHM-1', title='Contract', created_by=user,
+            gdrive_pdf_file_id='old-pdf'
+        )
+        contract.rendered_docx.save('HAHM-1.docx', ContentFile(b'docx'), save=False)
+        contract.rendered_pdf.save('HAHM-1.pdf', ContentFile(b'pdf'), save=False)
+
+        with patch('contracts.services.contract_generator.ContractGeneratorService') as generator:
+            generator.return_value.generate_contract.return_value = {
+                'file_id': 'doc', 'web_view_link': 'https://docs/doc'
+            }
+            _render_contract(contract, {})
+
+        self.assertFalse(contract.rendered_docx)
+        self.assertFalse(contract.rendered_pdf)
+        self.assertEqual(contract.gdrive_pdf_file_id, '')
+        self.assertEqual(contract.gdrive_file_id, 'doc')
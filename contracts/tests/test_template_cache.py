@@ -0,0 +1,92 @@
+"""
+Tests for the contract template snapshot cache.
+
+Tests contracts.services.template_cache and GoogleDriveService.copy_file:
+- An unchanged template is exported once and uploaded from the snapshot after
+- An edit in Drive (new modifiedTime) is exported again
+- Creating a template version drops the file's snapshots
+"""
+
+import shutil
+import tempfile
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from contracts.models import ContractTemplate, ContractTemplateVersion
+from contracts.services.google_drive import GoogleDriveService
+from contracts.services.template_cache import snapshot_name, snapshot_storage
+
+User = get_user_model()
+
+
+class TemplateSnapshotCacheTest(TestCase):
+    """Test template copies served from cached snapshots."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root, USE_S3=False)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        with patch.object(GoogleDriveService, '__init__', return_value=None):
+            self.drive = GoogleDriveService()
+        self.drive.service = Mock()
+        self.drive.service.files.return_value.create.return_value.execute.return_value = {
+            'id': 'copy', 'webViewLink': 'https://docs.google.com/copy'
+        }
+        self.drive.export_file = Mock(return_value=b'docx bytes')
+        self.set_template_revision('2026-01-01T10:00:00.000Z')
+
+    def set_template_revision(self, modified_time):
+        self.drive.service.files.return_value.get.return_value.execute.return_value = {
+            'mimeType': 'application/vnd.google-apps.document',
+            'modifiedTime': modified_time,
+        }
+
+    def test_unchanged_template_is_exported_once(self):
+        first = self.drive.copy_file('template', 'Contract 1', folder_id='folder')
+        second = self.drive.copy_file('template', 'Contract 2', folder_id='folder')
+
+        self.assertEqual(first['file_id'], 'copy')
+        self.assertEqual(second['file_id'], 'copy')
+        self.drive.export_file.assert_called_once()
+        self.assertEqual(self.drive.service.files.return_value.create.call_count, 2)
+        self.assertTrue(snapshot_storage().exists(snapshot_name('template', '2026-01-01T10:00:00.000Z')))
+
+    def test_edited_template_is_exported_again(self):
+        self.drive.copy_file('template', 'Contract 1')
+        self.set_template_revision('2026-02-01T10:00:00.000Z')
+        self.drive.copy_file('template', 'Contract 2')
+
+        self.assertEqual(self.drive.export_file.call_count, 2)
+
+    @override_settings(CONTRACT_TEMPLATE_CACHE_ENABLED=False)
+    def test_disabled_cache_always_exports(self):
+        self.drive.copy_file('template', 'Contract 1')
+        self.drive.copy_file('template', 'Contract 2')
+
+        self.assertEqual(self.drive.export_file.call_count, 2)
+
+    def test_new_version_drops_snapshots(self):
+        user = User.objects.create(username='legal')
+        template = ContractTemplate.objects.create(
+            name='Artist Agreement',
+            gdrive_template_file_id='template',
+            gdrive_output_folder_id='folder',
+            created_by=user
+        )
+        self.drive.copy_file('template', 'Contract 1')
+
+        with patch('contracts.tasks.compile_template_plans.delay') as compile_plans, \
+                self.captureOnCommitCallbacks(execute=True):
+            ContractTemplateVersion.objects.create(
+                template=template, version_number=1, gdrive_file_id='template-v2', created_by=user
+            )
+
+        self.assertFalse(snapshot_storage().exists(snapshot_name('template', '2026-01-01T10:00:00.000Z')))
+        compile_plans.assert_called_once_with(['template', 'template-v2'])
+        self.drive.copy_file('template', 'Contract 2')
+        self.assertEqual(self.drive.export_file.call_count, 2)
@@ -0,0 +1,189 @@
+"""
+Tests for compiled template placeholder plans.
+
+Tests contracts.services.template_plan and its use in ContractGeneratorService:
+- Plans list the placeholders, sections and special forms of a document
+- Generation reads a template revision once and replaces special forms as written
+- Google Docs generation and compile_template_plans compile from the .docx snapshot
+- Document text includes tables, headers, footers and footnotes
+- Stored plans answer previews without Drive calls
+"""
+
+from unittest.mock import Mock, patch
+
+from django.test import TestCase
+
+from contracts.models import ContractTemplatePlan
+from contracts.services.contract_generator import ContractGeneratorService
+from contracts.services.google_drive import GOOGLE_DOC_MIME_TYPE
+from contracts.services.template_plan import (
+    compile_template, find_template_plan, get_template_plan, missing_placeholders,
+)
+from contracts.tasks import compile_template_plans
+
+DOCUMENT = (
+    "{{entity.gender:Subsemnatul:Subsemnata}} {{ person.full_name }}, born {{person.birth_date}}, "
+    "agrees on {{today}}. {{BEGIN:has_concert_rights}}Concert share: {{Commission.Concert.Uniform}}%"
+    "{{END:has_concert_rights}} {{concert_first_years.phrase:one year:many years}} "
+    "Signed by {{person.full_name}}."
+)
+
+
+def replaced_tokens(docs_service):
+    body = docs_service.documents.return_value.batchUpdate.call_args.kwargs['body']
+    return {request['replaceAllText']['containsText']['text']: request['replaceAllText']['replaceText']
+            for request in body['requests']}
+
+
+class CompileTemplateTest(TestCase):
+    """Test parsing documents into plans."""
+
+    def test_plan_lists_document_contents(self):
+        plan = compile_template(DOCUMENT)
+
+        self.assertEqual(
+            plan['placeholders'],
+            ['person.full_name', 'person.birth_date', 'today', 'Commission.Concert.Uniform']
+        )
+        self.assertEqual(plan['tokens']['person.full_name'], ['{{ person.full_name }}', '{{person.full_name}}'])
+        self.assertEqual(plan['tokens']['commission.concert.uniform'], ['{{Commission.Concert.Uniform}}'])
+        self.assertEqual(plan['sections'], ['has_concert_rights'])
+        self.assertEqual(plan['genders'], [
+            {'key': 'entity.gender:Subsemnatul:Subsemnata', 'forms': ['Subsemnatul', 'Subsemnata']}
+        ])
+        self.assertEqual(plan['phrases'][0]['key'], 'concert_first_years.phrase:one year:many years')
+
+    def test_missing_placeholders_ignore_dates_and_case(self):
+        plan = compile_template(DOCUMENT)
+
+        missing = missing_placeholders(plan, {'person.full_name': 'Ana Pop', 'commission.concert.uniform': 20,
+                                              'person.birth_date': ''})
+
+        self.assertEqual(missing, ['person.birth_date'])
+
+
+class PlannedGenerationTest(TestCase):
+    """Test contract generation from compiled plans."""
+
+    def setUp(self):
+        with patch.object(ContractGeneratorService, '__init__', return_value=None):
+            self.generator = ContractGeneratorService()
+        self.generator.drive_service = Mock()
+        self.generator.drive_service.get_template_content.return_value = {
+            'content': b'docx', 'mime_type': GOOGLE_DOC_MIME_TYPE, 'modified_time': '2026-01-01T10:00:00.000Z'
+        }
+        self.generator.drive_service.copy_file.return_value = {
+            'file_id': 'copy', 'web_view_link': 'https://docs.google.com/copy',
+            'modified_time': '2026-01-01T10:00:00.000Z'
+        }
+        self.generator.docs_service = Mock()
+        self.docx_text = patch('contracts.services.local_renderer.docx_text', return_value=DOCUMENT).start()
+        self.addCleanup(patch.stopall)
+
+    def generate(self):
+        return self.generator.generate_contract(
+            template_file_id='template',
+            output_folder_id='folder',
+            output_file_name='HAHM-1',
+            placeholder_values={
+                'person.full_name': 'Ana Pop',
+                'entity.gender': 'F',
+                'concert_first_years': 1,
+                'commission.concert.uniform': 20,
+                'company.name': 'Unused Ltd',
+                'bank.iban': 'RO00',
+            }
+        )
+
+    def test_plain_keys_in_both_forms_and_special_forms_as_written(self):
+        self.generate()
+
+        tokens = replaced_tokens(self.generator.docs_service)
+        self.assertEqual(tokens['{{ person.full_name }}'], 'Ana Pop')
+        self.assertEqual(tokens['{{person.full_name}}'], 'Ana Pop')
+        self.assertEqual(tokens['{{Commission.Concert.Uniform}}'], '20')
+        self.assertEqual(tokens['{{entity.gender:Subsemnatul:Subsemnata}}'], 'Subsemnata')
+        self.assertEqual(tokens['{{concert_first_years.phrase:one year:many years}}'], 'one year')
+        self.assertIn('{{today}}', tokens)
+        # Plain keys missing from the plan are still sent, in case the text read missed them
+        self.assertEqual(tokens['{{ company.name }}'], 'Unused Ltd')
+        self.assertNotIn('{{ entity.gender:Subsemnatul:Subsemnata }}', tokens)
+
+    def test_template_revision_is_read_once(self):
+        self.generate()
+        self.generate()
+
+        self.docx_text.assert_called_once_with(b'docx')
+        self.assertEqual(ContractTemplatePlan.objects.count(), 1)
+        self.assertEqual(find_template_plan('template')['sections'], ['has_concert_rights'])
+
+    def test_new_revision_is_recompiled(self):
+        self.generate()
+        self.generator.drive_service.get_template_content.return_value['modified_time'] = '2026-02-01T10:00:00.000Z'
+        self.docx_text.return_value = 'Only {{person.full_name}}'
+        self.generate()
+
+        self.assertEqual(find_template_plan('template')['placeholders'], ['person.full_name'])
+
+    def test_unreadable_document_is_not_stored(self):
+        plan = get_template_plan('template', '2026-01-01T10:00:00.000Z', lambda: '')
+
+        self.assertEqual(plan['placeholders'], [])
+        self.assertIsNone(find_template_plan('template'))
+
+    def test_snapshot_and_docs_plans_are_shared(self):
+        self.generate()
+
+        self.generator.drive_service.copy_file.assert_called_once_with(
+            file_id='template', new_name='HAHM-1', folder_id='folder',
+            template=self.generator.drive_service.get_template_content.return_value
+        )
+        with patch('contracts.services.google_drive.GoogleDriveService') as drive:
+            drive.return_value.get_template_content.return_value = (
+                self.generator.drive_service.get_template_content.return_value
+            )
+            self.assertEqual(compile_template_plans(['template']), {'template': 4})
+        self.docx_text.assert_called_once_with(b'docx')
+
+    def test_other_files_are_read_through_docs(self):
+        self.generator.drive_service.get_template_content.return_value['mime_type'] = 'application/pdf'
+        self.generator.get_document_text = Mock(return_value=DOCUMENT)
+
+        self.generate()
+
+        self.generator.get_document_text.assert_called_once_with('copy')
+        self.docx_text.assert_not_called()
+
+    def test_read_error_fails_generation(self):
+        self.docx_text.side_effect = Exception('Corrupt template')
+
+        with self.assertRaises(Exception):
+            self.generate()
+
+        self.generator.docs_service.documents.return_value.batchUpdate.assert_not_called()
+        self.assertIsNone(find_template_plan('template'))
+
+
+class DocumentTextTest(TestCase):
+    """Test reading the text of a Google Docs document."""
+
+    def test_reads_tables_headers_footers_and_footnotes(self):
+        def paragraph(text):
+            return {'paragraph': {'elements': [{'textRun': {'content': text}}]}}
+
+        with patch.object(ContractGeneratorService, '__init__', return_value=None):
+            generator = ContractGeneratorService()
+        generator.docs_service = Mock()
+        generator.docs_service.documents.return_value.get.return_value.execute.return_value = {
+            'body': {'content': [
+                paragraph('{{a}}'),
+                {'table': {'tableRows': [{'tableCells': [{'content': [paragraph('{{b}}')]}]}]}},
+            ]},
+            'headers': {'h': {'content': [paragraph('{{c}}')]}},
+            'footers': {'f': {'content': [paragraph('{{d}}')]}},
+            'footnotes': {'n': {'content': [paragraph('{{e}}')]}},
+        }
+
+        text = generator.get_document_text('doc')
+
+        self.assertEqual(compile_template(text)['placeholders'], ['a', 'b', 'c', 'd', 'e'])
@@ -24,6 +24,7 @@ from .serializers import (
 )
 from .services.contract_generator import ContractGeneratorService
 from .services.dropbox_sign import DropboxSignService
+from .services.template_plan import find_template_plan, missing_placeholders
 from api.viewsets import DepartmentScopedViewSet
 from .permissions import ContractTemplatePermission
 
@@ -454,7 +455,7 @@ class ContractViewSet(OwnedResourceViewSet):
 
         # Add company placeholders automatically
         from api.models import CompanySettings
-        company_settings = CompanySettings.load()
+        company_settings = CompanySettings.cached()
         company_placeholders = company_settings.get_placeholders()
 
         # Merge company placeholders with user-provided placeholders
@@ -984,49 +985,30 @@ class ContractViewSet(OwnedResourceViewSet):
             'summary': summary
         })
 
-    @action(detail=False, methods=['post'])
-    def generate_with_terms(self, request):
+    def _create_contract_with_terms(self, template, entity, contract_number, contract_terms_data,
+                                    contract_shares_data, placeholder_overrides, company_placeholders,
+                                    batch=None):
         """
-        Generate a contract with entity and contract terms.
-        This endpoint handles the full contract generation with all business terms.
+        Create a contract with its terms, shares and placeholder values (status='processing').
+        Shared by generate_with_terms and bulk_generate; the caller queues generation.
+
+        Returns:
+            tuple: (contract, contract_terms)
         """
         import logging
-        from .tasks import generate_contract_async
-        from identity.models import Entity
 
         logger = logging.getLogger(__name__)
-
-        # Use ContractGenerationSerializer to validate the data
-        serializer = ContractGenerationSerializer(data=request.data, context={'request': request})
-        serializer.is_valid(raise_exception=True)
-
-        # Extract validated data
-        entity_id = serializer.validated_data['entity_id']
-        template_id = serializer.validated_data['template_id']
-        contract_terms_data = serializer.validated_data.get('contract_terms', {})
-        contract_shares_data = serializer.validated_data.get('contract_shares', [])
-        placeholder_overrides = serializer.validated_data.get('placeholder_overrides', {})
-
-        logger.info(f"Generating contract with terms for entity {entity_id}, template {template_id}")
-
-        entity = Entity.objects.get(id=entity_id)
-        template = ContractTemplate.objects.get(id=template_id)
+        request = self.request
 
         # Remove entity from contract_terms_data if it exists (to avoid duplicate)
+        contract_terms_data = dict(contract_terms_data)
         contract_terms_data.pop('entity', None)
         contract_terms_data.pop('entity_id', None)
 
-        # Generate contract number using template series
-        # Allow manual override via request data (for "bis" variants)
-        contract_number = request.data.get('contract_number')
-        if not contract_number:
-            contract_number = template.get_next_contract_number()
-
-        logger.info(f"Generated contract number: {contract_number}")
-
         # Create Contract first
         contract = Contract.objects.create(
             template=template,
+            batch=batch,
             contract_number=contract_number,
             title=f"Contract - {entity.display_name} - {template.name}",
             counterparty_entity=entity,
@@ -1054,13 +1036,10 @@ class ContractViewSet(OwnedResourceViewSet):
             share_serializer.save()
 
         # Collect all placeholders
-        from api.models import CompanySettings
-
         placeholders = {}
 
         # Add company placeholders (first party)
-        company_settings = CompanySettings.load()
-        placeholders.update(company_settings.get_placeholders())
+        placeholders.update(company_placeholders)
 
         # Add entity placeholders (second party - artist/counterparty)
         placeholders.update(entity.get_placeholders())
@@ -1095,6 +1074,50 @@ class ContractViewSet(OwnedResourceViewSet):
         contract.placeholder_values = placeholders
         contract.save()
 
+        return contract, contract_terms
+
+    @action(detail=False, methods=['post'])
+    def generate_with_terms(self, request):
+        """
+        Generate a contract with entity and contract terms.
+        This endpoint handles the full contract generation with all business terms.
+        """
+        import logging
+        from .tasks import generate_contract_async
+        from identity.models import Entity
+
+        logger = logging.getLogger(__name__)
+
+        # Use ContractGenerationSerializer to validate the data
+        serializer = ContractGenerationSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+
+        # Extract validated data
+        entity_id = serializer.validated_data['entity_id']
+        template_id = serializer.validated_data['template_id']
+        contract_terms_data = serializer.validated_data.get('contract_terms', {})
+        contract_shares_data = serializer.validated_data.get('contract_shares', [])
+        placeholder_overrides = serializer.validated_data.get('placeholder_overrides', {})
+
+        logger.info(f"Generating contract with terms for entity {entity_id}, template {template_id}")
+
+        entity = Entity.objects.get(id=entity_id)
+        template = ContractTemplate.objects.get(id=template_id)
+
+        # Generate contract number using template series
+        # Allow manual override via request data (for "bis" variants)
+        contract_number = request.data.get('contract_number')
+        if not contract_number:
+            contract_number = template.get_next_contract_number()
+
+        logger.info(f"Generated contract number: {contract_number}")
+
+        from api.models import CompanySettings
+        contract, contract_terms = self._create_contract_with_terms(
+            template, entity, contract_number, contract_terms_data, contract_shares_data,
+            placeholder_overrides, CompanySettings.cached().get_placeholders()
+        )
+
         # Start async generation task
         task = generate_contract_async.delay(contract.id)
         contract.celery_task_id = task.id
@@ -1108,6 +1131,81 @@ class ContractViewSet(OwnedResourceViewSet):
 
         return Response(response_data, status=status.HTTP_202_ACCEPTED)
 
+    @action(detail=False, methods=['post'])
+    def bulk_generate(self, request):
+        """
+        Generate many contracts from one template (async).
+
+        Creates the contracts with status='processing', reserves all contract
+        numbers in one step and queues them as one batch generated in parallel
+        lanes (see tasks.start_contract_batch). Returns the batch; poll
+        batch_status for aggregate progress.
+        """
+        import logging
+        from identity.models import Entity
+        from api.models import CompanySettings
+        from .models import ContractBatch
+        from .serializers import ContractBatchGenerationSerializer, ContractBatchSerializer
+        from .tasks import start_contract_batch
+
+        logger = logging.getLogger(__name__)
+
+        serializer = ContractBatchGenerationSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+
+        template = ContractTemplate.objects.get(id=serializer.validated_data['template_id'])
+        rows = serializer.validated_data['rows']
+        entities = Entity.objects.in_bulk({row['entity_id'] for row in rows})
+        company_placeholders = CompanySettings.cached().get_placeholders()
+
+        with transaction.atomic():
+            batch = ContractBatch.objects.create(
+                template=template,
+                total=len(rows),
+                created_by=request.user,
+                department=getattr(getattr(request.user, 'profile', None), 'department', None),
+            )
+
+            # Rows are created under provisional numbers; the series sequence row
+            # is locked only from the reservation at the end until commit
+            contracts = [
+                self._create_contract_with_terms(
+                    template, entities[row['entity_id']], f"{template.series}-B{batch.id}-{index}",
+                    row['contract_terms'], row['contract_shares'], row['placeholder_overrides'],
+                    company_placeholders, batch=batch
+                )[0]
+                for index, row in enumerate(rows)
+            ]
+
+            contract_numbers = template.reserve_contract_numbers(len(rows))
+            for contract, contract_number in zip(contracts, contract_numbers):
+                contract.contract_number = contract_number
+            Contract.objects.bulk_update(contracts, ['contract_number'])
+
+        start_contract_batch(batch)
+
+        logger.info(f"Started contract batch {batch.id}: {batch.total} contracts from template {template.id}")
+
+        return Response(ContractBatchSerializer(batch).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'], url_path=r'batches/(?P<batch_id>[0-9]+)')
+    def batch_status(self, request, batch_id=None):
+        """
+        Aggregate status of a bulk generation batch.
+        Progress counts only the batch's contracts visible to the requester.
+        """
+        from django.shortcuts import get_object_or_404
+        from .models import ContractBatch
+        from .serializers import ContractBatchSerializer
+
+        batch = get_object_or_404(ContractBatch.objects.select_related('template'), id=batch_id)
+        contracts = self.get_queryset().filter(batch=batch)
+
+        if batch.created_by_id != request.user.id and not contracts.exists():
+            return Response({'error': 'Batch not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(ContractBatchSerializer(batch, context={'contracts': contracts}).data)
+
     @action(detail=False, methods=['post'])
     def preview_generation(self, request):
         """
@@ -1155,6 +1253,16 @@ class ContractViewSet(OwnedResourceViewSet):
 
         placeholders.update(placeholder_overrides)
 
+        # Placeholders the template document uses, from its compiled plan (no Drive calls)
+        plan = find_template_plan(template.gdrive_template_file_id)
+        if plan is not None:
+            missing = missing_placeholders(plan, placeholders)
+        else:
+            missing = [
+                p for p in template.placeholders
+                if p not in placeholders or not placeholders[p]
+            ]
+
         # Return preview data
         return Response({
             'entity': {
@@ -1169,10 +1277,9 @@ class ContractViewSet(OwnedResourceViewSet):
             },
             'placeholders': placeholders,
             'placeholder_count': len(placeholders),
-            'missing_placeholders': [
-                p for p in template.placeholders
-                if p not in placeholders or not placeholders[p]
-            ]
+            'document_placeholders': plan['placeholders'] if plan is not None else None,
+            'conditional_sections': plan['sections'] if plan is not None else None,
+            'missing_placeholders': missing
         })
 
     @action(detail=False, methods=['get'])
@@ -1203,6 +1310,16 @@ class ContractViewSet(OwnedResourceViewSet):
             'commission': []
         }
 
+        # What the template document actually uses, once its plan is compiled
+        plan = find_template_plan(template.gdrive_template_file_id)
+        if plan is not None:
+            placeholders['document'] = {
+                'placeholders': plan['placeholders'],
+                'sections': plan['sections'],
+                'gender_forms': [gender['key'] for gender in plan['genders']],
+                'phrases': [phrase['key'] for phrase in plan['phrases']]
+            }
+
         # Entity placeholders
         if entity_kind == 'PF':
             placeholders['entity'] = [
@@ -2,6 +2,7 @@ from django.db import models
 from django.core.validators import URLValidator
 from django.core.exceptions import ValidationError
 from catalog.models import Recording, Release
+from catalog.prefetch import get_prefetched_parent
 
 
 class Publication(models.Model):
@@ -281,14 +282,14 @@ class Publication(models.Model):
     def get_recording(self):
         """Get the associated Recording if object_type is 'recording'."""
         if self.object_type == 'recording':
-            return Recording.objects.filter(id=self.object_id).first()
+            return get_prefetched_parent(self) or Recording.objects.filter(id=self.object_id).first()
         return None
 
     @property
     def get_release(self):
         """Get the associated Release if object_type is 'release'."""
         if self.object_type == 'release':
-            return Release.objects.filter(id=self.object_id).first()
+            return get_prefetched_parent(self) or Release.objects.filter(id=self.object_id).first()
         return None
 
     @property
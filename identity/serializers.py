@@ -200,6 +200,8 @@ class EntityListSerializer(serializers.ModelSerializer):
 
     def get_has_internal_role(self, obj):
         """Check if entity has any internal roles."""
+        if 'entity_roles' in getattr(obj, '_prefetched_objects_cache', {}):
+            return any(role.is_internal for role in obj.entity_roles.all())
         return obj.entity_roles.filter(is_internal=True).exists()
 
 
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification
+from .models import ArchivedNotification, Notification
 
 
 @admin.register(Notification)
@@ -36,3 +36,18 @@ class NotificationAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(ArchivedNotification)
+class ArchivedNotificationAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'notification_type', 'created_at', 'archived_at']
+    list_filter = ['notification_type', 'created_at']
+    search_fields = ['user__email', 'message']
+    date_hierarchy = 'created_at'
+    ordering = ['-created_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
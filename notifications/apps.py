@@ -6,5 +6,9 @@ class NotificationsConfig(AppConfig):
     name = 'notifications'
 
     def ready(self):
-        """Import signal handlers when app is ready"""
+        """Import signal handlers and register cached configs when app is ready"""
         import notifications.signals  # noqa
+        from api.config_registry import register_config
+        from .models import PREFERENCES_CONFIG, NotificationPreferences
+
+        register_config(PREFERENCES_CONFIG, NotificationPreferences, NotificationPreferences.load_all)
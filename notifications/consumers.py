@@ -1,7 +1,46 @@
+"""
+WebSocket consumer for real-time notifications.
+
+Protocol (client -> server):
+- {"type": "ping", "timestamp": ...}: answered with "pong"
+- {"type": "resume", "last_id": N}: replays the notifications created after N
+  in one "backlog" frame (at most NOTIFICATION_BACKLOG_LIMIT, oldest first,
+  with "has_more" when the client should fetch the rest over REST)
+- {"type": "mark_read", "notification_id": N}
+- {"type": "mark_read_many", "notification_ids": [...]}: one UPDATE, answered
+  with "marked_read"
+- {"type": "get_unread_counts"}: answered with "unread_counts" (also sent
+  after every backlog)
+
+Unread counter changes of the user and of their department's song alerts
+are pushed as "unread_delta" events (see notifications.counters).
+
+Live notifications arriving within NOTIFICATION_BATCH_WINDOW_MS of each other
+are coalesced: a burst is sent as one "notification_batch" frame, a lone
+notification as a "notification" frame. Notifications already delivered by a
+resume are not sent again.
+"""
+
+import asyncio
 import json
+
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.utils import timezone
+
+from .counters import NOTIFICATIONS, adjust_unread, get_unread_counts, owner_group
+
+
+def backlog_limit():
+    """Return the maximum number of notifications replayed on resume."""
+    return getattr(settings, 'NOTIFICATION_BACKLOG_LIMIT', 100)
+
+
+def batch_window():
+    """Return the live notification coalescing window, in seconds."""
+    return getattr(settings, 'NOTIFICATION_BATCH_WINDOW_MS', 50) / 1000
 
 
 class NotificationConsumer(AsyncWebsocketConsumer):
@@ -20,6 +59,12 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             await self.close(code=4001)
             return
 
+        # Live notifications waiting for the batch window, and the IDs delivered
+        # by resume backlogs (their live copies are not sent again)
+        self.pending = []
+        self.flush_task = None
+        self.backlog_ids = set()
+
         # Create a unique group name for this user
         self.group_name = f'notifications_{self.user.id}'
 
@@ -29,6 +74,14 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
 
+        # Join the department group for song alert counter updates
+        self.department_id = await self.get_department_id()
+        if self.department_id:
+            await self.channel_layer.group_add(
+                owner_group('department', self.department_id),
+                self.channel_name
+            )
+
         # Accept WebSocket connection
         await self.accept()
 
@@ -40,17 +93,25 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection"""
+        if getattr(self, 'flush_task', None):
+            self.flush_task.cancel()
+
         if hasattr(self, 'group_name'):
             # Leave user's notification group
             await self.channel_layer.group_discard(
                 self.group_name,
                 self.channel_name
             )
+        if getattr(self, 'department_id', None):
+            await self.channel_layer.group_discard(
+                owner_group('department', self.department_id),
+                self.channel_name
+            )
 
     async def receive(self, text_data):
         """
         Handle messages from WebSocket client.
-        Currently supports: ping/pong for connection health.
+        Supports: ping/pong, resume, get_unread_counts, mark_read and mark_read_many.
         """
         try:
             data = json.loads(text_data)
@@ -62,39 +123,136 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                     'type': 'pong',
                     'timestamp': data.get('timestamp')
                 }))
+            elif message_type == 'resume':
+                await self.send_backlog(data.get('last_id') or 0)
+                await self.send_unread_counts()
+            elif message_type == 'get_unread_counts':
+                await self.send_unread_counts()
             elif message_type == 'mark_read':
                 # Handle mark as read from WebSocket
                 notification_id = data.get('notification_id')
                 if notification_id:
-                    await self.mark_notification_read(notification_id)
+                    await self.mark_notifications_read([notification_id])
+            elif message_type == 'mark_read_many':
+                notification_ids = data.get('notification_ids') or []
+                count = await self.mark_notifications_read(notification_ids) if notification_ids else 0
+                await self.send(text_data=json.dumps({
+                    'type': 'marked_read',
+                    'notification_ids': notification_ids,
+                    'count': count
+                }))
 
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, TypeError, ValueError):
             await self.send(text_data=json.dumps({
                 'type': 'error',
                 'message': 'Invalid JSON'
             }))
 
+    async def send_backlog(self, last_id):
+        """Send the notifications created after last_id in one frame."""
+        notifications, has_more = await self.get_backlog(int(last_id))
+        self.backlog_ids.update(n['id'] for n in notifications)
+
+        await self.send(text_data=json.dumps({
+            'type': 'backlog',
+            'notifications': notifications,
+            'has_more': has_more
+        }))
+
     async def notification_message(self, event):
         """
         Handle notification.message events from channel layer.
         This is called when a notification is sent to the user's group.
+        Notifications are held for the batch window and sent together.
+        """
+        self.pending.append(event['notification'])
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = asyncio.ensure_future(self.flush_later())
+
+    async def flush_later(self):
+        await asyncio.sleep(batch_window())
+        await self.flush_pending()
+
+    async def flush_pending(self):
+        """Send held live notifications, skipping those a resume backlog delivered."""
+        notifications = [n for n in self.pending if n['id'] not in self.backlog_ids]
+        # Each backlog notification arrives live at most once
+        self.backlog_ids.difference_update(n['id'] for n in self.pending)
+        self.pending = []
+        if not notifications:
+            return
+
+        if len(notifications) == 1:
+            await self.send(text_data=json.dumps({
+                'type': 'notification',
+                'notification': notifications[0]
+            }))
+        else:
+            await self.send(text_data=json.dumps({
+                'type': 'notification_batch',
+                'notifications': notifications
+            }))
+
+    async def send_unread_counts(self):
+        """Send the user's unread notification and song alert counts."""
+        counts = await database_sync_to_async(get_unread_counts)(self.user.id, self.department_id)
+        await self.send(text_data=json.dumps({
+            'type': 'unread_counts',
+            **counts
+        }))
+
+    async def unread_delta(self, event):
+        """
+        Handle unread.delta events from channel layer.
+        Sent when one of the user's (or their department's) unread counters changes.
         """
-        # Send notification to WebSocket
         await self.send(text_data=json.dumps({
-            'type': 'notification',
-            'notification': event['notification']
+            'type': 'unread_delta',
+            'counter': event['counter'],
+            'delta': event['delta']
+        }))
+
+    async def notification_throttled(self, event):
+        """
+        Handle notification.throttled events from channel layer.
+        Sent instead of notifications held back by the push rate limit;
+        the client should refresh its notification list.
+        """
+        await self.send(text_data=json.dumps({
+            'type': 'notifications_throttled',
+            'count': event['count']
         }))
 
     @database_sync_to_async
-    def mark_notification_read(self, notification_id):
-        """Mark notification as read (async wrapper)"""
+    def get_backlog(self, last_id):
+        """Return (serialized notifications after last_id, has_more) (async wrapper)"""
         from .models import Notification
-        try:
-            notification = Notification.objects.get(
-                id=notification_id,
-                user=self.user
-            )
-            notification.mark_as_read()
-            return True
-        except Notification.DoesNotExist:
-            return False
+        from .serializers import NotificationSerializer
+
+        limit = backlog_limit()
+        notifications = list(
+            Notification.objects.filter(user=self.user, id__gt=last_id)
+            .select_related('content_type')
+            .order_by('id')[:limit + 1]
+        )
+        return NotificationSerializer(notifications[:limit], many=True).data, len(notifications) > limit
+
+    @database_sync_to_async
+    def get_department_id(self):
+        """Return the user's department ID, if any (async wrapper)"""
+        from api.models import UserProfile
+
+        return UserProfile.objects.filter(user=self.user).values_list('department_id', flat=True).first()
+
+    @database_sync_to_async
+    def mark_notifications_read(self, notification_ids):
+        """Mark the user's notifications as read with a single UPDATE (async wrapper)"""
+        from .models import Notification
+
+        count = Notification.objects.filter(
+            id__in=[int(notification_id) for notification_id in notification_ids],
+            user=self.user,
+            is_read=False
+        ).update(is_read=True, updated_at=timezone.now())
+        adjust_unread({(NOTIFICATIONS, 'user', self.user.id): -count})
+        return count
@@ -0,0 +1,217 @@
+"""
+Unread counters for notifications and song alerts, kept in the shared cache.
+
+Each counter belongs to an owner: notifications to their user; song alerts
+to their target department when they have one (the read flag is shared by
+the whole department), otherwise to their target user. A user's song alert
+count is their own counter plus their department's.
+
+Creation and read paths call adjust_unread() with deltas. Deltas are applied
+with atomic cache increments after the transaction commits and pushed to
+the owners' WebSocket groups as 'unread_delta' events, so clients no longer
+poll. A counter missing from the cache is computed from the database on
+first read. reconcile_unread_counters() rewrites every counter from the
+database periodically, to repair drift from increments lost to races or
+cache outages.
+
+Usage:
+    adjust_unread({(NOTIFICATIONS, 'user', user.id): 1})
+    counts = get_unread_counts(user.id, department_id)
+"""
+
+import asyncio
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from api.cache import make_key
+
+logger = logging.getLogger(__name__)
+
+
+NOTIFICATIONS = 'notifications'
+SONG_ALERTS = 'song_alerts'
+
+
+def counter_key(counter, owner_type, owner_id):
+    return make_key('unread', counter, owner_type, owner_id)
+
+
+def owner_group(owner_type, owner_id):
+    """Return the WebSocket group of a counter owner ('user' or 'department')."""
+    if owner_type == 'department':
+        return f'notifications_department_{owner_id}'
+    return f'notifications_{owner_id}'
+
+
+def song_alert_owner(alert):
+    """Return the (owner_type, owner_id) of a SongAlert's unread counter."""
+    if alert.target_department_id:
+        return 'department', alert.target_department_id
+    return 'user', alert.target_user_id
+
+
+def song_alert_deltas(alerts, delta=1):
+    """Return adjust_unread() deltas for SongAlert instances."""
+    deltas = {}
+    for alert in alerts:
+        key = (SONG_ALERTS, *song_alert_owner(alert))
+        deltas[key] = deltas.get(key, 0) + delta
+    return deltas
+
+
+def notification_deltas(notifications, delta=1):
+    """Return adjust_unread() deltas for Notification instances."""
+    deltas = {}
+    for notification in notifications:
+        key = (NOTIFICATIONS, 'user', notification.user_id)
+        deltas[key] = deltas.get(key, 0) + delta
+    return deltas
+
+
+# ==================== Updates ====================
+
+def adjust_unread(deltas):
+    """
+    Change unread counters once the current transaction commits.
+
+    Args:
+        deltas: {(counter, owner_type, owner_id): delta}
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta and key[2] is not None}
+    if deltas:
+        transaction.on_commit(lambda: apply_unread_deltas(deltas))
+
+
+def apply_unread_deltas(deltas):
+    """Increment stored counters and push the deltas to their owners."""
+    for key, delta in deltas.items():
+        try:
+            cache.incr(counter_key(*key), delta)
+        except ValueError:
+            pass  # not cached yet: computed from the database on next read
+        except Exception as e:
+            logger.warning(f"Could not update unread counter {key}: {e}")
+    push_unread_deltas(deltas)
+
+
+def push_unread_deltas(deltas):
+    """Send 'unread_delta' events to the owners' WebSocket groups in one async batch."""
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+
+    async def send_all():
+        return await asyncio.gather(
+            *(
+                channel_layer.group_send(
+                    owner_group(owner_type, owner_id),
+                    {'type': 'unread_delta', 'counter': counter, 'delta': delta},
+                )
+                for (counter, owner_type, owner_id), delta in deltas.items()
+            ),
+            return_exceptions=True,
+        )
+
+    failures = sum(isinstance(result, Exception) for result in async_to_sync(send_all)())
+    if failures:
+        logger.warning(f"Could not push {failures} unread counter updates over WebSocket")
+
+
+# ==================== Reads ====================
+
+def count_unread(counter, owner_type, owner_id):
+    """Count a counter's unread rows in the database."""
+    if counter == NOTIFICATIONS:
+        from .models import Notification
+
+        return Notification.objects.filter(user_id=owner_id, is_read=False).count()
+
+    from catalog.models import SongAlert
+
+    alerts = SongAlert.objects.filter(is_read=False)
+    if owner_type == 'department':
+        return alerts.filter(target_department_id=owner_id).count()
+    return alerts.filter(target_user_id=owner_id, target_department__isnull=True).count()
+
+
+def get_unread_counts(user_id, department_id=None):
+    """
+    Return a user's unread notification and song alert counts.
+
+    One cache round trip when the counters are cached; missing counters are
+    counted in the database and stored.
+
+    Args:
+        user_id: User ID
+        department_id: ID of the user's department, if any
+
+    Returns:
+        dict: {'notifications': int, 'song_alerts': int}
+    """
+    owners = [(NOTIFICATIONS, 'user', user_id), (SONG_ALERTS, 'user', user_id)]
+    if department_id:
+        owners.append((SONG_ALERTS, 'department', department_id))
+
+    keys = {counter_key(*owner): owner for owner in owners}
+    stored = cache.get_many(list(keys))
+
+    counts = {NOTIFICATIONS: 0, SONG_ALERTS: 0}
+    for key, owner in keys.items():
+        value = stored.get(key)
+        if value is None:
+            value = count_unread(*owner)
+            if not cache.add(key, value, timeout=None):
+                value = cache.get(key, value)
+        counts[owner[0]] += max(0, value)
+    return counts
+
+
+# ==================== Reconciliation ====================
+
+def reconcile_unread_counters():
+    """
+    Rewrite every unread counter from the database.
+
+    Returns:
+        dict: {'counters': int, 'corrected': int}
+    """
+    from django.contrib.auth import get_user_model
+    from api.models import Department
+    from catalog.models import SongAlert
+    from .models import Notification
+
+    User = get_user_model()
+
+    values = {}
+    for user_id in User.objects.values_list('id', flat=True):
+        values[(NOTIFICATIONS, 'user', user_id)] = 0
+        values[(SONG_ALERTS, 'user', user_id)] = 0
+    for department_id in Department.objects.values_list('id', flat=True):
+        values[(SONG_ALERTS, 'department', department_id)] = 0
+
+    for row in Notification.objects.filter(is_read=False).values('user_id').annotate(count=Count('id')).order_by():
+        values[(NOTIFICATIONS, 'user', row['user_id'])] = row['count']
+
+    unread_alerts = SongAlert.objects.filter(is_read=False).order_by()
+    for row in unread_alerts.filter(target_department__isnull=False).values('target_department_id').annotate(
+        count=Count('id')
+    ):
+        values[(SONG_ALERTS, 'department', row['target_department_id'])] = row['count']
+    for row in unread_alerts.filter(target_department__isnull=True, target_user__isnull=False).values(
+        'target_user_id'
+    ).annotate(count=Count('id')):
+        values[(SONG_ALERTS, 'user', row['target_user_id'])] = row['count']
+
+    keyed = {counter_key(*owner): value for owner, value in values.items()}
+    stored = cache.get_many(list(keyed))
+    corrected = sum(1 for key, value in keyed.items() if key in stored and stored[key] != value)
+    cache.set_many(keyed, timeout=None)
+
+    if corrected:
+        logger.warning(f"Reconciled {corrected} drifted unread counters")
+    return {'counters': len(keyed), 'corrected': corrected}
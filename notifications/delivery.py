@@ -0,0 +1,169 @@
+"""
+Digesting and push rate limiting for bulk notification delivery.
+
+Periodic alert tasks can produce many alerts of one kind for the same user in
+a single run (e.g. a dozen overdue tasks). digest_notifications() merges each
+user's alerts of one alert type into a single summary notification once they
+exceed NOTIFICATION_DIGEST_THRESHOLD, so one row and one push replace many.
+
+Real-time pushes are further limited per user by a token bucket kept in the
+shared cache (NOTIFICATION_PUSH_BURST tokens, refilled at
+NOTIFICATION_PUSH_RATE per minute). Notifications beyond the limit are still
+stored; the user gets a single 'notification_throttled' event telling the
+client to refresh its list. Buckets are read and written for all recipients
+in one cache round trip each; concurrent senders may over-grant slightly,
+and a cache outage disables the limit rather than blocking delivery.
+
+Usage:
+    notifications = digest_notifications(notifications)
+    granted = take_push_tokens({user.id: 5})
+"""
+
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api.cache import make_key
+
+
+# alert_type -> (summary label, action URL) for digest notifications
+DIGEST_ALERT_TYPES = {
+    'deadline_tomorrow': ('tasks due tomorrow', '/task-management'),
+    'deadline_urgent': ('tasks due in the next few hours', '/task-management'),
+    'task_inactive': ('tasks without recent updates', '/task-management'),
+    'task_overdue': ('overdue tasks', '/task-management'),
+    'campaign_ending': ('campaigns ending soon', '/crm'),
+}
+
+# Titles listed in a digest message before "and N more"
+DIGEST_PREVIEW_SIZE = 3
+
+
+def digest_threshold():
+    """Return the number of same-type alerts per user above which they are digested (0 disables)."""
+    return getattr(settings, 'NOTIFICATION_DIGEST_THRESHOLD', 3)
+
+
+def push_rate():
+    """Return the (tokens per minute, burst size) of the per-user push bucket."""
+    return (
+        getattr(settings, 'NOTIFICATION_PUSH_RATE', 30),
+        getattr(settings, 'NOTIFICATION_PUSH_BURST', 10),
+    )
+
+
+# ==================== Digests ====================
+
+def _item_title(metadata):
+    return metadata.get('task_title') or metadata.get('campaign_name') or ''
+
+
+def build_digest(user_id, alert_type, notifications):
+    """
+    Build one unsaved summary Notification replacing several alerts of one type.
+
+    Args:
+        user_id: Recipient ID
+        alert_type: metadata['alert_type'] shared by the notifications
+        notifications: The unsaved Notification instances being merged
+
+    Returns:
+        Notification instance (not saved)
+    """
+    from .models import Notification
+
+    label, action_url = DIGEST_ALERT_TYPES.get(alert_type, ('alerts', ''))
+    titles = [_item_title(n.metadata) for n in notifications]
+    preview = ', '.join(title for title in titles[:DIGEST_PREVIEW_SIZE] if title)
+    if len(titles) > DIGEST_PREVIEW_SIZE:
+        preview += f" and {len(titles) - DIGEST_PREVIEW_SIZE} more"
+
+    return Notification(
+        user_id=user_id,
+        message=f"{len(notifications)} {label}: {preview}",
+        notification_type=notifications[0].notification_type,
+        action_url=action_url,
+        metadata={
+            'alert_type': alert_type,
+            'digest': True,
+            'count': len(notifications),
+            'items': [n.metadata for n in notifications],
+        },
+    )
+
+
+def digest_notifications(notifications, threshold=None):
+    """
+    Merge each user's alerts of one type into a digest when there are too many.
+
+    Only notifications whose metadata carries an 'alert_type' are digested;
+    the others are returned unchanged. Order is kept, with each digest in the
+    place of the first alert it replaces.
+
+    Args:
+        notifications: Unsaved Notification instances
+        threshold: Maximum same-type alerts per user sent individually
+                   (defaults to NOTIFICATION_DIGEST_THRESHOLD; 0 disables)
+
+    Returns:
+        list: Unsaved Notification instances
+    """
+    threshold = digest_threshold() if threshold is None else threshold
+    if not threshold:
+        return list(notifications)
+
+    groups = {}
+    for notification in notifications:
+        alert_type = notification.metadata.get('alert_type')
+        if alert_type:
+            groups.setdefault((notification.user_id, alert_type), []).append(notification)
+
+    result = []
+    for notification in notifications:
+        key = (notification.user_id, notification.metadata.get('alert_type'))
+        group = groups.get(key)
+        if group is None or len(group) <= threshold:
+            result.append(notification)
+        elif group[0] is notification:
+            result.append(build_digest(*key, group))
+    return result
+
+
+# ==================== Push Rate Limiting ====================
+
+def _bucket_key(user_id):
+    return make_key('notifications', 'push_bucket', user_id)
+
+
+def take_push_tokens(requested, now=None):
+    """
+    Take push tokens from the users' buckets.
+
+    Args:
+        requested: {user_id: number of pushes wanted}
+        now: Current time as a UNIX timestamp (defaults to time.time())
+
+    Returns:
+        dict: {user_id: number of pushes allowed}
+    """
+    rate, burst = push_rate()
+    if not rate or not requested:
+        return dict(requested)
+
+    now = time.time() if now is None else now
+    keys = {_bucket_key(user_id): user_id for user_id in requested}
+    stored = cache.get_many(list(keys))  # an unreachable cache reads as full buckets
+
+    granted = {}
+    buckets = {}
+    for key, user_id in keys.items():
+        tokens, updated_at = stored.get(key, (burst, now))
+        tokens = min(burst, tokens + max(0, now - updated_at) * rate / 60)
+        granted[user_id] = min(requested[user_id], int(tokens))
+        buckets[key] = (tokens - granted[user_id], now)
+
+    # A bucket left alone long enough to refill completely can expire
+    cache.set_many(buckets, timeout=math.ceil(burst * 60 / rate) + 60)
+    return granted
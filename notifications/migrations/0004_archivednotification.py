@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notifications', '0003_alter_notification_notification_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedNotification',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('message', models.TextField()),
+                ('notification_type', models.CharField(choices=[('assignment', 'Assignment'), ('mention', 'Mention'), ('status_change', 'Status Change'), ('contract_signed', 'Contract Signed'), ('contract_created', 'Contract Created'), ('comment', 'Comment'), ('entity_request', 'Entity Change Request'), ('system', 'System')], default='system', max_length=50)),
+                ('object_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('action_url', models.CharField(blank=True, max_length=500)),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True, help_text='When the notification was archived')),
+                ('content_type', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+                ('user', models.ForeignKey(help_text='User who received this notification', on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived Notification',
+                'verbose_name_plural': 'Archived Notifications',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='notificatio_user_id_0b7536_idx'), models.Index(fields=['notification_type', 'created_at'], name='notificatio_notific_21d583_idx')],
+            },
+        ),
+    ]
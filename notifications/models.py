@@ -6,6 +6,9 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 
 User = get_user_model()
 
+# Config registry entry holding every user's stored preferences (see api.config_registry)
+PREFERENCES_CONFIG = 'notifications.preferences'
+
 
 class Notification(models.Model):
     """
@@ -100,14 +103,75 @@ class Notification(models.Model):
     def mark_as_read(self):
         """Mark notification as read"""
         if not self.is_read:
+            from .counters import adjust_unread, notification_deltas
+
             self.is_read = True
             self.save(update_fields=['is_read', 'updated_at'])
+            adjust_unread(notification_deltas([self], delta=-1))
 
     def mark_as_unread(self):
         """Mark notification as unread"""
         if self.is_read:
+            from .counters import adjust_unread, notification_deltas
+
             self.is_read = False
             self.save(update_fields=['is_read', 'updated_at'])
+            adjust_unread(notification_deltas([self]))
+
+
+class ArchivedNotification(models.Model):
+    """
+    Read notifications moved out of Notification by the retention job
+    (see notifications.retention). Rows keep their original ID.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_notifications',
+        help_text="User who received this notification"
+    )
+
+    message = models.TextField()
+
+    notification_type = models.CharField(
+        max_length=50,
+        choices=Notification.NOTIFICATION_TYPES,
+        default='system'
+    )
+
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True
+    )
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+    content_object = GenericForeignKey('content_type', 'object_id')
+
+    action_url = models.CharField(max_length=500, blank=True)
+    metadata = models.JSONField(default=dict, blank=True)
+
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="When the notification was archived"
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['notification_type', 'created_at']),
+        ]
+        verbose_name = 'Archived Notification'
+        verbose_name_plural = 'Archived Notifications'
+
+    def __str__(self):
+        return f"{self.notification_type} for user {self.user_id} (archived): {self.message[:50]}"
 
 
 class NotificationPreferences(models.Model):
@@ -229,3 +293,34 @@ class NotificationPreferences(models.Model):
         """Get or create preferences for a user"""
         preferences, created = cls.objects.get_or_create(user=user)
         return preferences
+
+    @classmethod
+    def load_all(cls):
+        """Load {user_id: NotificationPreferences} for every stored row (one query)"""
+        return {p.user_id: p for p in cls.objects.all()}
+
+    @classmethod
+    def for_users(cls, user_ids):
+        """
+        Return the preferences of many users from the per-process config registry.
+
+        Users without stored preferences get unsaved defaults. The instances
+        are shared with other callers and must not be modified.
+
+        Args:
+            user_ids: Iterable of user IDs
+
+        Returns:
+            dict: {user_id: NotificationPreferences}
+        """
+        from api.config_registry import get_config
+
+        stored = get_config(PREFERENCES_CONFIG)
+        return {
+            user_id: stored.get(user_id) or cls(user_id=user_id)
+            for user_id in set(user_ids)
+        }
+
+    def alert_enabled(self, toggle):
+        """Return True if the alert toggle (e.g. 'deadline_tomorrow_enabled') is on and alerts aren't muted"""
+        return getattr(self, toggle) and not self.mute_all_alerts
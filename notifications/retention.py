@@ -0,0 +1,213 @@
+"""
+Retention and archival of notifications and song alerts.
+
+Notification and SongAlert rows are added by every periodic alert task and
+stage transition, and the inbox and unread queries read them by user and
+recency. apply_retention() keeps those hot tables small:
+
+1. Rows past their type's retention (NOTIFICATION_RETENTION_DAYS /
+   SONG_ALERT_RETENTION_DAYS, read or not) are deleted.
+2. Read rows older than NOTIFICATION_ARCHIVE_AFTER_DAYS are moved to the
+   archive tables (ArchivedNotification / ArchivedSongAlert), keeping their IDs.
+3. Archived rows past their type's retention are deleted.
+
+Each step works in transactions of at most RETENTION_BATCH_SIZE rows, locking
+with SKIP LOCKED so users marking rows read are never blocked, and stops after
+RETENTION_MAX_BATCHES batches per run; the next run picks up the rest.
+Rows are removed from the hot tables without per-row signals, and unread
+counters (see notifications.counters) are adjusted once per batch.
+
+Usage:
+    summary = apply_retention()
+"""
+
+import logging
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .counters import NOTIFICATIONS, SONG_ALERTS, adjust_unread, notification_deltas, song_alert_deltas
+
+logger = logging.getLogger(__name__)
+
+
+# name -> (model label, archive model label, type field, retention setting, unread deltas)
+RETENTION_TABLES = {
+    NOTIFICATIONS: (
+        'notifications.Notification', 'notifications.ArchivedNotification',
+        'notification_type', 'NOTIFICATION_RETENTION_DAYS', notification_deltas,
+    ),
+    SONG_ALERTS: (
+        'catalog.SongAlert', 'catalog.ArchivedSongAlert',
+        'alert_type', 'SONG_ALERT_RETENTION_DAYS', song_alert_deltas,
+    ),
+}
+
+
+def archive_after_days():
+    """Return the age (days) at which read rows are archived (0 disables archiving)."""
+    return getattr(settings, 'NOTIFICATION_ARCHIVE_AFTER_DAYS', 30)
+
+
+def retention_days(setting):
+    """
+    Return a table's retention in days by type.
+
+    Args:
+        setting: Setting name (e.g. 'NOTIFICATION_RETENTION_DAYS')
+
+    Returns:
+        dict: {type: days}, where 'default' covers unlisted types and None keeps rows forever
+    """
+    return {'default': 365, **getattr(settings, setting, {})}
+
+
+def retention_batch_size():
+    """Return the (rows per batch, batches per run) of each retention step."""
+    return (
+        getattr(settings, 'RETENTION_BATCH_SIZE', 1000),
+        getattr(settings, 'RETENTION_MAX_BATCHES', 100),
+    )
+
+
+def expired_filter(type_field, retention, now):
+    """
+    Build the filter matching rows past their type's retention.
+
+    Args:
+        type_field: Name of the model's type field
+        retention: {type: days} as returned by retention_days()
+        now: Current datetime
+
+    Returns:
+        Q, or None when nothing expires
+    """
+    overrides = {row_type: days for row_type, days in retention.items() if row_type != 'default'}
+
+    clauses = [
+        Q(**{type_field: row_type, 'created_at__lt': now - timedelta(days=days)})
+        for row_type, days in overrides.items()
+        if days is not None
+    ]
+    if retention['default'] is not None:
+        clauses.append(
+            ~Q(**{f'{type_field}__in': list(overrides)})
+            & Q(created_at__lt=now - timedelta(days=retention['default']))
+        )
+
+    if not clauses:
+        return None
+    expired = clauses[0]
+    for clause in clauses[1:]:
+        expired |= clause
+    return expired
+
+
+# ==================== Batches ====================
+
+def _in_batches(queryset, handle):
+    """
+    Call handle(ids) on the rows of queryset, one locked batch per transaction.
+
+    Returns:
+        int: Number of rows handled
+    """
+    batch_size, max_batches = retention_batch_size()
+
+    handled = 0
+    for _ in range(max_batches):
+        with transaction.atomic():
+            ids = list(
+                queryset.select_for_update(skip_locked=True)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if ids:
+                handle(ids)
+        handled += len(ids)
+        if len(ids) < batch_size:
+            break
+    return handled
+
+
+def _remove(model, ids, unread_deltas):
+    """Delete hot rows without per-row signals and uncount the unread ones."""
+    unread = list(model.objects.filter(pk__in=ids, is_read=False))
+    queryset = model.objects.filter(pk__in=ids)
+    # No model references notifications or song alerts, so there is nothing to cascade
+    queryset._raw_delete(queryset.db)
+    adjust_unread(unread_deltas(unread, delta=-1))
+
+
+def _archive(model, archive_model, ids):
+    """Copy hot rows to the archive table and remove them."""
+    fields = [field.attname for field in archive_model._meta.concrete_fields if field.name != 'archived_at']
+    archive_model.objects.bulk_create(
+        [archive_model(**row) for row in model.objects.filter(pk__in=ids).values(*fields)],
+        ignore_conflicts=True,
+    )
+    queryset = model.objects.filter(pk__in=ids)
+    queryset._raw_delete(queryset.db)
+
+
+# ==================== Retention ====================
+
+def apply_table_retention(name, now=None):
+    """
+    Delete expired rows of one table and archive its old read rows.
+
+    Args:
+        name: NOTIFICATIONS or SONG_ALERTS
+        now: Current datetime (defaults to timezone.now())
+
+    Returns:
+        dict: {'deleted': int, 'archived': int, 'purged': int}
+    """
+    model_label, archive_label, type_field, setting, unread_deltas = RETENTION_TABLES[name]
+    model = apps.get_model(model_label)
+    archive_model = apps.get_model(archive_label)
+    now = now or timezone.now()
+
+    summary = {'deleted': 0, 'archived': 0, 'purged': 0}
+    expired = expired_filter(type_field, retention_days(setting), now)
+
+    if expired is not None:
+        summary['deleted'] = _in_batches(
+            model.objects.filter(expired),
+            lambda ids: _remove(model, ids, unread_deltas),
+        )
+
+    archive_after = archive_after_days()
+    if archive_after:
+        summary['archived'] = _in_batches(
+            model.objects.filter(is_read=True, created_at__lt=now - timedelta(days=archive_after)),
+            lambda ids: _archive(model, archive_model, ids),
+        )
+
+    if expired is not None:
+        summary['purged'] = _in_batches(
+            archive_model.objects.filter(expired),
+            lambda ids: archive_model.objects.filter(pk__in=ids).delete(),
+        )
+
+    return summary
+
+
+def apply_retention(now=None):
+    """
+    Apply retention to notifications and song alerts.
+
+    Args:
+        now: Current datetime (defaults to timezone.now())
+
+    Returns:
+        dict: {table name: {'deleted': int, 'archived': int, 'purged': int}}
+    """
+    now = now or timezone.now()
+    summary = {name: apply_table_retention(name, now) for name in RETENTION_TABLES}
+    logger.info(f"Notification retention: {summary}")
+    return summary
@@ -1,9 +1,19 @@
+import asyncio
+import logging
+
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 from django.contrib.contenttypes.models import ContentType
-from .models import Notification
+from .counters import adjust_unread, notification_deltas
+from .delivery import digest_notifications, take_push_tokens
+from .models import Notification, NotificationPreferences
 from .serializers import NotificationSerializer
 
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT and concurrent WebSocket sends when fanning out notifications
+NOTIFICATION_BATCH_SIZE = 500
+
 
 class NotificationService:
     """
@@ -80,6 +90,134 @@ class NotificationService:
             }
         )
 
+    @staticmethod
+    def build_notification(user, message, notification_type='system', related_object=None,
+                           action_url='', metadata=None):
+        """
+        Build an unsaved Notification (same arguments as create_notification).
+
+        Args:
+            user: User instance or user ID
+
+        Returns:
+            Notification instance (not saved)
+        """
+        notification = Notification(
+            user_id=getattr(user, 'pk', user),
+            message=message,
+            notification_type=notification_type,
+            action_url=action_url,
+            metadata=metadata or {},
+        )
+        if related_object:
+            # get_for_model() is cached per process, so this costs one query per model at most
+            notification.content_type = ContentType.objects.get_for_model(related_object)
+            notification.object_id = related_object.pk
+        return notification
+
+    @staticmethod
+    def create_notifications(items, alert_preference=None, preferences=None, digest=False,
+                             batch_size=NOTIFICATION_BATCH_SIZE):
+        """
+        Create many notifications at once and send them via WebSocket.
+
+        Notifications are written with bulk_create() and pushed to the users'
+        groups concurrently on a single event loop, so the cost grows with the
+        number of rows, not with per-recipient round trips.
+
+        Args:
+            items: Iterable of (user, payload) pairs; user is a User instance or ID and
+                   payload a dict of create_notification() keyword arguments
+            alert_preference: Optional NotificationPreferences toggle (e.g.
+                              'deadline_tomorrow_enabled'); recipients who disabled it
+                              or muted all alerts are skipped
+            preferences: Optional {user_id: NotificationPreferences} already loaded
+                         (see NotificationPreferences.for_users)
+            digest: Merge each user's alerts of one type into a summary notification
+                    above NOTIFICATION_DIGEST_THRESHOLD (see delivery.digest_notifications)
+            batch_size: Rows per INSERT
+
+        Returns:
+            List of created Notification instances
+        """
+        notifications = [NotificationService.build_notification(user, **payload) for user, payload in items]
+
+        if alert_preference:
+            if preferences is None:
+                preferences = NotificationPreferences.for_users(n.user_id for n in notifications)
+            notifications = [
+                n for n in notifications if preferences[n.user_id].alert_enabled(alert_preference)
+            ]
+
+        if digest:
+            notifications = digest_notifications(notifications)
+
+        if not notifications:
+            return []
+
+        Notification.objects.bulk_create(notifications, batch_size=batch_size)
+        adjust_unread(notification_deltas(notifications))
+        NotificationService.send_many(notifications, batch_size=batch_size)
+        return notifications
+
+    @staticmethod
+    def send_many(notifications, batch_size=NOTIFICATION_BATCH_SIZE):
+        """
+        Send saved notifications to their users' WebSocket groups in one async batch.
+
+        Pushes are rate limited per user (see delivery.take_push_tokens); a user
+        over the limit gets one 'notification_throttled' event with the number
+        of notifications not pushed. Delivery failures are logged, not raised:
+        the notifications are already stored and will be listed by the API.
+
+        Args:
+            notifications: Notification instances
+            batch_size: Maximum number of concurrent group sends
+        """
+        channel_layer = get_channel_layer()
+        if channel_layer is None or not notifications:
+            return
+
+        requested = {}
+        for notification in notifications:
+            requested[notification.user_id] = requested.get(notification.user_id, 0) + 1
+        granted = take_push_tokens(requested)
+
+        allowed = []
+        throttled = {}
+        for notification in notifications:
+            if granted[notification.user_id] > 0:
+                granted[notification.user_id] -= 1
+                allowed.append(notification)
+            else:
+                throttled[notification.user_id] = throttled.get(notification.user_id, 0) + 1
+
+        messages = [
+            (
+                f'notifications_{data["user"]}',
+                {'type': 'notification_message', 'notification': data},
+            )
+            for data in NotificationSerializer(allowed, many=True).data
+        ]
+        messages += [
+            (f'notifications_{user_id}', {'type': 'notification_throttled', 'count': count})
+            for user_id, count in throttled.items()
+        ]
+
+        async def send_all():
+            failures = 0
+            for start in range(0, len(messages), batch_size):
+                results = await asyncio.gather(
+                    *(channel_layer.group_send(group, message) for group, message in messages[start:start + batch_size]),
+                    return_exceptions=True,
+                )
+                failures += sum(isinstance(result, Exception) for result in results)
+            return failures
+
+        failures = async_to_sync(send_all)()
+        if failures:
+            logger.warning(f"Could not push {failures} of {len(messages)} notifications over WebSocket")
+
     @staticmethod
     def notify_assignment(user, assigned_by, object_name, object_type, action_url=''):
         """
@@ -169,7 +307,7 @@ def notify_entity_change_request(request_obj):
     from api.models import UserProfile
 
     # Get all admin users (role level >= 1000)
-    admins = UserProfile.objects.filter(role__level__gte=1000).select_related('user', 'role')
+    admins = UserProfile.objects.filter(role__level__gte=1000).only('user_id')
 
     # Determine action word
     action = 'edit' if request_obj.request_type == 'edit' else 'delete'
@@ -181,18 +319,20 @@ def notify_entity_change_request(request_obj):
     )
 
     # Create notification for each admin
-    for admin_profile in admins:
-        NotificationService.create_notification(
-            user=admin_profile.user,
-            message=f"{requester_name} requested to {action} entity '{request_obj.entity.display_name}'",
-            notification_type='entity_request',
-            related_object=request_obj,
-            action_url=f"/admin/entity-requests",
-            metadata={
-                'request_type': request_obj.request_type,
-                'entity_id': request_obj.entity.id,
-                'entity_name': request_obj.entity.display_name,
-                'requester_id': request_obj.requested_by.id,
-                'requester_name': requester_name,
-            }
-        )
+    message = f"{requester_name} requested to {action} entity '{request_obj.entity.display_name}'"
+    payload = {
+        'message': message,
+        'notification_type': 'entity_request',
+        'related_object': request_obj,
+        'action_url': "/admin/entity-requests",
+        'metadata': {
+            'request_type': request_obj.request_type,
+            'entity_id': request_obj.entity.id,
+            'entity_name': request_obj.entity.display_name,
+            'requester_id': request_obj.requested_by.id,
+            'requester_name': requester_name,
+        },
+    }
+    NotificationService.create_notifications(
+        (admin_profile.user_id, payload) for admin_profile in admins
+    )
@@ -25,6 +25,13 @@ def notify_contract_assignment(sender, instance, created, **kwargs):
         )
 """
 
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .counters import adjust_unread, notification_deltas
+from .models import Notification
+
+
 # Import your models and add signal handlers below
 # from django.db.models.signals import post_save, pre_save
 # from django.dispatch import receiver
@@ -42,3 +49,20 @@ def notify_contract_assignment(sender, instance, created, **kwargs):
 #             object_type=sender.__name__.lower(),
 #             action_url=f"/{sender.__name__.lower()}s/{instance.id}"
 #         )
+
+
+# ==================== Unread Counters ====================
+
+
+@receiver(post_save, sender=Notification)
+def count_created_notification(sender, instance, created, **kwargs):
+    """Count new unread notifications (bulk_create() callers adjust counters themselves)."""
+    if created and not instance.is_read:
+        adjust_unread(notification_deltas([instance]))
+
+
+@receiver(post_delete, sender=Notification)
+def count_deleted_notification(sender, instance, **kwargs):
+    """Uncount deleted unread notifications."""
+    if not instance.is_read:
+        adjust_unread(notification_deltas([instance], delta=-1))
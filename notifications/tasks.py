@@ -6,6 +6,12 @@ These tasks run periodically to check for:
 - Tasks due in a few hours (urgent)
 - Tasks without updates for too long (inactivity)
 - Campaigns ending soon
+
+Each task loads recipients' preferences in one query and delivers its
+notifications through NotificationService.create_notifications() (bulk insert
+plus one batch of WebSocket sends). The recurring checks (due soon, inactive,
+overdue) digest each user's alerts of one type into a single notification
+when there are more than NOTIFICATION_DIGEST_THRESHOLD of them.
 """
 
 from celery import shared_task
@@ -14,6 +20,8 @@ from django.db.models import Q
 from datetime import timedelta
 from .services import NotificationService
 
+ACTIVE_TASK_STATUSES = ['todo', 'in_progress', 'blocked', 'review']
+
 
 @shared_task(name='notifications.check_tasks_due_tomorrow')
 def check_tasks_due_tomorrow():
@@ -31,39 +39,32 @@ def check_tasks_due_tomorrow():
     tasks_due_tomorrow = Task.objects.filter(
         due_date__gte=tomorrow_start,
         due_date__lt=tomorrow_end,
-        status__in=['todo', 'in_progress', 'blocked', 'review']
-    ).select_related('assigned_to')
-
-    notifications_sent = 0
-
-    for task in tasks_due_tomorrow:
-        if task.assigned_to:
-            # Check user preferences
-            from .models import NotificationPreferences
-            preferences = NotificationPreferences.get_or_create_for_user(task.assigned_to)
-
-            # Skip if alert type disabled or all alerts muted
-            if not preferences.deadline_tomorrow_enabled or preferences.mute_all_alerts:
-                continue
-
-            # Create notification
-            NotificationService.create_notification(
-                user=task.assigned_to,
-                message=f"� Task due tomorrow: {task.title}",
-                notification_type='system',
-                related_object=task,
-                action_url=f"/task-management?task={task.id}",
-                metadata={
+        status__in=ACTIVE_TASK_STATUSES,
+        assigned_to__isnull=False,
+    )
+
+    # Skipped if alert type disabled or all alerts muted
+    notifications = NotificationService.create_notifications(
+        (
+            (task.assigned_to_id, {
+                'message': f"� Task due tomorrow: {task.title}",
+                'notification_type': 'system',
+                'related_object': task,
+                'action_url': f"/task-management?task={task.id}",
+                'metadata': {
                     'alert_type': 'deadline_tomorrow',
                     'task_id': task.id,
                     'task_title': task.title,
                     'due_date': task.due_date.isoformat(),
                     'priority': task.priority,
-                }
-            )
-            notifications_sent += 1
+                },
+            })
+            for task in tasks_due_tomorrow
+        ),
+        alert_preference='deadline_tomorrow_enabled',
+    )
 
-    return f"Sent {notifications_sent} tomorrow deadline notifications"
+    return f"Sent {len(notifications)} tomorrow deadline notifications"
 
 
 @shared_task(name='notifications.check_tasks_due_soon')
@@ -86,51 +87,46 @@ def check_tasks_due_soon(hours=None):
     deadline = now + timedelta(hours=max_hours)
 
     # Find tasks due soon that are not done/cancelled
-    tasks_due_soon = Task.objects.filter(
+    tasks_due_soon = list(Task.objects.filter(
         due_date__gte=now,
         due_date__lte=deadline,
-        status__in=['todo', 'in_progress', 'blocked', 'review']
-    ).select_related('assigned_to')
-
-    notifications_sent = 0
+        status__in=ACTIVE_TASK_STATUSES,
+        assigned_to__isnull=False,
+    ))
+    preferences = NotificationPreferences.for_users(task.assigned_to_id for task in tasks_due_soon)
 
+    items = []
     for task in tasks_due_soon:
-        if task.assigned_to:
-            # Check user preferences
-            preferences = NotificationPreferences.get_or_create_for_user(task.assigned_to)
-
-            # Skip if alert type disabled or all alerts muted
-            if not preferences.deadline_urgent_enabled or preferences.mute_all_alerts:
-                continue
-
-            # Calculate hours remaining
-            hours_remaining = (task.due_date - now).total_seconds() / 3600
-
-            # Only send if within user's custom threshold
-            if hours_remaining > preferences.urgent_deadline_hours:
-                continue
-
-            hours_text = f"{int(hours_remaining)} hour{'s' if hours_remaining != 1 else ''}"
-
-            # Create urgent notification
-            NotificationService.create_notification(
-                user=task.assigned_to,
-                message=f"=� URGENT: Task due in {hours_text}: {task.title}",
-                notification_type='system',
-                related_object=task,
-                action_url=f"/task-management?task={task.id}",
-                metadata={
-                    'alert_type': 'deadline_urgent',
-                    'task_id': task.id,
-                    'task_title': task.title,
-                    'due_date': task.due_date.isoformat(),
-                    'hours_remaining': hours_remaining,
-                    'priority': task.priority,
-                }
-            )
-            notifications_sent += 1
-
-    return f"Sent {notifications_sent} urgent deadline notifications"
+        # Calculate hours remaining
+        hours_remaining = (task.due_date - now).total_seconds() / 3600
+
+        # Only send if within user's custom threshold
+        if hours_remaining > preferences[task.assigned_to_id].urgent_deadline_hours:
+            continue
+
+        hours_text = f"{int(hours_remaining)} hour{'s' if hours_remaining != 1 else ''}"
+
+        items.append((task.assigned_to_id, {
+            'message': f"=� URGENT: Task due in {hours_text}: {task.title}",
+            'notification_type': 'system',
+            'related_object': task,
+            'action_url': f"/task-management?task={task.id}",
+            'metadata': {
+                'alert_type': 'deadline_urgent',
+                'task_id': task.id,
+                'task_title': task.title,
+                'due_date': task.due_date.isoformat(),
+                'hours_remaining': hours_remaining,
+                'priority': task.priority,
+            },
+        }))
+
+    # Skipped if alert type disabled or all alerts muted; digested if too many per user
+    notifications = NotificationService.create_notifications(
+        items, alert_preference='deadline_urgent_enabled', preferences=preferences, digest=True
+    )
+
+    return f"Sent {len(notifications)} urgent deadline notifications"
 
 
 @shared_task(name='notifications.check_inactive_tasks')
@@ -143,54 +139,49 @@ def check_inactive_tasks(days_threshold=7):
         days_threshold: Number of days without update to trigger alert (default: 7)
     """
     from crm_extensions.models import Task
+    from .models import NotificationPreferences
 
     now = timezone.now()
     threshold_date = now - timedelta(days=days_threshold)
 
     # Find active tasks that haven't been updated in a while
-    inactive_tasks = Task.objects.filter(
-        status__in=['todo', 'in_progress', 'blocked', 'review'],
-        updated_at__lt=threshold_date
-    ).select_related('assigned_to')
-
-    notifications_sent = 0
-
+    inactive_tasks = list(Task.objects.filter(
+        status__in=ACTIVE_TASK_STATUSES,
+        updated_at__lt=threshold_date,
+        assigned_to__isnull=False,
+    ))
+    preferences = NotificationPreferences.for_users(task.assigned_to_id for task in inactive_tasks)
+
+    items = []
     for task in inactive_tasks:
-        if task.assigned_to:
-            # Check user preferences
-            from .models import NotificationPreferences
-            preferences = NotificationPreferences.get_or_create_for_user(task.assigned_to)
-
-            # Skip if alert type disabled or all alerts muted
-            if not preferences.task_inactivity_enabled or preferences.mute_all_alerts:
-                continue
-
-            # Calculate days since last update
-            days_inactive = (now - task.updated_at).days
-
-            # Only send if exceeds user's custom threshold
-            if days_inactive < preferences.inactivity_days:
-                continue
-
-            # Create notification
-            NotificationService.create_notification(
-                user=task.assigned_to,
-                message=f"� No updates for {days_inactive} days: {task.title}",
-                notification_type='system',
-                related_object=task,
-                action_url=f"/task-management?task={task.id}",
-                metadata={
-                    'alert_type': 'task_inactive',
-                    'task_id': task.id,
-                    'task_title': task.title,
-                    'days_inactive': days_inactive,
-                    'last_updated': task.updated_at.isoformat(),
-                    'status': task.status,
-                }
-            )
-            notifications_sent += 1
-
-    return f"Sent {notifications_sent} inactivity notifications"
+        # Calculate days since last update
+        days_inactive = (now - task.updated_at).days
+
+        # Only send if exceeds user's custom threshold
+        if days_inactive < preferences[task.assigned_to_id].inactivity_days:
+            continue
+
+        items.append((task.assigned_to_id, {
+            'message': f"� No updates for {days_inactive} days: {task.title}",
+            'notification_type': 'system',
+            'related_object': task,
+            'action_url': f"/task-management?task={task.id}",
+            'metadata': {
+                'alert_type': 'task_inactive',
+                'task_id': task.id,
+                'task_title': task.title,
+                'days_inactive': days_inactive,
+                'last_updated': task.updated_at.isoformat(),
+                'status': task.status,
+            },
+        }))
+
+    # Skipped if alert type disabled or all alerts muted; digested if too many per user
+    notifications = NotificationService.create_notifications(
+        items, alert_preference='task_inactivity_enabled', preferences=preferences, digest=True
+    )
+
+    return f"Sent {len(notifications)} inactivity notifications"
 
 
 @shared_task(name='notifications.check_campaigns_ending_soon')
@@ -203,97 +194,74 @@ def check_campaigns_ending_soon(days_ahead=7):
         days_ahead: Number of days to look ahead for ending campaigns (default: 7)
     """
     from campaigns.models import Campaign
+    from crm_extensions.models import Task
+    from .models import NotificationPreferences
 
     now = timezone.now()
     end_date_threshold = (now + timedelta(days=days_ahead)).date()
     today = now.date()
 
     # Find active campaigns ending soon
-    campaigns_ending = Campaign.objects.filter(
+    campaigns_ending = list(Campaign.objects.filter(
         end_date__gte=today,
         end_date__lte=end_date_threshold,
-        status__in=['confirmed', 'active']
-    ).select_related('department')
-
-    notifications_sent = 0
-
+        status__in=['confirmed', 'active'],
+        department__isnull=False,
+    ).select_related('department', 'client'))
+
+    # Employees with active tasks on these campaigns, in one query
+    assigned_users = {}
+    for campaign_id, user_id in Task.objects.filter(
+        campaign__in=campaigns_ending,
+        status__in=ACTIVE_TASK_STATUSES,
+        assigned_to__isnull=False,
+    ).values_list('campaign_id', 'assigned_to').distinct():
+        assigned_users.setdefault(campaign_id, set()).add(user_id)
+
+    recipients = []
     for campaign in campaigns_ending:
         # Calculate days remaining
         days_remaining = (campaign.end_date - today).days
-
-        # Get department users to notify
-        if campaign.department:
-            # Notify department manager
-            if hasattr(campaign.department, 'manager') and campaign.department.manager:
-                # Check manager preferences
-                from .models import NotificationPreferences
-                manager_prefs = NotificationPreferences.get_or_create_for_user(campaign.department.manager)
-
-                # Only send if enabled and within threshold
-                if (manager_prefs.campaign_ending_enabled and
-                    not manager_prefs.mute_all_alerts and
-                    days_remaining <= manager_prefs.campaign_ending_days):
-
-                    NotificationService.create_notification(
-                        user=campaign.department.manager,
-                        message=f"=� Campaign ending in {days_remaining} day{'s' if days_remaining != 1 else ''}: {campaign.campaign_name}",
-                        notification_type='system',
-                        related_object=campaign,
-                        action_url=f"/crm?campaign={campaign.id}",
-                        metadata={
-                            'alert_type': 'campaign_ending',
-                            'campaign_id': campaign.id,
-                            'campaign_name': campaign.campaign_name,
-                            'end_date': campaign.end_date.isoformat(),
-                            'days_remaining': days_remaining,
-                            'client': str(campaign.client),
-                        }
-                    )
-                    notifications_sent += 1
-
-            # Notify all department employees with tasks on this campaign
-            from crm_extensions.models import Task
-            from django.contrib.auth import get_user_model
-            User = get_user_model()
-
-            assigned_users = Task.objects.filter(
-                campaign=campaign,
-                status__in=['todo', 'in_progress', 'blocked', 'review']
-            ).values_list('assigned_to', flat=True).distinct()
-
-            for user_id in assigned_users:
-                if user_id and user_id != campaign.department.manager.id:
-                    try:
-                        user = User.objects.get(id=user_id)
-
-                        # Check user preferences
-                        from .models import NotificationPreferences
-                        user_prefs = NotificationPreferences.get_or_create_for_user(user)
-
-                        # Only send if enabled and within threshold
-                        if (user_prefs.campaign_ending_enabled and
-                            not user_prefs.mute_all_alerts and
-                            days_remaining <= user_prefs.campaign_ending_days):
-
-                            NotificationService.create_notification(
-                                user=user,
-                                message=f"=� Campaign ending in {days_remaining} day{'s' if days_remaining != 1 else ''}: {campaign.campaign_name}",
-                                notification_type='system',
-                                related_object=campaign,
-                                action_url=f"/crm?campaign={campaign.id}",
-                                metadata={
-                                    'alert_type': 'campaign_ending',
-                                    'campaign_id': campaign.id,
-                                    'campaign_name': campaign.campaign_name,
-                                    'end_date': campaign.end_date.isoformat(),
-                                    'days_remaining': days_remaining,
-                                }
-                            )
-                            notifications_sent += 1
-                    except User.DoesNotExist:
-                        pass
-
-    return f"Sent {notifications_sent} campaign ending notifications"
+        payload = {
+            'message': f"=� Campaign ending in {days_remaining} day{'s' if days_remaining != 1 else ''}: {campaign.campaign_name}",
+            'notification_type': 'system',
+            'related_object': campaign,
+            'action_url': f"/crm?campaign={campaign.id}",
+            'metadata': {
+                'alert_type': 'campaign_ending',
+                'campaign_id': campaign.id,
+                'campaign_name': campaign.campaign_name,
+                'end_date': campaign.end_date.isoformat(),
+                'days_remaining': days_remaining,
+            },
+        }
+
+        # Notify department manager
+        manager = getattr(campaign.department, 'manager', None)
+        if manager:
+            recipients.append((manager.id, days_remaining, {
+                **payload,
+                'metadata': {**payload['metadata'], 'client': str(campaign.client)},
+            }))
+
+        # Notify all department employees with tasks on this campaign
+        for user_id in sorted(assigned_users.get(campaign.id, ())):
+            if not manager or user_id != manager.id:
+                recipients.append((user_id, days_remaining, payload))
+
+    preferences = NotificationPreferences.for_users(user_id for user_id, _days, _payload in recipients)
+
+    # Only send if enabled and within threshold
+    notifications = NotificationService.create_notifications(
+        (
+            (user_id, payload) for user_id, days_remaining, payload in recipients
+            if days_remaining <= preferences[user_id].campaign_ending_days
+        ),
+        alert_preference='campaign_ending_enabled',
+        preferences=preferences,
+    )
+
+    return f"Sent {len(notifications)} campaign ending notifications"
 
 
 @shared_task(name='notifications.check_overdue_tasks')
@@ -309,40 +277,60 @@ def check_overdue_tasks():
     # Find overdue tasks
     overdue_tasks = Task.objects.filter(
         due_date__lt=now,
-        status__in=['todo', 'in_progress', 'blocked', 'review']
-    ).select_related('assigned_to')
-
-    notifications_sent = 0
+        status__in=ACTIVE_TASK_STATUSES,
+        assigned_to__isnull=False,
+    )
 
+    items = []
     for task in overdue_tasks:
-        if task.assigned_to:
-            # Check user preferences
-            from .models import NotificationPreferences
-            preferences = NotificationPreferences.get_or_create_for_user(task.assigned_to)
-
-            # Skip if alert type disabled or all alerts muted
-            if not preferences.task_overdue_enabled or preferences.mute_all_alerts:
-                continue
-
-            # Calculate how overdue
-            days_overdue = (now - task.due_date).days
-
-            # Create notification
-            NotificationService.create_notification(
-                user=task.assigned_to,
-                message=f"=4 OVERDUE by {days_overdue} day{'s' if days_overdue != 1 else ''}: {task.title}",
-                notification_type='system',
-                related_object=task,
-                action_url=f"/task-management?task={task.id}",
-                metadata={
-                    'alert_type': 'task_overdue',
-                    'task_id': task.id,
-                    'task_title': task.title,
-                    'due_date': task.due_date.isoformat(),
-                    'days_overdue': days_overdue,
-                    'priority': task.priority,
-                }
-            )
-            notifications_sent += 1
+        # Calculate how overdue
+        days_overdue = (now - task.due_date).days
+
+        items.append((task.assigned_to_id, {
+            'message': f"=4 OVERDUE by {days_overdue} day{'s' if days_overdue != 1 else ''}: {task.title}",
+            'notification_type': 'system',
+            'related_object': task,
+            'action_url': f"/task-management?task={task.id}",
+            'metadata': {
+                'alert_type': 'task_overdue',
+                'task_id': task.id,
+                'task_title': task.title,
+                'due_date': task.due_date.isoformat(),
+                'days_overdue': days_overdue,
+                'priority': task.priority,
+            },
+        }))
+
+    # Skipped if alert type disabled or all alerts muted; digested if too many per user
+    notifications = NotificationService.create_notifications(
+        items, alert_preference='task_overdue_enabled', digest=True
+    )
+
+    return f"Sent {len(notifications)} overdue task notifications"
+
+
+@shared_task(name='notifications.reconcile_unread_counters')
+def reconcile_unread_counters():
+    """
+    Rewrite the cached unread counters from the database.
+    Runs every 15 minutes.
+    """
+    from .counters import reconcile_unread_counters as reconcile
+
+    result = reconcile()
+    return f"Reconciled {result['counters']} unread counters ({result['corrected']} corrected)"
+
+
+@shared_task(name='notifications.apply_retention')
+def apply_retention():
+    """
+    Delete expired notifications and song alerts and archive old read ones.
+    Runs daily at 3:00 AM.
+    """
+    from .retention import apply_retention as apply
 
-    return f"Sent {notifications_sent} overdue task notifications"
+    summary = apply()
+    return ', '.join(
+        f"{name}: {counts['deleted']} deleted, {counts['archived']} archived, {counts['purged']} purged"
+        for name, counts in summary.items()
+    )
@@ -1,3 +1,384 @@
-from django.test import TestCase
+"""
+Tests for bulk notification delivery.
 
-# Create your tests here.
+Tests NotificationService.create_notifications() and the periodic alert tasks:
+- Preferences are loaded once and respected
+- Notifications are bulk-inserted and pushed to each user's WebSocket group
+- Query count does not grow with the number of recipients
+- Same-type alerts are digested per user and pushes are rate limited
+- NotificationConsumer resume, live batching and mark_read_many
+- Unread counters kept in the cache, pushed as deltas and reconciled
+- Retention deletes expired rows and archives old read ones in batches
+"""
+
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from api.models import Department, Role, UserProfile
+from catalog.models import ArchivedSongAlert, Song, SongAlert
+from crm_extensions.models import Task
+from notifications.consumers import NotificationConsumer
+from notifications.counters import (
+    NOTIFICATIONS, SONG_ALERTS, counter_key, get_unread_counts, reconcile_unread_counters,
+)
+from notifications.delivery import take_push_tokens
+from notifications.retention import apply_retention
+from notifications.models import ArchivedNotification, Notification, NotificationPreferences
+from notifications.services import NotificationService
+from identity.models import Entity
+from notifications.tasks import check_overdue_tasks, check_tasks_due_tomorrow
+
+User = get_user_model()
+
+IN_MEMORY_CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'notifications'}}
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS)
+class BulkNotificationTestCase(TestCase):
+    """Test NotificationService.create_notifications()."""
+
+    def setUp(self):
+        self.users = [User.objects.create(username=f'user{i}', email=f'user{i}@example.com') for i in range(3)]
+        NotificationPreferences.objects.create(user=self.users[1], mute_all_alerts=True)
+        NotificationPreferences.objects.create(user=self.users[2], deadline_tomorrow_enabled=False)
+        self.department = Department.objects.create(code='digital', name='Digital')
+        ContentType.objects.get_for_model(Task)  # cached per process after first use
+
+    def receive(self, user):
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(f'notifications_{user.id}', channel)
+        return layer, channel
+
+    def test_create_notifications_respects_preferences(self):
+        layer, channel = self.receive(self.users[0])
+        task = Task.objects.create(title='Mix', department=self.department)
+
+        with self.assertNumQueries(2):  # preferences, insert
+            notifications = NotificationService.create_notifications(
+                [(user, {'message': 'Due tomorrow', 'related_object': task}) for user in self.users],
+                alert_preference='deadline_tomorrow_enabled',
+            )
+
+        self.assertEqual([n.user_id for n in notifications], [self.users[0].id])
+        stored = Notification.objects.get()
+        self.assertEqual((stored.message, stored.object_id), ('Due tomorrow', task.id))
+
+        message = async_to_sync(layer.receive)(channel)
+        self.assertEqual(message['type'], 'notification_message')
+        self.assertEqual(message['notification']['id'], stored.id)
+        self.assertEqual(message['notification']['content_type_name'], 'task')
+
+    def test_without_preference_everyone_is_notified(self):
+        notifications = NotificationService.create_notifications(
+            (user.id, {'message': 'Hello', 'notification_type': 'system'}) for user in self.users
+        )
+
+        self.assertEqual(len(notifications), 3)
+        self.assertEqual(Notification.objects.count(), 3)
+
+    def test_tasks_due_tomorrow_query_count_is_constant(self):
+        due = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        for user in self.users:
+            Task.objects.create(title=f'Task for {user.username}', department=self.department,
+                                assigned_to=user, due_date=due)
+        with self.assertNumQueries(3):  # tasks, preferences, insert
+            self.assertEqual(check_tasks_due_tomorrow(), 'Sent 1 tomorrow deadline notifications')
+
+        extra = [User.objects.create(username=f'extra{i}') for i in range(10)]
+        for user in extra:
+            Task.objects.create(title=f'Task for {user.username}', department=self.department,
+                                assigned_to=user, due_date=due)
+        with self.assertNumQueries(3):
+            self.assertEqual(check_tasks_due_tomorrow(), 'Sent 11 tomorrow deadline notifications')
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS, CACHES=LOCMEM_CACHES,
+                   NOTIFICATION_PUSH_RATE=60, NOTIFICATION_PUSH_BURST=2)
+class DigestAndThrottleTestCase(TestCase):
+    """Test alert digests and the per-user push rate limit."""
+
+    def setUp(self):
+        self.user = User.objects.create(username='busy')
+        self.other = User.objects.create(username='calm')
+        self.department = Department.objects.create(code='digital', name='Digital')
+
+    def test_overdue_alerts_are_digested_per_user(self):
+        due = timezone.now() - timedelta(days=2)
+        for i in range(5):
+            Task.objects.create(title=f'Task {i}', department=self.department, assigned_to=self.user, due_date=due)
+        Task.objects.create(title='Single', department=self.department, assigned_to=self.other, due_date=due)
+
+        self.assertEqual(check_overdue_tasks(), 'Sent 2 overdue task notifications')
+
+        digest = Notification.objects.get(user=self.user)
+        self.assertEqual(digest.metadata['count'], 5)
+        self.assertTrue(digest.metadata['digest'])
+        self.assertRegex(digest.message, r'^5 overdue tasks: Task \d, Task \d, Task \d and 2 more$')
+        self.assertFalse(Notification.objects.get(user=self.other).metadata.get('digest'))
+
+    def test_token_bucket_refills(self):
+        self.assertEqual(take_push_tokens({self.user.id: 3}, now=1000), {self.user.id: 2})
+        self.assertEqual(take_push_tokens({self.user.id: 3}, now=1000), {self.user.id: 0})
+        self.assertEqual(take_push_tokens({self.user.id: 3}, now=1001), {self.user.id: 1})
+        self.assertEqual(take_push_tokens({self.user.id: 3}, now=1100), {self.user.id: 2})
+
+    def test_pushes_beyond_limit_are_throttled(self):
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(f'notifications_{self.user.id}', channel)
+
+        notifications = NotificationService.create_notifications(
+            (self.user, {'message': f'Update {i}'}) for i in range(4)
+        )
+
+        self.assertEqual(len(notifications), 4)
+        received = [async_to_sync(layer.receive)(channel) for _ in range(3)]
+        self.assertEqual([m['type'] for m in received],
+                         ['notification_message', 'notification_message', 'notification_throttled'])
+        self.assertEqual(received[2]['count'], 2)
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS, CACHES=LOCMEM_CACHES, NOTIFICATION_BACKLOG_LIMIT=2,
+                   NOTIFICATION_BATCH_WINDOW_MS=20)
+class NotificationConsumerTestCase(TransactionTestCase):
+    """Test the WebSocket resume protocol, batching and bulk mark-read."""
+
+    def setUp(self):
+        self.user = User.objects.create(username='listener')
+        self.sent = [
+            Notification.objects.create(user=self.user, message=f'Missed {i}') for i in range(3)
+        ]
+
+    async def connect(self):
+        communicator = WebsocketCommunicator(NotificationConsumer.as_asgi(), '/ws/notifications/')
+        communicator.scope['user'] = self.user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        self.assertEqual((await communicator.receive_json_from())['type'], 'connection_established')
+        return communicator
+
+    async def test_resume_replays_backlog_in_one_frame(self):
+        communicator = await self.connect()
+
+        await communicator.send_json_to({'type': 'resume', 'last_id': self.sent[0].id})
+        frame = await communicator.receive_json_from()
+
+        self.assertEqual(frame['type'], 'backlog')
+        self.assertEqual([n['id'] for n in frame['notifications']], [self.sent[1].id, self.sent[2].id])
+        self.assertFalse(frame['has_more'])
+        self.assertEqual(await communicator.receive_json_from(),
+                         {'type': 'unread_counts', 'notifications': 3, 'song_alerts': 0})
+
+        await communicator.send_json_to({'type': 'resume', 'last_id': 0})
+        frame = await communicator.receive_json_from()
+        self.assertEqual(len(frame['notifications']), 2)
+        self.assertTrue(frame['has_more'])
+        await communicator.receive_json_from()
+        await communicator.disconnect()
+
+    async def test_live_burst_is_batched_and_deduplicated(self):
+        communicator = await self.connect()
+        await communicator.send_json_to({'type': 'resume', 'last_id': 0})
+        await communicator.receive_json_from()  # backlog
+        await communicator.receive_json_from()  # unread counts
+
+        # Already replayed by the resume, then two new ones
+        fresh = [await database_sync_to_async(Notification.objects.create)(user=self.user, message=f'Live {i}')
+                 for i in range(2)]
+        await database_sync_to_async(NotificationService.send_many)([self.sent[0], *fresh])
+
+        frames = []
+        while not await communicator.receive_nothing(timeout=0.2):
+            frames.append(await communicator.receive_json_from())
+
+        # One counter delta per created notification, then the live batch
+        self.assertEqual([frame['type'] for frame in frames], ['unread_delta', 'unread_delta', 'notification_batch'])
+        self.assertEqual([n['id'] for n in frames[-1]['notifications']], [n.id for n in fresh])
+        await communicator.disconnect()
+
+    async def test_late_live_notification_below_backlog_is_sent(self):
+        communicator = await self.connect()
+        await communicator.send_json_to({'type': 'resume', 'last_id': self.sent[0].id})
+        await communicator.receive_json_from()  # backlog of sent[1] and sent[2]
+        await communicator.receive_json_from()  # unread counts
+
+        # Committed late: older than the backlog's newest but not part of it
+        await database_sync_to_async(NotificationService.send_many)([self.sent[0]])
+
+        frames = []
+        while not await communicator.receive_nothing(timeout=0.2):
+            frames.append(await communicator.receive_json_from())
+
+        self.assertEqual(frames[-1]['type'], 'notification')
+        self.assertEqual(frames[-1]['notification']['id'], self.sent[0].id)
+        await communicator.disconnect()
+
+    async def test_mark_read_many(self):
+        communicator = await self.connect()
+        ids = [self.sent[0].id, self.sent[1].id]
+
+        await communicator.send_json_to({'type': 'mark_read_many', 'notification_ids': ids})
+        frame = await communicator.receive_json_from()
+
+        self.assertEqual(frame, {'type': 'marked_read', 'notification_ids': ids, 'count': 2})
+        unread = await database_sync_to_async(
+            lambda: set(Notification.objects.filter(is_read=False).values_list('id', flat=True))
+        )()
+        self.assertEqual(unread, {self.sent[2].id})
+        await communicator.disconnect()
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS, CACHES=LOCMEM_CACHES)
+class UnreadCounterTestCase(TestCase):
+    """Test cached unread counters."""
+
+    def setUp(self):
+        cache.clear()
+        self.department = Department.objects.create(code='label', name='Label')
+        role = Role.objects.create(code='label_employee', name='Label Employee', level=200)
+        self.user = User.objects.create(username='reader')
+        UserProfile.objects.update_or_create(user=self.user, defaults={'role': role, 'department': self.department})
+        artist = Entity.objects.create(kind='PF', display_name='Artist')
+        self.song = Song.objects.create(title='Hit', artist=artist, created_by=self.user)
+
+    def add_alert(self, **target):
+        return SongAlert.objects.create(song=self.song, alert_type='overdue', title='Late', message='Late', **target)
+
+    def test_counts_are_read_from_cache(self):
+        Notification.objects.create(user=self.user, message='Unread')
+        self.add_alert(target_user=self.user)
+        self.add_alert(target_department=self.department)
+
+        self.assertEqual(get_unread_counts(self.user.id, self.department.id), {NOTIFICATIONS: 1, SONG_ALERTS: 2})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_counts(self.user.id, self.department.id), {NOTIFICATIONS: 1, SONG_ALERTS: 2})
+
+    def test_changes_adjust_counters_and_push_deltas(self):
+        get_unread_counts(self.user.id, self.department.id)
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(f'notifications_department_{self.department.id}', channel)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notification = NotificationService.create_notification(user=self.user, message='Hi')
+            self.add_alert(target_department=self.department)
+            self.add_alert(target_department=self.department)
+        self.assertEqual(get_unread_counts(self.user.id, self.department.id), {NOTIFICATIONS: 1, SONG_ALERTS: 2})
+        self.assertEqual(async_to_sync(layer.receive)(channel),
+                         {'type': 'unread_delta', 'counter': SONG_ALERTS, 'delta': 1})
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            notification.mark_as_read()
+            response = client.post('/api/v1/alerts/mark_all_read/')
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(get_unread_counts(self.user.id, self.department.id), {NOTIFICATIONS: 0, SONG_ALERTS: 0})
+
+        response = client.get('/api/v1/alerts/unread_count/')
+        self.assertEqual(response.data, {'unread_count': 0})
+
+    def test_reconcile_repairs_drift(self):
+        self.add_alert(target_user=self.user)
+        cache.set(counter_key(SONG_ALERTS, 'user', self.user.id), 5, timeout=None)
+        cache.set(counter_key(NOTIFICATIONS, 'user', self.user.id), 3, timeout=None)
+
+        result = reconcile_unread_counters()
+
+        self.assertEqual(result['corrected'], 2)
+        self.assertEqual(get_unread_counts(self.user.id), {NOTIFICATIONS: 0, SONG_ALERTS: 1})
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS, CACHES=LOCMEM_CACHES,
+                   NOTIFICATION_ARCHIVE_AFTER_DAYS=30,
+                   NOTIFICATION_RETENTION_DAYS={'default': 365, 'system': 90},
+                   SONG_ALERT_RETENTION_DAYS={'default': None, 'overdue': 180})
+class RetentionTestCase(TestCase):
+    """Test notification and song alert retention."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='reader')
+        artist = Entity.objects.create(kind='PF', display_name='Artist')
+        self.song = Song.objects.create(title='Hit', artist=artist, created_by=self.user)
+        self.now = timezone.now()
+
+    def add_notification(self, days_old, is_read, notification_type='assignment'):
+        notification = Notification.objects.create(
+            user=self.user, message='Hi', notification_type=notification_type, is_read=is_read,
+        )
+        Notification.objects.filter(pk=notification.pk).update(created_at=self.now - timedelta(days=days_old))
+        return notification
+
+    def add_alert(self, days_old, is_read, alert_type='overdue'):
+        alert = SongAlert.objects.create(
+            song=self.song, alert_type=alert_type, title='Late', message='Late',
+            target_user=self.user, is_read=is_read,
+        )
+        SongAlert.objects.filter(pk=alert.pk).update(created_at=self.now - timedelta(days=days_old))
+        return alert
+
+    def test_expired_rows_are_deleted_and_old_read_rows_archived(self):
+        recent_read = self.add_notification(5, is_read=True)
+        old_unread = self.add_notification(60, is_read=False)
+        old_read = self.add_notification(60, is_read=True)
+        self.add_notification(100, is_read=False, notification_type='system')
+        self.add_notification(400, is_read=True)
+        old_alert = self.add_alert(60, is_read=True, alert_type='assignment')
+        ancient_alert = self.add_alert(1000, is_read=True, alert_type='assignment')
+        self.add_alert(200, is_read=False)
+
+        summary = apply_retention(now=self.now)
+
+        self.assertEqual(summary['notifications'], {'deleted': 2, 'archived': 1, 'purged': 0})
+        self.assertEqual(summary['song_alerts'], {'deleted': 1, 'archived': 2, 'purged': 0})
+        self.assertEqual(
+            set(Notification.objects.values_list('id', flat=True)), {recent_read.id, old_unread.id}
+        )
+        archived = ArchivedNotification.objects.get()
+        self.assertEqual((archived.id, archived.user_id, archived.message), (old_read.id, self.user.id, 'Hi'))
+        self.assertFalse(SongAlert.objects.exists())
+        self.assertEqual(
+            set(ArchivedSongAlert.objects.values_list('id', flat=True)), {old_alert.id, ancient_alert.id}
+        )
+
+    def test_archived_rows_are_purged_after_retention(self):
+        self.add_alert(60, is_read=True)
+        apply_retention(now=self.now)
+
+        summary = apply_retention(now=self.now + timedelta(days=150))
+
+        self.assertEqual(summary['song_alerts'], {'deleted': 0, 'archived': 0, 'purged': 1})
+        self.assertFalse(ArchivedSongAlert.objects.exists())
+
+    def test_work_is_done_in_bounded_batches(self):
+        for _ in range(5):
+            self.add_notification(60, is_read=True)
+
+        with override_settings(RETENTION_BATCH_SIZE=2, RETENTION_MAX_BATCHES=2):
+            self.assertEqual(apply_retention(now=self.now)['notifications']['archived'], 4)
+            self.assertEqual(apply_retention(now=self.now)['notifications']['archived'], 1)
+        self.assertEqual(ArchivedNotification.objects.count(), 5)
+
+    def test_deleting_unread_rows_adjusts_counters(self):
+        self.add_notification(400, is_read=False)
+        self.add_alert(200, is_read=False)
+        self.assertEqual(get_unread_counts(self.user.id), {NOTIFICATIONS: 1, SONG_ALERTS: 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_retention(now=self.now)
+
+        self.assertEqual(get_unread_counts(self.user.id), {NOTIFICATIONS: 0, SONG_ALERTS: 0})
@@ -6,6 +6,7 @@ from django.db.models import Q
 from django_ratelimit.decorators import ratelimit
 from django.utils.decorators import method_decorator
 
+from .counters import NOTIFICATIONS, adjust_unread, get_unread_counts
 from .models import Notification, NotificationPreferences
 from .serializers import (
     NotificationSerializer,
@@ -79,6 +80,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
             user=request.user,
             is_read=False
         ).update(is_read=True)
+        adjust_unread({(NOTIFICATIONS, 'user', request.user.id): -updated_count})
 
         return Response(
             {'count': updated_count},
@@ -88,11 +90,8 @@ class NotificationViewSet(viewsets.ModelViewSet):
     @method_decorator(ratelimit(key='user', rate='100/m', method='GET'))
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
-        """Get count of unread notifications (cached in Redis)"""
-        count = Notification.objects.filter(
-            user=request.user,
-            is_read=False
-        ).count()
+        """Get count of unread notifications (cached in Redis, see counters)"""
+        count = get_unread_counts(request.user.id)[NOTIFICATIONS]
 
         return Response(
             {'count': count},
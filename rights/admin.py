@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django import forms
-from .models import Credit, Split, SplitValidation
+from .models import Credit, Split, SplitTotal, SplitValidation
 
 
 class CreditAdminForm(forms.ModelForm):
@@ -200,4 +200,19 @@ def auto_calculate_splits(modeladmin, request, queryset):
 
 
 # Add actions to the admin
-SplitAdmin.actions = [validate_splits, auto_calculate_splits]
\ No newline at end of file
+SplitAdmin.actions = [validate_splits, auto_calculate_splits]
+
+
+@admin.register(SplitTotal)
+class SplitTotalAdmin(admin.ModelAdmin):
+    """Read-only view of the materialized split totals (maintained by signals)."""
+    list_display = ['scope', 'object_id', 'right_type', 'total', 'split_count', 'is_complete', 'updated_at']
+    list_filter = ['scope', 'right_type', 'is_complete']
+    search_fields = ['object_id']
+    readonly_fields = ['scope', 'object_id', 'right_type', 'total', 'split_count', 'is_complete', 'updated_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,445 @@
+"""
+Set-based split aggregation for Works and Recordings.
+
+Computes writer/publisher/master totals for any number of objects in a single
+grouped query instead of loading every Split row and summing in Python.
+
+Two entry points are provided:
+- get_split_totals() / get_split_completeness(): bulk API returning plain dicts
+  keyed by object id (one query regardless of how many ids are passed),
+  always computed live from Split rows.
+- annotate_split_totals(): queryset annotations (<right_type>_split_total,
+  <right_type>_split_count and splits_complete) for filtering, ordering and
+  list serializers, read from the materialized SplitTotal table.
+
+SplitTotal rows are maintained by refresh_split_total() (called from the Split
+signals) and can be rebuilt or checked for drift with rebuild_split_totals().
+
+Completeness rules (shared by every caller):
+- Work: writer splits total 100%, publisher splits either absent or 100%.
+- Recording: master splits total 100%.
+"""
+
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    BooleanField, Case, Count, DecimalField, IntegerField, OuterRef, Q,
+    Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Split, SplitTotal
+
+
+SPLIT_TOTAL = Decimal('100')
+SPLIT_TOLERANCE = Decimal('0.01')
+
+# Right types that apply to each scope
+SCOPE_RIGHT_TYPES = {
+    'work': ('writer', 'publisher'),
+    'recording': ('master',),
+}
+
+# Attribute used to cache bulk-loaded totals on model instances
+TOTALS_CACHE_ATTR = '_split_totals'
+
+
+def is_share_complete(total):
+    """Return True if a split total is 100% (within rounding tolerance)."""
+    return abs((total or Decimal('0')) - SPLIT_TOTAL) < SPLIT_TOLERANCE
+
+
+def empty_totals(scope):
+    """Return a zeroed totals dict for every right type of a scope."""
+    return {
+        right_type: {'total': Decimal('0'), 'count': 0}
+        for right_type in SCOPE_RIGHT_TYPES.get(scope, ())
+    }
+
+
+def is_complete(scope, totals):
+    """
+    Decide completeness from a totals dict.
+
+    Args:
+        scope: 'work' or 'recording'
+        totals: {right_type: {'total': Decimal, 'count': int}}
+
+    Returns:
+        bool: True if the object's splits are complete for its scope
+    """
+    if scope == 'work':
+        writer = totals.get('writer', {'total': Decimal('0'), 'count': 0})
+        publisher = totals.get('publisher', {'total': Decimal('0'), 'count': 0})
+        writer_complete = is_share_complete(writer['total'])
+        publisher_complete = publisher['count'] == 0 or is_share_complete(publisher['total'])
+        return writer_complete and publisher_complete
+
+    if scope == 'recording':
+        master = totals.get('master', {'total': Decimal('0'), 'count': 0})
+        return is_share_complete(master['total'])
+
+    return False
+
+
+def get_split_totals(scope, object_ids, right_types=None):
+    """
+    Compute split totals for many objects in one grouped query.
+
+    Args:
+        scope: 'work' or 'recording'
+        object_ids: Iterable of Work/Recording IDs
+        right_types: Optional subset of right types (defaults to all for scope)
+
+    Returns:
+        dict: {object_id: {right_type: {'total': Decimal, 'count': int}}}
+              Every requested id is present, with zeroed totals if it has no splits.
+    """
+    object_ids = {int(obj_id) for obj_id in object_ids if obj_id is not None}
+    right_types = tuple(right_types or SCOPE_RIGHT_TYPES.get(scope, ()))
+
+    results = {obj_id: empty_totals(scope) for obj_id in object_ids}
+    if not object_ids or not right_types:
+        return results
+
+    rows = (
+        Split.objects
+        .filter(scope=scope, object_id__in=object_ids, right_type__in=right_types)
+        .values('object_id', 'right_type')
+        .annotate(total=Sum('share'), count=Count('id'))
+        .order_by()
+    )
+
+    for row in rows:
+        results[row['object_id']][row['right_type']] = {
+            'total': row['total'] or Decimal('0'),
+            'count': row['count'],
+        }
+
+    return results
+
+
+def get_split_completeness(scope, object_ids):
+    """
+    Return {object_id: bool} completeness for many objects in one query.
+
+    Args:
+        scope: 'work' or 'recording'
+        object_ids: Iterable of Work/Recording IDs
+    """
+    totals = get_split_totals(scope, object_ids)
+    return {obj_id: is_complete(scope, obj_totals) for obj_id, obj_totals in totals.items()}
+
+
+def attach_split_totals(instances, scope):
+    """
+    Bulk-load split totals and cache them on model instances.
+
+    After this call, Work.has_complete_publishing_splits and
+    Recording.has_complete_master_splits read from the cache instead of
+    querying. Use for pages of objects that were not annotated.
+
+    Args:
+        instances: Iterable of Work or Recording instances
+        scope: 'work' or 'recording'
+
+    Returns:
+        list: The instances, for chaining
+    """
+    instances = [obj for obj in instances if obj is not None]
+    totals = get_split_totals(scope, [obj.pk for obj in instances])
+    for obj in instances:
+        setattr(obj, TOTALS_CACHE_ATTR, totals.get(obj.pk, empty_totals(scope)))
+    return instances
+
+
+def get_instance_split_totals(instance, scope):
+    """
+    Return the totals dict for a single instance.
+
+    Resolution order: cached totals from attach_split_totals(), then queryset
+    annotations from annotate_split_totals(), then a single grouped query.
+    """
+    cached = getattr(instance, TOTALS_CACHE_ATTR, None)
+    if cached is not None:
+        return cached
+
+    right_types = SCOPE_RIGHT_TYPES.get(scope, ())
+    if right_types and all(hasattr(instance, f'{rt}_split_total') for rt in right_types):
+        return {
+            rt: {
+                'total': getattr(instance, f'{rt}_split_total') or Decimal('0'),
+                'count': getattr(instance, f'{rt}_split_count', 0) or 0,
+            }
+            for rt in right_types
+        }
+
+    # Not cached: the object may be edited again in the same request
+    return get_split_totals(scope, [instance.pk]).get(instance.pk, empty_totals(scope))
+
+
+def _split_total_subquery(scope, right_type, field, output_field):
+    """Unique-index lookup of one SplitTotal column for the outer object."""
+    return Subquery(
+        SplitTotal.objects
+        .filter(scope=scope, object_id=OuterRef('pk'), right_type=right_type)
+        .order_by()
+        .values(field)[:1],
+        output_field=output_field,
+    )
+
+
+def splits_complete_q(scope):
+    """
+    Q object matching complete objects on an annotated queryset.
+
+    Shares have two decimal places, so "within 0.01 of 100" is an exact
+    comparison with 100 in SQL.
+    """
+    if scope == 'work':
+        return Q(writer_split_total=SPLIT_TOTAL) & (
+            Q(publisher_split_count=0) | Q(publisher_split_total=SPLIT_TOTAL)
+        )
+    if scope == 'recording':
+        return Q(master_split_total=SPLIT_TOTAL)
+    return Q(pk__in=[])
+
+
+def annotate_split_totals(queryset, scope):
+    """
+    Annotate a Work or Recording queryset with split totals and completeness.
+
+    Adds <right_type>_split_total, <right_type>_split_count for each right type
+    of the scope, plus a boolean splits_complete. Values come from the
+    SplitTotal table through its unique (scope, object_id, right_type) index,
+    so the whole page is resolved in the list query itself.
+
+    Args:
+        queryset: Work or Recording queryset
+        scope: 'work' or 'recording'
+
+    Returns:
+        QuerySet: Annotated queryset (unchanged if already annotated)
+    """
+    if 'splits_complete' in queryset.query.annotations:
+        return queryset
+
+    decimal_field = DecimalField(max_digits=9, decimal_places=2)
+    annotations = {}
+    for right_type in SCOPE_RIGHT_TYPES.get(scope, ()):
+        annotations[f'{right_type}_split_total'] = Coalesce(
+            _split_total_subquery(scope, right_type, 'total', decimal_field),
+            Value(Decimal('0')),
+            output_field=decimal_field,
+        )
+        annotations[f'{right_type}_split_count'] = Coalesce(
+            _split_total_subquery(scope, right_type, 'split_count', IntegerField()),
+            Value(0),
+            output_field=IntegerField(),
+        )
+
+    return queryset.annotate(**annotations).annotate(
+        splits_complete=Case(
+            When(splits_complete_q(scope), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        )
+    )
+
+
+def refresh_split_total(scope, object_id, right_type):
+    """
+    Recompute the SplitTotal row for one (scope, object_id, right_type) key.
+
+    Locks the existing row (if any) so concurrent split edits on the same
+    object serialize. When two transactions create the row at once, the one
+    losing the insert retries under the lock of the committed row, so its
+    aggregate includes the other's splits. The row is deleted once the key has
+    no splits left.
+
+    Args:
+        scope: 'work' or 'recording'
+        object_id: Work/Recording ID
+        right_type: Split right type
+
+    Returns:
+        SplitTotal or None: The refreshed row, or None if no splits remain
+    """
+    try:
+        return _refresh_split_total(scope, object_id, right_type)
+    except IntegrityError:
+        return _refresh_split_total(scope, object_id, right_type)
+
+
+def _refresh_split_total(scope, object_id, right_type):
+    with transaction.atomic():
+        row = (
+            SplitTotal.objects
+            .select_for_update()
+            .filter(scope=scope, object_id=object_id, right_type=right_type)
+            .first()
+        )
+        aggregate = Split.objects.filter(
+            scope=scope, object_id=object_id, right_type=right_type
+        ).aggregate(total=Sum('share'), count=Count('id'))
+
+        if not aggregate['count']:
+            if row is not None:
+                row.delete()
+            return None
+
+        total = aggregate['total'] or Decimal('0')
+        if row is None:
+            row = SplitTotal(scope=scope, object_id=object_id, right_type=right_type)
+        row.total = total
+        row.split_count = aggregate['count']
+        row.is_complete = is_share_complete(total)
+        row.save()
+        return row
+
+
+def rebuild_split_totals(check_only=False):
+    """
+    Compare SplitTotal with live Split aggregates and optionally repair it.
+
+    Args:
+        check_only: If True, report drift without writing anything
+
+    Returns:
+        dict: {
+            'expected': int,   # keys that have at least one split
+            'missing': [...],  # keys with splits but no SplitTotal row
+            'stale': [...],    # keys whose stored total/count differs
+            'orphaned': [...], # SplitTotal rows with no splits left
+        }
+        Each list holds (scope, object_id, right_type) tuples.
+    """
+    live = {
+        (row['scope'], row['object_id'], row['right_type']): (row['total'] or Decimal('0'), row['count'])
+        for row in (
+            Split.objects
+            .values('scope', 'object_id', 'right_type')
+            .annotate(total=Sum('share'), count=Count('id'))
+            .order_by()
+        )
+    }
+    stored = {
+        (row.scope, row.object_id, row.right_type): row
+        for row in SplitTotal.objects.all()
+    }
+
+    missing = sorted(key for key in live if key not in stored)
+    orphaned = sorted(key for key in stored if key not in live)
+    stale = sorted(
+        key for key, (total, count) in live.items()
+        if key in stored and (
+            stored[key].total != total
+            or stored[key].split_count != count
+            or stored[key].is_complete != is_share_complete(total)
+        )
+    )
+
+    if not check_only and (missing or stale or orphaned):
+        with transaction.atomic():
+            if orphaned:
+                SplitTotal.objects.filter(pk__in=[stored[key].pk for key in orphaned]).delete()
+
+            now = timezone.now()
+            for key in stale:
+                row = stored[key]
+                row.updated_at = now
+                row.total, row.split_count = live[key]
+                row.is_complete = is_share_complete(row.total)
+            if stale:
+                SplitTotal.objects.bulk_update(
+                    [stored[key] for key in stale],
+                    ['total', 'split_count', 'is_complete', 'updated_at'],
+                    batch_size=500,
+                )
+
+            SplitTotal.objects.bulk_create(
+                [
+                    SplitTotal(
+                        scope=scope, object_id=object_id, right_type=right_type,
+                        total=live[(scope, object_id, right_type)][0],
+                        split_count=live[(scope, object_id, right_type)][1],
+                        is_complete=is_share_complete(live[(scope, object_id, right_type)][0]),
+                    )
+                    for scope, object_id, right_type in missing
+                ],
+                batch_size=500,
+            )
+
+        # Bulk writes bypass the signals that invalidate cached API responses
+        from api.cache import bump_model_version
+        transaction.on_commit(lambda: bump_model_version(SplitTotal))
+
+    return {
+        'expected': len(live),
+        'missing': missing,
+        'stale': stale,
+        'orphaned': orphaned,
+    }
+
+
+def incomplete_object_ids(scope):
+    """
+    Ids of objects that have splits but are not fully split, from SplitTotal.
+
+    Matches the per-right-type rules of Split.validate_splits_total(): the
+    primary right type (writer for works, master for recordings) must total
+    100%, and any other right type must be absent, 0% or 100%.
+
+    Args:
+        scope: 'work' or 'recording'
+
+    Returns:
+        QuerySet: Distinct object ids, ordered ascending
+    """
+    right_types = SCOPE_RIGHT_TYPES.get(scope, ())
+    if not right_types:
+        return SplitTotal.objects.none().values_list('object_id', flat=True)
+
+    primary_type = right_types[0]
+    rows = SplitTotal.objects.filter(scope=scope)
+    primary_ids = rows.filter(right_type=primary_type).values('object_id')
+
+    return (
+        rows.filter(
+            Q(right_type=primary_type, is_complete=False)
+            | Q(right_type__in=right_types[1:], is_complete=False, total__gt=0)
+            | ~Q(object_id__in=primary_ids)
+        )
+        .order_by('object_id')
+        .values_list('object_id', flat=True)
+        .distinct()
+    )
+
+
+def get_stored_split_totals(scope, object_ids):
+    """
+    Read split totals for many objects from SplitTotal in one query.
+
+    Same return shape as get_split_totals(); use it where the materialized
+    totals are good enough (reports, dashboards).
+    """
+    object_ids = {int(obj_id) for obj_id in object_ids if obj_id is not None}
+    results = {obj_id: empty_totals(scope) for obj_id in object_ids}
+    if not object_ids:
+        return results
+
+    rows = SplitTotal.objects.filter(
+        scope=scope,
+        object_id__in=object_ids,
+        right_type__in=SCOPE_RIGHT_TYPES.get(scope, ()),
+    ).values('object_id', 'right_type', 'total', 'split_count')
+
+    for row in rows:
+        results[row['object_id']][row['right_type']] = {
+            'total': row['total'],
+            'count': row['split_count'],
+        }
+
+    return results
@@ -0,0 +1,55 @@
+"""
+Management command to rebuild the materialized SplitTotal table.
+
+Recomputes every (scope, object_id, right_type) total from Split rows and
+repairs missing, stale and orphaned SplitTotal rows:
+    python manage.py rebuild_split_totals
+
+Report drift without writing anything (exits non-zero if drift is found):
+    python manage.py rebuild_split_totals --check
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from rights.aggregation import rebuild_split_totals
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the SplitTotal table from Split rows, or checks it for drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report drift; do not modify SplitTotal',
+        )
+
+    def handle(self, *args, **options):
+        """Compare SplitTotal with live aggregates and repair or report drift."""
+        check_only = options['check']
+        report = rebuild_split_totals(check_only=check_only)
+
+        for label in ('missing', 'stale', 'orphaned'):
+            keys = report[label]
+            if not keys:
+                continue
+            self.stdout.write(self.style.WARNING(f'{label.capitalize()}: {len(keys)}'))
+            for scope, object_id, right_type in keys[:20]:
+                self.stdout.write(f'  {scope} #{object_id} ({right_type})')
+            if len(keys) > 20:
+                self.stdout.write(f'  ... and {len(keys) - 20} more')
+
+        drift = sum(len(report[label]) for label in ('missing', 'stale', 'orphaned'))
+
+        if check_only:
+            if drift:
+                raise CommandError(f'SplitTotal drift detected: {drift} key(s) out of date')
+            self.stdout.write(
+                self.style.SUCCESS(f'✓ SplitTotal is in sync ({report["expected"]} keys)')
+            )
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✓ Rebuild complete: {report["expected"]} keys, {drift} repaired'
+            )
+        )
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:34
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_split_totals(apps, schema_editor):
+    """Build SplitTotal rows from existing splits."""
+    Split = apps.get_model('rights', 'Split')
+    SplitTotal = apps.get_model('rights', 'SplitTotal')
+
+    rows = (
+        Split.objects
+        .values('scope', 'object_id', 'right_type')
+        .annotate(total=Sum('share'), count=Count('id'))
+        .order_by()
+    )
+    SplitTotal.objects.bulk_create(
+        [
+            SplitTotal(
+                scope=row['scope'],
+                object_id=row['object_id'],
+                right_type=row['right_type'],
+                total=row['total'] or Decimal('0'),
+                split_count=row['count'],
+                is_complete=abs((row['total'] or Decimal('0')) - Decimal('100')) < Decimal('0.01'),
+            )
+            for row in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rights', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SplitTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('work', 'Work'), ('recording', 'Recording')], help_text='Whether these totals are for a Work or Recording', max_length=10)),
+                ('object_id', models.BigIntegerField(help_text='ID of the Work or Recording')),
+                ('right_type', models.CharField(choices=[('writer', 'Writer Share'), ('publisher', 'Publisher Share'), ('master', 'Master Share')], help_text='Type of right/royalty', max_length=20)),
+                ('total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Sum of split shares for this key', max_digits=7)),
+                ('split_count', models.PositiveIntegerField(default=0, help_text='Number of splits for this key')),
+                ('is_complete', models.BooleanField(default=False, help_text='Whether the total is 100%')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Split Total',
+                'verbose_name_plural': 'Split Totals',
+                'indexes': [models.Index(fields=['scope', 'right_type', 'is_complete'], name='rights_spli_scope_809b42_idx')],
+                'unique_together': {('scope', 'object_id', 'right_type')},
+            },
+        ),
+        migrations.RunPython(populate_split_totals, migrations.RunPython.noop),
+    ]
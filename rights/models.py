@@ -1,9 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from decimal import Decimal
 from identity.models import Entity
 from catalog.models import Work, Recording
+from catalog.prefetch import get_prefetched_parent
 
 
 class Credit(models.Model):
@@ -143,14 +144,14 @@ class Credit(models.Model):
     def get_work(self):
         """Get the associated Work if scope is 'work'."""
         if self.scope == 'work':
-            return Work.objects.filter(id=self.object_id).first()
+            return get_prefetched_parent(self) or Work.objects.filter(id=self.object_id).first()
         return None
 
     @property
     def get_recording(self):
         """Get the associated Recording if scope is 'recording'."""
         if self.scope == 'recording':
-            return Recording.objects.filter(id=self.object_id).first()
+            return get_prefetched_parent(self) or Recording.objects.filter(id=self.object_id).first()
         return None
 
 
@@ -249,22 +250,17 @@ class Split(models.Model):
             raise ValidationError("Writer and publisher shares are not valid for Recording splits")
 
         # Check if adding/updating this split would exceed 100%
+        existing_splits = Split.objects.filter(
+            scope=self.scope,
+            object_id=self.object_id,
+            right_type=self.right_type
+        )
         if self.pk:
             # Updating existing split
-            existing_splits = Split.objects.filter(
-                scope=self.scope,
-                object_id=self.object_id,
-                right_type=self.right_type
-            ).exclude(pk=self.pk)
-        else:
-            # Creating new split
-            existing_splits = Split.objects.filter(
-                scope=self.scope,
-                object_id=self.object_id,
-                right_type=self.right_type
-            )
+            existing_splits = existing_splits.exclude(pk=self.pk)
 
-        total_share = sum(s.share for s in existing_splits) + (self.share or Decimal('0'))
+        existing_total = existing_splits.aggregate(total=models.Sum('share'))['total'] or Decimal('0')
+        total_share = existing_total + (self.share or Decimal('0'))
 
         if total_share > Decimal('100.01'):  # Allow 0.01 tolerance for rounding
             raise ValidationError(
@@ -272,22 +268,41 @@ class Split(models.Model):
                 f"would exceed 100% (total: {total_share:.2f}%)"
             )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded totals key so a re-keyed split refreshes both totals."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_totals_key = instance.totals_key
+        return instance
+
+    @property
+    def totals_key(self):
+        """(scope, object_id, right_type) key of the SplitTotal row this split feeds."""
+        return (
+            self.__dict__.get('scope'),
+            self.__dict__.get('object_id'),
+            self.__dict__.get('right_type'),
+        )
+
     def save(self, *args, **kwargs):
         self.clean()
-        super().save(*args, **kwargs)
+        # SplitTotal is refreshed from post_save; keep both in one transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._loaded_totals_key = self.totals_key
 
     @property
     def get_work(self):
         """Get the associated Work if scope is 'work'."""
         if self.scope == 'work':
-            return Work.objects.filter(id=self.object_id).first()
+            return get_prefetched_parent(self) or Work.objects.filter(id=self.object_id).first()
         return None
 
     @property
     def get_recording(self):
         """Get the associated Recording if scope is 'recording'."""
         if self.scope == 'recording':
-            return Recording.objects.filter(id=self.object_id).first()
+            return get_prefetched_parent(self) or Recording.objects.filter(id=self.object_id).first()
         return None
 
     @classmethod
@@ -296,13 +311,27 @@ class Split(models.Model):
         Validate that splits for a given scope/object/right_type total 100%.
         Returns a dictionary with validation results.
         """
-        splits = cls.objects.filter(
+        splits = list(cls.objects.filter(
             scope=scope,
             object_id=object_id,
             right_type=right_type
-        )
+        ).values('entity__display_name', 'share', 'source'))
+
+        return cls.build_validation_result(right_type, splits)
 
-        total = sum(s.share for s in splits)
+    @staticmethod
+    def build_validation_result(right_type, splits):
+        """
+        Build a validate_splits_total() result from already-loaded split rows.
+
+        Args:
+            right_type: 'writer', 'publisher' or 'master'
+            splits: List of dicts with entity__display_name, share and source
+
+        Returns:
+            dict: total, is_complete, missing and splits
+        """
+        total = sum((s['share'] for s in splits), Decimal('0'))
         is_complete = abs(total - Decimal('100')) < Decimal('0.01')
 
         # For publishers, it's OK to have 0% (no publishers)
@@ -313,7 +342,7 @@ class Split(models.Model):
             'total': total,
             'is_complete': is_complete,
             'missing': Decimal('100') - total if not is_complete else Decimal('0'),
-            'splits': list(splits.values('entity__display_name', 'share', 'source'))
+            'splits': splits
         }
 
     @classmethod
@@ -392,6 +421,67 @@ class Split(models.Model):
                         )
 
 
+class SplitTotal(models.Model):
+    """
+    Denormalized split totals per (scope, object_id, right_type).
+
+    Kept current by rights.signals on every Split save/delete, in the same
+    transaction as the split change. Rows exist only while at least one split
+    exists for the key. Lets Work/Recording lists filter, order and paginate
+    on completeness through a unique-index lookup instead of aggregating
+    Split rows on every request.
+
+    Rebuild from scratch or check for drift with:
+        python manage.py rebuild_split_totals [--check]
+    """
+
+    scope = models.CharField(
+        max_length=10,
+        choices=Split.SCOPE_CHOICES,
+        help_text="Whether these totals are for a Work or Recording"
+    )
+
+    object_id = models.BigIntegerField(
+        help_text="ID of the Work or Recording"
+    )
+
+    right_type = models.CharField(
+        max_length=20,
+        choices=Split.RIGHT_TYPE_CHOICES,
+        help_text="Type of right/royalty"
+    )
+
+    total = models.DecimalField(
+        max_digits=7,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        help_text="Sum of split shares for this key"
+    )
+
+    split_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of splits for this key"
+    )
+
+    is_complete = models.BooleanField(
+        default=False,
+        help_text="Whether the total is 100%"
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['scope', 'object_id', 'right_type']
+        indexes = [
+            models.Index(fields=['scope', 'right_type', 'is_complete']),
+        ]
+        verbose_name = "Split Total"
+        verbose_name_plural = "Split Totals"
+
+    def __str__(self):
+        return f"{self.scope} {self.object_id} - {self.total}% {self.get_right_type_display()}"
+
+
 class SplitValidation:
     """
     Utility class for validating split totals.
@@ -399,8 +489,44 @@ class SplitValidation:
     """
 
     @staticmethod
-    def validate_work_splits(work_id):
-        """Validate all splits for a Work."""
+    def _load_validations(scope, object_ids):
+        """
+        Load split rows for many objects in one query and build per-right-type
+        validation results.
+
+        Returns:
+            dict: {object_id: {right_type: validate_splits_total() result}}
+        """
+        from .aggregation import SCOPE_RIGHT_TYPES
+
+        right_types = SCOPE_RIGHT_TYPES.get(scope, ())
+        rows_by_object = {
+            int(obj_id): {right_type: [] for right_type in right_types}
+            for obj_id in object_ids
+        }
+
+        rows = Split.objects.filter(
+            scope=scope,
+            object_id__in=list(rows_by_object),
+            right_type__in=right_types
+        ).values('object_id', 'right_type', 'entity__display_name', 'share', 'source')
+
+        for row in rows:
+            object_id = row.pop('object_id')
+            right_type = row.pop('right_type')
+            rows_by_object[object_id][right_type].append(row)
+
+        return {
+            obj_id: {
+                right_type: Split.build_validation_result(right_type, splits)
+                for right_type, splits in by_type.items()
+            }
+            for obj_id, by_type in rows_by_object.items()
+        }
+
+    @staticmethod
+    def _work_result(work_id, writer_validation, publisher_validation):
+        """Build the validation result for a Work from its split validations."""
         results = {
             'work_id': work_id,
             'valid': True,
@@ -409,7 +535,6 @@ class SplitValidation:
         }
 
         # Check writer splits (must equal 100%)
-        writer_validation = Split.validate_splits_total('work', work_id, 'writer')
         if not writer_validation['is_complete']:
             results['valid'] = False
             results['errors'].append(
@@ -418,7 +543,6 @@ class SplitValidation:
             )
 
         # Check publisher splits (must equal 100% if publishers exist)
-        publisher_validation = Split.validate_splits_total('work', work_id, 'publisher')
         if publisher_validation['total'] > 0 and not publisher_validation['is_complete']:
             results['valid'] = False
             results['errors'].append(
@@ -434,8 +558,8 @@ class SplitValidation:
         return results
 
     @staticmethod
-    def validate_recording_splits(recording_id):
-        """Validate all splits for a Recording."""
+    def _recording_result(recording_id, master_validation):
+        """Build the validation result for a Recording from its split validation."""
         results = {
             'recording_id': recording_id,
             'valid': True,
@@ -444,7 +568,6 @@ class SplitValidation:
         }
 
         # Check master splits (must equal 100%)
-        master_validation = Split.validate_splits_total('recording', recording_id, 'master')
         if not master_validation['is_complete']:
             results['valid'] = False
             results['errors'].append(
@@ -456,16 +579,39 @@ class SplitValidation:
 
         return results
 
+    @staticmethod
+    def validate_work_splits(work_id):
+        """Validate all splits for a Work."""
+        validations = SplitValidation._load_validations('work', [work_id])[int(work_id)]
+        return SplitValidation._work_result(
+            work_id, validations['writer'], validations['publisher']
+        )
+
+    @staticmethod
+    def validate_recording_splits(recording_id):
+        """Validate all splits for a Recording."""
+        validations = SplitValidation._load_validations('recording', [recording_id])[int(recording_id)]
+        return SplitValidation._recording_result(recording_id, validations['master'])
+
     @staticmethod
     def bulk_validate(scope, object_ids):
-        """Validate splits for multiple objects."""
+        """
+        Validate splits for multiple objects.
+
+        All split rows are loaded in a single query, regardless of how many
+        objects are validated.
+        """
+        validations = SplitValidation._load_validations(scope, object_ids)
         results = []
 
         for obj_id in object_ids:
+            obj_validations = validations[int(obj_id)]
             if scope == 'work':
-                result = SplitValidation.validate_work_splits(obj_id)
+                result = SplitValidation._work_result(
+                    obj_id, obj_validations['writer'], obj_validations['publisher']
+                )
             else:
-                result = SplitValidation.validate_recording_splits(obj_id)
+                result = SplitValidation._recording_result(obj_id, obj_validations['master'])
             results.append(result)
 
         return {
@@ -474,4 +620,4 @@ class SplitValidation:
             'valid_count': sum(1 for r in results if r['valid']),
             'invalid_count': sum(1 for r in results if not r['valid']),
             'details': results
-        }
\ No newline at end of file
+        }
@@ -1,7 +1,8 @@
 """
-Rights signals for checklist auto-validation.
+Rights signals for split totals and checklist auto-validation.
 
-Handles auto-validation when splits (writers, publishers, masters) are created/updated.
+Keeps the materialized SplitTotal table current and handles auto-validation
+when splits (writers, publishers, masters) are created/updated.
 """
 
 import logging
@@ -12,20 +13,47 @@ from .models import Split
 logger = logging.getLogger(__name__)
 
 
+@receiver(post_save, sender=Split)
+def refresh_totals_on_split_saved(sender, instance, **kwargs):
+    """
+    Refresh SplitTotal for the saved split's key.
+
+    Runs inside Split.save()'s transaction, so totals never diverge from the
+    splits they summarize. If the split was moved to another object or right
+    type, the previous key is refreshed as well.
+    """
+    from .aggregation import refresh_split_total
+
+    keys = {instance.totals_key}
+    previous_key = getattr(instance, '_loaded_totals_key', None)
+    if previous_key and None not in previous_key:
+        keys.add(previous_key)
+
+    for key in keys:
+        refresh_split_total(*key)
+
+
+@receiver(post_delete, sender=Split)
+def refresh_totals_on_split_deleted(sender, instance, **kwargs):
+    """Refresh SplitTotal for the deleted split's key."""
+    from .aggregation import refresh_split_total
+
+    refresh_split_total(instance.scope, instance.object_id, instance.right_type)
+
+
 @receiver(post_save, sender=Split)
 def on_split_saved(sender, instance, created, **kwargs):
     """
     Handle Split save events.
 
     When writers, publishers, or master splits are created/updated,
-    trigger checklist validation for the related entity.
+    revalidate the split-dependent checklist items of the related entity.
     """
     try:
-        # Trigger validation based on scope and right_type
         if instance.scope == 'work' and instance.right_type in ['writer', 'publisher']:
-            _validate_work_checklists(instance.object_id, instance.right_type)
+            _revalidate_split_checklists('work', instance.object_id)
         elif instance.scope == 'recording' and instance.right_type == 'master':
-            _validate_recording_checklists(instance.object_id)
+            _revalidate_split_checklists('recording', instance.object_id)
 
     except Exception as e:
         logger.error(
@@ -42,11 +70,8 @@ def on_split_deleted(sender, instance, **kwargs):
     When splits are deleted, re-validate checklists (items may become incomplete).
     """
     try:
-        # Trigger validation based on scope
-        if instance.scope == 'work':
-            _validate_work_checklists(instance.object_id, instance.right_type)
-        elif instance.scope == 'recording':
-            _validate_recording_checklists(instance.object_id)
+        if instance.scope in ['work', 'recording']:
+            _revalidate_split_checklists(instance.scope, instance.object_id)
 
     except Exception as e:
         logger.error(
@@ -55,110 +80,14 @@ def on_split_deleted(sender, instance, **kwargs):
         )
 
 
-def _validate_work_checklists(work_id, right_type=None):
+def _revalidate_split_checklists(scope, object_id):
     """
-    Validate and auto-complete work-related checklist items.
+    Complete split-dependent checklist items that now pass, and reopen those that no longer do.
 
     Args:
-        work_id: ID of the Work that was updated
-        right_type: Optional right_type filter ('writer' or 'publisher')
+        scope: 'work' or 'recording'
+        object_id: ID of the Work or Recording whose splits changed
     """
-    from catalog.models import Work, Song, SongChecklistItem
+    from catalog.jobs import schedule_revalidation
 
-    try:
-        work = Work.objects.get(id=work_id)
-
-        # Find all songs that use this work
-        songs = Song.objects.filter(work=work)
-
-        for song in songs:
-            # Get ALL incomplete checklist items for this song
-            checklist_items = SongChecklistItem.objects.filter(
-                song=song,
-                is_complete=False
-            )
-
-            for item in checklist_items:
-                # Check if this item validates against work
-                validation_rule = item.validation_rule or {}
-                entity = validation_rule.get('entity')
-
-                # Only process items that validate against 'work' or 'work_writers'
-                if entity in ['work', 'work_writers']:
-                    # Run validation
-                    is_valid = item.validate()
-
-                    if is_valid:
-                        item.is_complete = True
-                        item.save(update_fields=['is_complete'])
-                        logger.info(
-                            f"Split ({right_type}): ✓ Auto-completed checklist item '{item.item_name}' "
-                            f"for Song {song.id} (Work {work_id})"
-                        )
-                    elif item.is_complete:
-                        # If was complete but no longer valid (e.g., split deleted), mark incomplete
-                        item.is_complete = False
-                        item.save(update_fields=['is_complete'])
-                        logger.info(
-                            f"Split ({right_type}): ✗ Marked checklist item '{item.item_name}' as incomplete "
-                            f"for Song {song.id} (Work {work_id})"
-                        )
-
-    except Work.DoesNotExist:
-        logger.warning(f"Work #{work_id} not found for split validation")
-    except Exception as e:
-        logger.error(f"Error validating work checklists for Work #{work_id}: {e}", exc_info=True)
-
-
-def _validate_recording_checklists(recording_id):
-    """
-    Validate and auto-complete recording-related checklist items.
-
-    Args:
-        recording_id: ID of the Recording that was updated
-    """
-    from catalog.models import Recording, Song, SongChecklistItem
-
-    try:
-        recording = Recording.objects.get(id=recording_id)
-
-        # Get the song associated with this recording
-        if hasattr(recording, 'song') and recording.song:
-            song = recording.song
-
-            # Get ALL incomplete checklist items for this song
-            checklist_items = SongChecklistItem.objects.filter(
-                song=song,
-                is_complete=False
-            )
-
-            for item in checklist_items:
-                # Check if this item validates against recording
-                validation_rule = item.validation_rule or {}
-                entity = validation_rule.get('entity')
-
-                # Only process items that validate against 'recording'
-                if entity == 'recording':
-                    # Run validation
-                    is_valid = item.validate()
-
-                    if is_valid:
-                        item.is_complete = True
-                        item.save(update_fields=['is_complete'])
-                        logger.info(
-                            f"Split (master): ✓ Auto-completed checklist item '{item.item_name}' "
-                            f"for Song {song.id} (Recording {recording_id})"
-                        )
-                    elif item.is_complete:
-                        # If was complete but no longer valid, mark incomplete
-                        item.is_complete = False
-                        item.save(update_fields=['is_complete'])
-                        logger.info(
-                            f"Split (master): ✗ Marked checklist item '{item.item_name}' as incomplete "
-                            f"for Song {song.id} (Recording {recording_id})"
-                        )
-
-    except Recording.DoesNotExist:
-        logger.warning(f"Recording #{recording_id} not found for split validation")
-    except Exception as e:
-        logger.error(f"Error validating recording checklists for Recording #{recording_id}: {e}", exc_info=True)
+    schedule_revalidation(scope, object_id, fields=['splits'], sync=True)
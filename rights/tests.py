@@ -1,3 +1,239 @@
+"""
+Tests for set-based split aggregation and materialized split totals (rights.aggregation).
+"""
+
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.db.models import QuerySet
 from django.test import TestCase
 
-# Create your tests here.
+from catalog.models import Work, Recording
+from identity.models import Entity
+from rights.models import Split, SplitTotal, SplitValidation
+from rights.aggregation import (
+    annotate_split_totals, attach_split_totals, get_split_completeness,
+    get_split_totals, incomplete_object_ids, rebuild_split_totals, refresh_split_total,
+)
+
+
+class SplitAggregationTestCase(TestCase):
+    """Test grouped split totals and completeness annotations."""
+
+    def setUp(self):
+        """Set up works, recordings and entities."""
+        self.writer_a = Entity.objects.create(kind='PF', display_name='Writer A')
+        self.writer_b = Entity.objects.create(kind='PF', display_name='Writer B')
+        self.publisher = Entity.objects.create(kind='PJ', display_name='Publisher')
+
+        # Complete: writers 100%, no publishers
+        self.complete_work = Work.objects.create(title='Complete Work')
+        Split.objects.create(scope='work', object_id=self.complete_work.id,
+                             entity=self.writer_a, right_type='writer', share=Decimal('60.00'))
+        Split.objects.create(scope='work', object_id=self.complete_work.id,
+                             entity=self.writer_b, right_type='writer', share=Decimal('40.00'))
+
+        # Incomplete: writers 100%, publishers 50%
+        self.partial_publisher_work = Work.objects.create(title='Partial Publisher Work')
+        Split.objects.create(scope='work', object_id=self.partial_publisher_work.id,
+                             entity=self.writer_a, right_type='writer', share=Decimal('100.00'))
+        Split.objects.create(scope='work', object_id=self.partial_publisher_work.id,
+                             entity=self.publisher, right_type='publisher', share=Decimal('50.00'))
+
+        # Incomplete: no splits at all
+        self.empty_work = Work.objects.create(title='Empty Work')
+
+        self.complete_recording = Recording.objects.create(title='Complete Recording')
+        Split.objects.create(scope='recording', object_id=self.complete_recording.id,
+                             entity=self.writer_a, right_type='master', share=Decimal('100.00'))
+
+        self.partial_recording = Recording.objects.create(title='Partial Recording')
+        Split.objects.create(scope='recording', object_id=self.partial_recording.id,
+                             entity=self.writer_a, right_type='master', share=Decimal('70.00'))
+
+    def test_get_split_totals_single_query(self):
+        """Totals for many works are computed with one query."""
+        ids = [self.complete_work.id, self.partial_publisher_work.id, self.empty_work.id]
+
+        with self.assertNumQueries(1):
+            totals = get_split_totals('work', ids)
+
+        self.assertEqual(totals[self.complete_work.id]['writer']['total'], Decimal('100.00'))
+        self.assertEqual(totals[self.complete_work.id]['writer']['count'], 2)
+        self.assertEqual(totals[self.partial_publisher_work.id]['publisher']['total'], Decimal('50.00'))
+        self.assertEqual(totals[self.empty_work.id]['writer'], {'total': Decimal('0'), 'count': 0})
+
+    def test_get_split_completeness(self):
+        """Completeness matches the per-object model properties."""
+        works = get_split_completeness(
+            'work', [self.complete_work.id, self.partial_publisher_work.id, self.empty_work.id]
+        )
+        self.assertEqual(works, {
+            self.complete_work.id: True,
+            self.partial_publisher_work.id: False,
+            self.empty_work.id: False,
+        })
+
+        for work in Work.objects.all():
+            self.assertEqual(work.has_complete_publishing_splits, works[work.id])
+
+        recordings = get_split_completeness(
+            'recording', [self.complete_recording.id, self.partial_recording.id]
+        )
+        self.assertTrue(recordings[self.complete_recording.id])
+        self.assertFalse(recordings[self.partial_recording.id])
+
+    def test_annotate_split_totals_filters(self):
+        """splits_complete annotation filters works and recordings in SQL."""
+        complete_works = annotate_split_totals(Work.objects.all(), 'work').filter(splits_complete=True)
+        self.assertEqual(list(complete_works), [self.complete_work])
+
+        incomplete_recordings = annotate_split_totals(
+            Recording.objects.all(), 'recording'
+        ).filter(splits_complete=False)
+        self.assertEqual(list(incomplete_recordings), [self.partial_recording])
+
+    def test_annotated_properties_do_not_query(self):
+        """Model properties read annotations instead of querying per row."""
+        works = list(annotate_split_totals(Work.objects.all(), 'work'))
+
+        with self.assertNumQueries(0):
+            flags = {work.id: work.has_complete_publishing_splits for work in works}
+
+        self.assertTrue(flags[self.complete_work.id])
+        self.assertFalse(flags[self.partial_publisher_work.id])
+
+    def test_attach_split_totals(self):
+        """Bulk-attached totals are used by the model properties."""
+        recordings = list(Recording.objects.all())
+
+        with self.assertNumQueries(1):
+            attach_split_totals(recordings, 'recording')
+
+        with self.assertNumQueries(0):
+            flags = {r.id: r.has_complete_master_splits for r in recordings}
+
+        self.assertTrue(flags[self.complete_recording.id])
+        self.assertFalse(flags[self.partial_recording.id])
+
+    def test_bulk_validate_single_query(self):
+        """bulk_validate loads all split rows in one query."""
+        ids = [self.complete_work.id, self.partial_publisher_work.id, self.empty_work.id]
+
+        with self.assertNumQueries(1):
+            report = SplitValidation.bulk_validate('work', ids)
+
+        self.assertEqual(report['total_objects'], 3)
+        self.assertEqual(report['valid_count'], 1)
+        self.assertEqual(report['invalid_count'], 2)
+        self.assertEqual(report['details'][0], SplitValidation.validate_work_splits(self.complete_work.id))
+
+    def test_split_clean_rejects_total_over_100(self):
+        """Adding a split that pushes the total over 100% is rejected."""
+        from django.core.exceptions import ValidationError
+
+        with self.assertRaises(ValidationError):
+            Split.objects.create(scope='recording', object_id=self.partial_recording.id,
+                                 entity=self.writer_b, right_type='master', share=Decimal('40.00'))
+
+
+class SplitTotalTestCase(TestCase):
+    """Test that SplitTotal rows follow Split changes and can be rebuilt."""
+
+    def setUp(self):
+        """Set up a work with one writer split."""
+        self.writer = Entity.objects.create(kind='PF', display_name='Writer')
+        self.publisher = Entity.objects.create(kind='PJ', display_name='Publisher')
+        self.work = Work.objects.create(title='Work')
+        self.other_work = Work.objects.create(title='Other Work')
+        self.split = Split.objects.create(scope='work', object_id=self.work.id,
+                                          entity=self.writer, right_type='writer', share=Decimal('60.00'))
+
+    def get_total(self, object_id, right_type='writer'):
+        return SplitTotal.objects.filter(scope='work', object_id=object_id, right_type=right_type).first()
+
+    def test_totals_follow_create_update_delete(self):
+        """Saving and deleting splits keeps the stored total current."""
+        row = self.get_total(self.work.id)
+        self.assertEqual(row.total, Decimal('60.00'))
+        self.assertEqual(row.split_count, 1)
+        self.assertFalse(row.is_complete)
+
+        self.split.share = Decimal('100.00')
+        self.split.save()
+        row = self.get_total(self.work.id)
+        self.assertEqual(row.total, Decimal('100.00'))
+        self.assertTrue(row.is_complete)
+
+        self.split.delete()
+        self.assertIsNone(self.get_total(self.work.id))
+
+    def test_rekeyed_split_refreshes_both_keys(self):
+        """Moving a split to another work refreshes the old and the new total."""
+        split = Split.objects.get(pk=self.split.pk)
+        split.object_id = self.other_work.id
+        split.save()
+
+        self.assertIsNone(self.get_total(self.work.id))
+        self.assertEqual(self.get_total(self.other_work.id).total, Decimal('60.00'))
+
+    def test_concurrent_first_insert_retries_under_lock(self):
+        """Losing the insert race retries against the row the other transaction created."""
+        SplitTotal.objects.filter(scope='work', object_id=self.work.id).update(total=0, split_count=0)
+        first = QuerySet.first
+        missed = []
+
+        def first_missing_once(queryset):
+            # The competing row is not visible yet when this transaction locks
+            if queryset.model is SplitTotal and not missed:
+                missed.append(True)
+                return None
+            return first(queryset)
+
+        with patch.object(QuerySet, 'first', first_missing_once):
+            row = refresh_split_total('work', self.work.id, 'writer')
+
+        self.assertEqual(row.total, Decimal('60.00'))
+        self.assertEqual(SplitTotal.objects.filter(scope='work', object_id=self.work.id).count(), 1)
+
+    def test_incomplete_object_ids(self):
+        """Works with partial writers or publisher-only splits are incomplete."""
+        publisher_only = Work.objects.create(title='Publisher Only')
+        Split.objects.create(scope='work', object_id=publisher_only.id,
+                             entity=self.publisher, right_type='publisher', share=Decimal('100.00'))
+        complete = Work.objects.create(title='Complete')
+        Split.objects.create(scope='work', object_id=complete.id,
+                             entity=self.writer, right_type='writer', share=Decimal('100.00'))
+
+        self.assertEqual(
+            list(incomplete_object_ids('work')),
+            sorted([self.work.id, publisher_only.id])
+        )
+
+    def test_rebuild_reports_and_repairs_drift(self):
+        """rebuild_split_totals finds missing, stale and orphaned rows and fixes them."""
+        SplitTotal.objects.filter(scope='work', object_id=self.work.id).update(total=Decimal('10.00'))
+        SplitTotal.objects.create(scope='work', object_id=self.other_work.id, right_type='writer',
+                                  total=Decimal('100.00'), split_count=1, is_complete=True)
+
+        report = rebuild_split_totals(check_only=True)
+        self.assertEqual(report['stale'], [('work', self.work.id, 'writer')])
+        self.assertEqual(report['orphaned'], [('work', self.other_work.id, 'writer')])
+        self.assertEqual(self.get_total(self.work.id).total, Decimal('10.00'))
+
+        rebuild_split_totals()
+        self.assertEqual(self.get_total(self.work.id).total, Decimal('60.00'))
+        self.assertIsNone(self.get_total(self.other_work.id))
+
+        SplitTotal.objects.all().delete()
+        report = rebuild_split_totals()
+        self.assertEqual(report['missing'], [('work', self.work.id, 'writer')])
+        self.assertEqual(rebuild_split_totals(check_only=True)['missing'], [])
+
+    def test_annotations_read_split_totals(self):
+        """Completeness annotations read the stored totals."""
+        SplitTotal.objects.filter(scope='work', object_id=self.work.id).update(
+            total=Decimal('100.00'), is_complete=True
+        )
+        work = annotate_split_totals(Work.objects.filter(pk=self.work.pk), 'work').get()
+        self.assertTrue(work.splits_complete)
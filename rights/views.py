@@ -7,6 +7,7 @@ from django.db.models import Q, Sum, Count
 from django.db import transaction
 from decimal import Decimal
 from .models import Credit, Split, SplitValidation
+from .aggregation import get_stored_split_totals, incomplete_object_ids
 from .serializers import (
     CreditSerializer, SplitSerializer, SplitValidationSerializer,
     SplitBulkCreateSerializer, AutoCalculateSplitsSerializer,
@@ -416,32 +417,51 @@ class SplitViewSet(viewsets.ModelViewSet):
     def stats(self, request):
         """Get split statistics."""
         stats = {
-            'total_splits': Split.objects.count(),
-            'by_scope': {},
-            'by_right_type': {},
-            'locked_count': Split.objects.filter(is_locked=True).count(),
+            'total_splits': 0,
+            'by_scope': {scope_name: 0 for _, scope_name in Split.SCOPE_CHOICES},
+            'by_right_type': {type_name: 0 for _, type_name in Split.RIGHT_TYPE_CHOICES},
+            'locked_count': 0,
             'incomplete_works': [],
-            'incomplete_recordings': []
+            'incomplete_works_count': 0,
+            'incomplete_recordings': [],
+            'incomplete_recordings_count': 0
         }
 
-        # Count by scope
-        for scope_code, scope_name in Split.SCOPE_CHOICES:
-            count = Split.objects.filter(scope=scope_code).count()
-            stats['by_scope'][scope_name] = count
-
-        # Count by right type
-        for type_code, type_name in Split.RIGHT_TYPE_CHOICES:
-            count = Split.objects.filter(right_type=type_code).count()
-            stats['by_right_type'][type_name] = count
+        # Counts by scope/right type/lock state in a single grouped query
+        scope_names = dict(Split.SCOPE_CHOICES)
+        type_names = dict(Split.RIGHT_TYPE_CHOICES)
+        grouped = Split.objects.values('scope', 'right_type').annotate(
+            count=Count('id'),
+            locked=Count('id', filter=Q(is_locked=True))
+        ).order_by()
+
+        for row in grouped:
+            stats['total_splits'] += row['count']
+            stats['locked_count'] += row['locked']
+            if row['scope'] in scope_names:
+                stats['by_scope'][scope_names[row['scope']]] += row['count']
+            if row['right_type'] in type_names:
+                stats['by_right_type'][type_names[row['right_type']]] += row['count']
+
+        # Incomplete objects come from the SplitTotal table: counts cover every
+        # object, the detail lists are limited to the first `limit` objects.
+        try:
+            limit = max(0, int(request.query_params.get('limit', 10)))
+        except (TypeError, ValueError):
+            limit = 10
 
         # Find incomplete works
-        work_ids = Split.objects.filter(scope='work').values('object_id').distinct()
-        for work_id in work_ids[:10]:  # Limit to 10 for performance
-            obj_id = work_id['object_id']
+        incomplete_work_ids = incomplete_object_ids('work')
+        stats['incomplete_works_count'] = incomplete_work_ids.count()
+        work_ids = list(incomplete_work_ids[:limit])
+        work_totals = get_stored_split_totals('work', work_ids)
+        works = Work.objects.in_bulk(work_ids)
+        for obj_id in work_ids:
             for right_type in ['writer', 'publisher']:
-                validation = Split.validate_splits_total('work', obj_id, right_type)
+                total = work_totals[obj_id][right_type]['total']
+                validation = Split.build_validation_result(right_type, [{'share': total}])
                 if not validation['is_complete']:
-                    work = Work.objects.filter(id=obj_id).first()
+                    work = works.get(obj_id)
                     stats['incomplete_works'].append({
                         'id': obj_id,
                         'title': work.title if work else f"Work #{obj_id}",
@@ -451,12 +471,16 @@ class SplitViewSet(viewsets.ModelViewSet):
                     })
 
         # Find incomplete recordings
-        recording_ids = Split.objects.filter(scope='recording').values('object_id').distinct()
-        for recording_id in recording_ids[:10]:  # Limit to 10 for performance
-            obj_id = recording_id['object_id']
-            validation = Split.validate_splits_total('recording', obj_id, 'master')
+        incomplete_recording_ids = incomplete_object_ids('recording')
+        stats['incomplete_recordings_count'] = incomplete_recording_ids.count()
+        recording_ids = list(incomplete_recording_ids[:limit])
+        recording_totals = get_stored_split_totals('recording', recording_ids)
+        recordings = Recording.objects.in_bulk(recording_ids)
+        for obj_id in recording_ids:
+            total = recording_totals[obj_id]['master']['total']
+            validation = Split.build_validation_result('master', [{'share': total}])
             if not validation['is_complete']:
-                recording = Recording.objects.filter(id=obj_id).first()
+                recording = recordings.get(obj_id)
                 stats['incomplete_recordings'].append({
                     'id': obj_id,
                     'title': recording.title if recording else f"Recording #{obj_id}",
@@ -464,4 +488,4 @@ class SplitViewSet(viewsets.ModelViewSet):
                     'missing': float(validation['missing'])
                 })
 
-        return Response(stats)
\ No newline at end of file
+        return Response(stats)